@@ -0,0 +1,170 @@
+import logging
+import select
+import threading
+from collections import defaultdict
+
+import inject
+
+from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.data_version_repository_service import DataVersionRepositoryService
+
+
+class DataChangeNotifier:
+    """
+    Change notification channel between the process writing data sets and the processes caching them.
+
+    Writers publish the name of a data set after storing it, which increments its version in the data_version
+    table. Readers subscribe callbacks, usually cache invalidations, and start a background listener that compares
+    the stored versions with the last seen ones and calls the callbacks of every changed data set.
+
+    On PostgreSQL the listener waits on LISTEN for the notification sent with every version change, so caches are
+    invalidated right after the change is committed. The versions are also polled every poll interval, which is
+    the only mechanism on SQLite and covers notifications missed while the listen connection was reconnecting.
+
+    Attributes:
+        DATA_CHANGE_POLL_INTERVAL_IN_SECONDS_CONFIG_NAME (str): Configuration key of the version poll interval.
+    """
+    DATA_CHANGE_POLL_INTERVAL_IN_SECONDS_CONFIG_NAME = 'data_change_poll_interval_in_seconds'
+    DEFAULT_DATA_CHANGE_POLL_INTERVAL_IN_SECONDS = 5
+
+    @inject.autoparams()
+    def __init__(self, configuration: BaseConfiguration, repository_service: DataVersionRepositoryService):
+        """
+        Initializes the DataChangeNotifier.
+
+        Args:
+            configuration (BaseConfiguration): Configuration holding the poll interval.
+            repository_service (DataVersionRepositoryService): Repository of the data set versions.
+        """
+        self.configuration = configuration
+        self.repository_service = repository_service
+        self.poll_interval_in_seconds = float(configuration.get(self.DATA_CHANGE_POLL_INTERVAL_IN_SECONDS_CONFIG_NAME,
+                                                                self.DEFAULT_DATA_CHANGE_POLL_INTERVAL_IN_SECONDS))
+        self.logger = logging.getLogger(__name__)
+        self._subscribers = defaultdict(list)
+        self._versions = {}
+        self._listen_connection = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def publish(self, name):
+        """
+        Announces that a data set was changed.
+
+        A failed announcement is logged only, the caches of other processes then catch up when their TTL expires.
+
+        Args:
+            name (str): The name of the changed data set.
+        """
+        try:
+            self.repository_service.increment_data_version(name)
+        except Exception as e:
+            self.logger.error(f"Failed to publish change of data set {name}. Error: {e}")
+
+    def subscribe(self, name, callback):
+        """
+        Registers a callback called when a data set is changed by another process.
+
+        Args:
+            name (str): The name of the data set.
+            callback (callable): Function called without arguments.
+        """
+        self._subscribers[name].append(callback)
+
+    def start(self):
+        """
+        Starts the background listener, the versions stored at this point are not reported as changes.
+        """
+        if self._thread is not None:
+            return
+        try:
+            self._versions = self.repository_service.get_data_versions()
+        except Exception as e:
+            self.logger.error(f"Failed to read data set versions. Error: {e}")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='data-change-listener', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the background listener and closes its connection.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def check_for_changes(self):
+        """
+        Reads the data set versions and calls the callbacks of the data sets changed since the last check.
+
+        Returns:
+            list[str]: The names of the changed data sets.
+        """
+        versions = self.repository_service.get_data_versions()
+        changed_names = [name for name, version in versions.items() if self._versions.get(name) != version]
+        self._versions = versions
+        for name in changed_names:
+            self.logger.info(f"Data set {name} changed to version {versions[name]}.")
+            for callback in self._subscribers.get(name, []):
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.error(f"Failed to handle change of data set {name}. Error: {e}")
+        return changed_names
+
+    def _run(self):
+        """
+        Waits for changes and checks the versions until the listener is stopped.
+        """
+        while not self._stop_event.is_set():
+            try:
+                self._wait_for_change()
+                self.check_for_changes()
+            except Exception as e:
+                self.logger.error(f"Failed to check data set versions. Error: {e}")
+                self._close_listen_connection()
+                self._stop_event.wait(self.poll_interval_in_seconds)
+        self._close_listen_connection()
+
+    def _wait_for_change(self):
+        """
+        Blocks until a change notification arrives or the poll interval passes.
+        """
+        if self._listen_connection is None:
+            self._listen_connection = self._open_listen_connection()
+        if self._listen_connection is None:
+            self._stop_event.wait(self.poll_interval_in_seconds)
+            return
+        driver_connection = self._listen_connection.driver_connection
+        select.select([driver_connection], [], [], self.poll_interval_in_seconds)
+        driver_connection.poll()
+        driver_connection.notifies.clear()
+
+    def _open_listen_connection(self):
+        """
+        Opens a dedicated PostgreSQL connection listening on the data change channel.
+
+        Returns:
+            The pooled connection wrapper or None if the database does not support notifications.
+        """
+        engine = self.repository_service.engine
+        if engine.dialect.name != 'postgresql':
+            return None
+        connection = engine.raw_connection()
+        connection.driver_connection.autocommit = True
+        cursor = connection.driver_connection.cursor()
+        cursor.execute(f'LISTEN {self.repository_service.DATA_CHANGE_CHANNEL}')
+        cursor.close()
+        return connection
+
+    def _close_listen_connection(self):
+        """
+        Discards the listen connection, it is not returned to the pool because it was switched to autocommit.
+        """
+        if self._listen_connection is not None:
+            try:
+                self._listen_connection.invalidate()
+            except Exception as e:
+                self.logger.error(f"Failed to close data change listen connection. Error: {e}")
+            self._listen_connection = None
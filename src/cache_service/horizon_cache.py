@@ -0,0 +1,178 @@
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+
+class HorizonSnapshot:
+    """
+    Immutable snapshot of time series records loaded from the repository.
+
+    The records are kept in a tuple ordered by datetime, so readers can never change the cached data and lookups
+    of a time window are binary searches.
+
+    Attributes:
+        horizon_start (datetime): Records after this date are contained in the snapshot.
+        records (tuple): The records ordered by their datetime attribute.
+        loaded_at (float): Monotonic time at which the snapshot was loaded.
+    """
+    __slots__ = ('horizon_start', 'records', 'loaded_at', '_datetimes', '_representations', '_representations_lock')
+
+    def __init__(self, horizon_start, records, loaded_at):
+        self.horizon_start = horizon_start
+        self.records = tuple(sorted(records, key=lambda record: record.datetime))
+        self.loaded_at = loaded_at
+        self._datetimes = tuple(record.datetime for record in self.records)
+        self._representations = {}
+        self._representations_lock = threading.Lock()
+
+    def get_records(self, start_date, end_date=None):
+        """
+        Returns the records after start_date and up to and including end_date.
+
+        Args:
+            start_date (datetime): Records after this date are returned.
+            end_date (datetime): Records up to this date are returned, None for all records after start_date.
+
+        Returns:
+            list: The records ordered by datetime.
+        """
+        start_index = bisect_right(self._datetimes, start_date)
+        end_index = len(self.records) if end_date is None else bisect_right(self._datetimes, end_date)
+        return list(self.records[start_index:end_index])
+
+    def get_representation(self, name, factory):
+        """
+        Returns a representation derived from all records of the snapshot, building it once per snapshot.
+
+        Args:
+            name (str): The name of the representation.
+            factory (callable): Function building the representation from the records tuple.
+
+        Returns:
+            The representation, which must not be changed by its users.
+        """
+        with self._representations_lock:
+            if name not in self._representations:
+                self._representations[name] = factory(self.records)
+            return self._representations[name]
+
+
+class HorizonCache:
+    """
+    Read-through cache of the forward looking horizon of time series data, such as prices and forecasts.
+
+    Each key holds a HorizonSnapshot of all records after the horizon start, which reaches HISTORY_WINDOW into the
+    past so that logic looking back a few hours is served from memory as well. A snapshot is reloaded when it is
+    older than the TTL, when a request starts before its horizon or after it was invalidated. Requests starting
+    before HISTORY_WINDOW are read from the repository without being cached, so a single request for old data does
+    not make every later reload of the key read that far back.
+
+    Attributes:
+        HISTORY_WINDOW (timedelta): How far into the past a loaded snapshot reaches.
+    """
+    HISTORY_WINDOW = timedelta(days=1)
+
+    def __init__(self, ttl_in_seconds):
+        """
+        Initializes the HorizonCache.
+
+        Args:
+            ttl_in_seconds (float): Number of seconds a snapshot is used, 0 or less disables caching.
+        """
+        self.ttl_in_seconds = ttl_in_seconds
+        self._snapshots = {}
+        self._generation = 0
+        self._key_generations = {}
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    @property
+    def enabled(self):
+        """
+        bool: True if the cache keeps snapshots.
+        """
+        return self.ttl_in_seconds > 0
+
+    def _get_valid_snapshot(self, key, start_date):
+        """
+        Returns the snapshot of the key if it can answer a request starting at start_date.
+
+        Args:
+            key: The key of the snapshot.
+            start_date (datetime): The start of the requested window.
+
+        Returns:
+            HorizonSnapshot: The snapshot or None if it is missing, expired or does not reach back to start_date.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is None or time.monotonic() - snapshot.loaded_at >= self.ttl_in_seconds:
+            return None
+        if start_date < snapshot.horizon_start:
+            return None
+        return snapshot
+
+    def get_snapshot(self, key, start_date, loader):
+        """
+        Returns the snapshot of the key able to answer requests starting at start_date, loading it if needed.
+
+        Concurrent misses of the cache are serialized per key, so a burst of requests after an invalidation runs a
+        single query per key while the other keys are loaded in parallel. A snapshot whose load overlapped an
+        invalidation of its key or of all keys is returned but not kept.
+
+        Args:
+            key: The key of the snapshot, for example a location id.
+            start_date (datetime): The start of the requested window.
+            loader (callable): Function returning all records after the horizon start date passed to it.
+
+        Returns:
+            HorizonSnapshot: The snapshot.
+        """
+        snapshot = self._get_valid_snapshot(key, start_date)
+        if snapshot is None:
+            horizon_start = datetime.now() - self.HISTORY_WINDOW
+            if start_date < horizon_start:
+                return HorizonSnapshot(start_date, loader(start_date), time.monotonic())
+            with self._lock:
+                load_lock = self._load_locks.setdefault(key, threading.Lock())
+            with load_lock:
+                snapshot = self._get_valid_snapshot(key, start_date)
+                if snapshot is None:
+                    with self._lock:
+                        generation = (self._generation, self._key_generations.get(key, 0))
+                    snapshot = HorizonSnapshot(horizon_start, loader(horizon_start), time.monotonic())
+                    with self._lock:
+                        if generation == (self._generation, self._key_generations.get(key, 0)):
+                            self._snapshots[key] = snapshot
+        return snapshot
+
+    def get_records(self, key, start_date, end_date, loader):
+        """
+        Returns the records of the key within a time window, loading the snapshot if needed.
+
+        Args:
+            key: The key of the snapshot, for example a location id.
+            start_date (datetime): Records after this date are returned.
+            end_date (datetime): Records up to this date are returned, None for all records after start_date.
+            loader (callable): Function returning all records after the horizon start date passed to it.
+
+        Returns:
+            list: The records ordered by datetime.
+        """
+        return self.get_snapshot(key, start_date, loader).get_records(start_date, end_date)
+
+    def invalidate(self, key=None):
+        """
+        Removes the snapshot of a key, or all snapshots.
+
+        Args:
+            key: The key of the snapshot to remove, None to remove all snapshots.
+        """
+        with self._lock:
+            if key is None:
+                self._generation += 1
+                self._snapshots.clear()
+            else:
+                self._key_generations[key] = self._key_generations.get(key, 0) + 1
+                self._snapshots.pop(key, None)
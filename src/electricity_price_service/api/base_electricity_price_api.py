@@ -1,5 +1,7 @@
 from abc import abstractmethod, ABC
 from src.configuration.base_configuration import BaseConfiguration
+from src.http_client.http_client import HttpClient
+from src.http_client.payload_fingerprint import calculate_payload_fingerprint
 import logging
 
 
@@ -10,6 +12,7 @@ class BaseElectricityPriceAPI(ABC):
     Attributes:
         configuration (BaseConfiguration): Configuration object that holds settings
                                            such as API keys and URLs.
+        http_client (HttpClient): The shared HTTP client used to send requests to the electricity price service.
         logger (Logger): Logger instance for logging messages.
 
     Methods:
@@ -17,15 +20,17 @@ class BaseElectricityPriceAPI(ABC):
                                electricity prices from a specific service.
     """
 
-    def __init__(self, configuration: BaseConfiguration):
+    def __init__(self, configuration: BaseConfiguration, http_client: HttpClient):
         """
         Initializes the BaseElectricityPriceAPI with the necessary configuration.
 
         Args:
             configuration (BaseConfiguration): The configuration object containing
                                                necessary parameters and credentials for the API.
+            http_client (HttpClient): The shared HTTP client used to send requests.
         """
         self.configuration = configuration
+        self.http_client = http_client
         self.logger = logging.getLogger(__name__)
 
     @abstractmethod
@@ -40,3 +45,15 @@ class BaseElectricityPriceAPI(ABC):
             electricity price data.
         """
         pass
+
+    def get_payload_fingerprint(self, raw_data):
+        """
+        Calculates the fingerprint of raw electricity price data, used to skip processing of unchanged data.
+
+        Args:
+            raw_data: Raw electricity price data returned by get_electricity_price.
+
+        Returns:
+            str: Fingerprint of the raw data, None if there is no data.
+        """
+        return calculate_payload_fingerprint(raw_data)
@@ -1,6 +1,5 @@
 from src.electricity_price_service.api.base_electricity_price_api import BaseElectricityPriceAPI
 from requests.exceptions import RequestException
-import requests
 
 
 class NordpoolElectricityPriceAPI(BaseElectricityPriceAPI):
@@ -26,7 +25,7 @@ class NordpoolElectricityPriceAPI(BaseElectricityPriceAPI):
         try:
             nordpool_url = self.configuration.get(self.NORDPOOL_URL_CONFIG_NAME)
             self.logger.debug(f'Fetching electricity price from Nordpool: {nordpool_url}')
-            resp = requests.get(nordpool_url)
+            resp = self.http_client.get(nordpool_url)
         except RequestException as e:
             self.logger.error(f'Failed to fetch electricity price from Nordpool: {e}')
             return None
@@ -1,6 +1,13 @@
 import inject
+import logging
+from datetime import timedelta
+from src.cache_service.data_change_notifier import DataChangeNotifier
+from src.cache_service.horizon_cache import HorizonCache
+from src.configuration.base_configuration import BaseConfiguration
 from src.electricity_price_service.api.base_electricity_price_api import BaseElectricityPriceAPI
+from src.electricity_price_service.price_series import PriceSeries
 from src.electricity_price_service.processors.base_electricity_price_processor import BaseElectricityPriceProcessor
+from src.repository_service.base_repository_service import UpsertResult
 from src.repository_service.electricity_price_repository_service import ElectricityPriceRepositoryService
 
 
@@ -15,12 +22,22 @@ class ElectricityPriceService:
         electricity_price_api (BaseElectricityPriceAPI): An API client for fetching electricity price data.
         electricity_price_processor (BaseElectricityPriceProcessor): A processor to transform raw data into a usable format.
         repository_service (SwitchRepositoryService): A repository service for storing and retrieving processed data.
+        configuration (BaseConfiguration): Configuration instance to fetch the cache settings.
+        last_payload_fingerprint (str): Fingerprint of the last raw data that was stored successfully.
+        electricity_price_cache (HorizonCache): Cache of the electricity prices read by switch logic.
+        data_change_notifier (DataChangeNotifier): Channel announcing stored prices to the other processes.
+        DATA_SET_NAME (str): Name of the electricity prices in the data change notifications.
     """
+    DATA_SET_NAME = 'electricity_price'
+    ELECTRICITY_PRICE_DATA_CACHE_TTL_IN_SECONDS_CONFIG_NAME = 'electricity_price_data_cache_ttl_in_seconds'
+    DEFAULT_ELECTRICITY_PRICE_DATA_CACHE_TTL_IN_SECONDS = 300
 
     @inject.autoparams()
     def __init__(self, electricity_price_api: BaseElectricityPriceAPI,
                  electricity_price_processor: BaseElectricityPriceProcessor,
-                 repository_service: ElectricityPriceRepositoryService):
+                 repository_service: ElectricityPriceRepositoryService,
+                 configuration: BaseConfiguration,
+                 data_change_notifier: DataChangeNotifier):
         """
         Initializes the ElectricityPriceService with the necessary components.
 
@@ -31,10 +48,20 @@ class ElectricityPriceService:
             electricity_price_api (BaseElectricityPriceAPI): The API client component for fetching electricity prices.
             electricity_price_processor (BaseElectricityPriceProcessor): The data processor component.
             repository_service (BaseRepositoryService): The data storage and retrieval component.
+            configuration (BaseConfiguration): Configuration service for retrieving the cache settings.
+            data_change_notifier (DataChangeNotifier): The channel invalidating the caches of other processes.
         """
         self.electricity_price_api = electricity_price_api
         self.electricity_price_processor = electricity_price_processor
         self.repository_service = repository_service
+        self.configuration = configuration
+        self.last_payload_fingerprint = None
+        self.electricity_price_cache = HorizonCache(float(configuration.get(
+            self.ELECTRICITY_PRICE_DATA_CACHE_TTL_IN_SECONDS_CONFIG_NAME,
+            self.DEFAULT_ELECTRICITY_PRICE_DATA_CACHE_TTL_IN_SECONDS)))
+        self.data_change_notifier = data_change_notifier
+        self.data_change_notifier.subscribe(self.DATA_SET_NAME, self.electricity_price_cache.invalidate)
+        self.logger = logging.getLogger(__name__)
 
     def regenerate_electricity_price_data(self):
         """
@@ -44,19 +71,62 @@ class ElectricityPriceService:
         1. Fetching raw data from the API.
         2. Processing that data into a structured format.
         3. Storing the processed data in the repository.
+
+        Processing and storing are skipped if the raw data is unchanged since the last successful run. Changed
+        prices are announced to the other processes, so their caches are invalidated.
+
+        Returns:
+            UpsertResult: Number of inserted and changed electricity price records.
         """
         raw_data = self.electricity_price_api.get_electricity_price()
+        payload_fingerprint = self.electricity_price_api.get_payload_fingerprint(raw_data)
+        if payload_fingerprint is not None and payload_fingerprint == self.last_payload_fingerprint:
+            self.logger.info("Electricity price data is unchanged since the last run, skipping processing.")
+            return UpsertResult(0, 0)
         processed_data = self.electricity_price_processor.process_data(raw_data)
-        self.repository_service.store_electricity_price_data(processed_data)
+        result = self.repository_service.store_electricity_price_data(processed_data)
+        self.electricity_price_cache.invalidate()
+        if result.inserted or result.updated:
+            self.data_change_notifier.publish(self.DATA_SET_NAME)
+        self.last_payload_fingerprint = payload_fingerprint
+        return result
 
     def get_electricity_price_data_after_date(self, date):
         """
         Retrieves processed electricity price data stored after a specified date.
 
+        The data is served from the electricity price cache, which is reloaded from the repository when it expires
+        or new prices are stored.
+
         Args:
             date (datetime): The starting date from which to retrieve data.
 
         Returns:
             list[ElectricityPriceModel]: A list of ElectricityPriceModel instances representing hourly electricity prices starting from the specified date.
         """
-        return self.repository_service.get_electricity_price_data_after_date(date)
+        if not self.electricity_price_cache.enabled:
+            return self.repository_service.get_electricity_price_data_after_date(date)
+        return self.electricity_price_cache.get_records(None, date, None,
+                                                        self.repository_service.get_electricity_price_data_after_date)
+
+    def get_electricity_price_series(self, start_date, end_date=None):
+        """
+        Retrieves the electricity prices valid from a start date up to an end date as a PriceSeries.
+
+        The series of the whole electricity price cache is built once per cache load and windows of it are handed
+        out, so switch logic calling this for every switch does not convert the price records again.
+
+        Args:
+            start_date (datetime): Prices at or after this date are returned.
+            end_date (datetime): Prices before this date are returned, None for all prices after start_date.
+
+        Returns:
+            PriceSeries: The prices of the window.
+        """
+        after_date = start_date - timedelta(microseconds=1)
+        if not self.electricity_price_cache.enabled:
+            records = self.repository_service.get_electricity_price_data_after_date(after_date)
+            return PriceSeries.from_records(records).get_window(start_date, end_date)
+        snapshot = self.electricity_price_cache.get_snapshot(
+            None, after_date, self.repository_service.get_electricity_price_data_after_date)
+        return snapshot.get_representation('price_series', PriceSeries.from_records).get_window(start_date, end_date)
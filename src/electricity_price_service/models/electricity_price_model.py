@@ -1,5 +1,8 @@
+from collections import namedtuple
 from datetime import datetime
 
+ElectricityPriceRecord = namedtuple('ElectricityPriceRecord', ['datetime', 'price'])
+
 
 class ElectricityPriceModel:
     """
@@ -0,0 +1,190 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+
+class PriceSeries:
+    """
+    Read-only array representation of an electricity price series with the primitives commonly used by switch logic.
+
+    The datetimes and prices are kept in two parallel tuples ordered by datetime, so windows are found with binary
+    searches and the primitives run over plain floats instead of sorting model objects. Each price is valid from its
+    datetime until the datetime of the next price, but at most for PRICE_DURATION.
+
+    Attributes:
+        PRICE_DURATION (timedelta): The longest time a price is valid, the length of a price slot.
+        datetimes (tuple[datetime]): The start of the validity of each price, in ascending order.
+        prices (tuple[float]): The prices in the order of the datetimes.
+    """
+    __slots__ = ('datetimes', 'prices', '_sorted_prices')
+    PRICE_DURATION = timedelta(hours=1)
+
+    def __init__(self, datetimes, prices):
+        """
+        Initializes the PriceSeries.
+
+        Args:
+            datetimes (iterable[datetime]): The start of the validity of each price, in ascending order.
+            prices (iterable[float]): The prices in the order of the datetimes.
+        """
+        self.datetimes = tuple(datetimes)
+        self.prices = tuple(prices)
+        self._sorted_prices = None
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Creates a PriceSeries from electricity price records.
+
+        Args:
+            records (iterable[ElectricityPriceModel]): The price records in any order.
+
+        Returns:
+            PriceSeries: The series of the records ordered by datetime.
+        """
+        ordered_records = sorted(records, key=lambda record: record.datetime)
+        return cls((record.datetime for record in ordered_records), (record.price for record in ordered_records))
+
+    def __len__(self):
+        return len(self.prices)
+
+    def __getstate__(self):
+        return self.datetimes, self.prices
+
+    def __setstate__(self, state):
+        self.datetimes, self.prices = state
+        self._sorted_prices = None
+
+    @property
+    def sorted_prices(self):
+        """
+        tuple[float]: The prices in ascending order, computed on first use.
+        """
+        if self._sorted_prices is None:
+            self._sorted_prices = tuple(sorted(self.prices))
+        return self._sorted_prices
+
+    def get_window(self, start_date, end_date=None):
+        """
+        Returns the part of the series from start_date up to end_date.
+
+        Args:
+            start_date (datetime): Prices at or after this date are returned.
+            end_date (datetime): Prices before this date are returned, None for all prices after start_date.
+
+        Returns:
+            PriceSeries: The prices of the window.
+        """
+        start_index = bisect_left(self.datetimes, start_date)
+        end_index = len(self.datetimes) if end_date is None else bisect_left(self.datetimes, end_date)
+        return PriceSeries(self.datetimes[start_index:end_index], self.prices[start_index:end_index])
+
+    def _get_index_at(self, moment):
+        """
+        Returns the index of the price valid at a moment, None if the series starts after it or the price slot
+        before it ended.
+        """
+        index = bisect_right(self.datetimes, moment) - 1
+        if index < 0 or moment >= self.datetimes[index] + self.PRICE_DURATION:
+            return None
+        return index
+
+    def get_price_at(self, moment):
+        """
+        Returns the price valid at a moment.
+
+        Args:
+            moment (datetime): The moment.
+
+        Returns:
+            float: The price of the newest datetime at or before the moment, None if the series starts after it or
+                the moment is not within PRICE_DURATION of that datetime.
+        """
+        index = self._get_index_at(moment)
+        return None if index is None else self.prices[index]
+
+    def get_cheapest_datetimes(self, count):
+        """
+        Returns the datetimes of the cheapest prices, of equal prices the earlier ones.
+
+        Args:
+            count (int): The number of prices to select.
+
+        Returns:
+            list[datetime]: The datetimes of the count cheapest prices in ascending order.
+        """
+        cheapest_indexes = heapq.nsmallest(count, range(len(self.prices)), key=lambda index: self.prices[index])
+        return [self.datetimes[index] for index in sorted(cheapest_indexes)]
+
+    def is_among_cheapest(self, moment, count):
+        """
+        Checks whether the price valid at a moment is one of the cheapest prices of the series.
+
+        A price is among the count cheapest if fewer than count prices are lower, so equal prices are treated alike.
+
+        Args:
+            moment (datetime): The moment.
+            count (int): The number of cheapest prices.
+
+        Returns:
+            bool: True if fewer than count prices are lower, False also if no price is valid at the moment.
+        """
+        price = self.get_price_at(moment)
+        return price is not None and bisect_left(self.sorted_prices, price) < count
+
+    def get_cheapest_block_start(self, length):
+        """
+        Finds the consecutive prices with the lowest sum.
+
+        Args:
+            length (int): The number of consecutive prices in the block.
+
+        Returns:
+            datetime: The datetime of the first price of the cheapest block, of equal blocks the earliest one, None if
+                the series has fewer than length prices.
+        """
+        if length < 1 or length > len(self.prices):
+            return None
+        block_sum = best_sum = sum(self.prices[:length])
+        best_index = 0
+        for index in range(length, len(self.prices)):
+            block_sum += self.prices[index] - self.prices[index - length]
+            if block_sum < best_sum:
+                best_sum, best_index = block_sum, index - length + 1
+        return self.datetimes[best_index]
+
+    def get_rolling_averages(self, length):
+        """
+        Calculates the average of each price and the length - 1 prices before it.
+
+        Args:
+            length (int): The number of prices averaged.
+
+        Returns:
+            PriceSeries: The averages at the datetimes of the prices having length - 1 predecessors.
+        """
+        if length < 1 or length > len(self.prices):
+            return PriceSeries((), ())
+        window_sum = sum(self.prices[:length - 1])
+        averages = []
+        for index in range(length - 1, len(self.prices)):
+            window_sum += self.prices[index]
+            averages.append(window_sum / length)
+            window_sum -= self.prices[index - length + 1]
+        return PriceSeries(self.datetimes[length - 1:], averages)
+
+    def get_percentile_rank(self, moment):
+        """
+        Returns the share of prices of the series lower than the price valid at a moment.
+
+        Args:
+            moment (datetime): The moment.
+
+        Returns:
+            float: 0.0 if the price is the lowest, approaching 1.0 for the highest, None if no price is valid at the
+                moment.
+        """
+        price = self.get_price_at(moment)
+        if price is None:
+            return None
+        return bisect_left(self.sorted_prices, price) / len(self.prices)
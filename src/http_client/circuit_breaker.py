@@ -0,0 +1,68 @@
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding calls to a single upstream host.
+
+    After failure_threshold consecutive failures the circuit opens and calls are rejected without contacting the
+    host. Once reset_timeout_in_seconds has passed a single trial call is let through: a success closes the circuit
+    again, a failure keeps it open for another timeout period.
+
+    Attributes:
+        CLOSED (str): State in which all calls are allowed.
+        OPEN (str): State in which calls are rejected.
+        HALF_OPEN (str): State in which a single trial call is allowed.
+    """
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
+
+    def __init__(self, failure_threshold, reset_timeout_in_seconds):
+        """
+        Initializes the CircuitBreaker in the closed state.
+
+        Args:
+            failure_threshold (int): Number of consecutive failures that open the circuit.
+            reset_timeout_in_seconds (float): Number of seconds the circuit stays open before a trial call.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_in_seconds = reset_timeout_in_seconds
+        self.state = self.CLOSED
+        self._failure_count = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """
+        Checks whether a call to the host may be made.
+
+        Returns:
+            bool: True if the call is allowed, False if the circuit is open.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_in_seconds:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Records a successful call and closes the circuit.
+        """
+        with self._lock:
+            self._failure_count = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        """
+        Records a failed call and opens the circuit if the failure threshold is reached or the trial call failed.
+        """
+        with self._lock:
+            self._failure_count += 1
+            if self.state == self.HALF_OPEN or self._failure_count >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
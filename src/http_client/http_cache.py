@@ -0,0 +1,135 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+class HttpCacheEntry:
+    """
+    Cached response of a single URL together with its validators.
+
+    Attributes:
+        response (requests.Response): The cached response.
+        etag (str): Value of the ETag response header.
+        last_modified (str): Value of the Last-Modified response header.
+        expires_at (float): Monotonic time until which the response is fresh, 0 if it must be revalidated.
+    """
+
+    def __init__(self, response, etag, last_modified, expires_at):
+        self.response = response
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    def is_fresh(self):
+        """
+        Checks whether the response may be used without contacting the upstream.
+
+        Returns:
+            bool: True if the Cache-Control max-age of the response has not passed yet.
+        """
+        return time.monotonic() < self.expires_at
+
+    def get_conditional_headers(self):
+        """
+        Builds the headers for revalidating the cached response.
+
+        Returns:
+            dict: If-None-Match and If-Modified-Since headers of the cached response.
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    LRU cache of GET responses honoring the ETag, Last-Modified and Cache-Control response headers.
+
+    Attributes:
+        DEFAULT_MAX_ENTRIES (int): Default number of URLs kept in the cache.
+    """
+    DEFAULT_MAX_ENTRIES = 256
+    MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Initializes the HttpCache.
+
+        Args:
+            max_entries (int): Maximum number of URLs kept in the cache.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """
+        Returns the cache entry of the URL.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            HttpCacheEntry: The cache entry or None if the URL is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def store(self, url, response):
+        """
+        Stores a successful response if its headers allow caching or revalidation.
+
+        Args:
+            url (str): The requested URL.
+            response (requests.Response): The response with status 200.
+        """
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control:
+            return
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        expires_at = self._get_expires_at(cache_control)
+        if not etag and not last_modified and not expires_at:
+            return
+        with self._lock:
+            self._entries[url] = HttpCacheEntry(response, etag, last_modified, expires_at)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, entry, response):
+        """
+        Updates the freshness of a cache entry revalidated with a 304 Not Modified response.
+
+        Args:
+            entry (HttpCacheEntry): The revalidated cache entry.
+            response (requests.Response): The 304 response.
+        """
+        cache_control = response.headers.get('Cache-Control', entry.response.headers.get('Cache-Control', ''))
+        entry.expires_at = self._get_expires_at(cache_control.lower())
+        entry.etag = response.headers.get('ETag', entry.etag)
+        entry.last_modified = response.headers.get('Last-Modified', entry.last_modified)
+
+    def _get_expires_at(self, cache_control):
+        """
+        Calculates until when a response is fresh from its Cache-Control header.
+
+        Args:
+            cache_control (str): Lower case value of the Cache-Control header.
+
+        Returns:
+            float: Monotonic expiry time, 0 if the response must be revalidated before every use.
+        """
+        if 'no-cache' in cache_control:
+            return 0.0
+        match = self.MAX_AGE_PATTERN.search(cache_control)
+        if not match or int(match.group(1)) == 0:
+            return 0.0
+        return time.monotonic() + int(match.group(1))
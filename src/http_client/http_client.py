@@ -0,0 +1,161 @@
+import logging
+import threading
+from urllib.parse import urlsplit
+
+import inject
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
+
+from src.configuration.base_configuration import BaseConfiguration
+from src.http_client.circuit_breaker import CircuitBreaker
+from src.http_client.http_cache import HttpCache
+
+
+class CircuitOpenError(RequestException):
+    """
+    Raised when a request is rejected because the circuit breaker of the upstream host is open.
+    """
+
+
+class HttpClient:
+    """
+    HTTP client shared by the upstream API clients.
+
+    Keeps a pooled requests session with keep-alive connections, applies connect and read timeouts to every
+    request, retries failed requests with bounded exponential backoff and guards every upstream host with a
+    circuit breaker, so a slow or failing upstream can not block the caller indefinitely.
+
+    Responses carrying ETag, Last-Modified or Cache-Control headers are cached. Fresh responses are served
+    without contacting the upstream and stale ones are revalidated with a conditional request.
+    """
+    HTTP_CONNECT_TIMEOUT_IN_SECONDS_CONFIG_NAME = 'http_connect_timeout_in_seconds'
+    HTTP_READ_TIMEOUT_IN_SECONDS_CONFIG_NAME = 'http_read_timeout_in_seconds'
+    HTTP_MAX_RETRIES_CONFIG_NAME = 'http_max_retries'
+    HTTP_RETRY_BACKOFF_FACTOR_CONFIG_NAME = 'http_retry_backoff_factor'
+    HTTP_POOL_SIZE_CONFIG_NAME = 'http_pool_size'
+    HTTP_CIRCUIT_BREAKER_FAILURE_THRESHOLD_CONFIG_NAME = 'http_circuit_breaker_failure_threshold'
+    HTTP_CIRCUIT_BREAKER_RESET_TIMEOUT_IN_SECONDS_CONFIG_NAME = 'http_circuit_breaker_reset_timeout_in_seconds'
+    DEFAULT_CONNECT_TIMEOUT_IN_SECONDS = 5
+    DEFAULT_READ_TIMEOUT_IN_SECONDS = 30
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_RETRY_BACKOFF_FACTOR = 0.5
+    DEFAULT_POOL_SIZE = 10
+    DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+    DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT_IN_SECONDS = 60
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    @inject.autoparams()
+    def __init__(self, configuration: BaseConfiguration):
+        """
+        Initializes the HttpClient and its pooled session from the configuration.
+
+        Args:
+            configuration (BaseConfiguration): Configuration holding the timeout, retry and circuit breaker settings.
+        """
+        self.configuration = configuration
+        self.logger = logging.getLogger(__name__)
+        self.timeout = (float(configuration.get(self.HTTP_CONNECT_TIMEOUT_IN_SECONDS_CONFIG_NAME,
+                                                self.DEFAULT_CONNECT_TIMEOUT_IN_SECONDS)),
+                        float(configuration.get(self.HTTP_READ_TIMEOUT_IN_SECONDS_CONFIG_NAME,
+                                                self.DEFAULT_READ_TIMEOUT_IN_SECONDS)))
+        self.failure_threshold = int(configuration.get(self.HTTP_CIRCUIT_BREAKER_FAILURE_THRESHOLD_CONFIG_NAME,
+                                                       self.DEFAULT_CIRCUIT_BREAKER_FAILURE_THRESHOLD))
+        self.reset_timeout_in_seconds = float(configuration.get(
+            self.HTTP_CIRCUIT_BREAKER_RESET_TIMEOUT_IN_SECONDS_CONFIG_NAME,
+            self.DEFAULT_CIRCUIT_BREAKER_RESET_TIMEOUT_IN_SECONDS))
+        self.session = self._create_session()
+        self.http_cache = HttpCache()
+        self._circuit_breakers = {}
+        self._circuit_breakers_lock = threading.Lock()
+
+    def _create_session(self):
+        """
+        Creates the requests session with a pooled adapter retrying failed requests with exponential backoff.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        max_retries = int(self.configuration.get(self.HTTP_MAX_RETRIES_CONFIG_NAME, self.DEFAULT_MAX_RETRIES))
+        pool_size = int(self.configuration.get(self.HTTP_POOL_SIZE_CONFIG_NAME, self.DEFAULT_POOL_SIZE))
+        retry = Retry(total=max_retries,
+                      backoff_factor=float(self.configuration.get(self.HTTP_RETRY_BACKOFF_FACTOR_CONFIG_NAME,
+                                                                  self.DEFAULT_RETRY_BACKOFF_FACTOR)),
+                      status_forcelist=self.RETRY_STATUS_CODES,
+                      allowed_methods=frozenset(['GET']),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_circuit_breaker(self, url):
+        """
+        Returns the circuit breaker of the host of the URL, creating it on first use.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            CircuitBreaker: The circuit breaker of the host.
+        """
+        host = urlsplit(url).netloc
+        with self._circuit_breakers_lock:
+            circuit_breaker = self._circuit_breakers.get(host)
+            if circuit_breaker is None:
+                circuit_breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout_in_seconds)
+                self._circuit_breakers[host] = circuit_breaker
+            return circuit_breaker
+
+    def get(self, url, headers=None):
+        """
+        Sends a GET request to the URL, answering it from the HTTP cache when possible.
+
+        Args:
+            url (str): The requested URL.
+            headers (dict): Additional request headers.
+
+        Returns:
+            requests.Response: The response of the upstream or the cached response.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker of the host is open.
+            RequestException: If the request fails after all retries or the response has an error status.
+        """
+        cache_entry = self.http_cache.get(url)
+        if cache_entry is not None and cache_entry.is_fresh():
+            self.logger.debug(f'Serving fresh cached response for {url}')
+            return cache_entry.response
+        request_headers = dict(headers or {})
+        if cache_entry is not None:
+            request_headers.update(cache_entry.get_conditional_headers())
+
+        circuit_breaker = self._get_circuit_breaker(url)
+        if not circuit_breaker.allow_request():
+            raise CircuitOpenError(f'Circuit breaker is open for {urlsplit(url).netloc}, request to {url} rejected')
+        try:
+            response = self.session.get(url, headers=request_headers or None, timeout=self.timeout)
+        except RequestException:
+            circuit_breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            circuit_breaker.record_failure()
+        else:
+            circuit_breaker.record_success()
+
+        if response.status_code == 304 and cache_entry is not None:
+            self.logger.debug(f'Cached response for {url} is not modified')
+            self.http_cache.refresh(cache_entry, response)
+            return cache_entry.response
+        response.raise_for_status()
+        if response.status_code == 200:
+            self.http_cache.store(url, response)
+        return response
+
+    def close(self):
+        """
+        Closes the pooled connections of the session.
+        """
+        self.session.close()
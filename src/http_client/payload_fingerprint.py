@@ -0,0 +1,21 @@
+import hashlib
+import json
+
+
+def calculate_payload_fingerprint(payload):
+    """
+    Calculates a content hash of a decoded JSON payload.
+
+    The payload is serialized with sorted keys, so equal payloads produce the same fingerprint regardless of the
+    key order of the upstream response.
+
+    Arguments:
+        payload: The decoded JSON payload.
+
+    Returns:
+        str: Hex digest of the payload, None if there is no payload.
+    """
+    if payload is None:
+        return None
+    serialized_payload = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(serialized_payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread safe limiter spacing out calls to an upstream host.
+
+    Each call to acquire reserves the next free time slot and sleeps until it is reached, so concurrent callers
+    are spread evenly and never exceed the configured rate.
+
+    Attributes:
+        interval (float): Minimum number of seconds between two calls, 0 if the rate is not limited.
+    """
+
+    def __init__(self, rate_per_second):
+        """
+        Initializes the RateLimiter.
+
+        Args:
+            rate_per_second (float): Maximum number of calls per second, 0 or less disables the limit.
+        """
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until the caller is allowed to make the next call.
+        """
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
@@ -1,6 +1,8 @@
 import logging
 from src.configuration.base_configuration import BaseConfiguration
 from src.configuration.environment_variable_configuration import EnvironmentVariableConfiguration
+from src.repository_service.database_engine import DatabaseEngine
+from src.http_client.http_client import HttpClient
 from src.electricity_price_service.api.base_electricity_price_api import BaseElectricityPriceAPI
 from src.electricity_price_service.api.nordpool_electricity_price_api import NordpoolElectricityPriceAPI
 from src.electricity_price_service.processors.base_electricity_price_processor import BaseElectricityPriceProcessor
@@ -32,16 +34,23 @@ def app_injection_configuration(binder):
         configuration_instance = EnvironmentVariableConfiguration()
         binder.bind(BaseConfiguration, configuration_instance)
 
+        # Bind one database engine per process, shared by all repository services
+        binder.bind_to_constructor(DatabaseEngine, lambda: DatabaseEngine(configuration_instance))
+
+        # Bind one HTTP client shared by all upstream API clients
+        http_client = HttpClient(configuration_instance)
+        binder.bind(HttpClient, http_client)
+
         weather_service_config = configuration_instance.get('weather_service')
         if configuration_instance.get('weather_service') == 'open_meteo':
-            binder.bind(BaseWeatherAPI, OpenMeteoWeatherAPI(configuration_instance))
+            binder.bind(BaseWeatherAPI, OpenMeteoWeatherAPI(configuration_instance, http_client))
             binder.bind(BaseWeatherProcessor, OpenMeteoWeatherProcessor())
         else:
             raise ValueError(f'Unsupported weather api service: {weather_service_config}')
 
         electricity_price_api_config = configuration_instance.get('electricity_price_service')
         if electricity_price_api_config == 'nordpool':
-            binder.bind(BaseElectricityPriceAPI, NordpoolElectricityPriceAPI(configuration_instance))
+            binder.bind(BaseElectricityPriceAPI, NordpoolElectricityPriceAPI(configuration_instance, http_client))
             binder.bind(BaseElectricityPriceProcessor, NordpoolElectricityPriceProcessor())
         else:
             raise ValueError(f'Unsupported electricity price api service: {electricity_price_api_config}')
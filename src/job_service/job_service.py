@@ -1,7 +1,10 @@
 import inject
+from datetime import datetime
 from apscheduler.schedulers.blocking import BlockingScheduler
 from src.electricity_price_service.electricity_price_service import ElectricityPriceService
 from src.weather_service.weather_service import WeatherService
+from src.switch_service.switch_service import SwitchService
+from src.switch_service.switch_data_rollup_service import SwitchDataRollupService
 from src.configuration.base_configuration import BaseConfiguration
 
 
@@ -15,16 +18,27 @@ class JobService:
     Attributes:
         weather_service (WeatherService): Service responsible for managing weather data operations.
         electricity_price_service (ElectricityPriceService): Service responsible for managing electricity price data operations.
+        switch_service (SwitchService): Service responsible for precomputing the switch decision tables and
+            maintaining the switch data partitions.
+        switch_data_rollup_service (SwitchDataRollupService): Service maintaining the switch data rollups.
         configuration (BaseConfiguration): Configuration instance to fetch job scheduling parameters.
         scheduler (BlockingScheduler): APScheduler's scheduler to manage jobs.
     """
     WEATHER_DATA_REGENERATION_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME = 'weather_data_regeneration_job_interval_in_minutes'
     ELECTRICITY_PRICE_DATA_REGENERATION_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME = 'electricity_price_data_regeneration_job_interval_in_minutes'
+    SWITCH_DECISION_TABLE_REGENERATION_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME = 'switch_decision_table_regeneration_job_interval_in_minutes'
+    DEFAULT_SWITCH_DECISION_TABLE_REGENERATION_JOB_INTERVAL_IN_MINUTES = 15
+    SWITCH_DATA_PARTITION_MAINTENANCE_JOB_INTERVAL_IN_HOURS_CONFIG_NAME = 'switch_data_partition_maintenance_job_interval_in_hours'
+    DEFAULT_SWITCH_DATA_PARTITION_MAINTENANCE_JOB_INTERVAL_IN_HOURS = 24
+    SWITCH_DATA_ROLLUP_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME = 'switch_data_rollup_job_interval_in_minutes'
+    DEFAULT_SWITCH_DATA_ROLLUP_JOB_INTERVAL_IN_MINUTES = 15
 
     @inject.autoparams()
     def __init__(self, weather_service: WeatherService,
                  electricity_price_service: ElectricityPriceService,
-                 configuration: BaseConfiguration):
+                 configuration: BaseConfiguration,
+                 switch_service: SwitchService,
+                 switch_data_rollup_service: SwitchDataRollupService):
         """
         Initializes the JobService with the necessary services and configuration.
 
@@ -34,18 +48,37 @@ class JobService:
             weather_service (WeatherService): The service that handles weather data regeneration.
             electricity_price_service (ElectricityPriceService): The service that handles electricity price data regeneration.
             configuration (BaseConfiguration): Configuration service for retrieving job intervals.
+            switch_service (SwitchService): The service that precomputes the switch decision tables.
+            switch_data_rollup_service (SwitchDataRollupService): The service that maintains the switch data rollups.
         """
         self.weather_service = weather_service
         self.electricity_price_service = electricity_price_service
         self.configuration = configuration
+        self.switch_service = switch_service
+        self.switch_data_rollup_service = switch_data_rollup_service
         self.scheduler = BlockingScheduler()
 
+    def _regenerate_weather_data(self):
+        """
+        Regenerates the weather data and, if it changed, the switch decision tables depending on it.
+        """
+        if self.weather_service.regenerate_weather_data():
+            self.switch_service.regenerate_switch_decision_tables()
+
+    def _regenerate_electricity_price_data(self):
+        """
+        Regenerates the electricity price data and, if it changed, the switch decision tables depending on it.
+        """
+        result = self.electricity_price_service.regenerate_electricity_price_data()
+        if result.inserted or result.updated:
+            self.switch_service.regenerate_switch_decision_tables()
+
     def _plan_weather_data_regeneration_job(self):
         """
         Plans and schedules the job to regenerate weather data at intervals specified in the configuration.
         """
         interval_in_minutes = int(self.configuration.get(self.WEATHER_DATA_REGENERATION_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME))
-        self.scheduler.add_job(self.weather_service.regenerate_weather_data,
+        self.scheduler.add_job(self._regenerate_weather_data,
                                'interval', minutes=interval_in_minutes)
 
     def _plan_electricity_price_data_regeneration_job(self):
@@ -53,13 +86,47 @@ class JobService:
         Plans and schedules the job to regenerate electricity price data at intervals specified in the configuration.
         """
         interval_in_minutes = int(self.configuration.get(self.ELECTRICITY_PRICE_DATA_REGENERATION_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME))
-        self.scheduler.add_job(self.electricity_price_service.regenerate_electricity_price_data,
+        self.scheduler.add_job(self._regenerate_electricity_price_data,
                                'interval', minutes=interval_in_minutes)
 
+    def _plan_switch_decision_table_regeneration_job(self):
+        """
+        Plans and schedules the job precomputing the switch decision tables, if the decision table is enabled.
+        """
+        if not self.switch_service.is_decision_table_enabled():
+            return
+        interval_in_minutes = int(self.configuration.get(
+            self.SWITCH_DECISION_TABLE_REGENERATION_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME,
+            self.DEFAULT_SWITCH_DECISION_TABLE_REGENERATION_JOB_INTERVAL_IN_MINUTES))
+        self.scheduler.add_job(self.switch_service.regenerate_switch_decision_tables,
+                               'interval', minutes=interval_in_minutes, next_run_time=datetime.now())
+
+    def _plan_switch_data_partition_maintenance_job(self):
+        """
+        Plans and schedules the job creating upcoming and dropping expired switch data partitions, starting right away.
+        """
+        interval_in_hours = int(self.configuration.get(
+            self.SWITCH_DATA_PARTITION_MAINTENANCE_JOB_INTERVAL_IN_HOURS_CONFIG_NAME,
+            self.DEFAULT_SWITCH_DATA_PARTITION_MAINTENANCE_JOB_INTERVAL_IN_HOURS))
+        self.scheduler.add_job(self.switch_service.maintain_switch_data_partitions,
+                               'interval', hours=interval_in_hours, next_run_time=datetime.now())
+
+    def _plan_switch_data_rollup_job(self):
+        """
+        Plans and schedules the job bringing the switch data rollups up to date, starting right away.
+        """
+        interval_in_minutes = int(self.configuration.get(self.SWITCH_DATA_ROLLUP_JOB_INTERVAL_IN_MINUTES_CONFIG_NAME,
+                                                         self.DEFAULT_SWITCH_DATA_ROLLUP_JOB_INTERVAL_IN_MINUTES))
+        self.scheduler.add_job(self.switch_data_rollup_service.regenerate_switch_data_rollups,
+                               'interval', minutes=interval_in_minutes, next_run_time=datetime.now())
+
     def plan_jobs(self):
         """
         Schedules all planned jobs and starts the scheduler. This method should be called after the service instantiation to begin job execution.
         """
         self._plan_weather_data_regeneration_job()
         self._plan_electricity_price_data_regeneration_job()
+        self._plan_switch_decision_table_regeneration_job()
+        self._plan_switch_data_partition_maintenance_job()
+        self._plan_switch_data_rollup_job()
         self.scheduler.start()
@@ -1,4 +1,5 @@
 import inject
+from src.cache_service.data_change_notifier import DataChangeNotifier
 from src.job_service.job_service import JobService
 from src.rest_api.flask_rest_api import FlaskRESTAPI
 from src.repository_service.base_repository_service import BaseRepositoryService
@@ -17,10 +18,12 @@ class Main:
         job_service (JobService): The service responsible for managing and scheduling background jobs.
         rest_api (FlaskRESTAPI): The REST API service that handles HTTP requests.
         repository_service (BaseRepositoryService): The service responsible for managing database interactions.
+        data_change_notifier (DataChangeNotifier): The channel invalidating the API caches when the jobs store data.
     """
 
     @inject.autoparams()
-    def __init__(self, job_service: JobService, rest_api: FlaskRESTAPI, repository_service: BaseRepositoryService):
+    def __init__(self, job_service: JobService, rest_api: FlaskRESTAPI, repository_service: BaseRepositoryService,
+                 data_change_notifier: DataChangeNotifier):
         """
         Initializes the Main class with a job service, REST API service, and repository service.
 
@@ -28,22 +31,26 @@ class Main:
             job_service (JobService): An instance of JobService to manage background job scheduling.
             rest_api (FlaskRESTAPI): An instance of FlaskRESTAPI to handle and respond to RESTful requests.
             repository_service (BaseRepositoryService): An instance of RepositoryService to manage database interactions.
+            data_change_notifier (DataChangeNotifier): An instance of DataChangeNotifier to receive data changes.
         """
         self.job_service = job_service
         self.rest_api = rest_api
         self.repository_service = repository_service
+        self.data_change_notifier = data_change_notifier
 
     def return_app(self):
         """
         Prepares the application by creating the database and returns the Flask app instance.
 
         This method ensures the database is set up and ready before returning the Flask app instance for handling
-        HTTP requests.
+        HTTP requests. It also starts listening for data changes made by the jobs, so the API caches are
+        invalidated when new weather or electricity price data is stored.
 
         Returns:
             Flask: The Flask app instance configured to handle RESTful requests.
         """
         self.repository_service.create_database()
+        self.data_change_notifier.start()
         return self.rest_api.app
 
     def run_jobs(self):
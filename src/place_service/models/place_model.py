@@ -13,5 +13,7 @@ class PlaceModel:
         self.location_id = location_id
         self.name = name
         self.description = description
-        self.switches = switches
-        self.location = location
+        self.switches = switches if switches is not None else []
+        # A location set to None would clear location_id when the place is stored, so it is only set if given.
+        if location is not None:
+            self.location = location
@@ -1,10 +1,13 @@
 import logging
+from collections import namedtuple
 
 import inject
-from sqlalchemy import create_engine, MetaData
-from sqlalchemy.orm import sessionmaker, registry
+from sqlalchemy import MetaData, and_, delete, insert, select, func, tuple_, or_, update, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import registry, relationship
 
 from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.database_engine import DatabaseEngine
 from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
 from src.repository_service.tables.registry import initialize_tables
 from src.switch_service.models.switch_model import SwitchModel
@@ -14,34 +17,222 @@ from src.place_service.models.place_model import PlaceModel
 from src.location_service.models.location_model import LocationModel
 from src.switch_service.models.switch_data_model import SwitchDataModel
 
+UpsertResult = namedtuple('UpsertResult', ['inserted', 'updated'])
+SWITCH_DEPENDENT_TABLE_NAMES = ['switch_schedule', 'switch_heartbeat', 'switch_data_rollup', 'switch_data_rollup_dirty']
+
 
 class BaseRepositoryService:
-    DATABASE_STRING_CONFIG_NAME = "database_string"
 
     @inject.autoparams()
-    def __init__(self, configuration: BaseConfiguration):
+    def __init__(self, configuration: BaseConfiguration, database_engine: DatabaseEngine):
         """
-        Initializes the RepositoryService with the provided configuration.
-        Creates the SQLAlchemy engine, session maker, and metadata objects.
-        Initializes the database tables.
+        Initializes the RepositoryService with the provided configuration and the shared database engine.
+        Creates the metadata objects and initializes the database tables.
         """
         self.configuration = configuration
         self.logger = logging.getLogger(__name__)
-        self.engine = create_engine(configuration.get(self.DATABASE_STRING_CONFIG_NAME))
-        self.session_maker = sessionmaker(bind=self.engine)
+        self.database_engine = database_engine
+        self.engine = database_engine.engine
+        self.session_maker = database_engine.session_maker
         self.metadata = MetaData()
         self.mapper_registry = registry()
-        self.tables = initialize_tables(self.metadata)
+        self.tables = initialize_tables(self.metadata, self.engine.dialect.name == 'postgresql')
 
     def create_database(self):
         """
         Creates the database and maps models to the respective tables.
+
+        Places are mapped with their switches, ordered by id and loaded when requested by a query, and their
+        location, which is joined into every place query. Nullable columns and indexes added to existing tables in
+        later versions are added to the database as well, since create_all only creates missing tables.
         """
         self.mapper_registry.map_imperatively(WeatherModel, self.tables['weather'])
         self.mapper_registry.map_imperatively(ElectricityPriceModel, self.tables['electricity_price'])
         self.mapper_registry.map_imperatively(SwitchModel, self.tables['switch'])
         self.mapper_registry.map_imperatively(LocationModel, self.tables['location'])
         self.mapper_registry.map_imperatively(UserModel, self.tables['user'])
-        self.mapper_registry.map_imperatively(PlaceModel, self.tables['place'])
+        self.mapper_registry.map_imperatively(PlaceModel, self.tables['place'], properties={
+            'switches': relationship(SwitchModel, order_by=self.tables['switch'].c.id),
+            'location': relationship(LocationModel, lazy='joined')})
         self.mapper_registry.map_imperatively(SwitchDataModel, self.tables['switch_data'])
         self.metadata.create_all(self.engine)
+        self._add_missing_columns()
+        self._add_missing_indexes()
+
+    def _add_missing_columns(self):
+        """
+        Adds the nullable columns of the tables that are missing in existing database tables.
+
+        Raises a RuntimeError if a missing column is not nullable, as it can not be added without a value for the
+        existing rows.
+        """
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+        for table in self.tables.values():
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                if not column.nullable:
+                    raise RuntimeError(f"Column {column.name} of table {table.name} is missing in the database and "
+                                       f"can not be added automatically.")
+                self.logger.warning(f"Adding missing column {column.name} to table {table.name}.")
+                with self.engine.begin() as connection:
+                    connection.execute(text(
+                        f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} "
+                        f"{column.type.compile(dialect=self.engine.dialect)}"))
+
+    def _add_missing_indexes(self):
+        """
+        Creates the indexes of the tables that are missing in existing database tables.
+        """
+        inspector = inspect(self.engine)
+        for table in self.tables.values():
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                self.logger.warning(f"Adding missing index {index.name} to table {table.name}.")
+                with self.engine.begin() as connection:
+                    index.create(connection)
+
+    @staticmethod
+    def _get_record_columns(record_class, table):
+        """
+        Returns the columns of a table read into a record class.
+
+        Args:
+            record_class (type): Named tuple class whose fields are named after the columns.
+            table (sqlalchemy.Table): The table to read.
+
+        Returns:
+            list[Column]: The columns in the order of the record fields.
+        """
+        return [table.c[field] for field in record_class._fields]
+
+    def _select_records(self, session, record_class, table, *criteria, order_by=()):
+        """
+        Reads rows of a table into immutable records with a Core select.
+
+        The rows bypass the ORM identity map and attribute instrumentation, which read-only callers do not need.
+        Writes keep using the mapped models.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): SQLAlchemy session for database operations.
+            record_class (type): Named tuple class whose fields are named after the columns to read.
+            table (sqlalchemy.Table): The table to read.
+            *criteria: The where criteria of the query.
+            order_by (tuple): The columns to order the records by.
+
+        Returns:
+            list: The records.
+        """
+        statement = select(*self._get_record_columns(record_class, table)).where(*criteria).order_by(*order_by)
+        return [record_class._make(row) for row in session.execute(statement)]
+
+    def _delete_switch_dependent_rows(self, session, switch_ids):
+        """
+        Deletes the rows of the tables derived from the switches, which are not mapped to the switch model.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): SQLAlchemy session of the transaction deleting the switches.
+            switch_ids (list[int]): The ids of the deleted switches.
+        """
+        for table_name in SWITCH_DEPENDENT_TABLE_NAMES:
+            table = self.tables[table_name]
+            session.execute(delete(table).where(table.c.switch_id.in_(switch_ids)))
+
+    def _supports_on_conflict(self):
+        """
+        Checks whether the database supports INSERT ... ON CONFLICT statements.
+
+        Returns:
+            bool: True on PostgreSQL and SQLite.
+        """
+        return self.engine.dialect.name in ('postgresql', 'sqlite')
+
+    def _get_dialect_insert(self, table):
+        """
+        Creates a dialect specific insert statement that supports ON CONFLICT clauses.
+
+        Args:
+            table (sqlalchemy.Table): The table to insert into.
+
+        Returns:
+            Insert: PostgreSQL or SQLite insert statement, raises a NotImplementedError for other databases.
+        """
+        dialect_name = self.engine.dialect.name
+        if dialect_name == 'postgresql':
+            return postgresql.insert(table)
+        if dialect_name == 'sqlite':
+            return sqlite.insert(table)
+        raise NotImplementedError(f"Bulk upsert is not supported for database dialect {dialect_name}.")
+
+    def _upsert_rows(self, session, table, rows, index_elements, update_columns):
+        """
+        Inserts the rows with a single INSERT ... ON CONFLICT DO UPDATE statement.
+
+        Rows with the same key are collapsed to the last one, because a single statement can not affect the same
+        row twice. Existing rows are updated only if one of the update columns has a different value. Databases
+        without ON CONFLICT support fall back to merging the rows one by one.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): SQLAlchemy session for database operations.
+            table (sqlalchemy.Table): The table to upsert into.
+            rows (list[dict]): Column values of the rows to upsert.
+            index_elements (list[str]): Columns of the unique constraint identifying a row.
+            update_columns (list[str]): Columns updated when the row already exists.
+
+        Returns:
+            UpsertResult: Number of inserted rows and number of existing rows that were changed.
+        """
+        rows_by_key = {tuple(row[column] for column in index_elements): row for row in rows}
+        if not rows_by_key:
+            return UpsertResult(0, 0)
+        if not self._supports_on_conflict():
+            return self._merge_rows(session, table, rows_by_key, index_elements, update_columns)
+
+        key_columns = [table.c[column] for column in index_elements]
+        if len(key_columns) == 1:
+            key_filter = key_columns[0].in_([key[0] for key in rows_by_key])
+        else:
+            key_filter = tuple_(*key_columns).in_(list(rows_by_key))
+        existing_count = session.execute(select(func.count()).select_from(table).where(key_filter)).scalar()
+
+        statement = self._get_dialect_insert(table).values(list(rows_by_key.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={column: statement.excluded[column] for column in update_columns},
+            where=or_(*[table.c[column].is_distinct_from(statement.excluded[column]) for column in update_columns]))
+        changed_count = session.execute(statement).rowcount
+
+        inserted_count = len(rows_by_key) - existing_count
+        return UpsertResult(inserted_count, changed_count - inserted_count)
+
+    def _merge_rows(self, session, table, rows_by_key, index_elements, update_columns):
+        """
+        Inserts or updates the rows one by one, for databases without ON CONFLICT support.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): SQLAlchemy session for database operations.
+            table (sqlalchemy.Table): The table to upsert into.
+            rows_by_key (dict): Column values of the rows to upsert by the values of their index elements.
+            index_elements (list[str]): Columns of the unique constraint identifying a row.
+            update_columns (list[str]): Columns updated when the row already exists.
+
+        Returns:
+            UpsertResult: Number of inserted rows and number of existing rows that were changed.
+        """
+        inserted_count = updated_count = 0
+        for key, row in rows_by_key.items():
+            key_filter = and_(*[table.c[column] == value for column, value in zip(index_elements, key)])
+            existing_row = session.execute(select(*[table.c[column] for column in update_columns])
+                                           .where(key_filter)).first()
+            if existing_row is None:
+                session.execute(insert(table).values(row))
+                inserted_count += 1
+            elif any(existing_row[index] != row[column] for index, column in enumerate(update_columns)):
+                session.execute(update(table).where(key_filter).values(
+                    {column: row[column] for column in update_columns}))
+                updated_count += 1
+        return UpsertResult(inserted_count, updated_count)
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from sqlalchemy import insert, select, text, update
+
+from src.repository_service.base_repository_service import BaseRepositoryService
+
+
+class DataVersionRepositoryService(BaseRepositoryService):
+    """
+    Service class responsible for the versions of data sets written by the jobs and cached by the API.
+
+    Every data set, such as the electricity prices, has a row with a version number that is incremented each time
+    the data set changes. On PostgreSQL the change is also announced with NOTIFY on DATA_CHANGE_CHANNEL, so
+    listening processes do not have to wait for their next poll of the versions.
+
+    Attributes:
+        DATA_CHANGE_CHANNEL (str): The PostgreSQL notification channel of data changes.
+    """
+    DATA_CHANGE_CHANNEL = 'data_changed'
+
+    def increment_data_version(self, name):
+        """
+        Increments the version of a data set and notifies the listeners of the change.
+
+        The notification is sent in the same transaction as the version update, so listeners never read an older
+        version after being notified.
+
+        Args:
+            name (str): The name of the changed data set.
+
+        Raises:
+            Exception: If an error occurred while updating the version.
+        """
+        table = self.tables['data_version']
+        changed_at = datetime.now()
+        with self.session_maker() as session:
+            try:
+                if self._supports_on_conflict():
+                    statement = self._get_dialect_insert(table).values(name=name, version=1, changed_at=changed_at)
+                    session.execute(statement.on_conflict_do_update(
+                        index_elements=['name'],
+                        set_={'version': table.c.version + 1, 'changed_at': statement.excluded.changed_at}))
+                elif not session.execute(update(table).where(table.c.name == name).values(
+                        version=table.c.version + 1, changed_at=changed_at)).rowcount:
+                    session.execute(insert(table).values(name=name, version=1, changed_at=changed_at))
+                if self.engine.dialect.name == 'postgresql':
+                    session.execute(text('SELECT pg_notify(:channel, :name)'),
+                                    {'channel': self.DATA_CHANGE_CHANNEL, 'name': name})
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error incrementing version of data set {name}. Error = {e}")
+                raise
+
+    def get_data_versions(self):
+        """
+        Retrieves the current versions of all data sets.
+
+        Returns:
+            dict: Version numbers keyed by the data set name.
+        """
+        table = self.tables['data_version']
+        with self.session_maker() as session:
+            return dict(session.execute(select(table.c.name, table.c.version)).all())
@@ -0,0 +1,74 @@
+import inject
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from src.configuration.base_configuration import BaseConfiguration
+
+
+class DatabaseEngine:
+    """
+    Process wide SQLAlchemy engine and session factory shared by all repository services.
+
+    Every repository service uses the same engine, so a worker process holds a single connection pool no matter
+    how many repository services it instantiates.
+
+    Attributes:
+        DATABASE_STRING_CONFIG_NAME (str): Configuration key of the database connection string.
+        DATABASE_POOL_SIZE_CONFIG_NAME (str): Configuration key of the number of connections kept in the pool.
+        DATABASE_MAX_OVERFLOW_CONFIG_NAME (str): Configuration key of the number of connections allowed above the pool size.
+        DATABASE_POOL_PRE_PING_CONFIG_NAME (str): Configuration key enabling the liveness check of pooled connections.
+        DATABASE_POOL_RECYCLE_IN_SECONDS_CONFIG_NAME (str): Configuration key of the maximum age of a pooled connection.
+    """
+    DATABASE_STRING_CONFIG_NAME = "database_string"
+    DATABASE_POOL_SIZE_CONFIG_NAME = "database_pool_size"
+    DATABASE_MAX_OVERFLOW_CONFIG_NAME = "database_max_overflow"
+    DATABASE_POOL_PRE_PING_CONFIG_NAME = "database_pool_pre_ping"
+    DATABASE_POOL_RECYCLE_IN_SECONDS_CONFIG_NAME = "database_pool_recycle_in_seconds"
+    DEFAULT_POOL_SIZE = 5
+    DEFAULT_MAX_OVERFLOW = 5
+    DEFAULT_POOL_PRE_PING = "true"
+    DEFAULT_POOL_RECYCLE_IN_SECONDS = 1800
+
+    @inject.autoparams()
+    def __init__(self, configuration: BaseConfiguration):
+        """
+        Creates the SQLAlchemy engine and the session maker bound to it.
+
+        Args:
+            configuration (BaseConfiguration): The configuration holding the connection string and pool settings.
+        """
+        self.configuration = configuration
+        database_string = configuration.get(self.DATABASE_STRING_CONFIG_NAME)
+        self.engine = create_engine(database_string, **self._get_pool_options(database_string))
+        self.session_maker = sessionmaker(bind=self.engine)
+
+    def _get_pool_options(self, database_string):
+        """
+        Reads the connection pool options from the configuration.
+
+        SQLite databases are used for local runs and tests and keep the SQLAlchemy default pool.
+
+        Args:
+            database_string (str): The database connection string.
+
+        Returns:
+            dict: Keyword arguments for create_engine.
+        """
+        if make_url(database_string).get_backend_name() == 'sqlite':
+            return {}
+        pool_pre_ping = self.configuration.get(self.DATABASE_POOL_PRE_PING_CONFIG_NAME, self.DEFAULT_POOL_PRE_PING)
+        return {
+            'pool_size': int(self.configuration.get(self.DATABASE_POOL_SIZE_CONFIG_NAME, self.DEFAULT_POOL_SIZE)),
+            'max_overflow': int(self.configuration.get(self.DATABASE_MAX_OVERFLOW_CONFIG_NAME,
+                                                       self.DEFAULT_MAX_OVERFLOW)),
+            'pool_pre_ping': str(pool_pre_ping).lower() == 'true',
+            'pool_recycle': int(self.configuration.get(self.DATABASE_POOL_RECYCLE_IN_SECONDS_CONFIG_NAME,
+                                                       self.DEFAULT_POOL_RECYCLE_IN_SECONDS))
+        }
+
+    def dispose(self):
+        """
+        Closes all connections of the connection pool.
+        """
+        self.engine.dispose()
@@ -1,6 +1,5 @@
 from src.repository_service.base_repository_service import BaseRepositoryService
-from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
-from sqlalchemy.exc import IntegrityError
+from src.electricity_price_service.models.electricity_price_model import ElectricityPriceRecord
 
 
 class ElectricityPriceRepositoryService(BaseRepositoryService):
@@ -10,37 +9,28 @@ class ElectricityPriceRepositoryService(BaseRepositoryService):
 
     def store_electricity_price_data(self, electricity_prices):
         """
-        Stores a list of electricity price records into the database.
-        Handles integrity errors by updating existing records.
+        Stores a list of electricity price records into the database with a single upsert statement.
+        Existing records with the same datetime are updated.
 
         Args:
             electricity_prices (list): List of ElectricityPriceModel objects to be stored in the database.
-        """
-        with self.session_maker() as session:
-            for electricity_price in electricity_prices:
-                try:
-                    session.add(electricity_price)
-                    session.commit()
-                except IntegrityError:
-                    session.rollback()
-                    self._update_electricity_price_data(session, electricity_price)
-                except Exception as e:
-                    session.rollback()
-                    self.logger.error(f"Error storing electricity price data into database. Error = {e}")
-
-    def _update_electricity_price_data(self, session, electricity_price):
-        """
-        Updates existing electricity price data in the database.
 
-        Args:
-            session (sqlalchemy.orm.session.Session): SQLAlchemy session for database operations.
-            electricity_price (ElectricityPriceModel): ElectricityPriceModel object containing updated price data.
+        Returns:
+            UpsertResult: Number of inserted records and number of existing records that were changed.
         """
-        existing_electricity_price = session.query(ElectricityPriceModel).filter(
-            ElectricityPriceModel.datetime == electricity_price.datetime).first()
-        if existing_electricity_price:
-            existing_electricity_price.price = electricity_price.price
-            session.commit()
+        rows = [{'datetime': electricity_price.datetime, 'price': electricity_price.price}
+                for electricity_price in electricity_prices]
+        with self.session_maker() as session:
+            try:
+                result = self._upsert_rows(session, self.tables['electricity_price'], rows,
+                                           index_elements=['datetime'], update_columns=['price'])
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error storing electricity price data into database. Error = {e}")
+                raise
+        self.logger.debug(f"Stored electricity price data: {result.inserted} inserted, {result.updated} updated.")
+        return result
 
     def get_electricity_price_data_after_date(self, date):
         """
@@ -50,7 +40,9 @@ class ElectricityPriceRepositoryService(BaseRepositoryService):
             date (datetime): The date after which the electricity price data records are to be retrieved.
 
         Returns:
-            list: List of ElectricityPriceModel objects retrieved from the database.
+            list[ElectricityPriceRecord]: The read-only electricity price records ordered by datetime.
         """
+        table = self.tables['electricity_price']
         with self.session_maker() as session:
-            return session.query(ElectricityPriceModel).filter(ElectricityPriceModel.datetime > date).all()
+            return self._select_records(session, ElectricityPriceRecord, table, table.c.datetime > date,
+                                        order_by=(table.c.datetime,))
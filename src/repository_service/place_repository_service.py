@@ -1,8 +1,8 @@
 from src.repository_service.base_repository_service import BaseRepositoryService
 from src.place_service.models.place_model import PlaceModel
 from src.switch_service.models.switch_model import SwitchModel
-from src.location_service.models.location_model import LocationModel
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 
 
 class PlaceRepositoryService(BaseRepositoryService):
@@ -53,6 +53,8 @@ class PlaceRepositoryService(BaseRepositoryService):
         """
         Retrieves a place object from the database based on the place name.
 
+        The place is loaded with its location in one query and its switches in a second one.
+
         Args:
             place_id (int): The id of the place to be retrieved.
             user_id (int): The id of the user for the place.
@@ -62,19 +64,19 @@ class PlaceRepositoryService(BaseRepositoryService):
             ValueError: If the place does not exist in the database.
         """
         with self.session_maker() as session:
-            place = session.query(PlaceModel).filter_by(id=place_id, user_id=user_id).first()
+            place = session.query(PlaceModel).options(selectinload(PlaceModel.switches)).filter_by(
+                id=place_id, user_id=user_id).first()
             if place is None:
                 raise ValueError(f"Place with id {place_id} does not exist in the database.")
-            switches = session.query(SwitchModel).filter_by(place_id=place.id).all()
-            location = session.query(LocationModel).filter_by(id=place.location_id).first()
-            place.switches = switches
-            place.location = location
             return place
 
     def get_all_places_and_switches_for_user(self, user_id):
         """
         Retrieves all places and switches for a user.
 
+        The places are loaded with their locations in one query and the switches of all places in a second one,
+        regardless of the number of places.
+
         Args:
             user_id (int): The id of the user for the places.
 
@@ -82,20 +84,18 @@ class PlaceRepositoryService(BaseRepositoryService):
             List[PlaceModel]: List of place objects retrieved from the database.
         """
         with self.session_maker() as session:
-            places = session.query(PlaceModel).filter_by(user_id=user_id).all()
+            places = session.query(PlaceModel).options(selectinload(PlaceModel.switches)).filter_by(
+                user_id=user_id).order_by(PlaceModel.id).all()
             if places is None:
                 raise ValueError(f"There are no places for user with id {user_id} in the database.")
-            for place in places:
-                switches = session.query(SwitchModel).filter_by(place_id=place.id).all()
-                place.switches = switches
-                location = session.query(LocationModel).filter_by(id=place.location_id).first()
-                place.location = location
             return places
 
     def delete_place(self, place_id, user_id):
         """
         Deletes a place object from the database based on the place name and user id.
 
+        The switches of the place are deleted with their schedules, heartbeats and rollups.
+
         Args:
             place_id (int): The id of the place to be deleted.
             user_id (int): The id of the user for the place.
@@ -108,6 +108,7 @@ class PlaceRepositoryService(BaseRepositoryService):
             if place is None:
                 raise ValueError(f"Place with id {place_id} does not exist for user {user_id} in the database.")
             switches = session.query(SwitchModel).filter_by(place_id=place.id).all()
+            self._delete_switch_dependent_rows(session, [switch.id for switch in switches])
             for switch in switches:
                 session.delete(switch)
             session.commit()
@@ -1,8 +1,31 @@
+import re
+from collections import namedtuple
+from datetime import datetime
+from sqlalchemy import case, delete, func, insert, select, text
 from sqlalchemy.exc import IntegrityError
-from src.repository_service.base_repository_service import BaseRepositoryService
-from src.switch_service.models.switch_model import SwitchModel
-from src.switch_service.models.switch_data_model import SwitchDataModel
+from src.repository_service.base_repository_service import BaseRepositoryService, UpsertResult
+from src.switch_service.models.switch_model import SwitchModel, SwitchRecord
+from src.switch_service.models.switch_data_model import SwitchDataModel, SwitchDataType
 from src.place_service.models.place_model import PlaceModel
+from src.repository_service.tables.switch_data_table import SWITCH_DATA_DEFAULT_PARTITION_NAME
+
+SwitchStatusInterval = namedtuple('SwitchStatusInterval', ['start', 'end', 'status'])
+SWITCH_DATA_PARTITION_NAME_PATTERN = re.compile(r'^switch_data_y(\d{4})m(\d{2})$')
+
+
+def _get_month_start(moment, months_to_add=0):
+    """
+    Returns the start of the month of a moment, shifted by a number of months.
+
+    Args:
+        moment (datetime): The moment.
+        months_to_add (int): Number of months to shift the result by, may be negative.
+
+    Returns:
+        datetime: Midnight of the first day of the month.
+    """
+    month_index = moment.year * 12 + moment.month - 1 + months_to_add
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
 
 
 class SwitchRepositoryService(BaseRepositoryService):
@@ -44,62 +67,127 @@ class SwitchRepositoryService(BaseRepositoryService):
             uuid (str): The uuid of the switch to be updated.
 
         Returns:
-            None, raises a ValueError if the switch does not exist in the database.
+            switch_id: Id of the updated switch, raises a ValueError if the switch does not exist in the database.
         """
         try:
             with self.session_maker() as session:
                 try:
-                    existing_switch = self.get_switch_for_user(uuid, user_id)
+                    existing_switch = self._query_switch_for_user(session, uuid, user_id)
                 except ValueError as ve:
                     self.logger.error(f"ValueError in get_switch: {ve}")
                     raise ve
                 existing_switch.status_calculation_logic = switch.status_calculation_logic
+                existing_switch.status_calculation_rule = switch.status_calculation_rule
                 existing_switch.name = switch.name
                 existing_switch.place_id = switch.place_id
                 existing_switch.uuid = switch.uuid
                 session.add(existing_switch)
                 session.commit()
+                return int(existing_switch.id)
         except Exception as e:
             self.logger.error(f"Error updating switch data into database. Error = {e}")
             raise e
 
     def get_switch(self, id):
         """
-        Retrieves a switch object from the database based on the switch id.
+        Retrieves a switch from the database based on the switch id.
 
         Args:
             id (str): The id of the switch to be retrieved.
 
         Returns:
-            SwitchModel: SwitchModel object retrieved from the database. ValueError is raised if the switch does not exist.
+            SwitchRecord: The read-only switch. ValueError is raised if the switch does not exist.
         """
+        table = self.tables['switch']
         with self.session_maker() as session:
-            existing_switch = session.query(SwitchModel).filter(SwitchModel.id == id).first()
-            if existing_switch:
-                return existing_switch
+            switches = self._select_records(session, SwitchRecord, table, table.c.id == id)
+            if switches:
+                return switches[0]
             else:
                 raise ValueError(f"Switch with uuid {id} does not exist in the database.")
 
+    def _query_switch_for_user(self, session, uuid, user_id):
+        """
+        Loads the mapped switch of a user for changing it within a session.
+
+        Args:
+            session (sqlalchemy.orm.session.Session): The session the switch is changed in.
+            uuid (str): The uuid of the switch.
+            user_id (int): The user id of the user who owns the switch.
+
+        Returns:
+            SwitchModel: The switch attached to the session. ValueError is raised if the switch does not exist.
+        """
+        existing_switch = session.query(SwitchModel).join(PlaceModel, SwitchModel.place_id == PlaceModel.id).filter(
+            SwitchModel.uuid == uuid, PlaceModel.user_id == user_id).first()
+        if existing_switch:
+            return existing_switch
+        raise ValueError(f"Switch with uuid {uuid} does not exist for the user in the database.")
+
     def get_switch_for_user(self, uuid, user_id):
         """
-        Retrieves a switch object from the database based on the switch uuid and user id.
+        Retrieves a switch from the database based on the switch uuid and user id.
 
         Args:
             uuid (str): The uuid of the switch to be retrieved.
             user_id (int): The user id of the user who owns the switch.
 
         Returns:
-            SwitchModel: SwitchModel object retrieved from the database. ValueError is raised if the switch does not exist.
+            SwitchRecord: The read-only switch. ValueError is raised if the switch does not exist.
         """
+        switch_table = self.tables['switch']
+        place_table = self.tables['place']
         with self.session_maker() as session:
-            user_places = session.query(PlaceModel).filter(PlaceModel.user_id == user_id).all()
-            for place in user_places:
-                existing_switch = session.query(SwitchModel).filter(SwitchModel.uuid == uuid,
-                                                                    SwitchModel.place_id == place.id).first()
-                if existing_switch:
-                    return existing_switch
+            row = session.execute(
+                select(*self._get_record_columns(SwitchRecord, switch_table))
+                .join_from(switch_table, place_table, switch_table.c.place_id == place_table.c.id)
+                .where(switch_table.c.uuid == uuid, place_table.c.user_id == user_id)).first()
+            if row:
+                return SwitchRecord._make(row)
             raise ValueError(f"Switch with uuid {uuid} does not exist for the user in the database.")
 
+    def get_switches_with_location_for_user(self, user_id, uuids=None, place_id=None):
+        """
+        Retrieves several switches of a user together with the location ids of their places in one query.
+
+        Args:
+            user_id (int): The user id of the user who owns the switches.
+            uuids (list[str]): The uuids of the switches, None to filter by place only.
+            place_id (int): The id of the place of the switches, None to filter by uuids only.
+
+        Returns:
+            list[tuple]: Tuples of read-only SwitchRecord and location id. Switches not owned by the user are left out.
+        """
+        switch_table = self.tables['switch']
+        place_table = self.tables['place']
+        statement = select(*self._get_record_columns(SwitchRecord, switch_table), place_table.c.location_id).join_from(
+            switch_table, place_table, switch_table.c.place_id == place_table.c.id).where(
+            place_table.c.user_id == user_id)
+        if uuids is not None:
+            statement = statement.where(switch_table.c.uuid.in_(uuids))
+        if place_id is not None:
+            statement = statement.where(switch_table.c.place_id == place_id)
+        with self.session_maker() as session:
+            return [(SwitchRecord._make(row[:-1]), row[-1])
+                    for row in session.execute(statement.order_by(switch_table.c.id))]
+
+    def get_switch_location_id(self, switch_id):
+        """
+        Retrieves the location id of the place the switch belongs to.
+
+        Args:
+            switch_id (int): The id of the switch.
+
+        Returns:
+            int: The location id of the switch place. ValueError is raised if the switch does not exist.
+        """
+        with self.session_maker() as session:
+            location_id = session.query(PlaceModel.location_id).join(
+                SwitchModel, SwitchModel.place_id == PlaceModel.id).filter(SwitchModel.id == switch_id).scalar()
+            if location_id is None:
+                raise ValueError(f"Switch with id {switch_id} does not exist in the database.")
+            return location_id
+
     def delete_switch(self, uuid, user_id):
         """
         Deletes a switch object from the database.
@@ -109,13 +197,16 @@ class SwitchRepositoryService(BaseRepositoryService):
             user_id (str): The user id of the user who owns the switch.
 
         Returns:
-            None, raises a ValueError if the switch does not exist in the database.
+            switch_id: Id of the deleted switch, raises a ValueError if the switch does not exist in the database.
         """
         try:
             with self.session_maker() as session:
-                existing_switch = self.get_switch_for_user(uuid, user_id)
+                existing_switch = self._query_switch_for_user(session, uuid, user_id)
+                switch_id = int(existing_switch.id)
+                self._delete_switch_dependent_rows(session, [switch_id])
                 session.delete(existing_switch)
                 session.commit()
+                return switch_id
         except ValueError as ve:
             self.logger.error(f"ValueError in get_switch: {ve}")
             raise ve
@@ -123,6 +214,84 @@ class SwitchRepositoryService(BaseRepositoryService):
             self.logger.error(f"Error deleting switch data from database. Error = {e}")
             raise e
 
+    def get_switches_with_logic(self):
+        """
+        Retrieves all switches that have status calculation logic.
+
+        Returns:
+            list[SwitchRecord]: The read-only switches with status calculation logic or a rule.
+        """
+        table = self.tables['switch']
+        with self.session_maker() as session:
+            return self._select_records(session, SwitchRecord, table, table.c.status_calculation_logic.isnot(None) |
+                                        table.c.status_calculation_rule.isnot(None))
+
+    def replace_switch_schedule(self, switch_id, schedule):
+        """
+        Replaces the precomputed statuses of a switch with a new schedule in a single transaction.
+
+        Args:
+            switch_id (int): The id of the switch.
+            schedule (dict): Switch statuses keyed by the start datetime of their hourly slot.
+        """
+        table = self.tables['switch_schedule']
+        rows = [{'switch_id': switch_id, 'slot_start': slot_start, 'value_text': value_text}
+                for slot_start, value_text in schedule.items()]
+        with self.session_maker() as session:
+            try:
+                session.execute(delete(table).where(table.c.switch_id == switch_id))
+                if rows:
+                    session.execute(insert(table), rows)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error storing schedule of switch {switch_id} into database. Error = {e}")
+                raise
+
+    def get_switch_schedule_value(self, switch_id, slot_start):
+        """
+        Retrieves the precomputed status of a switch for an hourly slot.
+
+        Args:
+            switch_id (int): The id of the switch.
+            slot_start (datetime): The start datetime of the slot.
+
+        Returns:
+            str: The precomputed switch status or None if the slot is not precomputed.
+        """
+        table = self.tables['switch_schedule']
+        with self.session_maker() as session:
+            return session.execute(select(table.c.value_text).where(
+                table.c.switch_id == switch_id, table.c.slot_start == slot_start)).scalar()
+
+    def get_switch_schedule_values(self, switch_ids, slot_start):
+        """
+        Retrieves the precomputed statuses of several switches for an hourly slot.
+
+        Args:
+            switch_ids (list[int]): The ids of the switches.
+            slot_start (datetime): The start datetime of the slot.
+
+        Returns:
+            dict: The precomputed switch statuses keyed by switch id, switches without the slot are left out.
+        """
+        table = self.tables['switch_schedule']
+        with self.session_maker() as session:
+            return dict(session.execute(select(table.c.switch_id, table.c.value_text).where(
+                table.c.switch_id.in_(switch_ids), table.c.slot_start == slot_start)).all())
+
+    def delete_switch_schedule(self, switch_id):
+        """
+        Deletes the precomputed statuses of a switch.
+
+        Args:
+            switch_id (int): The id of the switch.
+        """
+        table = self.tables['switch_schedule']
+        with self.session_maker() as session:
+            session.execute(delete(table).where(table.c.switch_id == switch_id))
+            session.commit()
+
     def store_switch_operational_data(self, switch_data):
         """
         Stores a switch operational data object into the database.
@@ -142,3 +311,498 @@ class SwitchRepositoryService(BaseRepositoryService):
         except Exception as e:
             self.logger.error(f"Error storing switch data into database. Error = {e}")
             raise
+
+    def store_switch_operational_data_many(self, switch_data):
+        """
+        Stores several switch operational data objects into the database with multi-row insert statements.
+
+        Switch data with the same switch, data type and log_cre_date as a stored row is skipped, so a batch that is
+        retried after a failed write or that repeats a row does not fail as a whole.
+
+        Args:
+            switch_data (list[SwitchDataModel]): SwitchDataModel objects to be stored in the database.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        return self.store_switch_operational_data_ignoring_duplicates([
+            {'switch_id': data.switch_id, 'data_type': data.data_type, 'log_cre_date': data.log_cre_date,
+             'value_text': data.value_text, 'value_number': data.value_number} for data in switch_data])
+
+    def _insert_switch_data_ignoring_duplicates(self, session, rows, chunk_size=1000):
+        """
+        Inserts switch data rows with multi-row INSERT ... ON CONFLICT DO NOTHING statements.
+
+        Args:
+            session (Session): The session of the transaction inserting the rows.
+            rows (list[dict]): Column values of the switch data rows.
+            chunk_size (int): Number of rows per insert statement.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        table = self.tables['switch_data']
+        inserted_count = 0
+        for index in range(0, len(rows), chunk_size):
+            statement = self._get_dialect_insert(table).values(rows[index:index + chunk_size])
+            statement = statement.on_conflict_do_nothing(index_elements=['switch_id', 'data_type', 'log_cre_date'])
+            inserted_count += session.execute(statement).rowcount
+        return inserted_count
+
+    def store_switch_operational_data_ignoring_duplicates(self, rows, chunk_size=1000):
+        """
+        Stores switch operational data with multi-row inserts, skipping rows that already exist.
+
+        Rows with the same switch, data type and log_cre_date as a stored row are ignored, so a batch may be
+        uploaded again after a failed or interrupted upload.
+
+        Args:
+            rows (list[dict]): Column values of the switch data rows.
+            chunk_size (int): Number of rows per insert statement.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        with self.session_maker() as session:
+            try:
+                inserted_count = self._insert_switch_data_ignoring_duplicates(session, rows, chunk_size)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error storing switch data into database. Error = {e}")
+                raise
+        return inserted_count
+
+    def store_switch_status_transitions(self, switch_data):
+        """
+        Stores relay statuses only where they differ from the previous status of the switch.
+
+        The previous status of every switch is kept in the switch_heartbeat table together with the time the switch
+        was last seen, so repeated polls with an unchanged status only update the heartbeat row of the switch.
+        Switch data of other types is stored as is.
+
+        The heartbeat rows are locked while the statuses are compared, so concurrent writers of the same switch
+        serialize, a heartbeat is never moved back to an older poll, and rows that are already stored are skipped.
+
+        Args:
+            switch_data (list[SwitchDataModel]): SwitchDataModel objects to be stored in the database.
+
+        Returns:
+            int: Number of stored switch data rows.
+        """
+        heartbeat_table = self.tables['switch_heartbeat']
+        switch_data = sorted(switch_data, key=lambda data: data.log_cre_date)
+        relay_statuses = [data for data in switch_data if data.data_type == SwitchDataType.RELAY_STATUS]
+        switch_ids = {data.switch_id for data in relay_statuses}
+        with self.session_maker() as session:
+            try:
+                last_statuses = dict(session.execute(
+                    select(heartbeat_table.c.switch_id, heartbeat_table.c.last_status)
+                    .where(heartbeat_table.c.switch_id.in_(switch_ids)).with_for_update()).all())
+                stored_data = [data for data in switch_data if data.data_type != SwitchDataType.RELAY_STATUS]
+                heartbeats = {}
+                for data in relay_statuses:
+                    if data.switch_id not in last_statuses or last_statuses[data.switch_id] != data.value_text:
+                        stored_data.append(data)
+                    last_statuses[data.switch_id] = data.value_text
+                    heartbeats[data.switch_id] = {'switch_id': data.switch_id, 'last_seen': data.log_cre_date,
+                                                  'last_status': data.value_text}
+                stored_count = self._insert_switch_data_ignoring_duplicates(session, [
+                    {'switch_id': data.switch_id, 'data_type': data.data_type, 'log_cre_date': data.log_cre_date,
+                     'value_text': data.value_text, 'value_number': data.value_number} for data in stored_data])
+                if heartbeats:
+                    statement = self._get_dialect_insert(heartbeat_table).values(list(heartbeats.values()))
+                    session.execute(statement.on_conflict_do_update(
+                        index_elements=['switch_id'],
+                        set_={'last_seen': statement.excluded.last_seen,
+                              'last_status': statement.excluded.last_status},
+                        where=statement.excluded.last_seen > heartbeat_table.c.last_seen))
+                session.commit()
+                return stored_count
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error storing switch status transitions into database. Error = {e}")
+                raise
+
+    def get_switch_heartbeat(self, switch_id):
+        """
+        Retrieves the time a switch was last seen and its status at that time.
+
+        Args:
+            switch_id (int): The id of the switch.
+
+        Returns:
+            tuple: The last seen datetime and the last status, None if no heartbeat is stored.
+        """
+        heartbeat_table = self.tables['switch_heartbeat']
+        with self.session_maker() as session:
+            return session.execute(select(heartbeat_table.c.last_seen, heartbeat_table.c.last_status).where(
+                heartbeat_table.c.switch_id == switch_id)).first()
+
+    def get_switch_status_timeline(self, switch_id, start_date, end_date):
+        """
+        Reconstructs the relay statuses of a switch in a time window as intervals of unchanged status.
+
+        The status at the start of the window is taken from the last stored row before it, and consecutive rows
+        with the same status are merged, so the result is the same whether every poll or only the transitions were
+        stored. The last interval ends at the end of the window, or at the time the switch was last seen if that is
+        earlier, because the status after the last poll is unknown.
+
+        Args:
+            switch_id (int): The id of the switch.
+            start_date (datetime): The start of the window.
+            end_date (datetime): The end of the window.
+
+        Returns:
+            list[SwitchStatusInterval]: The intervals ordered by start, empty if nothing is known in the window.
+        """
+        data_table = self.tables['switch_data']
+        relay_status_filter = (data_table.c.switch_id == switch_id,
+                               data_table.c.data_type == SwitchDataType.RELAY_STATUS)
+        with self.session_maker() as session:
+            previous_row = session.execute(
+                select(data_table.c.log_cre_date, data_table.c.value_text)
+                .where(*relay_status_filter, data_table.c.log_cre_date <= start_date)
+                .order_by(data_table.c.log_cre_date.desc()).limit(1)).first()
+            rows = session.execute(
+                select(data_table.c.log_cre_date, data_table.c.value_text)
+                .where(*relay_status_filter, data_table.c.log_cre_date > start_date,
+                       data_table.c.log_cre_date < end_date)
+                .order_by(data_table.c.log_cre_date)).all()
+            last_seen = session.execute(select(self.tables['switch_heartbeat'].c.last_seen).where(
+                self.tables['switch_heartbeat'].c.switch_id == switch_id)).scalar()
+
+        changes = []
+        if previous_row is not None:
+            changes.append((start_date, previous_row.value_text))
+        for log_cre_date, value_text in rows:
+            if not changes or changes[-1][1] != value_text:
+                changes.append((log_cre_date, value_text))
+        if not changes:
+            return []
+
+        timeline_end = end_date
+        if last_seen is not None:
+            timeline_end = min(end_date, max(last_seen, changes[-1][0]))
+        ends = [change[0] for change in changes[1:]] + [timeline_end]
+        return [SwitchStatusInterval(start, end, status) for (start, status), end in zip(changes, ends)]
+
+    def _is_switch_data_partitioned(self):
+        """
+        Checks whether the switch_data table is partitioned.
+
+        The table is created partitioned on PostgreSQL, but tables created by earlier versions are not migrated, so
+        the catalog is checked. A warning is logged for an unpartitioned table on PostgreSQL.
+
+        Returns:
+            bool: True if the switch data is stored in monthly partitions.
+        """
+        if self.engine.dialect.name != 'postgresql':
+            return False
+        with self.session_maker() as session:
+            partitioned = session.execute(text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+                "JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid "
+                "WHERE pg_class.relname = 'switch_data' AND pg_class.relnamespace = current_schema()::regnamespace)"
+            )).scalar()
+        if not partitioned:
+            self.logger.warning("The switch_data table is not partitioned, skipping the partition maintenance.")
+        return partitioned
+
+    def _get_switch_data_partition_months(self, session):
+        """
+        Lists the monthly partitions of the switch_data table.
+
+        Args:
+            session (Session): The session used for the query.
+
+        Returns:
+            dict: Start of the month of every monthly partition by partition name.
+        """
+        partition_names = session.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'switch_data'")).scalars().all()
+        partition_months = {}
+        for partition_name in partition_names:
+            match = SWITCH_DATA_PARTITION_NAME_PATTERN.match(partition_name)
+            if match:
+                partition_months[partition_name] = datetime(int(match.group(1)), int(match.group(2)), 1)
+        return partition_months
+
+    def _create_switch_data_partition(self, session, partition_name, month_start):
+        """
+        Creates a monthly partition of the switch_data table.
+
+        PostgreSQL refuses to create a partition while the default partition holds rows in its range, e.g. when the
+        partition maintenance did not run for a while. The default partition is then detached, the partition created,
+        the rows moved from the default partition into it and the default partition attached again.
+
+        Args:
+            session (Session): The session of the transaction creating the partition.
+            partition_name (str): The name of the partition.
+            month_start (datetime): The start of the month of the partition.
+        """
+        month_end = _get_month_start(month_start, 1)
+        month_range = {'month_start': month_start, 'month_end': month_end}
+        has_default_rows = session.execute(text(
+            f"SELECT EXISTS (SELECT 1 FROM {SWITCH_DATA_DEFAULT_PARTITION_NAME} "
+            "WHERE log_cre_date >= :month_start AND log_cre_date < :month_end)"), month_range).scalar()
+        if has_default_rows:
+            session.execute(text(f"ALTER TABLE switch_data DETACH PARTITION {SWITCH_DATA_DEFAULT_PARTITION_NAME}"))
+        session.execute(text(
+            f"CREATE TABLE {partition_name} PARTITION OF switch_data FOR VALUES "
+            f"FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"))
+        if has_default_rows:
+            columns = ', '.join(column.name for column in self.tables['switch_data'].columns)
+            moved_count = session.execute(text(
+                f"WITH moved_rows AS (DELETE FROM {SWITCH_DATA_DEFAULT_PARTITION_NAME} "
+                "WHERE log_cre_date >= :month_start AND log_cre_date < :month_end "
+                f"RETURNING {columns}) INSERT INTO {partition_name} ({columns}) SELECT {columns} FROM moved_rows"),
+                month_range).rowcount
+            session.execute(text(
+                f"ALTER TABLE switch_data ATTACH PARTITION {SWITCH_DATA_DEFAULT_PARTITION_NAME} DEFAULT"))
+            self.logger.info(f"Moved {moved_count} switch data rows from the default partition to {partition_name}.")
+
+    def create_switch_data_partitions(self, start_date, months):
+        """
+        Creates the missing monthly partitions of the switch_data table.
+
+        Every partition is created in its own transaction, so a failing month does not roll back the partitions
+        created before it.
+
+        Args:
+            start_date (datetime): A moment in the first month to create a partition for.
+            months (int): Number of consecutive months to create partitions for.
+
+        Returns:
+            list[str]: Names of the created partitions, empty if the table is not partitioned.
+        """
+        if not self._is_switch_data_partitioned():
+            return []
+        with self.session_maker() as session:
+            existing_partitions = self._get_switch_data_partition_months(session)
+        created_partitions = []
+        for month in range(months):
+            month_start = _get_month_start(start_date, month)
+            partition_name = f'switch_data_y{month_start.year:04d}m{month_start.month:02d}'
+            if partition_name in existing_partitions:
+                continue
+            with self.session_maker() as session:
+                try:
+                    self._create_switch_data_partition(session, partition_name, month_start)
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    self.logger.error(f"Error creating switch data partition {partition_name}. Error = {e}")
+                    raise
+            created_partitions.append(partition_name)
+        return created_partitions
+
+    def drop_switch_data_partitions(self, before_date):
+        """
+        Drops the monthly partitions of the switch_data table holding only data older than a moment.
+
+        Dropping a partition removes its rows without the table and index bloat a DELETE leaves behind.
+
+        Args:
+            before_date (datetime): Partitions ending at or before this moment are dropped.
+
+        Returns:
+            list[str]: Names of the dropped partitions, empty if the table is not partitioned.
+        """
+        if not self._is_switch_data_partitioned():
+            return []
+        with self.session_maker() as session:
+            try:
+                partition_months = self._get_switch_data_partition_months(session)
+                dropped_partitions = sorted(partition_name for partition_name, month_start in partition_months.items()
+                                            if _get_month_start(month_start, 1) <= before_date)
+                for partition_name in dropped_partitions:
+                    session.execute(text(f"DROP TABLE {partition_name}"))
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error dropping switch data partitions. Error = {e}")
+                raise
+        return dropped_partitions
+
+    def get_first_switch_data_date(self):
+        """
+        Retrieves the time of the oldest stored switch data.
+
+        Returns:
+            datetime: The oldest log_cre_date, None if no switch data is stored.
+        """
+        with self.session_maker() as session:
+            return session.execute(select(func.min(self.tables['switch_data'].c.log_cre_date))).scalar()
+
+    def get_switch_data_between(self, start_date, end_date, switch_ids=None):
+        """
+        Retrieves the switch data of all switches in a time window.
+
+        Args:
+            start_date (datetime): The inclusive start of the window.
+            end_date (datetime): The exclusive end of the window.
+            switch_ids (list[int]): The ids of the switches, None for all switches.
+
+        Returns:
+            list[Row]: Rows with switch_id, data_type, log_cre_date, value_text and value_number ordered by time.
+        """
+        table = self.tables['switch_data']
+        statement = select(table.c.switch_id, table.c.data_type, table.c.log_cre_date, table.c.value_text,
+                           table.c.value_number).where(table.c.log_cre_date >= start_date,
+                                                       table.c.log_cre_date < end_date)
+        if switch_ids is not None:
+            statement = statement.where(table.c.switch_id.in_(switch_ids))
+        with self.session_maker() as session:
+            return session.execute(statement.order_by(table.c.log_cre_date)).all()
+
+    def get_last_switch_statuses_before(self, moment, switch_ids=None):
+        """
+        Retrieves the last relay status of every switch stored before a moment.
+
+        Args:
+            moment (datetime): The exclusive upper bound of the log_cre_date.
+            switch_ids (list[int]): The ids of the switches, None for all switches.
+
+        Returns:
+            dict: Tuples of the last relay status and its log_cre_date by switch id.
+        """
+        table = self.tables['switch_data']
+        relay_status_filter = (table.c.data_type == SwitchDataType.RELAY_STATUS, table.c.log_cre_date < moment)
+        if switch_ids is not None:
+            relay_status_filter += (table.c.switch_id.in_(switch_ids),)
+        last_dates = (select(table.c.switch_id, func.max(table.c.log_cre_date).label('log_cre_date'))
+                      .where(*relay_status_filter).group_by(table.c.switch_id).subquery())
+        with self.session_maker() as session:
+            return {switch_id: (value_text, log_cre_date) for switch_id, value_text, log_cre_date in session.execute(
+                select(table.c.switch_id, table.c.value_text, table.c.log_cre_date)
+                .join(last_dates, (table.c.switch_id == last_dates.c.switch_id) &
+                      (table.c.log_cre_date == last_dates.c.log_cre_date))
+                .where(*relay_status_filter))}
+
+    def get_switch_last_seen_dates(self):
+        """
+        Retrieves the time every switch with a heartbeat was last seen.
+
+        Returns:
+            dict: The last seen datetime by switch id.
+        """
+        table = self.tables['switch_heartbeat']
+        with self.session_maker() as session:
+            return dict(session.execute(select(table.c.switch_id, table.c.last_seen)).all())
+
+    def get_last_switch_data_rollup_start(self, resolution):
+        """
+        Retrieves the start of the newest rollup bucket of a resolution.
+
+        Args:
+            resolution (str): The resolution of the rollups.
+
+        Returns:
+            datetime: The newest bucket start, None if no rollups of the resolution are stored.
+        """
+        table = self.tables['switch_data_rollup']
+        with self.session_maker() as session:
+            return session.execute(select(func.max(table.c.bucket_start))
+                                   .where(table.c.resolution == resolution)).scalar()
+
+    def get_switch_data_rollups(self, resolution, start_date, end_date, switch_id=None):
+        """
+        Retrieves the rollups of a resolution in a time window.
+
+        Args:
+            resolution (str): The resolution of the rollups.
+            start_date (datetime): The inclusive start of the window.
+            end_date (datetime): The exclusive end of the window.
+            switch_id (int): The id of the switch, None for the rollups of all switches.
+
+        Returns:
+            list[Row]: The rollup rows ordered by switch id and bucket start.
+        """
+        table = self.tables['switch_data_rollup']
+        statement = select(table).where(table.c.resolution == resolution, table.c.bucket_start >= start_date,
+                                        table.c.bucket_start < end_date)
+        if switch_id is not None:
+            statement = statement.where(table.c.switch_id == switch_id)
+        with self.session_maker() as session:
+            return session.execute(statement.order_by(table.c.switch_id, table.c.bucket_start)).all()
+
+    def upsert_switch_data_rollups(self, rollups, chunk_size=500):
+        """
+        Inserts new rollups and replaces the existing rollups of the same switch, resolution and bucket.
+
+        Args:
+            rollups (list[dict]): Column values of the rollups.
+            chunk_size (int): Number of rollups written per statement.
+
+        Returns:
+            UpsertResult: Number of inserted and updated rollups.
+        """
+        table = self.tables['switch_data_rollup']
+        update_columns = ['on_time_seconds', 'observed_seconds', 'switch_count', 'temperature_min',
+                          'temperature_avg', 'temperature_max', 'temperature_count']
+        inserted, updated = 0, 0
+        with self.session_maker() as session:
+            try:
+                for index in range(0, len(rollups), chunk_size):
+                    result = self._upsert_rows(session, table, rollups[index:index + chunk_size],
+                                               ['switch_id', 'resolution', 'bucket_start'], update_columns)
+                    inserted += result.inserted
+                    updated += result.updated
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error storing switch data rollups into database. Error = {e}")
+                raise
+        return UpsertResult(inserted, updated)
+
+    def mark_switch_data_rollups_dirty(self, switch_id, dirty_from):
+        """
+        Records that the rollups of a switch must be recomputed from a moment on, keeping an earlier mark.
+
+        Args:
+            switch_id (int): The id of the switch.
+            dirty_from (datetime): The earliest log_cre_date of switch data stored after it was rolled up.
+        """
+        table = self.tables['switch_data_rollup_dirty']
+        statement = self._get_dialect_insert(table).values(switch_id=switch_id, dirty_from=dirty_from)
+        statement = statement.on_conflict_do_update(index_elements=['switch_id'], set_={
+            'dirty_from': case((statement.excluded.dirty_from < table.c.dirty_from, statement.excluded.dirty_from),
+                               else_=table.c.dirty_from)})
+        with self.session_maker() as session:
+            try:
+                session.execute(statement)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error marking switch data rollups of switch {switch_id} dirty. Error = {e}")
+                raise
+
+    def get_switch_data_rollup_dirty_dates(self):
+        """
+        Retrieves the switches whose rollups must be recomputed.
+
+        Returns:
+            dict: The moment the rollups must be recomputed from by switch id.
+        """
+        table = self.tables['switch_data_rollup_dirty']
+        with self.session_maker() as session:
+            return dict(session.execute(select(table.c.switch_id, table.c.dirty_from)).all())
+
+    def clear_switch_data_rollup_dirty_dates(self, dirty_dates):
+        """
+        Removes recomputed marks, keeping marks that were moved to an earlier moment in the meantime.
+
+        Args:
+            dirty_dates (dict): The recomputed moments by switch id, as returned by
+                get_switch_data_rollup_dirty_dates.
+        """
+        table = self.tables['switch_data_rollup_dirty']
+        with self.session_maker() as session:
+            for switch_id, dirty_from in dirty_dates.items():
+                session.execute(delete(table).where(table.c.switch_id == switch_id,
+                                                    table.c.dirty_from >= dirty_from))
+            session.commit()
@@ -0,0 +1,16 @@
+from sqlalchemy import Table, Column, String, Integer, DateTime
+
+
+def create_data_version_table(metadata):
+    """
+    Create a table for the versions of data sets shared between processes
+
+    Arguments:
+        metadata: SQLAlchemy MetaData object
+    """
+    return Table(
+        'data_version', metadata,
+        Column('name', String(50), primary_key=True),
+        Column('version', Integer, nullable=False),
+        Column('changed_at', DateTime, nullable=False)
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, String, Integer, UniqueConstraint, ForeignKey
+from sqlalchemy import Table, Column, String, Integer, UniqueConstraint, ForeignKey, Index
 
 
 def create_place_table(metadata):
@@ -15,5 +15,6 @@ def create_place_table(metadata):
         Column('location_id', Integer, ForeignKey('location.id'), nullable=False),
         Column('name', String(80), nullable=False),
         Column('description', String(250), nullable=False),
-        UniqueConstraint('user_id', 'name', name='uix_user_id_name')
+        UniqueConstraint('user_id', 'name', name='uix_user_id_name'),
+        Index('ix_place_id_user_id', 'id', 'user_id')
     )
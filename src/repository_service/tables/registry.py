@@ -5,14 +5,20 @@ from src.repository_service.tables.user_table import create_user_table
 from src.repository_service.tables.place_table import create_place_table
 from src.repository_service.tables.location_table import create_location_table
 from src.repository_service.tables.switch_data_table import create_switch_data_table
+from src.repository_service.tables.data_version_table import create_data_version_table
+from src.repository_service.tables.switch_schedule_table import create_switch_schedule_table
+from src.repository_service.tables.switch_heartbeat_table import create_switch_heartbeat_table
+from src.repository_service.tables.switch_data_rollup_table import create_switch_data_rollup_table
+from src.repository_service.tables.switch_data_rollup_dirty_table import create_switch_data_rollup_dirty_table
 
 
-def initialize_tables(metadata):
+def initialize_tables(metadata, partitioned=False):
     """
     Initialize all tables
 
     Arguments:
         metadata: SQLAlchemy MetaData object
+        partitioned: Create the time series tables supporting it as partitioned tables
 
     Returns:
         tables: dict of tables
@@ -21,9 +27,14 @@ def initialize_tables(metadata):
         'weather': create_weather_table(metadata),
         'electricity_price': create_electricity_price_table(metadata),
         'switch': create_switch_table(metadata),
-        'switch_data': create_switch_data_table(metadata),
+        'switch_data': create_switch_data_table(metadata, partitioned),
         'user': create_user_table(metadata),
         'place': create_place_table(metadata),
-        'location': create_location_table(metadata)
+        'location': create_location_table(metadata),
+        'data_version': create_data_version_table(metadata),
+        'switch_schedule': create_switch_schedule_table(metadata),
+        'switch_heartbeat': create_switch_heartbeat_table(metadata),
+        'switch_data_rollup': create_switch_data_rollup_table(metadata),
+        'switch_data_rollup_dirty': create_switch_data_rollup_dirty_table(metadata)
     }
     return tables
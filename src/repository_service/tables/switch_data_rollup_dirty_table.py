@@ -0,0 +1,15 @@
+from sqlalchemy import Table, Column, DateTime, Integer, ForeignKey
+
+
+def create_switch_data_rollup_dirty_table(metadata):
+    """
+    Create a table for the earliest switch data time of every switch whose rollups must be recomputed
+
+    Arguments:
+        metadata: SQLAlchemy MetaData object
+    """
+    return Table(
+        'switch_data_rollup_dirty', metadata,
+        Column('switch_id', Integer, ForeignKey('switch.id'), primary_key=True),
+        Column('dirty_from', DateTime, nullable=False)
+    )
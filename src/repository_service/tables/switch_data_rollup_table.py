@@ -0,0 +1,25 @@
+from sqlalchemy import Table, Column, String, DateTime, Integer, Float, UniqueConstraint, ForeignKey
+
+
+def create_switch_data_rollup_table(metadata):
+    """
+    Create a table for the hourly and daily aggregates of the switch data
+
+    Arguments:
+        metadata: SQLAlchemy MetaData object
+    """
+    return Table(
+        'switch_data_rollup', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('switch_id', Integer, ForeignKey('switch.id'), nullable=False),
+        Column('resolution', String(10), nullable=False),
+        Column('bucket_start', DateTime, nullable=False),
+        Column('on_time_seconds', Float, nullable=False),
+        Column('observed_seconds', Float, nullable=False),
+        Column('switch_count', Integer, nullable=False),
+        Column('temperature_min', Float),
+        Column('temperature_avg', Float),
+        Column('temperature_max', Float),
+        Column('temperature_count', Integer, nullable=False),
+        UniqueConstraint('switch_id', 'resolution', 'bucket_start', name='switch_data_rollup_unique_constraint')
+    )
@@ -1,20 +1,45 @@
-from sqlalchemy import Table, Column, String, DateTime, Integer, Float, UniqueConstraint, ForeignKey, Enum
+from sqlalchemy import Table, Column, String, DateTime, Integer, Float, UniqueConstraint, ForeignKey, Enum, Identity, \
+    DDL, event
 from src.switch_service.models.switch_data_model import SwitchDataType
 
-def create_switch_data_table(metadata):
+SWITCH_DATA_DEFAULT_PARTITION_NAME = 'switch_data_default'
+
+
+def create_switch_data_table(metadata, partitioned=False):
     """
     Create a table for switch data
 
+    The partitioned table is range partitioned by log_cre_date on PostgreSQL. Its primary key includes the partition
+    key, as PostgreSQL requires for unique constraints of partitioned tables, and a default partition is created with
+    the table, so rows outside the created monthly partitions are never rejected.
+
     Arguments:
         metadata: SQLAlchemy MetaData object
+        partitioned: Create the table partitioned by log_cre_date
     """
-    return Table(
+    if not partitioned:
+        return Table(
+            'switch_data', metadata,
+            Column('id', Integer, primary_key=True),
+            Column('switch_id', Integer, ForeignKey('switch.id'), nullable=False),
+            Column('data_type', Enum(SwitchDataType), nullable=False),
+            Column('log_cre_date', DateTime, nullable=False),
+            Column('value_text', String(50)),
+            Column('value_number', Float),
+            UniqueConstraint('switch_id', 'data_type', 'log_cre_date', name='switch_data_unique_constraint')
+        )
+    table = Table(
         'switch_data', metadata,
-        Column('id', Integer, primary_key=True),
+        Column('id', Integer, Identity(), primary_key=True),
         Column('switch_id', Integer, ForeignKey('switch.id'), nullable=False),
         Column('data_type', Enum(SwitchDataType), nullable=False),
-        Column('log_cre_date', DateTime, nullable=False),
+        Column('log_cre_date', DateTime, primary_key=True),
         Column('value_text', String(50)),
         Column('value_number', Float),
-        UniqueConstraint('switch_id', 'data_type', 'log_cre_date', name='switch_data_unique_constraint')
+        UniqueConstraint('switch_id', 'data_type', 'log_cre_date', name='switch_data_unique_constraint'),
+        postgresql_partition_by='RANGE (log_cre_date)'
     )
+    event.listen(table, 'after_create', DDL(
+        f'CREATE TABLE IF NOT EXISTS {SWITCH_DATA_DEFAULT_PARTITION_NAME} PARTITION OF switch_data DEFAULT'
+    ).execute_if(dialect='postgresql'))
+    return table
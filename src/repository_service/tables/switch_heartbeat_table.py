@@ -0,0 +1,16 @@
+from sqlalchemy import Table, Column, String, DateTime, Integer, ForeignKey
+
+
+def create_switch_heartbeat_table(metadata):
+    """
+    Create a table for the last seen relay status of every switch
+
+    Arguments:
+        metadata: SQLAlchemy MetaData object
+    """
+    return Table(
+        'switch_heartbeat', metadata,
+        Column('switch_id', Integer, ForeignKey('switch.id'), primary_key=True),
+        Column('last_seen', DateTime, nullable=False),
+        Column('last_status', String(50))
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import Table, Column, String, DateTime, Integer, UniqueConstraint, ForeignKey
+
+
+def create_switch_schedule_table(metadata):
+    """
+    Create a table for the precomputed switch statuses of future hours
+
+    Arguments:
+        metadata: SQLAlchemy MetaData object
+    """
+    return Table(
+        'switch_schedule', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('switch_id', Integer, ForeignKey('switch.id'), nullable=False),
+        Column('slot_start', DateTime, nullable=False),
+        Column('value_text', String(50), nullable=False),
+        UniqueConstraint('switch_id', 'slot_start', name='switch_schedule_unique_constraint')
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, String, Integer, UniqueConstraint, ForeignKey
+from sqlalchemy import Table, Column, String, Integer, UniqueConstraint, ForeignKey, JSON
 
 
 def create_switch_table(metadata):
@@ -16,5 +16,6 @@ def create_switch_table(metadata):
         Column('name', String(80), nullable=False),
         Column('status', String(80)),
         Column('status_calculation_logic', String(2000)),
+        Column('status_calculation_rule', JSON(none_as_null=True)),
         UniqueConstraint('place_id', 'uuid', name='uix_place_id_uuid')
     )
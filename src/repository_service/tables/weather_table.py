@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, Float, DateTime, UniqueConstraint, ForeignKey
+from sqlalchemy import Table, Column, Integer, Float, DateTime, UniqueConstraint, ForeignKey, Index
 
 
 def create_weather_table(metadata):
@@ -19,5 +19,6 @@ def create_weather_table(metadata):
         Column('location_id', Integer, ForeignKey('location.id'), nullable=True),
         Column('sunshine_duration', Float),
         UniqueConstraint('datetime', 'latitude', 'longitude', name='uix_datetime_lat_long'),
-        UniqueConstraint('datetime', 'location_id', name='uix_datetime_location_id')
+        UniqueConstraint('datetime', 'location_id', name='uix_datetime_location_id'),
+        Index('ix_weather_location_id_datetime', 'location_id', 'datetime')
     )
@@ -1,6 +1,6 @@
-from src.repository_service.base_repository_service import BaseRepositoryService
-from src.weather_service.models.weather_model import WeatherModel
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, tuple_
+from src.repository_service.base_repository_service import BaseRepositoryService, UpsertResult
+from src.weather_service.models.weather_model import WeatherRecord
 
 
 class WeatherRepositoryService(BaseRepositoryService):
@@ -10,42 +10,54 @@ class WeatherRepositoryService(BaseRepositoryService):
 
     def store_weather_data(self, weather_data):
         """
-        Stores a list of weather data records into the database.
-        Handles integrity errors by updating existing records.
+        Stores a list of weather data records into the database with upsert statements.
+
+        Existing records of the same location and datetime are updated. Records are also unique per coordinates and
+        datetime, so a record whose coordinates and datetime are already stored, such as a legacy record without a
+        location, updates that record and assigns it to the location instead.
 
         Args:
             weather_data (list): List of WeatherModel objects to be stored in the database.
-        """
-        with (self.session_maker() as session):
-            for weather in weather_data:
-                try:
-                    session.add(weather)
-                    session.commit()
-                except IntegrityError:
-                    session.rollback()
-                    self._update_weather_data(session, weather)
-                except Exception as e:
-                    session.rollback()
-                    self.logger.error(f"Error storing weather data into database. Error - {e}")
-
-    def _update_weather_data(self, session, weather):
-        """
-        Updates existing weather data in the database.
 
-        Args:
-            session (sqlalchemy.orm.session.Session): SQLAlchemy session for database operations.
-            weather (WeatherModel): WeatherModel object containing updated weather data.
+        Returns:
+            UpsertResult: Number of inserted records and number of existing records that were changed.
         """
-        existing_weather = session.query(WeatherModel).filter(
-            WeatherModel.datetime == weather.datetime,
-            WeatherModel.latitude == weather.latitude,
-            WeatherModel.longitude == weather.longitude
-        ).first()
-        if existing_weather:
-            existing_weather.temperature = weather.temperature
-            existing_weather.cloud_cover = weather.cloud_cover
-            existing_weather.sunshine_duration = weather.sunshine_duration
-            session.commit()
+        rows = [{'datetime': weather.datetime,
+                 'cloud_cover': weather.cloud_cover,
+                 'temperature': weather.temperature,
+                 'latitude': weather.latitude,
+                 'longitude': weather.longitude,
+                 'location_id': weather.location_id,
+                 'sunshine_duration': weather.sunshine_duration} for weather in weather_data]
+        table = self.tables['weather']
+        with self.session_maker() as session:
+            try:
+                stored_coordinates = set(session.execute(
+                    select(table.c.datetime, table.c.latitude, table.c.longitude).where(
+                        tuple_(table.c.datetime, table.c.latitude, table.c.longitude).in_(
+                            [(row['datetime'], row['latitude'], row['longitude']) for row in rows]))).all()) \
+                    if rows else set()
+                coordinate_rows = [row for row in rows
+                                   if (row['datetime'], row['latitude'], row['longitude']) in stored_coordinates]
+                location_rows = [row for row in rows
+                                 if (row['datetime'], row['latitude'], row['longitude']) not in stored_coordinates]
+                coordinate_result = self._upsert_rows(session, table, coordinate_rows,
+                                                      index_elements=['datetime', 'latitude', 'longitude'],
+                                                      update_columns=['cloud_cover', 'temperature', 'location_id',
+                                                                      'sunshine_duration'])
+                location_result = self._upsert_rows(session, table, location_rows,
+                                                    index_elements=['datetime', 'location_id'],
+                                                    update_columns=['cloud_cover', 'temperature', 'latitude',
+                                                                    'longitude', 'sunshine_duration'])
+                result = UpsertResult(coordinate_result.inserted + location_result.inserted,
+                                      coordinate_result.updated + location_result.updated)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                self.logger.error(f"Error storing weather data into database. Error - {e}")
+                raise
+        self.logger.debug(f"Stored weather data: {result.inserted} inserted, {result.updated} updated.")
+        return result
 
     def get_weather_data_after_date(self, date):
         """
@@ -55,7 +67,27 @@ class WeatherRepositoryService(BaseRepositoryService):
             date (datetime): The date after which the weather data records are to be retrieved.
 
         Returns:
-            list: List of WeatherModel objects retrieved from the database.
+            list[WeatherRecord]: The read-only weather records ordered by datetime.
+        """
+        table = self.tables['weather']
+        with self.session_maker() as session:
+            return self._select_records(session, WeatherRecord, table, table.c.datetime > date,
+                                        order_by=(table.c.datetime,))
+
+    def get_weather_data_for_location(self, location_id, start_date, end_date):
+        """
+        Retrieves weather data records of a single location within the specified time window.
+
+        Args:
+            location_id (int): The id of the location for which the weather data records are to be retrieved.
+            start_date (datetime): The date after which the weather data records are to be retrieved.
+            end_date (datetime): The date until which (inclusive) the weather data records are to be retrieved.
+
+        Returns:
+            list[WeatherRecord]: The read-only weather records ordered by datetime.
         """
+        table = self.tables['weather']
         with self.session_maker() as session:
-            return session.query(WeatherModel).filter(WeatherModel.datetime > date).all()
+            return self._select_records(session, WeatherRecord, table, table.c.location_id == location_id,
+                                        table.c.datetime > start_date, table.c.datetime <= end_date,
+                                        order_by=(table.c.datetime,))
@@ -3,6 +3,7 @@ import logging
 from flask.views import MethodView
 from flask_smorest import Blueprint, abort
 from ..schemas import SwitchSchema
+from ..schemas import SwitchDataBatchSchema
 from src.switch_service.switch_service import SwitchService
 from src.switch_service.models.switch_model import SwitchModel
 from sqlalchemy.exc import IntegrityError
@@ -106,6 +107,54 @@ class SwitchItem(MethodView):
             abort(500, message="An error occurred while deleting switch data.")
         return {"message": "Switch deleted"}, 200
 
+
+@blp.route("/switch/<string:uuid>/data")
+class SwitchDataBatch(MethodView):
+    """
+    Class to handle readings uploaded by a switch
+    """
+
+    @inject.autoparams()
+    def __init__(self, switch_service: SwitchService):
+        """
+        Initializes the SwitchDataBatch class with the provided SwitchService.
+
+        Arguments:
+            switch_service (SwitchService): Service class to interact
+        """
+        self.switch_service = switch_service
+        self.logger = logging.getLogger(__name__)
+
+    @blp.arguments(SwitchDataBatchSchema)
+    @blp.response(201, SwitchDataBatchSchema)
+    @jwt_required()
+    def post(self, switch_data_batch, uuid):
+        """
+        Stores a batch of timestamped readings of the switch.
+
+        Readings already stored for the same time and type are skipped, so devices may upload their buffered
+        readings again after an interrupted upload.
+
+        Arguments:
+            switch_data_batch (dict): Dictionary containing the readings.
+            uuid (str): The uuid of the switch.
+
+        Returns:
+            dict: Number of received, stored and duplicate readings.
+            Error 404: If the switch does not exist.
+            Error 500: If an error occurred while storing the readings.
+        """
+        user_id = get_jwt_identity()
+        try:
+            return self.switch_service.store_switch_readings(uuid, user_id, switch_data_batch["readings"])
+        except ValueError as e:
+            self.logger.error(f"Error storing readings for the switch uuid {uuid}. Error = {e}")
+            abort(404, message=f"Switch with the uuid {uuid} not found.")
+        except Exception as e:
+            self.logger.error(f"Error storing readings for the switch uuid {uuid}. Error = {e}")
+            abort(500, message="An error occurred while storing switch readings.")
+
+
 @blp.route("/switch")
 class SwitchList(MethodView):
     """
@@ -6,6 +6,8 @@ from src.switch_service.switch_service import SwitchService
 from flask_smorest import Blueprint, abort
 from ..schemas import SwitchStatusRetrivalSchema
 from ..schemas import SwitchStatusCalculationTestSchema
+from ..schemas import SwitchStatusBatchRequestSchema
+from ..schemas import SwitchStatusBatchSchema
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from src.switch_service.models.switch_model import SwitchModel
 
@@ -58,6 +60,44 @@ class SwitchStatus(MethodView):
         self.logger.info(f'Returned response: {response}')
         return response
 
+@blp.route("/switch/status/batch")
+class SwitchStatusBatch(MethodView):
+    """
+    SwitchStatusBatch class for handling status retrieval requests of several switches at once.
+    """
+
+    @inject.autoparams()
+    def __init__(self, switch_service: SwitchService):
+        """
+        Initializes the SwitchStatusBatch with the provided SwitchService.
+        """
+        self.switch_service = switch_service
+        self.logger = logging.getLogger(__name__)
+
+    @jwt_required()
+    @blp.arguments(SwitchStatusBatchRequestSchema)
+    @blp.response(200, SwitchStatusBatchSchema)
+    def post(self, switch_selection):
+        """
+        Retrieves the statuses of the listed switches or of all switches of a place.
+
+        Statuses of switches that could not be calculated are returned in the list instead of failing the request.
+
+        Args:
+            switch_selection (dict): Dictionary containing either switch_uuids or place_id.
+
+        Returns:
+            dict: Dictionary containing the uuid and status of every switch.
+        """
+        user_id = get_jwt_identity()
+        self.logger.info(f"Received batch switch status request: {switch_selection}")
+        statuses = self.switch_service.get_switch_statuses(user_id, switch_selection.get("switch_uuids"),
+                                                           switch_selection.get("place_id"))
+        response = {"statuses": statuses}
+        self.logger.info(f'Returned response: {response}')
+        return response
+
+
 @blp.route("/switch/status/test_logic")
 class SwitchStatusCalculationTest(MethodView):
     """
@@ -1,4 +1,13 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+from src.switch_service.models.switch_data_model import SwitchDataType
+from src.switch_service.switch_rule_engine import SwitchRuleEngine, SwitchRuleError
+
+
+def validate_switch_rule(rule):
+    try:
+        SwitchRuleEngine.validate_rule(rule)
+    except SwitchRuleError as e:
+        raise ValidationError(str(e))
 
 
 class SwitchStatusRetrivalSchema(Schema):
@@ -6,6 +15,22 @@ class SwitchStatusRetrivalSchema(Schema):
     status = fields.Str(dump_only=True)
 
 
+class SwitchStatusBatchRequestSchema(Schema):
+    MAX_SWITCH_UUIDS = 100
+
+    switch_uuids = fields.List(fields.Str(), validate=validate.Length(min=1, max=MAX_SWITCH_UUIDS))
+    place_id = fields.Int()
+
+    @validates_schema
+    def validate_selection(self, data, **kwargs):
+        if ('switch_uuids' in data) == ('place_id' in data):
+            raise ValidationError('Either switch_uuids or place_id must be given.')
+
+
+class SwitchStatusBatchSchema(Schema):
+    statuses = fields.List(fields.Nested(SwitchStatusRetrivalSchema()), dump_only=True)
+
+
 class SwitchStatusCalculationTestSchema(Schema):
     switch_calculation_logic = fields.Str(required=True)
     switch_status = fields.Str(dump_only=True)
@@ -18,7 +43,37 @@ class SwitchSchema(Schema):
     uuid = fields.Str(required=True)
     place_id = fields.Int(required=True)
     status = fields.Str(dump_only=True)
-    status_calculation_logic = fields.Str(required=True)
+    status_calculation_logic = fields.Str(allow_none=True)
+    status_calculation_rule = fields.Dict(allow_none=True, validate=validate_switch_rule)
+
+    @validates_schema
+    def validate_status_calculation(self, data, **kwargs):
+        if data.get('status_calculation_logic') is None and data.get('status_calculation_rule') is None:
+            raise ValidationError('Either status_calculation_logic or status_calculation_rule must be given.')
+
+
+class SwitchDataReadingSchema(Schema):
+    data_type = fields.Enum(SwitchDataType, required=True)
+    log_cre_date = fields.DateTime(required=True)
+    value_text = fields.Str(validate=validate.Length(max=50))
+    value_number = fields.Float()
+
+    @validates_schema
+    def validate_value(self, data, **kwargs):
+        if data['data_type'] == SwitchDataType.RELAY_STATUS and data.get('value_text') is None:
+            raise ValidationError('Relay status readings require value_text.')
+        if data['data_type'] == SwitchDataType.TEMPERATURE and data.get('value_number') is None:
+            raise ValidationError('Temperature readings require value_number.')
+
+
+class SwitchDataBatchSchema(Schema):
+    MAX_READINGS = 10000
+
+    readings = fields.List(fields.Nested(SwitchDataReadingSchema()), required=True, load_only=True,
+                           validate=validate.Length(min=1, max=MAX_READINGS))
+    received = fields.Int(dump_only=True)
+    stored = fields.Int(dump_only=True)
+    duplicates = fields.Int(dump_only=True)
 
 
 class UserSchema(Schema):
@@ -1,3 +1,8 @@
+from collections import namedtuple
+
+SwitchRecord = namedtuple('SwitchRecord', ['id', 'name', 'uuid', 'place_id', 'status_calculation_logic', 'status',
+                                           'status_calculation_rule'])
+
 
 class SwitchModel:
     """
@@ -12,11 +17,14 @@ class SwitchModel:
     place_id: int
     status: str
     status_calculation_logic: str
+    status_calculation_rule: dict
 
-    def __init__(self, name, uuid, place_id, status_calculation_logic, status=None, id=None):
+    def __init__(self, name, uuid, place_id, status_calculation_logic=None, status=None, id=None,
+                 status_calculation_rule=None):
         self.id = id
         self.name = name
         self.uuid = uuid
         self.place_id = place_id
         self.status_calculation_logic = status_calculation_logic
         self.status = status
+        self.status_calculation_rule = status_calculation_rule
@@ -0,0 +1,295 @@
+import logging
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import inject
+
+from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.switch_repository_service import SwitchRepositoryService
+from src.switch_service.models.switch_data_model import SwitchDataType
+
+SwitchDataHistoryBucket = namedtuple('SwitchDataHistoryBucket', [
+    'bucket_start', 'on_time_fraction', 'switch_count', 'temperature_min', 'temperature_avg', 'temperature_max'])
+
+
+class SwitchDataRollupService:
+    """
+    Maintains hourly and daily aggregates of the switch data and answers history queries from them.
+
+    The hourly rollups hold the time a switch was ON, the time its status was known, the number of status changes
+    and the minimum, average and maximum temperature of every hour. The relay status of a switch is assumed to hold
+    until its next stored status, so transition only and fully sampled switch data give the same rollups. The status
+    after the last stored one holds until the switch was last seen. Without a heartbeat at or after the last reading
+    of the switch, it holds for at most the configured maximum hold after that reading, so a switch that stopped
+    reporting does not keep its status forever. Daily rollups are aggregated from the hourly ones.
+
+    Rollups are maintained incrementally: every run recomputes from the newest hourly bucket on, which completes the
+    bucket that was partial during the previous run. Switch data stored for older buckets after they were rolled up,
+    such as uploaded offline readings, marks the rollups of its switch dirty from its earliest reading, and the next
+    run recomputes the hourly and daily rollups of that switch from there.
+
+    Attributes:
+        HOURLY (str): Resolution of the hourly rollups.
+        DAILY (str): Resolution of the daily rollups.
+        RESOLUTIONS (dict): Bucket length by resolution, from the finest to the coarsest.
+        SWITCH_DATA_HISTORY_MAX_BUCKETS_CONFIG_NAME (str): Configuration key of the default number of buckets a
+            history query returns at most.
+        SWITCH_STATUS_MAX_HOLD_IN_MINUTES_CONFIG_NAME (str): Configuration key of the number of minutes the last
+            status of a switch without a newer heartbeat holds after its last reading.
+    """
+    HOURLY = 'HOUR'
+    DAILY = 'DAY'
+    RESOLUTIONS = {HOURLY: timedelta(hours=1), DAILY: timedelta(days=1)}
+    ON_STATUS = 'ON'
+    ROLLUP_WINDOW = timedelta(days=1)
+    SWITCH_DATA_HISTORY_MAX_BUCKETS_CONFIG_NAME = 'switch_data_history_max_buckets'
+    DEFAULT_SWITCH_DATA_HISTORY_MAX_BUCKETS = 500
+    SWITCH_STATUS_MAX_HOLD_IN_MINUTES_CONFIG_NAME = 'switch_status_max_hold_in_minutes'
+    DEFAULT_SWITCH_STATUS_MAX_HOLD_IN_MINUTES = 60
+
+    @inject.autoparams()
+    def __init__(self, configuration: BaseConfiguration, repository_service: SwitchRepositoryService):
+        """
+        Initializes the SwitchDataRollupService.
+
+        Args:
+            configuration (BaseConfiguration): Configuration holding the history query and status hold settings.
+            repository_service (SwitchRepositoryService): Repository holding the switch data and its rollups.
+        """
+        self.configuration = configuration
+        self.repository_service = repository_service
+        self.max_status_hold = timedelta(minutes=float(configuration.get(
+            self.SWITCH_STATUS_MAX_HOLD_IN_MINUTES_CONFIG_NAME, self.DEFAULT_SWITCH_STATUS_MAX_HOLD_IN_MINUTES)))
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _get_bucket_start(moment, resolution):
+        """
+        Returns the start of the bucket of a resolution containing a moment.
+
+        Args:
+            moment (datetime): The moment.
+            resolution (str): The resolution of the bucket.
+
+        Returns:
+            datetime: The start of the bucket.
+        """
+        if resolution == SwitchDataRollupService.DAILY:
+            return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        return moment.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def _get_bucket(buckets, switch_id, bucket_start):
+        """
+        Returns the aggregate of a switch and bucket, creating an empty one on first use.
+
+        Args:
+            buckets (dict): The aggregates by switch id and bucket start.
+            switch_id (int): The id of the switch.
+            bucket_start (datetime): The start of the bucket.
+
+        Returns:
+            dict: The aggregate of the bucket.
+        """
+        key = (switch_id, bucket_start)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = {'on_time_seconds': 0.0, 'observed_seconds': 0.0, 'switch_count': 0, 'temperature_min': None,
+                      'temperature_max': None, 'temperature_sum': 0.0, 'temperature_count': 0}
+            buckets[key] = bucket
+        return bucket
+
+    def _add_status_duration(self, buckets, switch_id, status, start_date, end_date):
+        """
+        Adds the time a switch held a status to the hourly aggregates the time span overlaps.
+
+        Args:
+            buckets (dict): The hourly aggregates by switch id and bucket start.
+            switch_id (int): The id of the switch.
+            status (str): The relay status held.
+            start_date (datetime): The start of the time span.
+            end_date (datetime): The end of the time span.
+        """
+        while start_date < end_date:
+            bucket_start = self._get_bucket_start(start_date, self.HOURLY)
+            span_end = min(bucket_start + self.RESOLUTIONS[self.HOURLY], end_date)
+            bucket = self._get_bucket(buckets, switch_id, bucket_start)
+            seconds = (span_end - start_date).total_seconds()
+            bucket['observed_seconds'] += seconds
+            if status == self.ON_STATUS:
+                bucket['on_time_seconds'] += seconds
+            start_date = span_end
+
+    @staticmethod
+    def _add_temperature(bucket, temperature):
+        """
+        Adds a temperature measurement to an aggregate.
+
+        Args:
+            bucket (dict): The aggregate.
+            temperature (float): The measured temperature.
+        """
+        bucket['temperature_min'] = temperature if bucket['temperature_min'] is None \
+            else min(bucket['temperature_min'], temperature)
+        bucket['temperature_max'] = temperature if bucket['temperature_max'] is None \
+            else max(bucket['temperature_max'], temperature)
+        bucket['temperature_sum'] += temperature
+        bucket['temperature_count'] += 1
+
+    def _get_rollup_rows(self, buckets, resolution):
+        """
+        Converts aggregates into rollup rows.
+
+        Args:
+            buckets (dict): The aggregates by switch id and bucket start.
+            resolution (str): The resolution of the aggregates.
+
+        Returns:
+            list[dict]: Column values of the rollups.
+        """
+        return [{'switch_id': switch_id, 'resolution': resolution, 'bucket_start': bucket_start,
+                 'on_time_seconds': bucket['on_time_seconds'], 'observed_seconds': bucket['observed_seconds'],
+                 'switch_count': bucket['switch_count'], 'temperature_min': bucket['temperature_min'],
+                 'temperature_avg': bucket['temperature_sum'] / bucket['temperature_count']
+                 if bucket['temperature_count'] else None,
+                 'temperature_max': bucket['temperature_max'], 'temperature_count': bucket['temperature_count']}
+                for (switch_id, bucket_start), bucket in buckets.items()]
+
+    def _get_status_end_date(self, last_reading_date, last_seen_date):
+        """
+        Returns until when the last relay status of a switch holds.
+
+        Args:
+            last_reading_date (datetime): The log_cre_date of the last relay status reading of the switch.
+            last_seen_date (datetime): The last time the switch was seen according to its heartbeat, None if the
+                switch has no heartbeat.
+
+        Returns:
+            datetime: The heartbeat if it is not older than the last reading, otherwise the end of the maximum hold
+                after the last reading.
+        """
+        if last_seen_date is not None and last_seen_date >= last_reading_date:
+            return last_seen_date
+        return last_reading_date + self.max_status_hold
+
+    def _regenerate_hourly_rollups(self, start_date, end_date, switch_ids=None):
+        """
+        Recomputes the hourly rollups from the switch data, one rollup window at a time.
+
+        Args:
+            start_date (datetime): The start of the first recomputed hour.
+            end_date (datetime): The time up to which the switch data is rolled up.
+            switch_ids (list[int]): The ids of the recomputed switches, None for all switches.
+        """
+        last_statuses = self.repository_service.get_last_switch_statuses_before(start_date, switch_ids)
+        statuses = {switch_id: status for switch_id, (status, _) in last_statuses.items()}
+        status_start_dates = {switch_id: start_date for switch_id in statuses}
+        last_reading_dates = {switch_id: log_cre_date for switch_id, (_, log_cre_date) in last_statuses.items()}
+        last_seen_dates = self.repository_service.get_switch_last_seen_dates()
+        window_start = start_date
+        while window_start < end_date:
+            window_end = min(window_start + self.ROLLUP_WINDOW, end_date)
+            buckets = {}
+            for row in self.repository_service.get_switch_data_between(window_start, window_end, switch_ids):
+                if row.data_type == SwitchDataType.RELAY_STATUS:
+                    previous_status = statuses.get(row.switch_id)
+                    if previous_status is not None:
+                        self._add_status_duration(buckets, row.switch_id, previous_status,
+                                                  status_start_dates[row.switch_id], row.log_cre_date)
+                        if previous_status != row.value_text:
+                            bucket_start = self._get_bucket_start(row.log_cre_date, self.HOURLY)
+                            self._get_bucket(buckets, row.switch_id, bucket_start)['switch_count'] += 1
+                    statuses[row.switch_id] = row.value_text
+                    status_start_dates[row.switch_id] = row.log_cre_date
+                    last_reading_dates[row.switch_id] = row.log_cre_date
+                elif row.data_type == SwitchDataType.TEMPERATURE and row.value_number is not None:
+                    bucket_start = self._get_bucket_start(row.log_cre_date, self.HOURLY)
+                    self._add_temperature(self._get_bucket(buckets, row.switch_id, bucket_start), row.value_number)
+            for switch_id, status in statuses.items():
+                status_end_date = min(window_end, self._get_status_end_date(
+                    last_reading_dates[switch_id], last_seen_dates.get(switch_id)))
+                self._add_status_duration(buckets, switch_id, status, status_start_dates[switch_id], status_end_date)
+                status_start_dates[switch_id] = window_end
+            self.repository_service.upsert_switch_data_rollups(self._get_rollup_rows(buckets, self.HOURLY))
+            window_start = window_end
+
+    def _regenerate_daily_rollups(self, start_date, end_date, switch_id=None):
+        """
+        Recomputes the daily rollups from the hourly rollups.
+
+        Args:
+            start_date (datetime): The start of the first recomputed day.
+            end_date (datetime): The time up to which the hourly rollups are aggregated.
+            switch_id (int): The id of the recomputed switch, None for all switches.
+        """
+        buckets = {}
+        for rollup in self.repository_service.get_switch_data_rollups(self.HOURLY, start_date, end_date, switch_id):
+            bucket = self._get_bucket(buckets, rollup.switch_id, self._get_bucket_start(rollup.bucket_start,
+                                                                                        self.DAILY))
+            bucket['on_time_seconds'] += rollup.on_time_seconds
+            bucket['observed_seconds'] += rollup.observed_seconds
+            bucket['switch_count'] += rollup.switch_count
+            if rollup.temperature_count:
+                bucket['temperature_min'] = rollup.temperature_min if bucket['temperature_min'] is None \
+                    else min(bucket['temperature_min'], rollup.temperature_min)
+                bucket['temperature_max'] = rollup.temperature_max if bucket['temperature_max'] is None \
+                    else max(bucket['temperature_max'], rollup.temperature_max)
+                bucket['temperature_sum'] += rollup.temperature_avg * rollup.temperature_count
+                bucket['temperature_count'] += rollup.temperature_count
+        self.repository_service.upsert_switch_data_rollups(self._get_rollup_rows(buckets, self.DAILY))
+
+    def regenerate_switch_data_rollups(self):
+        """
+        Brings the hourly and daily rollups up to date with the stored switch data.
+        """
+        now = datetime.now()
+        try:
+            dirty_dates = self.repository_service.get_switch_data_rollup_dirty_dates()
+            start_date = self.repository_service.get_last_switch_data_rollup_start(self.HOURLY)
+            if start_date is None:
+                first_date = self.repository_service.get_first_switch_data_date()
+                if first_date is None:
+                    return
+                start_date = self._get_bucket_start(first_date, self.HOURLY)
+            self._regenerate_hourly_rollups(start_date, now)
+            self._regenerate_daily_rollups(self._get_bucket_start(start_date, self.DAILY), now)
+            for switch_id, dirty_from in dirty_dates.items():
+                dirty_start_date = self._get_bucket_start(dirty_from, self.HOURLY)
+                if dirty_start_date < start_date:
+                    self._regenerate_hourly_rollups(dirty_start_date, start_date, [switch_id])
+                    self._regenerate_daily_rollups(self._get_bucket_start(dirty_start_date, self.DAILY), now,
+                                                   switch_id)
+            self.repository_service.clear_switch_data_rollup_dirty_dates(dirty_dates)
+            self.logger.info("Completed the regeneration of switch data rollups.")
+        except Exception as e:
+            self.logger.error(f"Error regenerating switch data rollups. The exception: {e}")
+
+    def get_switch_data_history(self, switch_id, start_date, end_date, max_buckets=None):
+        """
+        Returns the aggregated switch data of a time range at the finest resolution fitting into max_buckets.
+
+        The query reads one rollup per bucket, so its cost grows with the number of buckets and not with the number
+        of stored samples. Ranges too long for max_buckets daily buckets are still answered with daily rollups.
+
+        Args:
+            switch_id (int): The id of the switch.
+            start_date (datetime): The start of the range, rounded down to the start of its bucket.
+            end_date (datetime): The exclusive end of the range.
+            max_buckets (int): The number of buckets the range should be covered with at most, defaults to the
+                configured value.
+
+        Returns:
+            tuple: The chosen resolution and the list of SwitchDataHistoryBucket ordered by bucket start.
+        """
+        if max_buckets is None:
+            max_buckets = int(self.configuration.get(self.SWITCH_DATA_HISTORY_MAX_BUCKETS_CONFIG_NAME,
+                                                     self.DEFAULT_SWITCH_DATA_HISTORY_MAX_BUCKETS))
+        resolution = next((resolution for resolution, bucket_length in self.RESOLUTIONS.items()
+                           if (end_date - start_date) / bucket_length <= max_buckets), self.DAILY)
+        rollups = self.repository_service.get_switch_data_rollups(
+            resolution, self._get_bucket_start(start_date, resolution), end_date, switch_id)
+        return resolution, [SwitchDataHistoryBucket(
+            rollup.bucket_start,
+            rollup.on_time_seconds / rollup.observed_seconds if rollup.observed_seconds else None,
+            rollup.switch_count, rollup.temperature_min, rollup.temperature_avg, rollup.temperature_max)
+            for rollup in rollups]
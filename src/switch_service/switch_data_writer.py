@@ -0,0 +1,205 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+import inject
+
+from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.switch_repository_service import SwitchRepositoryService
+
+
+class SwitchDataWriter:
+    """
+    Buffered writer storing switch operational data in the background.
+
+    Written records are put into a bounded buffer and stored by a writer thread with one bulk insert per batch.
+    A batch is stored when it reaches the batch size or when the flush interval has passed since its first record,
+    so callers never wait for a database commit. When the buffer is full, callers are blocked for at most the
+    enqueue timeout per write or batch of writes and the records are dropped afterwards, which bounds both the memory use and the added latency
+    while the database is slow. The buffer is flushed when the writer is closed and at interpreter exit.
+
+    With transition only storing enabled, relay statuses equal to the previous status of their switch are not
+    inserted, only the heartbeat of the switch is updated.
+
+    Attributes:
+        SWITCH_DATA_WRITE_BATCH_SIZE_CONFIG_NAME (str): Configuration key of the number of records per insert.
+        SWITCH_DATA_WRITE_FLUSH_INTERVAL_IN_SECONDS_CONFIG_NAME (str): Configuration key of the longest time a
+            record waits in the buffer.
+        SWITCH_DATA_WRITE_BUFFER_SIZE_CONFIG_NAME (str): Configuration key of the number of buffered records.
+        SWITCH_DATA_WRITE_ENQUEUE_TIMEOUT_IN_SECONDS_CONFIG_NAME (str): Configuration key of the longest time a caller
+            waits for space in a full buffer.
+        SWITCH_DATA_TRANSITION_ONLY_CONFIG_NAME (str): Configuration key enabling storing of status transitions only.
+        dropped_count (int): Number of records dropped because the buffer was full.
+        failed_count (int): Number of records whose insert failed.
+    """
+    SWITCH_DATA_WRITE_BATCH_SIZE_CONFIG_NAME = 'switch_data_write_batch_size'
+    SWITCH_DATA_WRITE_FLUSH_INTERVAL_IN_SECONDS_CONFIG_NAME = 'switch_data_write_flush_interval_in_seconds'
+    SWITCH_DATA_WRITE_BUFFER_SIZE_CONFIG_NAME = 'switch_data_write_buffer_size'
+    SWITCH_DATA_WRITE_ENQUEUE_TIMEOUT_IN_SECONDS_CONFIG_NAME = 'switch_data_write_enqueue_timeout_in_seconds'
+    SWITCH_DATA_TRANSITION_ONLY_CONFIG_NAME = 'switch_data_transition_only'
+    DEFAULT_BATCH_SIZE = 500
+    DEFAULT_FLUSH_INTERVAL_IN_SECONDS = 1
+    DEFAULT_BUFFER_SIZE = 10000
+    DEFAULT_ENQUEUE_TIMEOUT_IN_SECONDS = 0.1
+    DEFAULT_TRANSITION_ONLY = 'false'
+    _STOP = object()
+
+    @inject.autoparams()
+    def __init__(self, configuration: BaseConfiguration, repository_service: SwitchRepositoryService):
+        """
+        Initializes the SwitchDataWriter, the writer thread is started by the first write.
+
+        Args:
+            configuration (BaseConfiguration): Configuration holding the batch, buffer and timing settings.
+            repository_service (SwitchRepositoryService): Repository storing the switch operational data.
+        """
+        self.configuration = configuration
+        self.repository_service = repository_service
+        self.logger = logging.getLogger(__name__)
+        self.batch_size = max(int(configuration.get(self.SWITCH_DATA_WRITE_BATCH_SIZE_CONFIG_NAME,
+                                                    self.DEFAULT_BATCH_SIZE)), 1)
+        self.flush_interval_in_seconds = float(configuration.get(
+            self.SWITCH_DATA_WRITE_FLUSH_INTERVAL_IN_SECONDS_CONFIG_NAME, self.DEFAULT_FLUSH_INTERVAL_IN_SECONDS))
+        self.enqueue_timeout_in_seconds = float(configuration.get(
+            self.SWITCH_DATA_WRITE_ENQUEUE_TIMEOUT_IN_SECONDS_CONFIG_NAME, self.DEFAULT_ENQUEUE_TIMEOUT_IN_SECONDS))
+        self.transition_only = str(configuration.get(self.SWITCH_DATA_TRANSITION_ONLY_CONFIG_NAME,
+                                                     self.DEFAULT_TRANSITION_ONLY)).lower() == 'true'
+        self.dropped_count = 0
+        self.failed_count = 0
+        self._buffer = queue.Queue(maxsize=int(configuration.get(self.SWITCH_DATA_WRITE_BUFFER_SIZE_CONFIG_NAME,
+                                                                 self.DEFAULT_BUFFER_SIZE)))
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def write(self, switch_data):
+        """
+        Buffers a switch operational data record for storing.
+
+        Args:
+            switch_data (SwitchDataModel): The record to store.
+
+        Returns:
+            bool: True if the record was buffered, False if it was dropped because the buffer stayed full.
+        """
+        self._start()
+        try:
+            self._buffer.put(switch_data, timeout=self.enqueue_timeout_in_seconds)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped_count += 1
+            self.logger.error(f"Switch data buffer is full, dropped switch data of switch {switch_data.switch_id}.")
+            return False
+
+    def write_many(self, switch_data):
+        """
+        Buffers several switch operational data records for storing.
+
+        The caller waits for space in a full buffer at most once for the whole batch, records that do not fit after
+        that are dropped without waiting.
+
+        Args:
+            switch_data (list[SwitchDataModel]): The records to store.
+
+        Returns:
+            int: Number of buffered records, the other records were dropped because the buffer stayed full.
+        """
+        self._start()
+        buffered_count = 0
+        waiting = True
+        for record in switch_data:
+            try:
+                if waiting:
+                    self._buffer.put(record, timeout=self.enqueue_timeout_in_seconds)
+                else:
+                    self._buffer.put_nowait(record)
+                buffered_count += 1
+            except queue.Full:
+                waiting = False
+        dropped_count = len(switch_data) - buffered_count
+        if dropped_count:
+            with self._lock:
+                self.dropped_count += dropped_count
+            self.logger.error(f"Switch data buffer is full, dropped {dropped_count} of {len(switch_data)} switch data "
+                              f"records.")
+        return buffered_count
+
+    def close(self):
+        """
+        Stores all buffered records and stops the writer thread.
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._buffer.put(self._STOP)
+        thread.join()
+
+    def _start(self):
+        """
+        Starts the writer thread if it is not running.
+        """
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='switch-data-writer', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        """
+        Collects the buffered records into batches and stores them until the writer is closed.
+        """
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect_batch()
+            self._store(batch)
+
+    def _collect_batch(self):
+        """
+        Waits for the next batch of records.
+
+        Returns:
+            tuple: The records of the batch and True if the writer was closed.
+        """
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = self.flush_interval_in_seconds if deadline is None else deadline - time.monotonic()
+            if deadline is not None and timeout <= 0:
+                break
+            try:
+                record = self._buffer.get(timeout=timeout)
+            except queue.Empty:
+                if deadline is None:
+                    continue
+                break
+            if record is self._STOP:
+                return batch, True
+            batch.append(record)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval_in_seconds
+        return batch, False
+
+    def _store(self, batch):
+        """
+        Stores a batch of records, skipping records that are already stored, or only its status transitions if enabled.
+
+        Args:
+            batch (list[SwitchDataModel]): The records to store.
+        """
+        if not batch:
+            return
+        try:
+            if self.transition_only:
+                self.repository_service.store_switch_status_transitions(batch)
+            else:
+                self.repository_service.store_switch_operational_data_many(batch)
+        except Exception as e:
+            with self._lock:
+                self.failed_count += len(batch)
+            self.logger.error(f"Error storing {len(batch)} switch data records into database. Error = {e}")
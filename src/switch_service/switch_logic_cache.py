@@ -0,0 +1,89 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class SwitchLogicCache:
+    """
+    LRU cache of compiled switch status calculation logic.
+
+    Entries are keyed by the switch id and store the compiled code object together with a content hash of the
+    logic it was compiled from. A cached entry is only used while the hash still matches the logic stored for the
+    switch, so a changed logic string is recompiled even if the entry was not explicitly invalidated.
+
+    Attributes:
+        DEFAULT_MAX_SIZE (int): Default number of compiled switch logic entries kept in the cache.
+    """
+    DEFAULT_MAX_SIZE = 1024
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        """
+        Initializes the SwitchLogicCache.
+
+        Args:
+            max_size (int): Maximum number of compiled switch logic entries kept in the cache.
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash_logic(status_calculation_logic):
+        """
+        Calculates the content hash of the switch status calculation logic.
+
+        Args:
+            status_calculation_logic (str): The status calculation logic of the switch.
+
+        Returns:
+            str: Hex digest of the logic.
+        """
+        return hashlib.sha256(status_calculation_logic.encode('utf-8')).hexdigest()
+
+    def get_compiled_logic(self, switch_id, status_calculation_logic):
+        """
+        Returns the compiled status calculation logic for the switch, compiling and caching it on a miss.
+
+        Args:
+            switch_id (int): The id of the switch.
+            status_calculation_logic (str): The status calculation logic of the switch.
+
+        Returns:
+            code: Compiled code object of the logic, raises a SyntaxError if the logic can not be compiled.
+        """
+        logic_hash = self._hash_logic(status_calculation_logic)
+        with self._lock:
+            entry = self._entries.get(switch_id)
+            if entry is not None and entry[0] == logic_hash:
+                self._entries.move_to_end(switch_id)
+                return entry[1]
+
+        compiled_logic = compile(status_calculation_logic, f'<switch {switch_id}>', 'exec')
+
+        with self._lock:
+            self._entries[switch_id] = (logic_hash, compiled_logic)
+            self._entries.move_to_end(switch_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return compiled_logic
+
+    def invalidate(self, switch_id):
+        """
+        Removes the compiled logic of the switch from the cache.
+
+        Args:
+            switch_id (int): The id of the switch.
+        """
+        with self._lock:
+            self._entries.pop(switch_id, None)
+
+    def clear(self):
+        """
+        Removes all compiled logic from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,399 @@
+import atexit
+import logging
+import math
+import multiprocessing
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+import inject
+
+from src.configuration.base_configuration import BaseConfiguration
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+_CALL = 'call'
+_RESULT = 'result'
+_ERROR = 'error'
+_STATUS = 'status'
+_EXCEPTION = 'exception'
+_MAX_COMPILED_LOGIC_PER_WORKER = 256
+
+
+class SwitchLogicTimeoutError(Exception):
+    """
+    Raised when switch logic does not return within the evaluation timeout.
+    """
+
+
+class SwitchLogicEvaluationError(Exception):
+    """
+    Raised when switch logic evaluated in an evaluator worker raises an exception or the worker dies.
+    """
+
+
+def _get_datetime_fixed_at(moment):
+    """
+    Creates a datetime class whose now and today return the given moment.
+
+    Used to evaluate switch logic as if it ran at the start of a future slot.
+
+    Arguments:
+        moment (datetime): The moment returned as the current time.
+
+    Returns:
+        type: Subclass of datetime with a fixed current time.
+    """
+
+    class FixedDatetime(datetime):
+
+        @classmethod
+        def now(cls, tz=None):
+            return moment if tz is None else moment.astimezone(tz)
+
+        @classmethod
+        def today(cls):
+            return moment
+
+    return FixedDatetime
+
+
+def get_allowed_builtins(now=None):
+    """
+    Returns the built-ins available to switch status calculation logic.
+
+    Arguments:
+        now (datetime): The current time seen by the logic, None for the actual current time.
+
+    Returns:
+        dict: The allowed built-ins by name.
+    """
+    datetime_class = datetime if now is None else _get_datetime_fixed_at(now)
+    return {'datetime': datetime_class, 'print': print, 'sorted': sorted, 'timedelta': timedelta}
+
+
+def _get_transferable(value):
+    """
+    Prepares a data function result for sending to an evaluator worker.
+
+    Mapped model instances are copied without their SQLAlchemy state, which can not be restored in a worker where
+    the models are not mapped. Read-only records are named tuples and are sent as they are.
+
+    Arguments:
+        value: The result of a data function.
+
+    Returns:
+        The picklable result.
+    """
+    if isinstance(value, list) or type(value) is tuple:
+        return [_get_transferable(item) for item in value]
+    if '_sa_instance_state' in getattr(value, '__dict__', {}):
+        detached_copy = object.__new__(type(value))
+        detached_copy.__dict__.update({key: item for key, item in vars(value).items()
+                                       if key != '_sa_instance_state'})
+        return detached_copy
+    return value
+
+
+def _get_data_function_proxy(connection, name):
+    """
+    Creates a function evaluated in the parent process when called by switch logic in a worker.
+
+    Arguments:
+        connection (Connection): The connection of the worker to the parent process.
+        name (str): The name of the data function.
+
+    Returns:
+        function: Function forwarding its arguments to the data function in the parent process.
+    """
+
+    def call_data_function(*args, **kwargs):
+        connection.send((_CALL, name, args, kwargs))
+        kind, value = connection.recv()
+        if kind == _ERROR:
+            raise RuntimeError(value)
+        return value
+
+    return call_data_function
+
+
+def _limit_cpu_time(cpu_limit_in_seconds):
+    """
+    Lets the worker use the given CPU time from now on before it is killed by the operating system.
+
+    Arguments:
+        cpu_limit_in_seconds (int): The CPU time the worker may use, 0 for no limit.
+    """
+    if not cpu_limit_in_seconds or resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft_limit = math.ceil(usage.ru_utime + usage.ru_stime) + cpu_limit_in_seconds
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard_limit != resource.RLIM_INFINITY:
+        soft_limit = min(soft_limit, hard_limit)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft_limit, hard_limit))
+
+
+def _run_worker(connection, memory_limit_in_bytes, cpu_limit_in_seconds=0):
+    """
+    Evaluates switch logic sent by the parent process until the connection is closed or None is received.
+
+    Arguments:
+        connection (Connection): The connection of the worker to the parent process.
+        memory_limit_in_bytes (int): Limit of the address space of the worker, 0 for no limit.
+        cpu_limit_in_seconds (int): Limit of the CPU time of a single evaluation, 0 for no limit.
+    """
+    if memory_limit_in_bytes and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_in_bytes, memory_limit_in_bytes))
+    compiled_logic = {}
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        status_calculation_logic, now, function_names = message
+        _limit_cpu_time(cpu_limit_in_seconds)
+        try:
+            code = compiled_logic.get(status_calculation_logic)
+            if code is None:
+                if len(compiled_logic) >= _MAX_COMPILED_LOGIC_PER_WORKER:
+                    compiled_logic.clear()
+                code = compile(status_calculation_logic, '<switch_logic>', 'exec')
+                compiled_logic[status_calculation_logic] = code
+            global_scope = {'__builtins__': get_allowed_builtins(now),
+                            **{name: _get_data_function_proxy(connection, name) for name in function_names}}
+            exec(code, global_scope)
+            connection.send((_STATUS, global_scope['get_switch_status']()))
+        except Exception as e:
+            connection.send((_EXCEPTION, f'{type(e).__name__}: {e}'))
+
+
+class _EvaluatorWorker:
+    """
+    Evaluator process together with the parent end of its connection.
+    """
+
+    def __init__(self, process, connection):
+        self.process = process
+        self.connection = connection
+        self.evaluation_count = 0
+
+
+class SwitchLogicEvaluator:
+    """
+    Pool of evaluator processes executing user supplied switch status calculation logic.
+
+    Logic runs in a separate process, so a slow or endless loop does not block the calling worker. Every evaluation
+    has a wall clock timeout after which the evaluator process is killed and replaced in the background. As a backstop
+    for when the calling process can not kill it, the CPU time of an evaluation is limited to the timeout by the
+    operating system as well. The address space of the evaluator processes is limited and they are replaced after a
+    number of evaluations, so memory leaked or hoarded by logic is given back. Data functions of the logic scope are called back in the calling process, so evaluator
+    processes need no database access.
+
+    The pool is started on first use. When the evaluator is disabled, switch logic is executed inline.
+
+    Attributes:
+        SWITCH_LOGIC_EVALUATOR_ENABLED_CONFIG_NAME (str): Configuration key enabling the evaluator processes.
+        SWITCH_LOGIC_EVALUATOR_POOL_SIZE_CONFIG_NAME (str): Configuration key of the number of evaluator processes.
+        SWITCH_LOGIC_EVALUATION_TIMEOUT_IN_SECONDS_CONFIG_NAME (str): Configuration key of the longest time an
+            evaluation may take, including the wait for a free evaluator process.
+        SWITCH_LOGIC_EVALUATOR_MEMORY_LIMIT_IN_MB_CONFIG_NAME (str): Configuration key of the address space limit of
+            an evaluator process, 0 for no limit.
+        SWITCH_LOGIC_EVALUATOR_MAX_EVALUATIONS_PER_WORKER_CONFIG_NAME (str): Configuration key of the number of
+            evaluations after which an evaluator process is replaced.
+    """
+    SWITCH_LOGIC_EVALUATOR_ENABLED_CONFIG_NAME = 'switch_logic_evaluator_enabled'
+    SWITCH_LOGIC_EVALUATOR_POOL_SIZE_CONFIG_NAME = 'switch_logic_evaluator_pool_size'
+    SWITCH_LOGIC_EVALUATION_TIMEOUT_IN_SECONDS_CONFIG_NAME = 'switch_logic_evaluation_timeout_in_seconds'
+    SWITCH_LOGIC_EVALUATOR_MEMORY_LIMIT_IN_MB_CONFIG_NAME = 'switch_logic_evaluator_memory_limit_in_mb'
+    SWITCH_LOGIC_EVALUATOR_MAX_EVALUATIONS_PER_WORKER_CONFIG_NAME = 'switch_logic_evaluator_max_evaluations_per_worker'
+    DEFAULT_ENABLED = 'false'
+    DEFAULT_POOL_SIZE = 2
+    DEFAULT_EVALUATION_TIMEOUT_IN_SECONDS = 2
+    DEFAULT_MEMORY_LIMIT_IN_MB = 512
+    DEFAULT_MAX_EVALUATIONS_PER_WORKER = 1000
+
+    @inject.autoparams()
+    def __init__(self, configuration: BaseConfiguration):
+        """
+        Initializes the SwitchLogicEvaluator, the evaluator processes are started by the first evaluation.
+
+        Args:
+            configuration (BaseConfiguration): Configuration holding the pool, timeout and limit settings.
+        """
+        self.configuration = configuration
+        self.logger = logging.getLogger(__name__)
+        self.enabled = str(configuration.get(self.SWITCH_LOGIC_EVALUATOR_ENABLED_CONFIG_NAME,
+                                             self.DEFAULT_ENABLED)).lower() == 'true'
+        self.pool_size = max(int(configuration.get(self.SWITCH_LOGIC_EVALUATOR_POOL_SIZE_CONFIG_NAME,
+                                                   self.DEFAULT_POOL_SIZE)), 1)
+        self.timeout_in_seconds = float(configuration.get(self.SWITCH_LOGIC_EVALUATION_TIMEOUT_IN_SECONDS_CONFIG_NAME,
+                                                          self.DEFAULT_EVALUATION_TIMEOUT_IN_SECONDS))
+        self.memory_limit_in_bytes = int(configuration.get(self.SWITCH_LOGIC_EVALUATOR_MEMORY_LIMIT_IN_MB_CONFIG_NAME,
+                                                           self.DEFAULT_MEMORY_LIMIT_IN_MB)) * 1024 * 1024
+        self.max_evaluations_per_worker = int(configuration.get(
+            self.SWITCH_LOGIC_EVALUATOR_MAX_EVALUATIONS_PER_WORKER_CONFIG_NAME,
+            self.DEFAULT_MAX_EVALUATIONS_PER_WORKER))
+        self.cpu_limit_in_seconds = math.ceil(self.timeout_in_seconds) + 1
+        self._context = multiprocessing.get_context('spawn')
+        self._idle_workers = queue.Queue()
+        self._replacement_threads = set()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def _start_worker(self):
+        """
+        Starts an evaluator process.
+
+        Returns:
+            _EvaluatorWorker: The started worker.
+        """
+        parent_connection, child_connection = self._context.Pipe()
+        process = self._context.Process(target=_run_worker,
+                                        args=(child_connection, self.memory_limit_in_bytes, self.cpu_limit_in_seconds),
+                                        name='switch-logic-evaluator', daemon=True)
+        process.start()
+        child_connection.close()
+        return _EvaluatorWorker(process, parent_connection)
+
+    def _stop_worker(self, worker, kill=False):
+        """
+        Stops an evaluator process, killing it if it is busy or does not stop in time.
+
+        Args:
+            worker (_EvaluatorWorker): The worker to stop.
+            kill (bool): Kill the process right away.
+        """
+        if not kill:
+            try:
+                worker.connection.send(None)
+                worker.process.join(1)
+            except (OSError, ValueError):
+                pass
+        if worker.process.is_alive():
+            worker.process.kill()
+            worker.process.join(1)
+        worker.connection.close()
+
+    def _acquire_worker(self, deadline):
+        """
+        Waits for an idle evaluator process, starting the pool on first use.
+
+        Args:
+            deadline (float): Monotonic time until which the evaluation has to finish.
+
+        Returns:
+            _EvaluatorWorker: The acquired worker, raises a SwitchLogicTimeoutError if no worker got idle in time.
+        """
+        if not self._started:
+            with self._lock:
+                if not self._started:
+                    for _ in range(self.pool_size):
+                        self._idle_workers.put(self._start_worker())
+                    self._started = True
+                    atexit.register(self.close)
+        try:
+            return self._idle_workers.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            raise SwitchLogicTimeoutError('No switch logic evaluator got available within the timeout.')
+
+    def _release_worker(self, worker, healthy):
+        """
+        Returns an evaluator process to the pool, replacing it if it failed or reached its evaluation limit.
+
+        The replacement is started in a background thread, so the calling request does not wait for the new process.
+
+        Args:
+            worker (_EvaluatorWorker): The worker to release.
+            healthy (bool): False if the worker timed out or its connection failed.
+        """
+        if healthy and worker.evaluation_count < self.max_evaluations_per_worker:
+            self._idle_workers.put(worker)
+            return
+        thread = threading.Thread(target=self._replace_worker, args=(worker, healthy),
+                                  name='switch-logic-evaluator-replacement', daemon=True)
+        with self._lock:
+            self._replacement_threads.add(thread)
+        thread.start()
+
+    def _replace_worker(self, worker, healthy):
+        """
+        Stops an evaluator process and adds a newly started one to the pool.
+
+        Args:
+            worker (_EvaluatorWorker): The worker to replace.
+            healthy (bool): False if the worker timed out or its connection failed.
+        """
+        try:
+            self._stop_worker(worker, kill=not healthy)
+            self._idle_workers.put(self._start_worker())
+        except Exception as e:
+            self.logger.error(f"Error starting a switch logic evaluator. The exception: {e}")
+        finally:
+            with self._lock:
+                self._replacement_threads.discard(threading.current_thread())
+
+    def evaluate(self, status_calculation_logic, data_functions, now=None):
+        """
+        Evaluates switch logic in an evaluator process.
+
+        Args:
+            status_calculation_logic (str): The logic defining get_switch_status.
+            data_functions (dict): Data functions available to the logic by name, called in this process.
+            now (datetime): The current time seen by the logic, None for the actual current time.
+
+        Returns:
+            The status returned by the logic, raises a SwitchLogicTimeoutError if the logic does not return in time
+            and a SwitchLogicEvaluationError if it raises an exception.
+        """
+        deadline = time.monotonic() + self.timeout_in_seconds
+        worker = self._acquire_worker(deadline)
+        healthy = False
+        try:
+            worker.evaluation_count += 1
+            worker.connection.send((status_calculation_logic, now, list(data_functions)))
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not worker.connection.poll(remaining):
+                    raise SwitchLogicTimeoutError(
+                        f'Switch logic did not return within {self.timeout_in_seconds} seconds.')
+                message = worker.connection.recv()
+                if message[0] == _CALL:
+                    _, name, args, kwargs = message
+                    try:
+                        worker.connection.send((_RESULT, _get_transferable(data_functions[name](*args, **kwargs))))
+                    except Exception as e:
+                        worker.connection.send((_ERROR, f'{type(e).__name__}: {e}'))
+                    continue
+                healthy = True
+                if message[0] == _EXCEPTION:
+                    raise SwitchLogicEvaluationError(message[1])
+                return message[1]
+        except (EOFError, OSError) as e:
+            raise SwitchLogicEvaluationError(f'Switch logic evaluator failed: {e}')
+        finally:
+            self._release_worker(worker, healthy)
+
+    def close(self):
+        """
+        Stops all idle evaluator processes, the pool is started again by the next evaluation.
+
+        Evaluator processes being replaced are waited for, so they are stopped as well.
+        """
+        with self._lock:
+            self._started = False
+            replacement_threads = list(self._replacement_threads)
+        for thread in replacement_threads:
+            thread.join()
+        while True:
+            try:
+                worker = self._idle_workers.get_nowait()
+            except queue.Empty:
+                return
+            self._stop_worker(worker)
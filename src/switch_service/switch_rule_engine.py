@@ -0,0 +1,315 @@
+import json
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from functools import lru_cache
+
+
+class SwitchRuleError(ValueError):
+    """
+    Raised when a switch rule is invalid or can not be evaluated with the available data.
+    """
+
+
+class SwitchRuleContext:
+    """
+    Data a switch rule is evaluated on.
+
+    The prices of the day and the current temperature are loaded on first use, so rules that do not use them do not
+    load them.
+
+    Attributes:
+        now (datetime): The current time seen by the rule.
+    """
+
+    def __init__(self, now, price_loader, weather_loader):
+        """
+        Initializes the SwitchRuleContext.
+
+        Args:
+            now (datetime): The current time seen by the rule.
+            price_loader (callable): Function returning the PriceSeries of the day of now.
+            weather_loader (callable): Function returning the WeatherSeries of the switch location around now.
+        """
+        self.now = now
+        self._price_loader = price_loader
+        self._weather_loader = weather_loader
+        self._current_price = None
+        self._sorted_day_prices = None
+        self._current_temperature = None
+
+    def _load_prices(self):
+        """
+        Loads the prices of the day and finds the price valid now.
+        """
+        price_series = self._price_loader()
+        current_price = price_series.get_price_at(self.now)
+        if current_price is None:
+            raise SwitchRuleError(f'No electricity price is available for {self.now}.')
+        self._current_price = current_price
+        self._sorted_day_prices = price_series.sorted_prices
+
+    @property
+    def current_price(self):
+        """
+        float: The electricity price valid now.
+        """
+        if self._sorted_day_prices is None:
+            self._load_prices()
+        return self._current_price
+
+    @property
+    def sorted_day_prices(self):
+        """
+        tuple[float]: The electricity prices of the day in ascending order.
+        """
+        if self._sorted_day_prices is None:
+            self._load_prices()
+        return self._sorted_day_prices
+
+    @property
+    def current_temperature(self):
+        """
+        float: The temperature of the newest weather record at or before now, or of the first one after now.
+        """
+        if self._current_temperature is None:
+            weather_series = self._weather_loader()
+            if not len(weather_series):
+                raise SwitchRuleError(f'No weather data is available for {self.now}.')
+            current_temperature = weather_series.get_temperature_at(self.now)
+            self._current_temperature = current_temperature if current_temperature is not None else \
+                weather_series.temperatures[0]
+        return self._current_temperature
+
+
+def _get_number(condition_name, value):
+    """
+    Returns the numeric argument of a condition, raises a SwitchRuleError if it is not a number.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise SwitchRuleError(f'{condition_name} requires a number.')
+    return value
+
+
+def _get_count(condition_name, value):
+    """
+    Returns the count argument of a condition, raises a SwitchRuleError if it is not a positive whole number.
+    """
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise SwitchRuleError(f'{condition_name} requires a positive whole number.')
+    return value
+
+
+def _compile_all(value):
+    """
+    Compiles a condition holding if all of its conditions hold.
+    """
+    if not isinstance(value, list) or not value:
+        raise SwitchRuleError('all requires a non empty list of conditions.')
+    conditions = [_compile_condition(condition) for condition in value]
+    return lambda context: all(condition(context) for condition in conditions)
+
+
+def _compile_any(value):
+    """
+    Compiles a condition holding if any of its conditions holds.
+    """
+    if not isinstance(value, list) or not value:
+        raise SwitchRuleError('any requires a non empty list of conditions.')
+    conditions = [_compile_condition(condition) for condition in value]
+    return lambda context: any(condition(context) for condition in conditions)
+
+
+def _compile_not(value):
+    """
+    Compiles a condition holding if its condition does not hold.
+    """
+    condition = _compile_condition(value)
+    return lambda context: not condition(context)
+
+
+def _compile_price_below(value):
+    """
+    Compiles a condition holding if the current price is below a threshold.
+    """
+    threshold = _get_number('price_below', value)
+    return lambda context: context.current_price < threshold
+
+
+def _compile_price_above(value):
+    """
+    Compiles a condition holding if the current price is above a threshold.
+    """
+    threshold = _get_number('price_above', value)
+    return lambda context: context.current_price > threshold
+
+
+def _compile_price_among_cheapest(value):
+    """
+    Compiles a condition holding if fewer than count prices of the day are lower than the current price.
+    """
+    count = _get_count('price_among_cheapest', value)
+    return lambda context: bisect_left(context.sorted_day_prices, context.current_price) < count
+
+
+def _compile_price_among_most_expensive(value):
+    """
+    Compiles a condition holding if fewer than count prices of the day are higher than the current price.
+    """
+    count = _get_count('price_among_most_expensive', value)
+    return lambda context: \
+        len(context.sorted_day_prices) - bisect_right(context.sorted_day_prices, context.current_price) < count
+
+
+def _compile_temperature_below(value):
+    """
+    Compiles a condition holding if the current temperature is below a threshold.
+    """
+    threshold = _get_number('temperature_below', value)
+    return lambda context: context.current_temperature < threshold
+
+
+def _compile_temperature_above(value):
+    """
+    Compiles a condition holding if the current temperature is above a threshold.
+    """
+    threshold = _get_number('temperature_above', value)
+    return lambda context: context.current_temperature > threshold
+
+
+def _compile_hour_between(value):
+    """
+    Compiles a condition holding from a start hour up to an end hour, wrapping around midnight.
+    """
+    if not isinstance(value, list) or len(value) != 2 or \
+            not all(isinstance(hour, int) and not isinstance(hour, bool) and 0 <= hour <= 24 for hour in value):
+        raise SwitchRuleError('hour_between requires a list of a start and an end hour from 0 to 24.')
+    start_hour, end_hour = value
+    if start_hour <= end_hour:
+        return lambda context: start_hour <= context.now.hour < end_hour
+    return lambda context: context.now.hour >= start_hour or context.now.hour < end_hour
+
+
+_CONDITION_COMPILERS = {
+    'all': _compile_all,
+    'any': _compile_any,
+    'not': _compile_not,
+    'price_below': _compile_price_below,
+    'price_above': _compile_price_above,
+    'price_among_cheapest': _compile_price_among_cheapest,
+    'price_among_most_expensive': _compile_price_among_most_expensive,
+    'temperature_below': _compile_temperature_below,
+    'temperature_above': _compile_temperature_above,
+    'hour_between': _compile_hour_between,
+}
+
+
+def _compile_condition(condition):
+    """
+    Compiles a condition of a switch rule into a function of the rule context.
+
+    Args:
+        condition (dict): Dictionary with a single condition name and its argument.
+
+    Returns:
+        function: Function returning whether the condition holds for a SwitchRuleContext.
+    """
+    if not isinstance(condition, dict) or len(condition) != 1:
+        raise SwitchRuleError('A condition must be an object with exactly one condition name.')
+    (name, value), = condition.items()
+    if name not in _CONDITION_COMPILERS:
+        raise SwitchRuleError(f'Unknown condition {name}, known conditions are {sorted(_CONDITION_COMPILERS)}.')
+    return _CONDITION_COMPILERS[name](value)
+
+
+@lru_cache(maxsize=1024)
+def _compile_rule_text(rule_text):
+    """
+    Compiles a switch rule given as canonical JSON text, caching the result by the text.
+
+    Args:
+        rule_text (str): The rule as JSON with sorted keys.
+
+    Returns:
+        function: Function returning the status of the rule for a SwitchRuleContext.
+    """
+    rule = json.loads(rule_text)
+    if not isinstance(rule, dict) or 'when' not in rule or set(rule) - {'when', 'then', 'else'}:
+        raise SwitchRuleError('A rule must be an object with a when condition and optional then and else statuses.')
+    then_status = rule.get('then', SwitchRuleEngine.DEFAULT_THEN_STATUS)
+    else_status = rule.get('else', SwitchRuleEngine.DEFAULT_ELSE_STATUS)
+    for status in (then_status, else_status):
+        if not isinstance(status, str) or not 0 < len(status) <= SwitchRuleEngine.MAX_STATUS_LENGTH:
+            raise SwitchRuleError(f'Statuses must be strings of 1 to {SwitchRuleEngine.MAX_STATUS_LENGTH} characters.')
+    condition = _compile_condition(rule['when'])
+    return lambda context: then_status if condition(context) else else_status
+
+
+class SwitchRuleEngine:
+    """
+    Interpreter of declarative switch rules.
+
+    A rule is a JSON object like {"when": {"all": [{"price_among_cheapest": 4}, {"temperature_below": 20}]},
+    "then": "ON", "else": "OFF"}. The when condition is built from the conditions all, any and not, price_below,
+    price_above, price_among_cheapest and price_among_most_expensive comparing the current electricity price with a
+    threshold or with the prices of the day, temperature_below and temperature_above comparing the current
+    temperature at the switch location, and hour_between holding from a start hour up to an end hour, wrapping around
+    midnight if the start is later than the end. The statuses default to ON and OFF.
+
+    Rules are compiled once into nested functions and evaluated on data loaded by the caller, without exec.
+
+    Attributes:
+        DEFAULT_THEN_STATUS (str): The status returned if the condition holds and the rule has no then status.
+        DEFAULT_ELSE_STATUS (str): The status returned if the condition fails and the rule has no else status.
+        MAX_STATUS_LENGTH (int): The longest status a rule may return, as stored in the switch data.
+    """
+    DEFAULT_THEN_STATUS = 'ON'
+    DEFAULT_ELSE_STATUS = 'OFF'
+    MAX_STATUS_LENGTH = 50
+    WEATHER_LOOKAROUND = timedelta(hours=3)
+
+    @staticmethod
+    def validate_rule(rule):
+        """
+        Checks that a rule can be compiled.
+
+        Args:
+            rule (dict): The rule.
+
+        Returns:
+            bool: True, raises a SwitchRuleError if the rule is invalid.
+        """
+        SwitchRuleEngine.compile_rule(rule)
+        return True
+
+    @staticmethod
+    def compile_rule(rule):
+        """
+        Compiles a rule, reusing the compiled function of an equal rule.
+
+        Args:
+            rule (dict): The rule.
+
+        Returns:
+            function: Function returning the status of the rule for a SwitchRuleContext, raises a SwitchRuleError if
+                the rule is invalid.
+        """
+        try:
+            rule_text = json.dumps(rule, sort_keys=True)
+        except (TypeError, ValueError) as e:
+            raise SwitchRuleError(f'A rule must be JSON serializable: {e}')
+        return _compile_rule_text(rule_text)
+
+    def evaluate(self, rule, now, price_loader, weather_loader):
+        """
+        Evaluates a rule.
+
+        Args:
+            rule (dict): The rule.
+            now (datetime): The current time seen by the rule.
+            price_loader (callable): Function returning the PriceSeries of the day of now.
+            weather_loader (callable): Function returning the WeatherSeries of the switch location around now.
+
+        Returns:
+            str: The status of the rule, raises a SwitchRuleError if the rule is invalid or data is missing.
+        """
+        return self.compile_rule(rule)(SwitchRuleContext(now, price_loader, weather_loader))
@@ -1,10 +1,14 @@
 from src.configuration.base_configuration import BaseConfiguration
 from src.weather_service.weather_service import WeatherService
 from src.electricity_price_service.electricity_price_service import ElectricityPriceService
-from src.repository_service.switch_repository_service import SwitchRepositoryService
+from src.repository_service.switch_repository_service import SwitchRepositoryService, _get_month_start
 from src.switch_service.models.switch_model import SwitchModel
 from src.switch_service.models.switch_data_model import SwitchDataModel
 from src.switch_service.models.switch_data_model import SwitchDataType
+from src.switch_service.switch_logic_cache import SwitchLogicCache
+from src.switch_service.switch_data_writer import SwitchDataWriter
+from src.switch_service.switch_logic_evaluator import SwitchLogicEvaluator, get_allowed_builtins
+from src.switch_service.switch_rule_engine import SwitchRuleEngine
 from datetime import datetime, timedelta
 import inject
 import logging
@@ -15,13 +19,34 @@ class SwitchService:
     The SwitchService class is responsible for managing the switch data and calculating the switch status based on the
     status calculation logic defined in the switch data. The class uses the WeatherService, ElectricityPriceService, and
     RepositoryService to get the required data and store the switch data.
+
+    When the decision table is enabled, the logic of every switch is evaluated ahead of time for each hour of the
+    decision table horizon and the results are stored as the switch schedule. The status of a switch is then read
+    from the schedule slot of the current hour, and the logic is only executed for slots that are not precomputed.
+
+    When the switch logic evaluator is enabled, the logic is executed in its pool of evaluator processes with a time
+    and memory limit instead of in the calling process.
+
+    Switches with a declarative status calculation rule are evaluated by the SwitchRuleEngine on the prices of the
+    day and the weather at the switch location, without executing Python logic. The rule takes precedence over
+    the logic if a switch has both.
     """
+    SWITCH_DECISION_TABLE_ENABLED_CONFIG_NAME = 'switch_decision_table_enabled'
+    SWITCH_DECISION_TABLE_HORIZON_IN_HOURS_CONFIG_NAME = 'switch_decision_table_horizon_in_hours'
+    DEFAULT_SWITCH_DECISION_TABLE_HORIZON_IN_HOURS = 48
+    SWITCH_DATA_PARTITION_MONTHS_AHEAD_CONFIG_NAME = 'switch_data_partition_months_ahead'
+    SWITCH_DATA_RETENTION_IN_MONTHS_CONFIG_NAME = 'switch_data_retention_in_months'
+    DEFAULT_SWITCH_DATA_PARTITION_MONTHS_AHEAD = 3
+    DEFAULT_SWITCH_DATA_RETENTION_IN_MONTHS = 0
+    SCHEDULE_SLOT_LENGTH = timedelta(hours=1)
 
     @inject.autoparams()
     def __init__(self, configuration: BaseConfiguration,
                  weather_service: WeatherService,
                  electricity_price_service: ElectricityPriceService,
-                 repository_service: SwitchRepositoryService):
+                 repository_service: SwitchRepositoryService,
+                 switch_data_writer: SwitchDataWriter,
+                 switch_logic_evaluator: SwitchLogicEvaluator):
         """
         Initializes the SwitchService with the configuration, WeatherService, ElectricityPriceService, and RepositoryService.
         Arguments:
@@ -29,24 +54,115 @@ class SwitchService:
             weather_service (WeatherService): The WeatherService object.
             electricity_price_service (ElectricityPriceService): The ElectricityPriceService object.
             repository_service (SwitchRepositoryService): The RepositoryService object.
+            switch_data_writer (SwitchDataWriter): The writer storing relay statuses in the background.
+            switch_logic_evaluator (SwitchLogicEvaluator): The pool of processes executing the switch logic.
 
         """
         self.configuration = configuration
         self.weather_service = weather_service
         self.electricity_price_service = electricity_price_service
         self.repository_service = repository_service
+        self.switch_data_writer = switch_data_writer
+        self.switch_logic_evaluator = switch_logic_evaluator
+        self.switch_logic_cache = SwitchLogicCache()
+        self.switch_rule_engine = SwitchRuleEngine()
         self.logger = logging.getLogger(__name__)
+        self._decision_table_warning_logged = False
 
-    def _get_allowed_scope(self):
+    def _get_allowed_scope(self, switch=None, now=None, location_id=None, shared_results=None):
         """
         Defines the scope of allowed built-in functions and service methods for executing switch status logic.
 
+        Arguments:
+            switch (SwitchModel): The switch the logic is executed for, None when testing logic without a switch.
+            now (datetime): The current time seen by the logic, None for the actual current time.
+            location_id (int): The location id of the switch place if already known.
+            shared_results (dict): Results of data calls shared between the switches evaluated in one batch.
+
         Returns:
             dict: A dictionary containing the allowed built-ins and service methods.
         """
-        return {'__builtins__': {'datetime': datetime, 'print': print, 'sorted': sorted, 'timedelta': timedelta},
-                'get_weather_data_after_date': self.weather_service.get_weather_data_after_date,
-                'get_electricity_price_data_after_date': self.electricity_price_service.get_electricity_price_data_after_date}
+        return {'__builtins__': get_allowed_builtins(now),
+                **self._get_data_functions(switch, location_id, shared_results)}
+
+    def _get_data_functions(self, switch=None, location_id=None, shared_results=None):
+        """
+        Defines the service methods available to switch status logic.
+
+        Arguments:
+            switch (SwitchModel): The switch the logic is executed for, None when testing logic without a switch.
+            location_id (int): The location id of the switch place if already known.
+            shared_results (dict): Results of data calls shared between the switches evaluated in one batch.
+
+        Returns:
+            dict: The data functions by name.
+        """
+        data_functions = {
+            'get_weather_data_after_date': self.weather_service.get_weather_data_after_date,
+            **self._get_switch_location_functions(switch, location_id),
+            'get_electricity_price_data_after_date': self.electricity_price_service.get_electricity_price_data_after_date,
+            'get_electricity_price_series': self.electricity_price_service.get_electricity_price_series}
+        if shared_results is not None:
+            data_functions = {name: self._share_results(
+                (name, location_id) if name.endswith('_for_switch_location') else (name,),
+                function, shared_results) for name, function in data_functions.items()}
+        return data_functions
+
+    @staticmethod
+    def _share_results(key_prefix, function, shared_results):
+        """
+        Wraps a data function so calls with the same arguments within a batch are answered once.
+
+        Arguments:
+            key_prefix (tuple): Identifies the function, and for the switch location function also the location.
+            function (callable): The data function.
+            shared_results (dict): Results of data calls shared between the switches of the batch.
+
+        Returns:
+            function: Function returning a copy of a shared result list, or the shared read-only result itself.
+        """
+
+        def get_shared_result(*args, **kwargs):
+            key = (*key_prefix, *args, *sorted(kwargs.items()))
+            if key not in shared_results:
+                shared_results[key] = function(*args, **kwargs)
+            result = shared_results[key]
+            return list(result) if isinstance(result, list) else result
+
+        return get_shared_result
+
+    def _get_switch_location_functions(self, switch, location_id=None):
+        """
+        Creates the functions exposed to switch logic that return weather data of the switch place location only.
+
+        The location of the switch is resolved on the first call of either function, so logic that does not use
+        weather data does not pay for the lookup.
+
+        Arguments:
+            switch (SwitchModel): The switch the logic is executed for, None when testing logic without a switch.
+            location_id (int): The location id of the switch place if already known.
+
+        Returns:
+            dict: Functions accepting start_date and optional end_date by name, get_weather_data_for_switch_location
+                returning a list of WeatherModel and get_weather_series_for_switch_location returning a WeatherSeries.
+        """
+
+        def get_location_id():
+            nonlocal location_id
+            if switch is None:
+                raise ValueError("Weather data for the switch location is available only for stored switches.")
+            if location_id is None:
+                location_id = self.repository_service.get_switch_location_id(switch.id)
+            return location_id
+
+        def get_weather_data_for_switch_location(start_date, end_date=None):
+            return self.weather_service.get_weather_data_for_location(get_location_id(), start_date, end_date)
+
+        def get_weather_series_for_switch_location(start_date, end_date=None):
+            return self.weather_service.get_weather_series_for_location(get_location_id(), start_date, end_date)
+
+        return {'get_weather_data_for_switch_location': get_weather_data_for_switch_location,
+                'get_weather_series_for_switch_location': get_weather_series_for_switch_location}
 
     def _fetch_switch(self, switch_uuid, user_id):
         """
@@ -68,19 +184,15 @@ class SwitchService:
 
     def _store_switch_status(self, switch, switch_status):
         """
-        Stores the status of the switch with the given uuid in the database.
+        Hands the status of the switch to the switch data writer, which stores it in the background.
 
         Arguments:
             switch (SwitchModel): The switch object.
             switch_status (str): The status of the switch.
         """
-        try:
-            switch_data = SwitchDataModel(switch_id=switch.id, data_type=SwitchDataType.RELAY_STATUS,
-                                          log_cre_date=datetime.now(), value_text=switch_status)
-            self.store_switch_operational_data(switch_data)
-        except Exception as e:
-            self.logger.error(
-                f"Error storing switch operational data into database for switch uuid {switch.uuid}, exception: {e}")
+        switch_data = SwitchDataModel(switch_id=switch.id, data_type=SwitchDataType.RELAY_STATUS,
+                                      log_cre_date=datetime.now(), value_text=switch_status)
+        self.switch_data_writer.write(switch_data)
 
     def get_switch_status(self, switch_uuid, user_id):
         """
@@ -93,26 +205,288 @@ class SwitchService:
         Returns:
             str: The status of the switch.
         """
-        global_scope = self._get_allowed_scope()
         switch = self._fetch_switch(switch_uuid, user_id)
-        switch_status_calculation_logic = switch.status_calculation_logic if switch else None
 
-        if switch_status_calculation_logic is None:
+        if not self._has_status_calculation(switch):
             self.logger.error(f"Switch calculation logic not found for switch {switch_uuid}.")
             switch_status = SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED
         else:
-            try:
-                exec(switch_status_calculation_logic, global_scope)
-                get_switch_status = global_scope["get_switch_status"]
-                switch_status = get_switch_status()
-            except Exception as e:
-                self.logger.error(f"Error calculating switch status for switch {switch_uuid}. The exception: {e}")
-                switch_status = SwitchModel.SWITCH_VALUE_IF_ERROR_OCCURRED
+            switch_status = self._get_scheduled_switch_status(switch)
+            if switch_status is None:
+                try:
+                    switch_status = self._evaluate_switch_logic(switch)
+                except Exception as e:
+                    self.logger.error(f"Error calculating switch status for switch {switch_uuid}. The exception: {e}")
+                    switch_status = SwitchModel.SWITCH_VALUE_IF_ERROR_OCCURRED
 
         if switch:
             self._store_switch_status(switch, switch_status)
         return switch_status
 
+    def get_switch_statuses(self, user_id, switch_uuids=None, place_id=None):
+        """
+        Calculates the statuses of several switches of a user, either listed by uuid or all switches of a place.
+
+        The switches and their locations are fetched with a single query that also checks the ownership, data
+        requested by the logic of several switches with the same arguments is loaded once, and the relay statuses
+        are handed to the switch data writer together, which stores them with bulk inserts.
+
+        Arguments:
+            user_id (int): The id of the user.
+            switch_uuids (list[str]): The uuids of the switches, None to use the switches of the place.
+            place_id (int): The id of the place whose switches are returned if no uuids are given.
+
+        Returns:
+            list[dict]: The uuid and status of every switch. Requested uuids that do not exist for the user have the
+                status SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED.
+        """
+        try:
+            switches = self.repository_service.get_switches_with_location_for_user(user_id, switch_uuids, place_id)
+        except Exception as e:
+            self.logger.error(f"Error fetching switches for user_id {user_id}. The exception: {e}")
+            switches = []
+
+        scheduled_statuses = self._get_scheduled_switch_statuses([switch.id for switch, _ in switches])
+        shared_results = {}
+        statuses = {}
+        for switch, location_id in switches:
+            if not self._has_status_calculation(switch):
+                self.logger.error(f"Switch calculation logic not found for switch {switch.uuid}.")
+                statuses[switch.uuid] = SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED
+                continue
+            switch_status = scheduled_statuses.get(switch.id)
+            if switch_status is None:
+                try:
+                    switch_status = self._evaluate_switch_logic(switch, location_id=location_id,
+                                                                shared_results=shared_results)
+                except Exception as e:
+                    self.logger.error(f"Error calculating switch status for switch {switch.uuid}. The exception: {e}")
+                    switch_status = SwitchModel.SWITCH_VALUE_IF_ERROR_OCCURRED
+            statuses[switch.uuid] = switch_status
+
+        self._store_switch_statuses([switch for switch, _ in switches], statuses)
+        if switch_uuids is None:
+            switch_uuids = [switch.uuid for switch, _ in switches]
+        return [{'uuid': switch_uuid,
+                 'status': statuses.get(switch_uuid, SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED)}
+                for switch_uuid in switch_uuids]
+
+    def _store_switch_statuses(self, switches, statuses):
+        """
+        Hands the statuses of several switches to the switch data writer, which stores them in the background.
+
+        Arguments:
+            switches (list[SwitchModel]): The switches.
+            statuses (dict): The statuses keyed by the switch uuid.
+        """
+        log_cre_date = datetime.now()
+        self.switch_data_writer.write_many([SwitchDataModel(switch_id=switch.id, data_type=SwitchDataType.RELAY_STATUS,
+                                                            log_cre_date=log_cre_date, value_text=statuses[switch.uuid])
+                                            for switch in switches])
+
+    @staticmethod
+    def _has_status_calculation(switch):
+        """
+        Checks whether the status of a switch can be calculated.
+
+        Arguments:
+            switch (SwitchModel): The switch, None if it was not found.
+
+        Returns:
+            bool: True if the switch has status calculation logic or a status calculation rule.
+        """
+        return switch is not None and (switch.status_calculation_logic is not None or
+                                       SwitchService._get_status_calculation_rule(switch) is not None)
+
+    @staticmethod
+    def _get_status_calculation_rule(switch):
+        """
+        Returns the declarative status calculation rule of a switch.
+
+        Arguments:
+            switch (SwitchModel): The switch.
+
+        Returns:
+            dict: The rule, None if the switch is calculated by logic only.
+        """
+        rule = getattr(switch, 'status_calculation_rule', None)
+        return rule if isinstance(rule, dict) else None
+
+    def _evaluate_switch_rule(self, switch, now=None, location_id=None, shared_results=None):
+        """
+        Evaluates the declarative status calculation rule of a switch.
+
+        Arguments:
+            switch (SwitchModel): The switch with a status calculation rule.
+            now (datetime): The current time seen by the rule, None for the actual current time.
+            location_id (int): The location id of the switch place if already known.
+            shared_results (dict): Results of data calls shared between the switches evaluated in one batch.
+
+        Returns:
+            str: The status of the switch, raises a SwitchRuleError if the rule is invalid or data is missing.
+        """
+        now = now if now is not None else datetime.now()
+        data_functions = self._get_data_functions(switch, location_id, shared_results)
+        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_end = day_start + timedelta(days=1)
+
+        def load_prices():
+            return data_functions['get_electricity_price_series'](day_start, day_end)
+
+        def load_weather():
+            return data_functions['get_weather_series_for_switch_location'](
+                now - SwitchRuleEngine.WEATHER_LOOKAROUND, now + SwitchRuleEngine.WEATHER_LOOKAROUND)
+
+        return self.switch_rule_engine.evaluate(self._get_status_calculation_rule(switch), now, load_prices,
+                                                load_weather)
+
+    def _evaluate_switch_logic(self, switch, now=None, location_id=None, shared_results=None):
+        """
+        Executes the status calculation rule or logic of a switch.
+
+        Arguments:
+            switch (SwitchModel): The switch with status calculation logic.
+            now (datetime): The current time seen by the logic, None for the actual current time.
+            location_id (int): The location id of the switch place if already known.
+            shared_results (dict): Results of data calls shared between the switches evaluated in one batch.
+
+        Returns:
+            str: The status of the switch, exceptions raised by the logic are propagated.
+        """
+        if self._get_status_calculation_rule(switch) is not None:
+            return self._evaluate_switch_rule(switch, now, location_id, shared_results)
+        if self.switch_logic_evaluator.enabled:
+            return self.switch_logic_evaluator.evaluate(
+                switch.status_calculation_logic, self._get_data_functions(switch, location_id, shared_results), now)
+        global_scope = self._get_allowed_scope(switch, now, location_id, shared_results)
+        compiled_logic = self.switch_logic_cache.get_compiled_logic(switch.id, switch.status_calculation_logic)
+        exec(compiled_logic, global_scope)
+        get_switch_status = global_scope["get_switch_status"]
+        return get_switch_status()
+
+    def is_decision_table_enabled(self):
+        """
+        Checks whether switch statuses are precomputed into the switch schedule.
+
+        The decision table executes the logic of every switch for every slot in the jobs process, so it requires the
+        switch logic evaluator, which bounds the time and memory of each execution. A warning is logged once if the
+        decision table is enabled without it.
+
+        Returns:
+            bool: True if the decision table and the switch logic evaluator are enabled in the configuration.
+        """
+        if str(self.configuration.get(self.SWITCH_DECISION_TABLE_ENABLED_CONFIG_NAME, 'false')).lower() != 'true':
+            return False
+        if not self.switch_logic_evaluator.enabled:
+            if not self._decision_table_warning_logged:
+                self.logger.warning("The switch decision table requires the switch logic evaluator, which is "
+                                    "disabled. Switch statuses are calculated when requested.")
+                self._decision_table_warning_logged = True
+            return False
+        return True
+
+    def _get_current_slot_start(self):
+        """
+        Returns the start of the schedule slot containing the current time.
+
+        Returns:
+            datetime: The current time truncated to the hour.
+        """
+        return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+    def _get_scheduled_switch_status(self, switch):
+        """
+        Reads the precomputed status of the switch for the current slot.
+
+        Arguments:
+            switch (SwitchModel): The switch.
+
+        Returns:
+            str: The precomputed status or None if the decision table is disabled or the slot is not precomputed.
+        """
+        if not self.is_decision_table_enabled():
+            return None
+        try:
+            return self.repository_service.get_switch_schedule_value(switch.id, self._get_current_slot_start())
+        except Exception as e:
+            self.logger.error(f"Error reading schedule of switch {switch.uuid}. The exception: {e}")
+            return None
+
+    def _get_scheduled_switch_statuses(self, switch_ids):
+        """
+        Reads the precomputed statuses of several switches for the current slot.
+
+        Arguments:
+            switch_ids (list[int]): The ids of the switches.
+
+        Returns:
+            dict: The precomputed statuses keyed by switch id, empty if the decision table is disabled.
+        """
+        if not switch_ids or not self.is_decision_table_enabled():
+            return {}
+        try:
+            return self.repository_service.get_switch_schedule_values(switch_ids, self._get_current_slot_start())
+        except Exception as e:
+            self.logger.error(f"Error reading schedules of switches {switch_ids}. The exception: {e}")
+            return {}
+
+    def regenerate_switch_decision_tables(self):
+        """
+        Precomputes the statuses of all switches for each hourly slot of the decision table horizon.
+
+        The logic of every switch is executed once per slot with the start of the slot as the current time, which
+        assumes the logic returns the same status for the whole hour. Slots whose evaluation fails are left out of
+        the schedule, so their status is calculated when requested, and one error is logged per switch.
+        """
+        if not self.is_decision_table_enabled():
+            return
+        horizon_in_hours = int(self.configuration.get(self.SWITCH_DECISION_TABLE_HORIZON_IN_HOURS_CONFIG_NAME,
+                                                      self.DEFAULT_SWITCH_DECISION_TABLE_HORIZON_IN_HOURS))
+        current_slot_start = self._get_current_slot_start()
+        slot_starts = [current_slot_start + self.SCHEDULE_SLOT_LENGTH * index for index in range(horizon_in_hours)]
+
+        for switch in self.repository_service.get_switches_with_logic():
+            schedule = {}
+            failed_slot_starts = []
+            last_exception = None
+            for slot_start in slot_starts:
+                try:
+                    schedule[slot_start] = self._evaluate_switch_logic(switch, slot_start)
+                except Exception as e:
+                    failed_slot_starts.append(slot_start)
+                    last_exception = e
+            if failed_slot_starts:
+                self.logger.error(f"Error precomputing status of switch {switch.uuid} for {len(failed_slot_starts)} "
+                                  f"of {len(slot_starts)} slots starting {failed_slot_starts[0]}. "
+                                  f"The last exception: {last_exception}")
+            try:
+                self.repository_service.replace_switch_schedule(switch.id, schedule)
+            except Exception as e:
+                self.logger.error(f"Error storing schedule of switch {switch.uuid}. The exception: {e}")
+        self.logger.info("Completed the regeneration of switch decision tables.")
+
+    def maintain_switch_data_partitions(self):
+        """
+        Creates the switch data partitions of the current and the upcoming months and drops the partitions older than
+        the retention period. A retention period of 0 months keeps all switch data.
+        """
+        months_ahead = int(self.configuration.get(self.SWITCH_DATA_PARTITION_MONTHS_AHEAD_CONFIG_NAME,
+                                                  self.DEFAULT_SWITCH_DATA_PARTITION_MONTHS_AHEAD))
+        retention_in_months = int(self.configuration.get(self.SWITCH_DATA_RETENTION_IN_MONTHS_CONFIG_NAME,
+                                                         self.DEFAULT_SWITCH_DATA_RETENTION_IN_MONTHS))
+        now = datetime.now()
+        try:
+            created_partitions = self.repository_service.create_switch_data_partitions(now, months_ahead + 1)
+            if created_partitions:
+                self.logger.info(f"Created switch data partitions {created_partitions}.")
+            if retention_in_months > 0:
+                retention_start = _get_month_start(now, -retention_in_months)
+                dropped_partitions = self.repository_service.drop_switch_data_partitions(retention_start)
+                if dropped_partitions:
+                    self.logger.info(f"Dropped switch data partitions {dropped_partitions}.")
+        except Exception as e:
+            self.logger.error(f"Error maintaining switch data partitions. The exception: {e}")
+
     def test_switch_status_calculation_logic(self, switch_status_calculation_logic):
         """
         Tests the status calculation logic for the switch.
@@ -124,12 +498,16 @@ class SwitchService:
             str: The status of the switch.
             str: Error message if any arise
         """
-        global_scope = self._get_allowed_scope()
         error_message = None
         try:
-            exec(switch_status_calculation_logic, global_scope)
-            get_switch_status = global_scope["get_switch_status"]
-            switch_status = get_switch_status()
+            if self.switch_logic_evaluator.enabled:
+                switch_status = self.switch_logic_evaluator.evaluate(switch_status_calculation_logic,
+                                                                     self._get_data_functions())
+            else:
+                global_scope = self._get_allowed_scope()
+                exec(switch_status_calculation_logic, global_scope)
+                get_switch_status = global_scope["get_switch_status"]
+                switch_status = get_switch_status()
         except Exception as e:
             self.logger.error(f"Error calculating switch status. The exception: {e}")
             switch_status = SwitchModel.SWITCH_VALUE_IF_ERROR_OCCURRED
@@ -151,14 +529,16 @@ class SwitchService:
 
     def update_switch_data(self, switch, user_id, uuid):
         """
-        Updates the switch data in the database.
+        Updates the switch data in the database and drops the precomputed schedule of the switch.
 
         Arguments:
             switch (SwitchModel): The switch data to update.
             user_id (int): The id of the user.
             uuid (str): The uuid of the switch.
         """
-        self.repository_service.update_switch_data(switch, user_id, uuid)
+        switch_id = self.repository_service.update_switch_data(switch, user_id, uuid)
+        self.switch_logic_cache.invalidate(switch_id)
+        self.repository_service.delete_switch_schedule(switch_id)
 
     def get_switch_data(self, switch_id):
         """
@@ -193,7 +573,35 @@ class SwitchService:
             switch_uuid (str): The uuid of the switch.
             user_id (str): The id of the user.
         """
-        self.repository_service.delete_switch(switch_uuid, user_id)
+        switch_id = self.repository_service.delete_switch(switch_uuid, user_id)
+        self.switch_logic_cache.invalidate(switch_id)
+
+    def store_switch_readings(self, switch_uuid, user_id, readings):
+        """
+        Stores readings uploaded for a switch, ignoring readings that are already stored.
+
+        Timezone aware reading times are converted to naive local times, like the times of the polled statuses. The
+        rollups of the switch are marked dirty from the earliest stored reading, so uploaded offline readings are
+        reflected in the switch data history.
+
+        Arguments:
+            switch_uuid (str): The uuid of the switch.
+            user_id (int): The id of the user owning the switch.
+            readings (list[dict]): The readings with data_type, log_cre_date, value_text and value_number.
+
+        Returns:
+            dict: Number of received, stored and duplicate readings, raises a ValueError if the switch does not exist.
+        """
+        switch = self.repository_service.get_switch_for_user(switch_uuid, user_id)
+        rows = [{'switch_id': switch.id, 'data_type': reading['data_type'],
+                 'log_cre_date': reading['log_cre_date'].astimezone().replace(tzinfo=None)
+                 if reading['log_cre_date'].tzinfo else reading['log_cre_date'],
+                 'value_text': reading.get('value_text'), 'value_number': reading.get('value_number')}
+                for reading in readings]
+        stored_count = self.repository_service.store_switch_operational_data_ignoring_duplicates(rows)
+        if stored_count:
+            self.repository_service.mark_switch_data_rollups_dirty(switch.id, min(row['log_cre_date'] for row in rows))
+        return {'received': len(rows), 'stored': stored_count, 'duplicates': len(rows) - stored_count}
 
     def store_switch_operational_data(self, switch_data):
         """
@@ -1,6 +1,8 @@
 import logging
 from abc import ABC, abstractmethod
 from src.configuration.base_configuration import BaseConfiguration
+from src.http_client.http_client import HttpClient
+from src.http_client.payload_fingerprint import calculate_payload_fingerprint
 
 
 class BaseWeatherAPI(ABC):
@@ -12,11 +14,15 @@ class BaseWeatherAPI(ABC):
 
     Attributes:
         configuration (BaseConfiguration): A configuration object which stores API keys, endpoints, and other necessary configuration settings.
+        http_client (HttpClient): The shared HTTP client used to send requests to the weather service.
         logger (Logger): A logger object used to log messages to the console or a file.
+        MAX_LOCATIONS_PER_REQUEST (int): The number of locations the API can fetch with a single request.
     """
+    MAX_LOCATIONS_PER_REQUEST = 1
 
-    def __init__(self, configuration: BaseConfiguration):
+    def __init__(self, configuration: BaseConfiguration, http_client: HttpClient):
         self.configuration = configuration
+        self.http_client = http_client
         self.logger = logging.getLogger(__name__)
 
     @abstractmethod
@@ -32,3 +38,33 @@ class BaseWeatherAPI(ABC):
             This method should return a structured dictionary of weather data specific to the implementation.
         """
         pass
+
+    def get_weather_data_many(self, locations):
+        """
+        Retrieves weather data for several geographical locations.
+
+        APIs that support fetching several locations with one request override this method together with
+        MAX_LOCATIONS_PER_REQUEST. The default implementation fetches the locations one by one.
+
+        Args:
+            locations (list[LocationModel]): The locations for which to retrieve weather data.
+
+        Returns:
+            Raw weather data of all locations, which the matching processor splits with process_raw_data_many.
+        """
+        return [self.get_weather_data(location.latitude, location.longitude) for location in locations]
+
+    def get_payload_fingerprint(self, raw_data):
+        """
+        Calculates the fingerprint of raw weather data, used to skip processing of unchanged data.
+
+        APIs whose responses contain values that change on every request without changing the weather data
+        override this method to leave those values out.
+
+        Args:
+            raw_data: Raw weather data returned by get_weather_data or get_weather_data_many.
+
+        Returns:
+            str: Fingerprint of the raw data, None if there is no data.
+        """
+        return calculate_payload_fingerprint(raw_data)
@@ -1,4 +1,3 @@
-import requests
 from src.weather_service.api.base_weather_api import BaseWeatherAPI
 from requests.exceptions import RequestException
 
@@ -15,11 +14,15 @@ class OpenMeteoWeatherAPI(BaseWeatherAPI):
         FORECAST_DAYS (str): Specifies the number of days to forecast.
         TIMEZONE (str): Specifies the timezone for the forecast data.
         OPEN_METEO_URN_CONFIG_NAME (str): Configuration key to retrieve the Open Meteo API URL.
+        MAX_LOCATIONS_PER_REQUEST (int): The number of coordinates sent in a single Open Meteo request.
+        VOLATILE_RESPONSE_KEYS (tuple): Response keys that change on every request and are left out of fingerprints.
     """
     WEATHER_DATA_TYPES = 'cloud_cover,temperature,sunshine_duration'
     FORECAST_DAYS = '3'
     TIMEZONE = 'EET'
     OPEN_METEO_URN_CONFIG_NAME = 'open_meteo_url'
+    MAX_LOCATIONS_PER_REQUEST = 50
+    VOLATILE_RESPONSE_KEYS = ('generationtime_ms',)
 
     def get_weather_data(self, latitude, longitude):
         """
@@ -44,7 +47,7 @@ class OpenMeteoWeatherAPI(BaseWeatherAPI):
                                         forecast_days=self.FORECAST_DAYS,
                                         timezone=self.TIMEZONE)
             self.logger.debug(f'Fetching weather data from Open Meteo API: {url}')
-            resp = requests.get(url)
+            resp = self.http_client.get(url)
         except KeyError as e:
             self.logger.error(f'Failed to construct Open Meteo API URL: {e}')
             return None
@@ -60,3 +63,51 @@ class OpenMeteoWeatherAPI(BaseWeatherAPI):
             self.logger.error(f'Failed to parse JSON response from Open Meteo: {e}')
             return None
         return weather_data
+
+    def get_weather_data_many(self, locations):
+        """
+        Fetches weather data of several locations from the Open Meteo API with a single request.
+
+        Open Meteo accepts comma separated latitude and longitude lists and responds with a list containing
+        one forecast per coordinate pair in the requested order. A single location is answered with a plain object.
+
+        Args:
+            locations (list[LocationModel]): The locations for which to retrieve weather data.
+
+        Returns:
+            list | dict: JSON response of the Open Meteo API.
+            Returns None if the request fails or the response cannot be parsed.
+        """
+        latitudes = ','.join(str(location.latitude) for location in locations)
+        longitudes = ','.join(str(location.longitude) for location in locations)
+        return self.get_weather_data(latitudes, longitudes)
+
+    def get_payload_fingerprint(self, raw_data):
+        """
+        Calculates the fingerprint of an Open Meteo response without the request specific generation time.
+
+        Args:
+            raw_data (list | dict): JSON response of the Open Meteo API.
+
+        Returns:
+            str: Fingerprint of the weather data in the response, None if there is no data.
+        """
+        if isinstance(raw_data, list):
+            raw_data = [self._remove_volatile_keys(location_data) for location_data in raw_data]
+        else:
+            raw_data = self._remove_volatile_keys(raw_data)
+        return super().get_payload_fingerprint(raw_data)
+
+    def _remove_volatile_keys(self, location_data):
+        """
+        Removes the values that change on every request from the response of a single location.
+
+        Args:
+            location_data (dict): Open Meteo response of a single location.
+
+        Returns:
+            dict: The response without VOLATILE_RESPONSE_KEYS.
+        """
+        if not isinstance(location_data, dict):
+            return location_data
+        return {key: value for key, value in location_data.items() if key not in self.VOLATILE_RESPONSE_KEYS}
@@ -1,5 +1,9 @@
+from collections import namedtuple
 from datetime import datetime
 
+WeatherRecord = namedtuple('WeatherRecord', ['datetime', 'cloud_cover', 'temperature', 'latitude', 'longitude',
+                                             'sunshine_duration', 'location_id'])
+
 
 class WeatherModel:
     """
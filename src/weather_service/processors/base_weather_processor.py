@@ -32,3 +32,17 @@ class BaseWeatherProcessor(ABC):
             A list or other collection of processed data objects, typically instances of a data model.
         """
         pass
+
+    def process_raw_data_many(self, raw_data, location_ids):
+        """
+        Processes raw weather data fetched for several locations with get_weather_data_many.
+
+        Args:
+            raw_data: The raw data of all locations as returned by get_weather_data_many.
+            location_ids (list[int]): The IDs of the locations in the order they were requested.
+
+        Returns:
+            list: One processed collection per location, in the order of location_ids.
+        """
+        return [self.process_raw_data(location_raw_data, location_id)
+                for location_raw_data, location_id in zip(raw_data, location_ids)]
@@ -63,3 +63,22 @@ class OpenMeteoWeatherProcessor(BaseWeatherProcessor):
                 return None
 
         return weather_data
+
+    def process_raw_data_many(self, raw_data, location_ids):
+        """
+        Splits an Open Meteo response for several coordinates into WeatherModel lists per location.
+
+        Args:
+            raw_data (list | dict): The raw JSON data received from the Open Meteo API for several coordinates.
+            location_ids (list[int]): The IDs of the locations in the order their coordinates were requested.
+
+        Returns:
+            list[list[WeatherModel]]: One list of WeatherModel instances per location, in the order of location_ids.
+            Returns None if the response does not contain one forecast per requested location.
+        """
+        if isinstance(raw_data, dict):
+            raw_data = [raw_data]
+        if not isinstance(raw_data, list) or len(raw_data) != len(location_ids):
+            self.logger.error(f'Open Meteo response does not contain weather data for all {len(location_ids)} locations')
+            return None
+        return super().process_raw_data_many(raw_data, location_ids)
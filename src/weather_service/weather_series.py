@@ -0,0 +1,129 @@
+from bisect import bisect_left, bisect_right
+
+
+class WeatherSeries:
+    """
+    Read-only columnar representation of the weather data of a location.
+
+    The datetimes and the values of each weather attribute are kept in parallel tuples ordered by datetime, so windows
+    are found with binary searches and readers share the series without copying model objects. Each value is valid
+    from its datetime until the datetime of the next one, missing values are None.
+
+    Attributes:
+        datetimes (tuple[datetime]): The datetimes of the weather data in ascending order.
+        temperatures (tuple[float]): The air temperatures in degrees Celsius in the order of the datetimes.
+        cloud_covers (tuple[float]): The percentages of the sky occluded by clouds in the order of the datetimes.
+        sunshine_durations (tuple[float]): The sunshine durations in the order of the datetimes.
+    """
+    __slots__ = ('datetimes', 'temperatures', 'cloud_covers', 'sunshine_durations')
+
+    def __init__(self, datetimes, temperatures, cloud_covers, sunshine_durations):
+        """
+        Initializes the WeatherSeries.
+
+        Args:
+            datetimes (iterable[datetime]): The datetimes of the weather data in ascending order.
+            temperatures (iterable[float]): The air temperatures in the order of the datetimes.
+            cloud_covers (iterable[float]): The cloud covers in the order of the datetimes.
+            sunshine_durations (iterable[float]): The sunshine durations in the order of the datetimes.
+        """
+        self.datetimes = tuple(datetimes)
+        self.temperatures = tuple(temperatures)
+        self.cloud_covers = tuple(cloud_covers)
+        self.sunshine_durations = tuple(sunshine_durations)
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Creates a WeatherSeries from weather records of a single location.
+
+        Args:
+            records (iterable[WeatherModel]): The weather records in any order.
+
+        Returns:
+            WeatherSeries: The series of the records ordered by datetime.
+        """
+        ordered_records = sorted(records, key=lambda record: record.datetime)
+        return cls((record.datetime for record in ordered_records),
+                   (record.temperature for record in ordered_records),
+                   (record.cloud_cover for record in ordered_records),
+                   (record.sunshine_duration for record in ordered_records))
+
+    def __len__(self):
+        return len(self.datetimes)
+
+    def get_window(self, start_date, end_date=None):
+        """
+        Returns the part of the series from start_date up to end_date.
+
+        Args:
+            start_date (datetime): Weather data at or after this date is returned.
+            end_date (datetime): Weather data before this date is returned, None for all data after start_date.
+
+        Returns:
+            WeatherSeries: The weather data of the window.
+        """
+        start_index = bisect_left(self.datetimes, start_date)
+        end_index = len(self.datetimes) if end_date is None else bisect_left(self.datetimes, end_date)
+        window = slice(start_index, end_index)
+        return WeatherSeries(self.datetimes[window], self.temperatures[window], self.cloud_covers[window],
+                             self.sunshine_durations[window])
+
+    def _get_index_at(self, moment):
+        """
+        Returns the index of the weather data valid at a moment, None if the series starts after it.
+        """
+        index = bisect_right(self.datetimes, moment) - 1
+        return index if index >= 0 else None
+
+    def get_temperature_at(self, moment):
+        """
+        Returns the temperature valid at a moment.
+
+        Args:
+            moment (datetime): The moment.
+
+        Returns:
+            float: The temperature of the newest datetime at or before the moment, None if the series starts after it.
+        """
+        index = self._get_index_at(moment)
+        return None if index is None else self.temperatures[index]
+
+    def get_cloud_cover_at(self, moment):
+        """
+        Returns the cloud cover valid at a moment.
+
+        Args:
+            moment (datetime): The moment.
+
+        Returns:
+            float: The cloud cover of the newest datetime at or before the moment, None if the series starts after it.
+        """
+        index = self._get_index_at(moment)
+        return None if index is None else self.cloud_covers[index]
+
+    def get_sunshine_duration_at(self, moment):
+        """
+        Returns the sunshine duration valid at a moment.
+
+        Args:
+            moment (datetime): The moment.
+
+        Returns:
+            float: The sunshine duration of the newest datetime at or before the moment, None if the series starts
+                after it.
+        """
+        index = self._get_index_at(moment)
+        return None if index is None else self.sunshine_durations[index]
+
+    def get_temperature_range(self):
+        """
+        Returns the lowest, the average and the highest temperature of the series.
+
+        Returns:
+            tuple: The minimum, average and maximum of the known temperatures, (None, None, None) if none is known.
+        """
+        temperatures = [temperature for temperature in self.temperatures if temperature is not None]
+        if not temperatures:
+            return None, None, None
+        return min(temperatures), sum(temperatures) / len(temperatures), max(temperatures)
@@ -1,7 +1,14 @@
 import inject
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from src.cache_service.data_change_notifier import DataChangeNotifier
+from src.cache_service.horizon_cache import HorizonCache
+from src.configuration.base_configuration import BaseConfiguration
+from src.http_client.rate_limiter import RateLimiter
 from src.weather_service.api.base_weather_api import BaseWeatherAPI
 from src.weather_service.processors.base_weather_processor import BaseWeatherProcessor
+from src.weather_service.weather_series import WeatherSeries
 from src.repository_service.weather_repository_service import WeatherRepositoryService
 from src.location_service.location_service import LocationService
 
@@ -19,12 +26,28 @@ class WeatherService:
         weather_processor (BaseWeatherProcessor): The processor for converting raw data into structured data.
         repository_service (WeatherRepositoryService): The service for storing and retrieving processed weather data.
         location_service (BaseLocationService): The service for obtaining the current geographic location.
+        configuration (BaseConfiguration): Configuration instance to fetch the regeneration concurrency settings.
+        payload_fingerprints (dict): Fingerprints of the last stored raw data keyed by the location ids of the batch.
+        weather_cache (HorizonCache): Cache of the weather data read by switch logic, keyed by location id.
+        data_change_notifier (DataChangeNotifier): Channel announcing stored weather data to the other processes.
+        DATA_SET_NAME (str): Name of the weather data in the data change notifications.
+        MAX_WEATHER_DATA_WINDOW (timedelta): The longest time window returned for a single location.
     """
+    MAX_WEATHER_DATA_WINDOW = timedelta(days=7)
+    DATA_SET_NAME = 'weather'
+    WEATHER_DATA_REGENERATION_CONCURRENCY_CONFIG_NAME = 'weather_data_regeneration_concurrency'
+    WEATHER_API_RATE_LIMIT_PER_SECOND_CONFIG_NAME = 'weather_api_rate_limit_per_second'
+    DEFAULT_WEATHER_DATA_REGENERATION_CONCURRENCY = 8
+    WEATHER_DATA_CACHE_TTL_IN_SECONDS_CONFIG_NAME = 'weather_data_cache_ttl_in_seconds'
+    DEFAULT_WEATHER_API_RATE_LIMIT_PER_SECOND = 5
+    DEFAULT_WEATHER_DATA_CACHE_TTL_IN_SECONDS = 300
 
     @inject.autoparams()
     def __init__(self, weather_api: BaseWeatherAPI, weather_processor: BaseWeatherProcessor,
                  repository_service: WeatherRepositoryService,
-                 location_service: LocationService):
+                 location_service: LocationService,
+                 configuration: BaseConfiguration,
+                 data_change_notifier: DataChangeNotifier):
         """
         Initializes the WeatherService with the necessary components for managing weather data.
 
@@ -33,49 +56,197 @@ class WeatherService:
             weather_processor (BaseWeatherProcessor): The processor to handle and convert raw weather data.
             repository_service (BaseRepositoryService): The repository to store and retrieve weather data.
             location_service (BaseLocationService): The service to obtain geographical location data.
+            configuration (BaseConfiguration): Configuration service for retrieving the regeneration concurrency and
+                cache settings.
+            data_change_notifier (DataChangeNotifier): The channel invalidating the caches of other processes.
         """
         self.weather_api = weather_api
         self.weather_processor = weather_processor
         self.repository_service = repository_service
         self.location_service = location_service
+        self.configuration = configuration
+        self.payload_fingerprints = {}
+        self.weather_cache = HorizonCache(float(configuration.get(self.WEATHER_DATA_CACHE_TTL_IN_SECONDS_CONFIG_NAME,
+                                                                  self.DEFAULT_WEATHER_DATA_CACHE_TTL_IN_SECONDS)))
+        self.data_change_notifier = data_change_notifier
+        self.data_change_notifier.subscribe(self.DATA_SET_NAME, self.weather_cache.invalidate)
         self.logger = logging.getLogger(__name__)
 
     def regenerate_weather_data(self):
         """
         Regenerates weather data for all locations by fetching, processing, and storing new weather data.
+
+        Locations are grouped into batches of up to MAX_LOCATIONS_PER_REQUEST of the weather API, so APIs that
+        support several coordinates per request are called once per batch. The batches are fetched and processed
+        concurrently by a thread pool, limited by the configured concurrency and the rate limit of the weather API.
+        Each batch is stored with one write by the calling thread as soon as its fetch completes. Batches whose raw
+        data is unchanged since their last successful store are neither processed nor stored again. If any weather
+        data changed, the change is announced once to the other processes, so their caches are invalidated.
+
+        Returns:
+            bool: True if any weather data was inserted or changed.
         """
         locations = self.location_service.get_all_locations()
-        for location in locations:
-            location_id = location.id
-            latitude = location.latitude
-            longitude = location.longitude
-            self.logger.info(
-                f"Regenerating weather data for location ID {location_id} at coordinates ({latitude}, {longitude}).")
+        concurrency = int(self.configuration.get(self.WEATHER_DATA_REGENERATION_CONCURRENCY_CONFIG_NAME,
+                                                 self.DEFAULT_WEATHER_DATA_REGENERATION_CONCURRENCY))
+        rate_limiter = RateLimiter(float(self.configuration.get(self.WEATHER_API_RATE_LIMIT_PER_SECOND_CONFIG_NAME,
+                                                                self.DEFAULT_WEATHER_API_RATE_LIMIT_PER_SECOND)))
+        data_changed = False
+        batch_size = max(self.weather_api.MAX_LOCATIONS_PER_REQUEST, 1)
+        location_batches = [locations[i:i + batch_size] for i in range(0, len(locations), batch_size)]
 
-            try:
-                data = self.weather_api.get_weather_data(latitude, longitude)
-                self.logger.debug(f"Received raw weather data for location ID {location_id}: {data}")
+        with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix='weather-fetch') as executor:
+            futures = {executor.submit(self._fetch_weather_data, location_batch, rate_limiter): location_batch
+                       for location_batch in location_batches}
+            for future in as_completed(futures):
+                location_ids = [location.id for location in futures[future]]
+                try:
+                    fetch_result = future.result()
+                    if fetch_result is None:
+                        self.logger.info(f"Weather data for location IDs {location_ids} is unchanged, skipping.")
+                        continue
+                    processed_data, payload_fingerprint = fetch_result
+                    result = self.repository_service.store_weather_data(processed_data)
+                    self.weather_cache.invalidate()
+                    data_changed = data_changed or bool(result.inserted or result.updated)
+                    self.payload_fingerprints[tuple(location_ids)] = payload_fingerprint
+                    self.logger.info(f"Successfully stored weather data for location IDs {location_ids}: "
+                                     f"{result.inserted} inserted, {result.updated} updated.")
+                except Exception as e:
+                    self.logger.error(f"Failed to regenerate weather data for location IDs {location_ids}. Error: {e}")
 
-                processed_data = self.weather_processor.process_raw_data(data, location_id)
-                self.logger.debug(f"Processed weather data for location ID {location_id}: {processed_data}")
+        if data_changed:
+            self.data_change_notifier.publish(self.DATA_SET_NAME)
+        self.logger.info("Completed the regeneration of weather data for all locations.")
+        return data_changed
 
-                self.repository_service.store_weather_data(processed_data)
-                self.logger.info(f"Successfully stored weather data for location ID {location_id}.")
+    def _fetch_weather_data(self, locations, rate_limiter):
+        """
+        Fetches and processes the weather data of a batch of locations.
 
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to regenerate weather data for location ID {location_id} at coordinates ({latitude}, {longitude}). Error: {e}")
+        Args:
+            locations (list[LocationModel]): The locations to fetch the weather data for.
+            rate_limiter (RateLimiter): The rate limiter of the weather API.
 
-        self.logger.info("Completed the regeneration of weather data for all locations.")
+        Returns:
+            tuple: A list of WeatherModel instances of all locations in the batch and the fingerprint of the raw
+                data, None if the raw data is unchanged since the batch was last stored.
+        """
+        location_ids = [location.id for location in locations]
+        self.logger.info(f"Regenerating weather data for location IDs {location_ids}.")
+        rate_limiter.acquire()
+        if len(locations) == 1:
+            location = locations[0]
+            data = self.weather_api.get_weather_data(location.latitude, location.longitude)
+            self.logger.debug(f"Received raw weather data for location ID {location.id}: {data}")
+            payload_fingerprint = self.weather_api.get_payload_fingerprint(data)
+            if self._is_payload_unchanged(payload_fingerprint, location_ids):
+                return None
+            processed_data = self.weather_processor.process_raw_data(data, location.id)
+            self.logger.debug(f"Processed weather data for location ID {location.id}: {processed_data}")
+            return processed_data, payload_fingerprint
+
+        data = self.weather_api.get_weather_data_many(locations)
+        self.logger.debug(f"Received raw weather data for location IDs {location_ids}: {data}")
+        payload_fingerprint = self.weather_api.get_payload_fingerprint(data)
+        if self._is_payload_unchanged(payload_fingerprint, location_ids):
+            return None
+        processed_data_per_location = self.weather_processor.process_raw_data_many(data, location_ids)
+        if processed_data_per_location is None:
+            raise ValueError(f"Could not process weather data for location IDs {location_ids}")
+
+        processed_data = []
+        for location_id, location_processed_data in zip(location_ids, processed_data_per_location):
+            if location_processed_data is None:
+                self.logger.error(f"Could not process weather data for location ID {location_id}.")
+                payload_fingerprint = None
+                continue
+            processed_data.extend(location_processed_data)
+        self.logger.debug(f"Processed weather data for location IDs {location_ids}: {processed_data}")
+        return processed_data, payload_fingerprint
+
+    def _is_payload_unchanged(self, payload_fingerprint, location_ids):
+        """
+        Checks whether the raw data of a batch equals the raw data of its last successful store.
+
+        Args:
+            payload_fingerprint (str): The fingerprint of the raw data of the batch.
+            location_ids (list[int]): The location ids of the batch.
+
+        Returns:
+            bool: True if the raw data is unchanged.
+        """
+        return payload_fingerprint is not None and payload_fingerprint == self.payload_fingerprints.get(
+            tuple(location_ids))
 
     def get_weather_data_after_date(self, date):
         """
         Retrieves weather data stored in the repository that was collected after a specified date.
 
+        The data is served from the weather cache, which is reloaded from the repository when it expires or new
+        weather data is stored.
+
         Args:
             date (datetime): The date after which to retrieve weather data.
 
         Returns:
             list: A list of WeatherModel instances representing the weather data collected after the specified date.
         """
-        return self.repository_service.get_weather_data_after_date(date)
+        if not self.weather_cache.enabled:
+            return self.repository_service.get_weather_data_after_date(date)
+        return self.weather_cache.get_records(None, date, None, self.repository_service.get_weather_data_after_date)
+
+    def get_weather_data_for_location(self, location_id, start_date, end_date=None):
+        """
+        Retrieves weather data of a single location within a bounded time window.
+
+        The window is limited to MAX_WEATHER_DATA_WINDOW after the start date, so callers can not pull in
+        an unbounded amount of forecast data. The data is served from the weather cache of the location.
+
+        Args:
+            location_id (int): The id of the location.
+            start_date (datetime): The date after which to retrieve weather data.
+            end_date (datetime): The date until which to retrieve weather data. Defaults to the longest allowed window.
+
+        Returns:
+            list: A list of WeatherModel instances of the location ordered by datetime.
+        """
+        max_end_date = start_date + self.MAX_WEATHER_DATA_WINDOW
+        if end_date is None or end_date > max_end_date:
+            end_date = max_end_date
+        if not self.weather_cache.enabled:
+            return self.repository_service.get_weather_data_for_location(location_id, start_date, end_date)
+        return self.weather_cache.get_records(
+            location_id, start_date, end_date,
+            lambda horizon_start: self.repository_service.get_weather_data_for_location(location_id, horizon_start,
+                                                                                        datetime.max))
+
+    def get_weather_series_for_location(self, location_id, start_date, end_date=None):
+        """
+        Retrieves the weather data of a single location within a bounded time window as a WeatherSeries.
+
+        The window is limited like in get_weather_data_for_location. The series of the whole cached weather data of
+        the location is built once per cache load and windows of it are handed out, so readers do not convert the
+        weather records again.
+
+        Args:
+            location_id (int): The id of the location.
+            start_date (datetime): Weather data at or after this date is returned.
+            end_date (datetime): Weather data before this date is returned. Defaults to the longest allowed window.
+
+        Returns:
+            WeatherSeries: The weather data of the location within the window.
+        """
+        max_end_date = start_date + self.MAX_WEATHER_DATA_WINDOW
+        if end_date is None or end_date > max_end_date:
+            end_date = max_end_date
+        after_date = start_date - timedelta(microseconds=1)
+        if not self.weather_cache.enabled:
+            records = self.repository_service.get_weather_data_for_location(location_id, after_date, end_date)
+            return WeatherSeries.from_records(records).get_window(start_date, end_date)
+        snapshot = self.weather_cache.get_snapshot(
+            location_id, after_date,
+            lambda horizon_start: self.repository_service.get_weather_data_for_location(location_id, horizon_start,
+                                                                                        datetime.max))
+        return snapshot.get_representation('weather_series', WeatherSeries.from_records).get_window(start_date,
+                                                                                                    end_date)
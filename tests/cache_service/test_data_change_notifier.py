@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import Mock
+from src.cache_service.data_change_notifier import DataChangeNotifier
+from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.data_version_repository_service import DataVersionRepositoryService
+
+
+class TestDataChangeNotifier(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_configuration = Mock(spec=BaseConfiguration)
+        self.mock_configuration.get.side_effect = lambda key, default=None: '0.01'
+        self.mock_repository_service = Mock(spec=DataVersionRepositoryService)
+        self.mock_repository_service.engine = Mock()
+        self.mock_repository_service.engine.dialect.name = 'sqlite'
+        self.data_change_notifier = DataChangeNotifier(self.mock_configuration, self.mock_repository_service)
+
+    def test_publish(self):
+        # Actions
+        self.data_change_notifier.publish('weather')
+
+        # Asserts
+        self.mock_repository_service.increment_data_version.assert_called_once_with('weather')
+
+    def test_publish_logs_errors(self):
+        # Setup
+        self.mock_repository_service.increment_data_version.side_effect = Exception('Boom!')
+
+        # Actions
+        self.data_change_notifier.publish('weather')
+
+        # Asserts
+        self.mock_repository_service.increment_data_version.assert_called_once_with('weather')
+
+    def test_check_for_changes_calls_subscribers_of_changed_data_sets(self):
+        # Setup
+        weather_callback = Mock()
+        price_callback = Mock(side_effect=Exception('Boom!'))
+        self.data_change_notifier.subscribe('weather', weather_callback)
+        self.data_change_notifier.subscribe('electricity_price', price_callback)
+        self.mock_repository_service.get_data_versions.side_effect = [{'weather': 1, 'electricity_price': 3},
+                                                                      {'weather': 2, 'electricity_price': 3}]
+
+        # Actions
+        first_changes = self.data_change_notifier.check_for_changes()
+        second_changes = self.data_change_notifier.check_for_changes()
+
+        # Asserts
+        self.assertEqual(first_changes, ['weather', 'electricity_price'])
+        self.assertEqual(second_changes, ['weather'])
+        self.assertEqual(weather_callback.call_count, 2)
+        price_callback.assert_called_once()
+
+    def test_start_ignores_versions_stored_before_start(self):
+        # Setup
+        callback = Mock()
+        self.data_change_notifier.subscribe('weather', callback)
+        self.mock_repository_service.get_data_versions.return_value = {'weather': 1}
+
+        # Actions
+        self.data_change_notifier.start()
+        self.data_change_notifier.stop()
+
+        # Asserts
+        callback.assert_not_called()
+        self.mock_repository_service.get_data_versions.assert_called()
@@ -0,0 +1,161 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from src.cache_service.horizon_cache import HorizonCache
+from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
+
+
+class TestHorizonCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = datetime.now()
+        self.records = [ElectricityPriceModel(self.now + timedelta(hours=hour), hour) for hour in range(-3, 5)]
+        self.loader = Mock(return_value=self.records)
+        self.horizon_cache = HorizonCache(ttl_in_seconds=60)
+
+    def test_get_records_loads_snapshot_once(self):
+        # Actions
+        first_result = self.horizon_cache.get_records('prices', self.now, None, self.loader)
+        second_result = self.horizon_cache.get_records('prices', self.now - timedelta(hours=2),
+                                                       self.now + timedelta(hours=2), self.loader)
+
+        # Asserts
+        self.loader.assert_called_once()
+        self.assertEqual([record.price for record in first_result], [1, 2, 3, 4])
+        self.assertEqual([record.price for record in second_result], [-1, 0, 1, 2])
+
+    def test_get_records_returns_copies(self):
+        # Setup
+        result = self.horizon_cache.get_records('prices', self.now, None, self.loader)
+
+        # Actions
+        result.clear()
+
+        # Asserts
+        self.assertEqual(len(self.horizon_cache.get_records('prices', self.now, None, self.loader)), 4)
+
+    @patch('src.cache_service.horizon_cache.time.monotonic')
+    def test_get_records_reloads_expired_snapshot(self, mock_monotonic):
+        # Setup
+        mock_monotonic.return_value = 100.0
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+
+        # Actions
+        mock_monotonic.return_value = 160.0
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+
+        # Asserts
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_get_records_reloads_for_earlier_start_date(self):
+        # Setup
+        self.horizon_cache.get_records('prices', datetime.now(), None, self.loader)
+        horizon_start = self.loader.call_args.args[0]
+
+        # Actions
+        self.horizon_cache.get_records('prices', horizon_start - timedelta(days=1), None, self.loader)
+
+        # Asserts
+        self.assertEqual(self.loader.call_count, 2)
+        self.assertEqual(self.loader.call_args.args[0], horizon_start - timedelta(days=1))
+
+    def test_get_records_does_not_cache_start_date_before_history_window(self):
+        # Setup
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+        old_start_date = self.now - HorizonCache.HISTORY_WINDOW - timedelta(days=1)
+
+        # Actions
+        self.horizon_cache.get_records('prices', old_start_date, None, self.loader)
+        self.horizon_cache.get_records('prices', old_start_date, None, self.loader)
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+
+        # Asserts
+        self.assertEqual(self.loader.call_count, 3)
+        self.assertEqual(self.loader.call_args.args[0], old_start_date)
+
+    def test_get_snapshot_loads_keys_in_parallel(self):
+        # Setup
+        loading = threading.Event()
+        release = threading.Event()
+
+        def slow_loader(horizon_start):
+            loading.set()
+            release.wait(2)
+            return self.records
+
+        thread = threading.Thread(target=self.horizon_cache.get_snapshot, args=('prices', self.now, slow_loader))
+        thread.start()
+        loading.wait(2)
+
+        # Actions
+        snapshot = self.horizon_cache.get_snapshot('other', self.now, self.loader)
+        loaded_while_blocked = thread.is_alive()
+        release.set()
+        thread.join(2)
+
+        # Asserts
+        self.assertTrue(loaded_while_blocked)
+        self.assertEqual(len(snapshot.records), 8)
+        self.loader.assert_called_once()
+
+    def test_invalidate(self):
+        # Setup
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+        self.horizon_cache.get_records('other', self.now, None, self.loader)
+
+        # Actions
+        self.horizon_cache.invalidate('prices')
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+        self.horizon_cache.get_records('other', self.now, None, self.loader)
+        self.horizon_cache.invalidate()
+        self.horizon_cache.get_records('other', self.now, None, self.loader)
+
+        # Asserts
+        self.assertEqual(self.loader.call_count, 4)
+
+    def test_invalidate_during_load_drops_snapshot(self):
+        # Setup
+        def loader(horizon_start):
+            self.horizon_cache.invalidate()
+            return self.records
+
+        # Actions
+        result = self.horizon_cache.get_records('prices', self.now, None, loader)
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+
+        # Asserts
+        self.assertEqual(len(result), 4)
+        self.loader.assert_called_once()
+
+    def test_invalidate_of_key_during_load_drops_snapshot_of_key_only(self):
+        # Setup
+        def loader(horizon_start):
+            self.horizon_cache.invalidate('prices')
+            return self.records
+
+        # Actions
+        self.horizon_cache.get_records('prices', self.now, None, loader)
+        self.horizon_cache.get_records('other', self.now, None, loader)
+        self.horizon_cache.get_records('prices', self.now, None, self.loader)
+        self.horizon_cache.get_records('other', self.now, None, self.loader)
+
+        # Asserts
+        self.loader.assert_called_once()
+        self.assertIn('other', self.horizon_cache._snapshots)
+
+    def test_get_representation_is_built_once_per_snapshot(self):
+        # Setup
+        factory = Mock(side_effect=lambda records: [record.price for record in records])
+
+        # Actions
+        snapshot = self.horizon_cache.get_snapshot('prices', self.now, self.loader)
+        first_result = snapshot.get_representation('prices', factory)
+        second_result = self.horizon_cache.get_snapshot('prices', self.now, self.loader).get_representation(
+            'prices', factory)
+
+        # Asserts
+        factory.assert_called_once()
+        self.assertIs(first_result, second_result)
+        self.assertEqual(first_result, list(range(-3, 5)))
+
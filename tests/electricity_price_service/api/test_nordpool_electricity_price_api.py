@@ -1,8 +1,9 @@
 import unittest
 from pathlib import Path
 import json
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from src.configuration.base_configuration import BaseConfiguration
+from src.http_client.http_client import HttpClient
 from src.electricity_price_service.api.nordpool_electricity_price_api import NordpoolElectricityPriceAPI
 
 class TestNordpoolElectricityPriceAPI(unittest.TestCase):
@@ -10,7 +11,8 @@ class TestNordpoolElectricityPriceAPI(unittest.TestCase):
     def setUp(self):
         self.mock_config = Mock(spec=BaseConfiguration)
         self.mock_config.get.return_value = 'http://some_url'
-        self.api = NordpoolElectricityPriceAPI(self.mock_config)
+        self.mock_http_client = Mock(spec=HttpClient)
+        self.api = NordpoolElectricityPriceAPI(self.mock_config, self.mock_http_client)
 
     def _get_expected_json(self, file_name):
         root_path = Path(__file__).parent.parent.parent
@@ -19,27 +21,25 @@ class TestNordpoolElectricityPriceAPI(unittest.TestCase):
             data = file.read()
         return json.loads(data)
 
-    @patch('src.electricity_price_service.api.nordpool_electricity_price_api.requests.get')
-    def test_get_electricity_price(self, mock_get):
+    def test_get_electricity_price(self):
 
         # Setup
         mock_response = Mock()
         expected_json = self._get_expected_json('nordpool_sample_response.json')
         mock_response.json.return_value = expected_json
-        mock_get.return_value = mock_response
+        self.mock_http_client.get.return_value = mock_response
 
         # Action
         result = self.api.get_electricity_price()
 
         # Assert
-        mock_get.assert_called_once_with('http://some_url')
+        self.mock_http_client.get.assert_called_once_with('http://some_url')
         self.assertEqual(result, expected_json)
 
-    @patch('src.electricity_price_service.api.nordpool_electricity_price_api.requests.get')
-    def test_get_electricity_price_request_exception(self, mock_get):
+    def test_get_electricity_price_request_exception(self):
 
         # Setup
-        mock_get.side_effect = Exception('Boom!')
+        self.mock_http_client.get.side_effect = Exception('Boom!')
 
         # Action
         result = self.api.get_electricity_price()
@@ -47,12 +47,11 @@ class TestNordpoolElectricityPriceAPI(unittest.TestCase):
         # Assert
         self.assertIsNone(result)
 
-    @patch('src.electricity_price_service.api.nordpool_electricity_price_api.requests.get')
-    def test_get_electricity_price_value_error(self, mock_get):
+    def test_get_electricity_price_value_error(self):
         # Setup
         mock_response = Mock()
         mock_response.json.side_effect = ValueError('Bang!')
-        mock_get.return_value = mock_response
+        self.mock_http_client.get.return_value = mock_response
 
         # Action
         result = self.api.get_electricity_price()
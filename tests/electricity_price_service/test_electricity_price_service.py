@@ -1,7 +1,12 @@
+from src.cache_service.data_change_notifier import DataChangeNotifier
+from src.configuration.base_configuration import BaseConfiguration
 from src.electricity_price_service.electricity_price_service import ElectricityPriceService
+from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
 from src.electricity_price_service.api.base_electricity_price_api import BaseElectricityPriceAPI
 from src.electricity_price_service.processors.base_electricity_price_processor import BaseElectricityPriceProcessor
+from src.repository_service.base_repository_service import UpsertResult
 from src.repository_service.electricity_price_repository_service import ElectricityPriceRepositoryService
+from datetime import datetime, timedelta
 from unittest.mock import Mock
 import unittest
 
@@ -11,7 +16,17 @@ class TestElectricityPriceService(unittest.TestCase):
         self.mock_api = Mock(spec=BaseElectricityPriceAPI)
         self.mock_processor = Mock(spec=BaseElectricityPriceProcessor)
         self.mock_repository = Mock(spec=ElectricityPriceRepositoryService)
-        self.service = ElectricityPriceService(self.mock_api, self.mock_processor, self.mock_repository)
+        self.mock_configuration = Mock(spec=BaseConfiguration)
+        self.configuration_values = {'electricity_price_data_cache_ttl_in_seconds': '0'}
+        self.mock_configuration.get.side_effect = lambda key, default=None: self.configuration_values.get(key, default)
+        self.mock_data_change_notifier = Mock(spec=DataChangeNotifier)
+        self.service = ElectricityPriceService(self.mock_api, self.mock_processor, self.mock_repository,
+                                               self.mock_configuration, self.mock_data_change_notifier)
+
+    def _create_cached_service(self):
+        self.configuration_values['electricity_price_data_cache_ttl_in_seconds'] = '300'
+        return ElectricityPriceService(self.mock_api, self.mock_processor, self.mock_repository,
+                                       self.mock_configuration, self.mock_data_change_notifier)
 
     def test_regenerate_electricity_price_date(self):
 
@@ -29,6 +44,53 @@ class TestElectricityPriceService(unittest.TestCase):
         self.mock_processor.process_data.assert_called_once_with(mock_raw_data)
         self.mock_repository.store_electricity_price_data.assert_called_once_with(mock_processed_data)
 
+    def test_regenerate_electricity_price_data_skips_unchanged_data(self):
+
+        # Setup
+        self.mock_api.get_electricity_price.return_value = 'raw data'
+        self.mock_api.get_payload_fingerprint.return_value = 'fingerprint'
+        self.mock_repository.store_electricity_price_data.return_value = UpsertResult(24, 0)
+
+        # Action
+        first_result = self.service.regenerate_electricity_price_data()
+        second_result = self.service.regenerate_electricity_price_data()
+
+        # Asserts
+        self.assertEqual(first_result, UpsertResult(24, 0))
+        self.assertEqual(second_result, UpsertResult(0, 0))
+        self.mock_processor.process_data.assert_called_once_with('raw data')
+        self.mock_repository.store_electricity_price_data.assert_called_once()
+
+    def test_regenerate_electricity_price_data_retries_after_failed_store(self):
+
+        # Setup
+        self.mock_api.get_payload_fingerprint.return_value = 'fingerprint'
+        self.mock_repository.store_electricity_price_data.side_effect = [Exception('Boom!'), UpsertResult(24, 0)]
+
+        # Action
+        with self.assertRaises(Exception):
+            self.service.regenerate_electricity_price_data()
+        result = self.service.regenerate_electricity_price_data()
+
+        # Asserts
+        self.assertEqual(result, UpsertResult(24, 0))
+        self.assertEqual(self.mock_repository.store_electricity_price_data.call_count, 2)
+
+    def test_regenerate_electricity_price_data_publishes_changes(self):
+
+        # Setup
+        self.mock_api.get_payload_fingerprint.side_effect = ['first', 'second']
+        self.mock_repository.store_electricity_price_data.side_effect = [UpsertResult(0, 0), UpsertResult(0, 2)]
+
+        # Action
+        self.service.regenerate_electricity_price_data()
+        self.service.regenerate_electricity_price_data()
+
+        # Asserts
+        self.mock_data_change_notifier.subscribe.assert_called_once_with(
+            'electricity_price', self.service.electricity_price_cache.invalidate)
+        self.mock_data_change_notifier.publish.assert_called_once_with('electricity_price')
+
     def test_get_electricity_price_data_after_date(self):
 
         # Setup
@@ -43,3 +105,66 @@ class TestElectricityPriceService(unittest.TestCase):
         self.mock_repository.get_electricity_price_data_after_date.assert_called_once_with(mock_date)
         self.assertEqual(result, mock_return_data)
 
+    def test_get_electricity_price_data_after_date_from_cache(self):
+
+        # Setup
+        service = self._create_cached_service()
+        now = datetime.now()
+        prices = [ElectricityPriceModel(now + timedelta(hours=hour), hour) for hour in [2, 0, 1]]
+        self.mock_repository.get_electricity_price_data_after_date.return_value = prices
+
+        # Action
+        first_result = service.get_electricity_price_data_after_date(now)
+        second_result = service.get_electricity_price_data_after_date(now + timedelta(minutes=30))
+
+        # Asserts
+        self.mock_repository.get_electricity_price_data_after_date.assert_called_once()
+        self.assertEqual([price.price for price in first_result], [1, 2])
+        self.assertEqual([price.price for price in second_result], [1, 2])
+
+    def test_regenerate_electricity_price_data_invalidates_cache(self):
+
+        # Setup
+        service = self._create_cached_service()
+        self.mock_repository.get_electricity_price_data_after_date.return_value = []
+        service.get_electricity_price_data_after_date(datetime.now())
+
+        # Action
+        service.regenerate_electricity_price_data()
+        service.get_electricity_price_data_after_date(datetime.now())
+
+        # Asserts
+        self.assertEqual(self.mock_repository.get_electricity_price_data_after_date.call_count, 2)
+
+    def test_get_electricity_price_series(self):
+
+        # Setup
+        start = datetime(2024, 5, 1)
+        prices = [ElectricityPriceModel(start + timedelta(hours=hour), hour) for hour in [2, 0, 1]]
+        self.mock_repository.get_electricity_price_data_after_date.return_value = prices
+
+        # Action
+        result = self.service.get_electricity_price_series(start, start + timedelta(hours=2))
+
+        # Asserts
+        self.mock_repository.get_electricity_price_data_after_date.assert_called_once_with(
+            start - timedelta(microseconds=1))
+        self.assertEqual(result.prices, (0, 1))
+
+    def test_get_electricity_price_series_from_cache(self):
+
+        # Setup
+        service = self._create_cached_service()
+        now = datetime.now().replace(minute=0, second=0, microsecond=0)
+        prices = [ElectricityPriceModel(now + timedelta(hours=hour), hour) for hour in [2, 0, 1]]
+        self.mock_repository.get_electricity_price_data_after_date.return_value = prices
+
+        # Action
+        first_result = service.get_electricity_price_series(now)
+        second_result = service.get_electricity_price_series(now + timedelta(hours=1))
+
+        # Asserts
+        self.mock_repository.get_electricity_price_data_after_date.assert_called_once()
+        self.assertEqual(first_result.prices, (0, 1, 2))
+        self.assertEqual(second_result.prices, (1, 2))
+
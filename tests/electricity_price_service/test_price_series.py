@@ -0,0 +1,95 @@
+import pickle
+import unittest
+from datetime import datetime, timedelta
+from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
+from src.electricity_price_service.price_series import PriceSeries
+
+
+class TestPriceSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.start = datetime(2024, 5, 1)
+        self.prices = [5.0, 3.0, 1.0, 2.0, 8.0, 1.0]
+        self.series = PriceSeries.from_records(
+            [ElectricityPriceModel(self._hour(hour), price) for hour, price in reversed(list(enumerate(self.prices)))])
+
+    def _hour(self, hour):
+        return self.start + timedelta(hours=hour)
+
+    def test_from_records_orders_by_datetime(self):
+        # Asserts
+        self.assertEqual(self.series.prices, tuple(self.prices))
+        self.assertEqual(self.series.datetimes, tuple(self._hour(hour) for hour in range(6)))
+        self.assertEqual(len(self.series), 6)
+
+    def test_get_window(self):
+        # Actions
+        window = self.series.get_window(self._hour(1), self._hour(4))
+        open_window = self.series.get_window(self._hour(4))
+
+        # Asserts
+        self.assertEqual(window.prices, (3.0, 1.0, 2.0))
+        self.assertEqual(open_window.prices, (8.0, 1.0))
+
+    def test_get_price_at(self):
+        # Asserts
+        self.assertEqual(self.series.get_price_at(self._hour(2) + timedelta(minutes=30)), 1.0)
+        self.assertIsNone(self.series.get_price_at(self._hour(-1)))
+
+    def test_get_price_at_after_last_price_slot(self):
+        # Asserts
+        self.assertEqual(self.series.get_price_at(self._hour(6) - timedelta(seconds=1)), 1.0)
+        self.assertIsNone(self.series.get_price_at(self._hour(6)))
+        self.assertIsNone(self.series.get_percentile_rank(self._hour(7)))
+        self.assertFalse(self.series.is_among_cheapest(self._hour(7), 3))
+
+    def test_get_cheapest_datetimes(self):
+        # Actions
+        result = self.series.get_cheapest_datetimes(3)
+
+        # Asserts
+        self.assertEqual(result, [self._hour(2), self._hour(3), self._hour(5)])
+
+    def test_is_among_cheapest(self):
+        # Asserts
+        self.assertTrue(self.series.is_among_cheapest(self._hour(5), 1))
+        self.assertTrue(self.series.is_among_cheapest(self._hour(3), 3))
+        self.assertFalse(self.series.is_among_cheapest(self._hour(1), 3))
+        self.assertFalse(self.series.is_among_cheapest(self._hour(-1), 3))
+
+    def test_get_cheapest_block_start(self):
+        # Asserts
+        self.assertEqual(self.series.get_cheapest_block_start(2), self._hour(2))
+        self.assertEqual(self.series.get_cheapest_block_start(3), self._hour(1))
+        self.assertIsNone(self.series.get_cheapest_block_start(7))
+
+    def test_get_rolling_averages(self):
+        # Actions
+        result = self.series.get_rolling_averages(2)
+
+        # Asserts
+        self.assertEqual(result.datetimes, tuple(self._hour(hour) for hour in range(1, 6)))
+        self.assertEqual(result.prices, (4.0, 2.0, 1.5, 5.0, 4.5))
+        self.assertEqual(len(self.series.get_rolling_averages(7)), 0)
+
+    def test_get_percentile_rank(self):
+        # Asserts
+        self.assertEqual(self.series.get_percentile_rank(self._hour(2)), 0.0)
+        self.assertEqual(self.series.get_percentile_rank(self._hour(4)), 5 / 6)
+        self.assertIsNone(self.series.get_percentile_rank(self._hour(-1)))
+
+    def test_pickle(self):
+        # Setup
+        self.series.get_percentile_rank(self._hour(2))
+
+        # Actions
+        result = pickle.loads(pickle.dumps(self.series))
+
+        # Asserts
+        self.assertEqual(result.prices, self.series.prices)
+        self.assertEqual(result.datetimes, self.series.datetimes)
+        self.assertEqual(result.get_percentile_rank(self._hour(4)), 5 / 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
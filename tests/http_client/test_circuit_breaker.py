@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+from src.http_client.circuit_breaker import CircuitBreaker
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout_in_seconds=60)
+
+    def test_circuit_opens_after_failure_threshold(self):
+        # Actions
+        self.circuit_breaker.record_failure()
+        allowed_after_first_failure = self.circuit_breaker.allow_request()
+        self.circuit_breaker.record_failure()
+
+        # Asserts
+        self.assertTrue(allowed_after_first_failure)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.circuit_breaker.allow_request())
+
+    def test_success_resets_failure_count(self):
+        # Actions
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_success()
+        self.circuit_breaker.record_failure()
+
+        # Asserts
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    @patch('src.http_client.circuit_breaker.time')
+    def test_trial_request_after_reset_timeout(self, mock_time):
+        # Setup
+        mock_time.monotonic.return_value = 100.0
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        mock_time.monotonic.return_value = 160.0
+
+        # Actions
+        trial_allowed = self.circuit_breaker.allow_request()
+        second_allowed = self.circuit_breaker.allow_request()
+        self.circuit_breaker.record_success()
+
+        # Asserts
+        self.assertTrue(trial_allowed)
+        self.assertFalse(second_allowed)
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    @patch('src.http_client.circuit_breaker.time')
+    def test_failed_trial_request_opens_circuit_again(self, mock_time):
+        # Setup
+        mock_time.monotonic.return_value = 100.0
+        self.circuit_breaker.record_failure()
+        self.circuit_breaker.record_failure()
+        mock_time.monotonic.return_value = 160.0
+
+        # Actions
+        self.circuit_breaker.allow_request()
+        self.circuit_breaker.record_failure()
+
+        # Asserts
+        self.assertEqual(self.circuit_breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.circuit_breaker.allow_request())
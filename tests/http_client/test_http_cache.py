@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import Mock, patch
+from src.http_client.http_cache import HttpCache
+
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        self.http_cache = HttpCache(max_entries=2)
+
+    def _get_response(self, headers):
+        response = Mock()
+        response.headers = headers
+        return response
+
+    def test_store_response_with_max_age(self):
+        # Setup
+        response = self._get_response({'Cache-Control': 'public, max-age=60'})
+
+        # Actions
+        self.http_cache.store('https://example.com/a', response)
+        entry = self.http_cache.get('https://example.com/a')
+
+        # Asserts
+        self.assertEqual(entry.response, response)
+        self.assertTrue(entry.is_fresh())
+
+    def test_store_response_with_validators_only(self):
+        # Setup
+        response = self._get_response({'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+
+        # Actions
+        self.http_cache.store('https://example.com/a', response)
+        entry = self.http_cache.get('https://example.com/a')
+
+        # Asserts
+        self.assertFalse(entry.is_fresh())
+        self.assertEqual(entry.get_conditional_headers(),
+                         {'If-None-Match': '"v1"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+
+    def test_store_skips_uncacheable_responses(self):
+        # Actions
+        self.http_cache.store('https://example.com/a', self._get_response({}))
+        self.http_cache.store('https://example.com/b', self._get_response({'Cache-Control': 'no-store',
+                                                                            'ETag': '"v1"'}))
+
+        # Asserts
+        self.assertIsNone(self.http_cache.get('https://example.com/a'))
+        self.assertIsNone(self.http_cache.get('https://example.com/b'))
+
+    def test_store_evicts_least_recently_used_entry(self):
+        # Setup
+        for url in ['https://example.com/a', 'https://example.com/b']:
+            self.http_cache.store(url, self._get_response({'ETag': '"v1"'}))
+        self.http_cache.get('https://example.com/a')
+
+        # Actions
+        self.http_cache.store('https://example.com/c', self._get_response({'ETag': '"v1"'}))
+
+        # Asserts
+        self.assertIsNotNone(self.http_cache.get('https://example.com/a'))
+        self.assertIsNone(self.http_cache.get('https://example.com/b'))
+        self.assertIsNotNone(self.http_cache.get('https://example.com/c'))
+
+    @patch('src.http_client.http_cache.time.monotonic')
+    def test_refresh_extends_freshness(self, mock_monotonic):
+        # Setup
+        mock_monotonic.return_value = 100.0
+        self.http_cache.store('https://example.com/a', self._get_response({'ETag': '"v1"',
+                                                                           'Cache-Control': 'max-age=10'}))
+        entry = self.http_cache.get('https://example.com/a')
+        mock_monotonic.return_value = 200.0
+        self.assertFalse(entry.is_fresh())
+
+        # Actions
+        self.http_cache.refresh(entry, self._get_response({'ETag': '"v2"'}))
+
+        # Asserts
+        self.assertTrue(entry.is_fresh())
+        self.assertEqual(entry.etag, '"v2"')
@@ -0,0 +1,114 @@
+import unittest
+from unittest.mock import Mock, MagicMock
+from requests.exceptions import ConnectionError, HTTPError
+from src.configuration.base_configuration import BaseConfiguration
+from src.http_client.http_client import HttpClient, CircuitOpenError
+
+
+class TestHttpClient(unittest.TestCase):
+
+    def setUp(self):
+        self.configuration_values = {'http_connect_timeout_in_seconds': '2',
+                                     'http_read_timeout_in_seconds': '10',
+                                     'http_max_retries': '4',
+                                     'http_circuit_breaker_failure_threshold': '2'}
+        self.mock_configuration = MagicMock(spec=BaseConfiguration)
+        self.mock_configuration.get.side_effect = lambda key, default=None: self.configuration_values.get(key, default)
+        self.http_client = HttpClient(self.mock_configuration)
+        self.http_client.session = Mock()
+
+    def _get_response(self, status_code, headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        if status_code >= 400:
+            response.raise_for_status.side_effect = HTTPError(f'{status_code} error')
+        return response
+
+    def test_session_is_configured_from_configuration(self):
+        # Actions
+        http_client = HttpClient(self.mock_configuration)
+        adapter = http_client.session.get_adapter('https://api.open-meteo.com')
+
+        # Asserts
+        self.assertEqual(http_client.timeout, (2.0, 10.0))
+        self.assertEqual(adapter.max_retries.total, 4)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        http_client.close()
+
+    def test_get(self):
+        # Setup
+        response = self._get_response(200)
+        self.http_client.session.get.return_value = response
+
+        # Actions
+        result = self.http_client.get('https://api.open-meteo.com/v1/forecast')
+
+        # Asserts
+        self.assertEqual(result, response)
+        self.http_client.session.get.assert_called_once_with('https://api.open-meteo.com/v1/forecast',
+                                                             headers=None, timeout=(2.0, 10.0))
+
+    def test_get_raises_on_error_status(self):
+        # Setup
+        self.http_client.session.get.return_value = self._get_response(404)
+
+        # Asserts
+        with self.assertRaises(HTTPError):
+            self.http_client.get('https://api.open-meteo.com/v1/forecast')
+
+    def test_get_opens_circuit_after_failures(self):
+        # Setup
+        self.http_client.session.get.side_effect = [ConnectionError('Boom!'), self._get_response(503)]
+
+        # Actions
+        with self.assertRaises(ConnectionError):
+            self.http_client.get('https://api.open-meteo.com/v1/forecast')
+        with self.assertRaises(HTTPError):
+            self.http_client.get('https://api.open-meteo.com/v1/forecast')
+
+        # Asserts
+        with self.assertRaises(CircuitOpenError):
+            self.http_client.get('https://api.open-meteo.com/v1/forecast')
+        self.assertEqual(self.http_client.session.get.call_count, 2)
+
+    def test_circuit_breakers_are_kept_per_host(self):
+        # Setup
+        response = self._get_response(200)
+        self.http_client.session.get.side_effect = [ConnectionError('Boom!'), ConnectionError('Boom!'), response]
+
+        # Actions
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.http_client.get('https://api.open-meteo.com/v1/forecast')
+        result = self.http_client.get('https://www.nordpoolgroup.com/api/marketdata/page/59')
+
+        # Asserts
+        self.assertEqual(result, response)
+
+    def test_get_serves_fresh_response_from_cache(self):
+        # Setup
+        response = self._get_response(200, {'Cache-Control': 'max-age=3600'})
+        self.http_client.session.get.return_value = response
+
+        # Actions
+        self.http_client.get('https://api.open-meteo.com/v1/forecast')
+        result = self.http_client.get('https://api.open-meteo.com/v1/forecast')
+
+        # Asserts
+        self.assertEqual(result, response)
+        self.http_client.session.get.assert_called_once()
+
+    def test_get_revalidates_cached_response(self):
+        # Setup
+        response = self._get_response(200, {'ETag': '"v1"'})
+        self.http_client.session.get.side_effect = [response, self._get_response(304)]
+
+        # Actions
+        self.http_client.get('https://api.open-meteo.com/v1/forecast')
+        result = self.http_client.get('https://api.open-meteo.com/v1/forecast')
+
+        # Asserts
+        self.assertEqual(result, response)
+        self.http_client.session.get.assert_called_with('https://api.open-meteo.com/v1/forecast',
+                                                        headers={'If-None-Match': '"v1"'}, timeout=(2.0, 10.0))
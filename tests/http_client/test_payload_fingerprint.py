@@ -0,0 +1,15 @@
+import unittest
+from src.http_client.payload_fingerprint import calculate_payload_fingerprint
+
+
+class TestPayloadFingerprint(unittest.TestCase):
+
+    def test_fingerprint_ignores_key_order(self):
+        self.assertEqual(calculate_payload_fingerprint({'a': 1, 'b': [1, 2]}),
+                         calculate_payload_fingerprint({'b': [1, 2], 'a': 1}))
+
+    def test_fingerprint_changes_with_content(self):
+        self.assertNotEqual(calculate_payload_fingerprint({'a': 1}), calculate_payload_fingerprint({'a': 2}))
+
+    def test_fingerprint_of_missing_payload(self):
+        self.assertIsNone(calculate_payload_fingerprint(None))
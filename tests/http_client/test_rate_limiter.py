@@ -0,0 +1,46 @@
+import unittest
+from unittest.mock import patch
+from src.http_client.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    @patch('src.http_client.rate_limiter.time')
+    def test_acquire_spaces_out_calls(self, mock_time):
+        # Setup
+        mock_time.monotonic.return_value = 100.0
+        rate_limiter = RateLimiter(rate_per_second=4)
+
+        # Actions
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+
+        # Asserts
+        self.assertEqual([call.args[0] for call in mock_time.sleep.call_args_list], [0.25, 0.5])
+
+    @patch('src.http_client.rate_limiter.time')
+    def test_acquire_does_not_wait_after_idle_period(self, mock_time):
+        # Setup
+        mock_time.monotonic.side_effect = [100.0, 200.0]
+        rate_limiter = RateLimiter(rate_per_second=1)
+
+        # Actions
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+
+        # Asserts
+        mock_time.sleep.assert_not_called()
+
+    @patch('src.http_client.rate_limiter.time')
+    def test_acquire_without_limit(self, mock_time):
+        # Setup
+        rate_limiter = RateLimiter(rate_per_second=0)
+
+        # Actions
+        rate_limiter.acquire()
+        rate_limiter.acquire()
+
+        # Asserts
+        mock_time.sleep.assert_not_called()
+        mock_time.monotonic.assert_not_called()
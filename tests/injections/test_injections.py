@@ -4,12 +4,14 @@ from unittest.mock import patch, MagicMock, call
 from src.electricity_price_service.api.base_electricity_price_api import BaseElectricityPriceAPI
 from src.electricity_price_service.processors.base_electricity_price_processor import BaseElectricityPriceProcessor
 from src.injections.injections import app_injection_configuration
+from src.repository_service.database_engine import DatabaseEngine
 from src.weather_service.api.base_weather_api import BaseWeatherAPI
 from src.weather_service.processors.base_weather_processor import BaseWeatherProcessor
 
 
 class TestAppInjectionConfiguration(unittest.TestCase):
 
+    @patch('src.injections.injections.HttpClient', autospec=True)
     @patch('src.injections.injections.EnvironmentVariableConfiguration', autospec=True)
     @patch('src.injections.injections.OpenMeteoWeatherAPI', autospec=True)
     @patch('src.injections.injections.OpenMeteoWeatherProcessor', autospec=True)
@@ -18,7 +20,7 @@ class TestAppInjectionConfiguration(unittest.TestCase):
     @patch('src.injections.injections.logging.getLogger')
     def test_app_injection_configuration(self, mock_logger, mock_nordpool_processor,
                                          mock_nordpool_api, mock_weather_processor, mock_weather_api,
-                                         mock_config):
+                                         mock_config, mock_http_client):
         # Setup mock configuration to return specific values
         mock_config_instance = MagicMock()
         mock_config.return_value = mock_config_instance
@@ -41,7 +43,12 @@ class TestAppInjectionConfiguration(unittest.TestCase):
         ]
 
         mock_binder.bind.assert_has_calls(expected_calls, any_order=True)
+        self.assertEqual(mock_binder.bind_to_constructor.call_args[0][0], DatabaseEngine)
+        mock_binder.bind.assert_any_call(mock_http_client, mock_http_client.return_value)
+        mock_weather_api.assert_called_once_with(mock_config_instance, mock_http_client.return_value)
+        mock_nordpool_api.assert_called_once_with(mock_config_instance, mock_http_client.return_value)
 
+    @patch('src.injections.injections.HttpClient', autospec=True)
     @patch('src.injections.injections.EnvironmentVariableConfiguration', autospec=True)
     @patch('src.injections.injections.OpenMeteoWeatherAPI', autospec=True)
     @patch('src.injections.injections.OpenMeteoWeatherProcessor', autospec=True)
@@ -49,7 +56,7 @@ class TestAppInjectionConfiguration(unittest.TestCase):
     @patch('src.injections.injections.NordpoolElectricityPriceProcessor', autospec=True)
     @patch('src.injections.injections.logging.getLogger')
     def test_invalid_weather_service_config(self, mock_logger, mock_nordpool_processor,
-                                            mock_nordpool_api, mock_weather_processor, mock_weather_api, mock_config):
+                                            mock_nordpool_api, mock_weather_processor, mock_weather_api, mock_config, mock_http_client):
         # Setup mock configuration to return an invalid value for location service
         mock_config_instance = MagicMock()
         mock_config.return_value = mock_config_instance
@@ -66,6 +73,7 @@ class TestAppInjectionConfiguration(unittest.TestCase):
             app_injection_configuration(mock_binder)
         self.assertIn("Unsupported weather api service", str(context.exception))
 
+    @patch('src.injections.injections.HttpClient', autospec=True)
     @patch('src.injections.injections.EnvironmentVariableConfiguration', autospec=True)
     @patch('src.injections.injections.OpenMeteoWeatherAPI', autospec=True)
     @patch('src.injections.injections.OpenMeteoWeatherProcessor', autospec=True)
@@ -73,7 +81,7 @@ class TestAppInjectionConfiguration(unittest.TestCase):
     @patch('src.injections.injections.NordpoolElectricityPriceProcessor', autospec=True)
     @patch('src.injections.injections.logging.getLogger')
     def test_invalid_electricity_price_service_config(self, mock_logger, mock_nordpool_processor,
-                                                      mock_nordpool_api, mock_weather_processor, mock_weather_api, mock_config):
+                                                      mock_nordpool_api, mock_weather_processor, mock_weather_api, mock_config, mock_http_client):
         # Setup mock configuration to return an invalid value for location service
         mock_config_instance = MagicMock()
         mock_config.return_value = mock_config_instance
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import Mock, patch
 from src.job_service.job_service import JobService
+from src.repository_service.base_repository_service import UpsertResult
 
 
 class TestJobService(unittest.TestCase):
@@ -10,8 +11,11 @@ class TestJobService(unittest.TestCase):
         self.mock_weather_service = Mock()
         self.mock_electricity_price_service = Mock()
         self.mock_configuration = Mock()
+        self.mock_switch_service = Mock()
+        self.mock_switch_data_rollup_service = Mock()
         self.mock_job_service = JobService(self.mock_weather_service, self.mock_electricity_price_service,
-                                           self.mock_configuration)
+                                           self.mock_configuration, self.mock_switch_service,
+                                           self.mock_switch_data_rollup_service)
         self.mock_job_service.scheduler = mock_scheduler()
 
         self.mock_configuration.get.side_effect = lambda key: {
@@ -25,7 +29,7 @@ class TestJobService(unittest.TestCase):
 
         # Assert job is added correctly
         self.mock_job_service.scheduler.add_job.assert_called_once_with(
-            self.mock_weather_service.regenerate_weather_data,
+            self.mock_job_service._regenerate_weather_data,
             'interval', minutes=30
         )
 
@@ -35,17 +39,116 @@ class TestJobService(unittest.TestCase):
 
         # Assert job is added correctly
         self.mock_job_service.scheduler.add_job.assert_called_once_with(
-            self.mock_electricity_price_service.regenerate_electricity_price_data,
+            self.mock_job_service._regenerate_electricity_price_data,
             'interval', minutes=45
         )
 
+    def test_regenerate_weather_data_regenerates_decision_tables_when_changed(self):
+        # Setup
+        self.mock_weather_service.regenerate_weather_data.return_value = True
+
+        # Action
+        self.mock_job_service._regenerate_weather_data()
+
+        # Assert
+        self.mock_switch_service.regenerate_switch_decision_tables.assert_called_once()
+
+    def test_regenerate_weather_data_keeps_decision_tables_when_unchanged(self):
+        # Setup
+        self.mock_weather_service.regenerate_weather_data.return_value = False
+
+        # Action
+        self.mock_job_service._regenerate_weather_data()
+
+        # Assert
+        self.mock_switch_service.regenerate_switch_decision_tables.assert_not_called()
+
+    def test_regenerate_electricity_price_data_regenerates_decision_tables_when_changed(self):
+        # Setup
+        self.mock_electricity_price_service.regenerate_electricity_price_data.return_value = UpsertResult(0, 2)
+
+        # Action
+        self.mock_job_service._regenerate_electricity_price_data()
+
+        # Assert
+        self.mock_switch_service.regenerate_switch_decision_tables.assert_called_once()
+
+    def test_regenerate_electricity_price_data_keeps_decision_tables_when_unchanged(self):
+        # Setup
+        self.mock_electricity_price_service.regenerate_electricity_price_data.return_value = UpsertResult(0, 0)
+
+        # Action
+        self.mock_job_service._regenerate_electricity_price_data()
+
+        # Assert
+        self.mock_switch_service.regenerate_switch_decision_tables.assert_not_called()
+
+    def test_switch_decision_table_regeneration_job_is_scheduled_when_enabled(self):
+        # Setup
+        self.mock_switch_service.is_decision_table_enabled.return_value = True
+        self.mock_configuration.get.side_effect = lambda key, default=None: {
+            'switch_decision_table_regeneration_job_interval_in_minutes': '10'}.get(key, default)
+
+        # Action
+        self.mock_job_service._plan_switch_decision_table_regeneration_job()
+
+        # Assert job is added correctly
+        self.mock_job_service.scheduler.add_job.assert_called_once()
+        self.assertEqual(self.mock_job_service.scheduler.add_job.call_args.args,
+                         (self.mock_switch_service.regenerate_switch_decision_tables, 'interval'))
+        self.assertEqual(self.mock_job_service.scheduler.add_job.call_args.kwargs['minutes'], 10)
+
+    def test_switch_decision_table_regeneration_job_is_not_scheduled_when_disabled(self):
+        # Setup
+        self.mock_switch_service.is_decision_table_enabled.return_value = False
+
+        # Action
+        self.mock_job_service._plan_switch_decision_table_regeneration_job()
+
+        # Assert
+        self.mock_job_service.scheduler.add_job.assert_not_called()
+
+    def test_switch_data_partition_maintenance_job_is_scheduled_correctly(self):
+        # Setup
+        self.mock_configuration.get.side_effect = lambda key, default=None: {
+            'switch_data_partition_maintenance_job_interval_in_hours': '12'}.get(key, default)
+
+        # Action
+        self.mock_job_service._plan_switch_data_partition_maintenance_job()
+
+        # Assert job is added correctly
+        self.assertEqual(self.mock_job_service.scheduler.add_job.call_args.args,
+                         (self.mock_switch_service.maintain_switch_data_partitions, 'interval'))
+        self.assertEqual(self.mock_job_service.scheduler.add_job.call_args.kwargs['hours'], 12)
+
+    def test_switch_data_rollup_job_is_scheduled_correctly(self):
+        # Setup
+        self.mock_configuration.get.side_effect = lambda key, default=None: default
+
+        # Action
+        self.mock_job_service._plan_switch_data_rollup_job()
+
+        # Assert job is added correctly
+        self.assertEqual(self.mock_job_service.scheduler.add_job.call_args.args,
+                         (self.mock_switch_data_rollup_service.regenerate_switch_data_rollups, 'interval'))
+        self.assertEqual(self.mock_job_service.scheduler.add_job.call_args.kwargs['minutes'], 15)
+
     @patch('src.job_service.job_service.JobService._plan_weather_data_regeneration_job')
     @patch('src.job_service.job_service.JobService._plan_electricity_price_data_regeneration_job')
-    def test_plan_jobs_is_called_correctly(self, mock_plan_electricity, mock_plan_weather):
+    @patch('src.job_service.job_service.JobService._plan_switch_decision_table_regeneration_job')
+    @patch('src.job_service.job_service.JobService._plan_switch_data_partition_maintenance_job')
+    @patch('src.job_service.job_service.JobService._plan_switch_data_rollup_job')
+    def test_plan_jobs_is_called_correctly(self, mock_plan_switch_data_rollup,
+                                           mock_plan_switch_data_partition_maintenance,
+                                           mock_plan_switch_decision_table, mock_plan_electricity,
+                                           mock_plan_weather):
         # Action
         self.mock_job_service.plan_jobs()
 
         # Assert
+        mock_plan_switch_data_rollup.assert_called_once()
+        mock_plan_switch_data_partition_maintenance.assert_called_once()
+        mock_plan_switch_decision_table.assert_called_once()
         mock_plan_electricity.assert_called_once()
         mock_plan_weather.assert_called_once()
         self.mock_job_service.scheduler.start.assert_called_once()
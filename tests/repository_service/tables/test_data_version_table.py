@@ -0,0 +1,22 @@
+from unittest import TestCase
+from src.repository_service.tables import data_version_table
+from sqlalchemy import MetaData, Table
+
+
+class TestDataVersionTable(TestCase):
+
+    def test_should_create_table_with_correct_columns_and_constraints(self):
+        # Setup
+        mock_metadata = MetaData()
+        expected_table_name = 'data_version'
+
+        # Actions
+        created_table = data_version_table.create_data_version_table(mock_metadata)
+
+        # Assert
+        self.assertIsInstance(created_table, Table)
+        self.assertEqual(created_table.name, expected_table_name)
+        self.assertEqual(len(created_table.columns), 3)
+        self.assertTrue(created_table.columns['name'].primary_key)
+        self.assertFalse(created_table.columns['version'].nullable)
+        self.assertFalse(created_table.columns['changed_at'].nullable)
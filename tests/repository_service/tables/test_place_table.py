@@ -26,3 +26,14 @@ class TestPlaceTable(TestCase):
         self.assertTrue(created_table.columns['id'].primary_key)
         self.assertFalse(created_table.columns['name'].nullable)
 
+    def test_should_create_ownership_lookup_index(self):
+        # Setup
+        metadata = MetaData()
+
+        # Actions
+        created_table = place_table.create_place_table(metadata)
+        indexes = {index.name: index for index in created_table.indexes}
+
+        # Assert
+        self.assertIn('ix_place_id_user_id', indexes)
+        self.assertEqual(['id', 'user_id'], [column.name for column in indexes['ix_place_id_user_id'].columns])
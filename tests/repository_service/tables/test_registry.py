@@ -8,13 +8,15 @@ class TestRegistry(TestCase):
     def test_should_initialize_all_tables(self):
         # Setup
         metadata = MetaData()
-        expected_table_names = ['weather', 'electricity_price', 'switch', 'user', 'place', 'location', 'switch_data']
+        expected_table_names = ['weather', 'electricity_price', 'switch', 'user', 'place', 'location', 'switch_data',
+                                'data_version', 'switch_schedule', 'switch_heartbeat',
+                                'switch_data_rollup', 'switch_data_rollup_dirty']
 
         # Actions
         tables = initialize_tables(metadata)
 
         # Asserts
-        self.assertEqual(7, len(tables))
+        self.assertEqual(12, len(tables))
         for table_name in expected_table_names:
             self.assertIn(table_name, tables)
             self.assertEqual(table_name, tables[table_name].name)
@@ -0,0 +1,22 @@
+from unittest import TestCase
+from src.repository_service.tables import switch_data_rollup_table
+from sqlalchemy import MetaData, Table
+
+
+class TestSwitchDataRollupTable(TestCase):
+
+    def test_should_create_table_with_correct_columns_and_constraints(self):
+        # Setup
+        mock_metadata = MetaData()
+        expected_table_name = 'switch_data_rollup'
+
+        # Actions
+        created_table = switch_data_rollup_table.create_switch_data_rollup_table(mock_metadata)
+
+        # Assert
+        self.assertIsInstance(created_table, Table)
+        self.assertEqual(created_table.name, expected_table_name)
+        self.assertEqual(len(created_table.columns), 11)
+        self.assertTrue(created_table.columns['id'].primary_key)
+        self.assertFalse(created_table.columns['bucket_start'].nullable)
+        self.assertTrue(created_table.columns['temperature_avg'].nullable)
@@ -25,3 +25,14 @@ class TestSwitchDataTable(TestCase):
         self.assertIn('value_text', created_table.columns)
         self.assertIn('value_number', created_table.columns)
         self.assertTrue(created_table.columns['id'].primary_key)
+
+    def test_should_create_partitioned_table_with_partition_key_in_primary_key(self):
+        # Setup
+        mock_metadata = MetaData()
+
+        # Actions
+        created_table = switch_data_table.create_switch_data_table(mock_metadata, partitioned=True)
+
+        # Assert
+        self.assertEqual([column.name for column in created_table.primary_key.columns], ['id', 'log_cre_date'])
+        self.assertEqual(created_table.dialect_options['postgresql']['partition_by'], 'RANGE (log_cre_date)')
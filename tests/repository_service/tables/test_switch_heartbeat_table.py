@@ -0,0 +1,22 @@
+from unittest import TestCase
+from src.repository_service.tables import switch_heartbeat_table
+from sqlalchemy import MetaData, Table
+
+
+class TestSwitchHeartbeatTable(TestCase):
+
+    def test_should_create_table_with_correct_columns_and_constraints(self):
+        # Setup
+        mock_metadata = MetaData()
+        expected_table_name = 'switch_heartbeat'
+
+        # Actions
+        created_table = switch_heartbeat_table.create_switch_heartbeat_table(mock_metadata)
+
+        # Assert
+        self.assertIsInstance(created_table, Table)
+        self.assertEqual(created_table.name, expected_table_name)
+        self.assertEqual(len(created_table.columns), 3)
+        self.assertTrue(created_table.columns['switch_id'].primary_key)
+        self.assertFalse(created_table.columns['last_seen'].nullable)
+        self.assertTrue(created_table.columns['last_status'].nullable)
@@ -0,0 +1,27 @@
+from unittest import TestCase
+from src.repository_service.tables import switch_schedule_table
+from sqlalchemy import MetaData, Table, UniqueConstraint
+
+
+class TestSwitchScheduleTable(TestCase):
+
+    def test_should_create_table_with_correct_columns_and_constraints(self):
+        # Setup
+        mock_metadata = MetaData()
+        expected_table_name = 'switch_schedule'
+
+        # Actions
+        created_table = switch_schedule_table.create_switch_schedule_table(mock_metadata)
+
+        # Assert
+        self.assertIsInstance(created_table, Table)
+        self.assertEqual(created_table.name, expected_table_name)
+        self.assertEqual(len(created_table.columns), 4)
+        self.assertTrue(created_table.columns['id'].primary_key)
+        self.assertFalse(created_table.columns['switch_id'].nullable)
+        self.assertFalse(created_table.columns['slot_start'].nullable)
+        self.assertFalse(created_table.columns['value_text'].nullable)
+        unique_constraints = [constraint for constraint in created_table.constraints
+                              if isinstance(constraint, UniqueConstraint)]
+        self.assertEqual(unique_constraints[0].name, 'switch_schedule_unique_constraint')
+        self.assertEqual([column.name for column in unique_constraints[0].columns], ['switch_id', 'slot_start'])
@@ -16,7 +16,7 @@ class TestSwitchTable(TestCase):
         # Assert
         self.assertIsInstance(created_table, Table)
         self.assertEqual(created_table.name, expected_table_name)
-        self.assertEqual(len(created_table.columns), 6)
+        self.assertEqual(len(created_table.columns), 7)
         self.assertEqual(len(created_table.constraints), 4)
         self.assertIn('id', created_table.columns)
         self.assertIn('uuid', created_table.columns)
@@ -24,6 +24,7 @@ class TestSwitchTable(TestCase):
         self.assertIn('name', created_table.columns)
         self.assertIn('status', created_table.columns)
         self.assertIn('status_calculation_logic', created_table.columns)
+        self.assertIn('status_calculation_rule', created_table.columns)
         self.assertTrue(created_table.columns['id'].primary_key)
         self.assertFalse(created_table.columns['name'].nullable)
 
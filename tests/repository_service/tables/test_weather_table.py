@@ -33,6 +33,15 @@ class TestWeatherTable(TestCase):
                 self.assertIn('datetime', constraint.columns)
                 self.assertIn('location_id', constraint.columns)
 
+    def test_should_create_location_datetime_index(self):
+        # Setup
+        metadata = MetaData()
 
+        # Actions
+        created_table = weather_table.create_weather_table(metadata)
+        indexes = {index.name: index for index in created_table.indexes}
 
-
+        # Asserts
+        self.assertIn('ix_weather_location_id_datetime', indexes)
+        self.assertEqual(['location_id', 'datetime'],
+                         [column.name for column in indexes['ix_weather_location_id_datetime'].columns])
@@ -1,9 +1,11 @@
 import unittest
-from unittest.mock import MagicMock
-from sqlalchemy import inspect
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy import inspect, select, text
 from sqlalchemy.orm import clear_mappers
 from src.configuration.base_configuration import BaseConfiguration
-from src.repository_service.base_repository_service import BaseRepositoryService
+from src.repository_service.database_engine import DatabaseEngine
+from src.repository_service.base_repository_service import BaseRepositoryService, UpsertResult
 
 
 class TestRepositoryService(unittest.TestCase):
@@ -11,7 +13,8 @@ class TestRepositoryService(unittest.TestCase):
     def setUp(self):
         self.mock_configuration = MagicMock(spec=BaseConfiguration)
         self.mock_configuration.get.return_value = "sqlite:///:memory:"
-        self.repository_service = BaseRepositoryService(configuration=self.mock_configuration)
+        self.repository_service = BaseRepositoryService(configuration=self.mock_configuration,
+                                                        database_engine=DatabaseEngine(self.mock_configuration))
         self.repository_service.create_database()
 
     def tearDown(self):
@@ -26,3 +29,48 @@ class TestRepositoryService(unittest.TestCase):
         # Asserts
         self.assertTrue(inspector.has_table('weather'))
         self.assertTrue(inspector.has_table('electricity_price'))
+
+    def test_create_database_adds_missing_nullable_columns(self):
+        # Setup
+        with self.repository_service.engine.begin() as connection:
+            connection.execute(text('ALTER TABLE switch DROP COLUMN status_calculation_rule'))
+        clear_mappers()
+
+        # Actions
+        self.repository_service.create_database()
+
+        # Asserts
+        columns = [column['name'] for column in inspect(self.repository_service.engine).get_columns('switch')]
+        self.assertIn('status_calculation_rule', columns)
+
+    def test_create_database_adds_missing_indexes(self):
+        # Setup
+        with self.repository_service.engine.begin() as connection:
+            connection.execute(text('DROP INDEX ix_place_id_user_id'))
+        clear_mappers()
+
+        # Actions
+        self.repository_service.create_database()
+
+        # Asserts
+        indexes = [index['name'] for index in inspect(self.repository_service.engine).get_indexes('place')]
+        self.assertIn('ix_place_id_user_id', indexes)
+
+    def test_upsert_rows_merges_rows_without_on_conflict_support(self):
+        # Setup
+        table = self.repository_service.tables['electricity_price']
+        first_rows = [{'datetime': datetime(2024, 1, 1, hour), 'price': 1.0} for hour in range(2)]
+        second_rows = [{'datetime': datetime(2024, 1, 1, hour), 'price': 1.0 + hour} for hour in range(3)]
+
+        # Actions
+        with patch.object(BaseRepositoryService, '_supports_on_conflict', return_value=False), \
+                self.repository_service.session_maker() as session:
+            first_result = self.repository_service._upsert_rows(session, table, first_rows, ['datetime'], ['price'])
+            second_result = self.repository_service._upsert_rows(session, table, second_rows, ['datetime'], ['price'])
+            session.commit()
+            prices = session.execute(select(table.c.price).order_by(table.c.datetime)).scalars().all()
+
+        # Asserts
+        self.assertEqual(first_result, UpsertResult(2, 0))
+        self.assertEqual(second_result, UpsertResult(1, 1))
+        self.assertEqual(prices, [1.0, 2.0, 3.0])
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.orm import clear_mappers
+from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.database_engine import DatabaseEngine
+from src.repository_service.data_version_repository_service import DataVersionRepositoryService
+
+
+class TestDataVersionRepositoryService(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_configuration = MagicMock(spec=BaseConfiguration)
+        self.mock_configuration.get.return_value = "sqlite:///:memory:"
+        self.data_version_repository_service = DataVersionRepositoryService(
+            configuration=self.mock_configuration, database_engine=DatabaseEngine(self.mock_configuration))
+        self.data_version_repository_service.create_database()
+
+    def tearDown(self):
+        self.data_version_repository_service.metadata.drop_all(self.data_version_repository_service.engine)
+        clear_mappers()
+        self.data_version_repository_service.engine.dispose()
+
+    def test_get_data_versions_without_changes(self):
+        # Actions
+        versions = self.data_version_repository_service.get_data_versions()
+
+        # Asserts
+        self.assertEqual(versions, {})
+
+    def test_increment_data_version(self):
+        # Actions
+        self.data_version_repository_service.increment_data_version('weather')
+        self.data_version_repository_service.increment_data_version('weather')
+        self.data_version_repository_service.increment_data_version('electricity_price')
+
+        # Asserts
+        self.assertEqual(self.data_version_repository_service.get_data_versions(),
+                         {'weather': 2, 'electricity_price': 1})
+
+    def test_increment_data_version_without_on_conflict_support(self):
+        # Actions
+        with patch.object(DataVersionRepositoryService, '_supports_on_conflict', return_value=False):
+            self.data_version_repository_service.increment_data_version('weather')
+            self.data_version_repository_service.increment_data_version('weather')
+
+        # Asserts
+        self.assertEqual(self.data_version_repository_service.get_data_versions(), {'weather': 2})
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import MagicMock
+from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.database_engine import DatabaseEngine
+
+
+class TestDatabaseEngine(unittest.TestCase):
+
+    def _get_configuration(self, values):
+        configuration = MagicMock(spec=BaseConfiguration)
+        configuration.get.side_effect = lambda key, default=None: values.get(key, default)
+        return configuration
+
+    def test_sqlite_engine_uses_default_pool(self):
+        # Setup
+        configuration = self._get_configuration({'database_string': 'sqlite:///:memory:',
+                                                 'database_pool_size': 'not used'})
+
+        # Actions
+        database_engine = DatabaseEngine(configuration)
+
+        # Asserts
+        self.assertEqual(database_engine.engine.dialect.name, 'sqlite')
+        self.assertIs(database_engine.session_maker.kw['bind'], database_engine.engine)
+        database_engine.dispose()
+
+    def test_pool_options_are_read_from_configuration(self):
+        # Setup
+        configuration = self._get_configuration({'database_string': 'postgresql+psycopg2://user:password@db:5432/db',
+                                                 'database_pool_size': '3',
+                                                 'database_max_overflow': '2',
+                                                 'database_pool_pre_ping': 'false',
+                                                 'database_pool_recycle_in_seconds': '600'})
+
+        # Actions
+        database_engine = DatabaseEngine(configuration)
+
+        # Asserts
+        self.assertEqual(database_engine.engine.pool.size(), 3)
+        self.assertEqual(database_engine.engine.pool._max_overflow, 2)
+        self.assertFalse(database_engine.engine.pool._pre_ping)
+        self.assertEqual(database_engine.engine.pool._recycle, 600)
+
+    def test_pool_options_defaults(self):
+        # Setup
+        configuration = self._get_configuration({'database_string': 'postgresql+psycopg2://user:password@db:5432/db'})
+
+        # Actions
+        database_engine = DatabaseEngine(configuration)
+
+        # Asserts
+        self.assertEqual(database_engine.engine.pool.size(), DatabaseEngine.DEFAULT_POOL_SIZE)
+        self.assertEqual(database_engine.engine.pool._max_overflow, DatabaseEngine.DEFAULT_MAX_OVERFLOW)
+        self.assertTrue(database_engine.engine.pool._pre_ping)
+        self.assertEqual(database_engine.engine.pool._recycle, DatabaseEngine.DEFAULT_POOL_RECYCLE_IN_SECONDS)
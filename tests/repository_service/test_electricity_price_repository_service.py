@@ -3,7 +3,9 @@ from unittest.mock import MagicMock
 from sqlalchemy.orm import clear_mappers
 from datetime import datetime
 from src.configuration.base_configuration import BaseConfiguration
-from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
+from src.repository_service.database_engine import DatabaseEngine
+from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel, \
+    ElectricityPriceRecord
 from src.repository_service.electricity_price_repository_service import ElectricityPriceRepositoryService
 
 
@@ -13,7 +15,7 @@ class TestRepositoryService(unittest.TestCase):
         self.mock_configuration = MagicMock(spec=BaseConfiguration)
         self.mock_configuration.get.return_value = "sqlite:///:memory:"
         self.electricity_price_repository_service = ElectricityPriceRepositoryService(
-            configuration=self.mock_configuration)
+            configuration=self.mock_configuration, database_engine=DatabaseEngine(self.mock_configuration))
         self.electricity_price_repository_service.create_database()
 
         self.electricity_price_data = [
@@ -55,6 +57,28 @@ class TestRepositoryService(unittest.TestCase):
 
         self.assertEqual(stored_data[0].price, expected_price)
 
+    def test_store_electricity_price_data_reports_changed_counts(self):
+        # Setup
+        changed_electricity_price_data = [
+            ElectricityPriceModel(datetime=datetime(2023, 1, 1, 12, 0), price=20.5),
+            ElectricityPriceModel(datetime=datetime(2023, 1, 1, 13, 0), price=30.0),
+            ElectricityPriceModel(datetime=datetime(2023, 1, 1, 14, 0), price=40.0),
+        ]
+        repriced_electricity_price_data = [
+            ElectricityPriceModel(datetime=datetime(2023, 1, 1, 12, 0), price=21.5),
+            ElectricityPriceModel(datetime=datetime(2023, 1, 1, 13, 0), price=30.0),
+        ]
+
+        # Actions
+        first_result = self.electricity_price_repository_service.store_electricity_price_data(
+            changed_electricity_price_data)
+        repriced_result = self.electricity_price_repository_service.store_electricity_price_data(
+            repriced_electricity_price_data)
+
+        # Asserts
+        self.assertEqual((first_result.inserted, first_result.updated), (3, 0))
+        self.assertEqual((repriced_result.inserted, repriced_result.updated), (0, 1))
+
     def test_get_electricity_price_data_after_date(self):
         # Setup
         expected_date = self.electricity_price_data[0].datetime
@@ -69,3 +93,4 @@ class TestRepositoryService(unittest.TestCase):
         self.assertEqual(len(result), len(self.electricity_price_data))
         self.assertEqual(result[0].datetime, expected_date)
         self.assertEqual(result[0].price, expected_price)
+        self.assertIsInstance(result[0], ElectricityPriceRecord)
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import MagicMock
 from sqlalchemy.orm import clear_mappers
 from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.database_engine import DatabaseEngine
 from src.repository_service.location_repository_service import LocationRepositoryService
 from src.location_service.models.location_model import LocationModel
 
@@ -11,7 +12,8 @@ class TestLocationRepositoryService(unittest.TestCase):
     def setUp(self):
         self.mock_configuration = MagicMock(spec=BaseConfiguration)
         self.mock_configuration.get.return_value = "sqlite:///:memory:"
-        self.locatrion_repository_service = LocationRepositoryService(configuration=self.mock_configuration)
+        self.locatrion_repository_service = LocationRepositoryService(configuration=self.mock_configuration,
+                                                                      database_engine=DatabaseEngine(self.mock_configuration))
         self.locatrion_repository_service.create_database()
         self.location = LocationModel(latitude=1.0, longitude=1.0)
 
@@ -1,10 +1,14 @@
 import unittest
+from datetime import datetime
 from unittest.mock import MagicMock
+from sqlalchemy import event
 from sqlalchemy.orm import clear_mappers
 from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.database_engine import DatabaseEngine
 from src.repository_service.place_repository_service import PlaceRepositoryService
 from src.place_service.models.place_model import PlaceModel
 from src.location_service.models.location_model import LocationModel
+from src.switch_service.models.switch_model import SwitchModel
 
 
 class TestPlaceRepositoryService(unittest.TestCase):
@@ -12,7 +16,8 @@ class TestPlaceRepositoryService(unittest.TestCase):
     def setUp(self):
         self.mock_configuration = MagicMock(spec=BaseConfiguration)
         self.mock_configuration.get.return_value = "sqlite:///:memory:"
-        self.place_repository_service = PlaceRepositoryService(configuration=self.mock_configuration)
+        self.place_repository_service = PlaceRepositoryService(configuration=self.mock_configuration,
+                                                               database_engine=DatabaseEngine(self.mock_configuration))
         self.place_repository_service.create_database()
         self.place = PlaceModel(id=1, name="Place 1", user_id=1, location_id=1, description="test description")
 
@@ -71,6 +76,63 @@ class TestPlaceRepositoryService(unittest.TestCase):
         self.assertEqual(result[1].name, expected_name_two)
         self.assertEqual(len(result), 2)
 
+    def _store_places_with_switches(self, place_count):
+        with self.place_repository_service.session_maker() as session:
+            session.add(LocationModel(latitude=50.0, longitude=8.0, id=1))
+            for index in range(1, place_count + 1):
+                session.add(PlaceModel(name=f"Place {index}", user_id=1, location_id=1, description="description",
+                                       id=index))
+                session.add(SwitchModel(name=f"Switch {index}", uuid=f"uuid_{index}", place_id=index))
+            session.commit()
+
+    def _count_queries(self, action):
+        statements = []
+
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(self.place_repository_service.engine, 'before_cursor_execute', count_query)
+        try:
+            result = action()
+        finally:
+            event.remove(self.place_repository_service.engine, 'before_cursor_execute', count_query)
+        return result, len(statements)
+
+    def test_get_all_places_and_switches_for_user_loads_relationships_eagerly(self):
+        # Setup
+        self._store_places_with_switches(5)
+
+        # Actions
+        places, query_count = self._count_queries(
+            lambda: self.place_repository_service.get_all_places_and_switches_for_user(1))
+
+        # Asserts
+        self.assertEqual(query_count, 2)
+        self.assertEqual([place.name for place in places], [f"Place {index}" for index in range(1, 6)])
+        self.assertEqual([[switch.uuid for switch in place.switches] for place in places],
+                         [[f"uuid_{index}"] for index in range(1, 6)])
+        self.assertEqual({place.location.latitude for place in places}, {50.0})
+
+    def test_get_place_and_switches_loads_relationships_eagerly(self):
+        # Setup
+        self._store_places_with_switches(2)
+
+        # Actions
+        place, query_count = self._count_queries(lambda: self.place_repository_service.get_place_and_switches(2, 1))
+
+        # Asserts
+        self.assertEqual(query_count, 2)
+        self.assertEqual([switch.uuid for switch in place.switches], ["uuid_2"])
+        self.assertEqual(place.location.longitude, 8.0)
+
+    def test_store_place_data_keeps_location_id(self):
+        # Actions
+        self.place_repository_service.store_place_data(self.place)
+        result = self.place_repository_service.get_place(1, 1)
+
+        # Asserts
+        self.assertEqual(result.location_id, 1)
+
     def test_delete_place(self):
 
         # Actions
@@ -80,4 +142,27 @@ class TestPlaceRepositoryService(unittest.TestCase):
             stored_data = session.query(PlaceModel).all()
 
         # Asserts
-        self.assertEqual(len(stored_data), 0)
\ No newline at end of file
+        self.assertEqual(len(stored_data), 0)
+
+    def test_delete_place_deletes_switch_dependent_rows(self):
+        # Setup
+        self.place_repository_service.store_place_data(self.place)
+        with self.place_repository_service.session_maker() as session:
+            session.add(SwitchModel(name="Switch 1", uuid='uuid_1', place_id=1, id=1))
+            session.commit()
+        heartbeat_table = self.place_repository_service.tables['switch_heartbeat']
+        dirty_table = self.place_repository_service.tables['switch_data_rollup_dirty']
+        with self.place_repository_service.session_maker() as session:
+            session.execute(heartbeat_table.insert().values(switch_id=1, last_seen=datetime(2024, 1, 1),
+                                                            last_status='ON'))
+            session.execute(dirty_table.insert().values(switch_id=1, dirty_from=datetime(2024, 1, 1)))
+            session.commit()
+
+        # Actions
+        self.place_repository_service.delete_place(1, 1)
+
+        # Asserts
+        with self.place_repository_service.session_maker() as session:
+            self.assertEqual(session.query(SwitchModel).count(), 0)
+            self.assertEqual(session.execute(heartbeat_table.select()).all(), [])
+            self.assertEqual(session.execute(dirty_table.select()).all(), [])
\ No newline at end of file
@@ -1,11 +1,12 @@
 import datetime
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from sqlalchemy.orm import clear_mappers
 from sqlalchemy.exc import IntegrityError
 from src.configuration.base_configuration import BaseConfiguration
-from src.repository_service.switch_repository_service import SwitchRepositoryService
-from src.switch_service.models.switch_model import SwitchModel
+from src.repository_service.database_engine import DatabaseEngine
+from src.repository_service.switch_repository_service import SwitchRepositoryService, _get_month_start
+from src.switch_service.models.switch_model import SwitchModel, SwitchRecord
 from src.place_service.models.place_model import PlaceModel
 from src.switch_service.models.switch_data_model import SwitchDataType
 from src.switch_service.models.switch_data_model import SwitchDataModel
@@ -16,7 +17,8 @@ class TestRepositoryService(unittest.TestCase):
     def setUp(self):
         self.mock_configuration = MagicMock(spec=BaseConfiguration)
         self.mock_configuration.get.return_value = "sqlite:///:memory:"
-        self.switch_repository_service = SwitchRepositoryService(configuration=self.mock_configuration)
+        self.switch_repository_service = SwitchRepositoryService(configuration=self.mock_configuration,
+                                                                 database_engine=DatabaseEngine(self.mock_configuration))
         self.switch_repository_service.create_database()
         self.place = PlaceModel(user_id=1, name="Place 1", description="Description 1", location_id=1, id=1)
         with self.switch_repository_service.session_maker() as session:
@@ -39,6 +41,22 @@ class TestRepositoryService(unittest.TestCase):
         # Asserts
         self.assertEqual(result.name, expected_name)
 
+    def test_get_switch_for_user_with_multiple_places(self):
+        # Setup
+        second_place = PlaceModel(user_id=1, name="Place 2", description="Description 2", location_id=1, id=2)
+        with self.switch_repository_service.session_maker() as session:
+            session.add(second_place)
+            session.commit()
+        switch = SwitchModel(name="Switch 2", uuid='uuid_2', place_id='2', status_calculation_logic="status_calculation_logic")
+
+        # Actions
+        self.switch_repository_service.store_switch_data(switch)
+        result = self.switch_repository_service.get_switch_for_user("uuid_2", 1)
+
+        # Asserts
+        self.assertEqual(result.name, "Switch 2")
+        self.assertEqual(result.place_id, 2)
+
     def test_get_switch_for_user_if_not_exists(self):
         # Setup
         switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="status_calculation_logic")
@@ -82,11 +100,12 @@ class TestRepositoryService(unittest.TestCase):
         updated_switch = SwitchModel(name="Switch 1", uuid=uuid, place_id='1', status_calculation_logic="new_status_calculation_logic")
 
         # Actions
-        self.switch_repository_service.store_switch_data(switch)
-        self.switch_repository_service.update_switch_data(updated_switch, 1, uuid)
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        updated_switch_id = self.switch_repository_service.update_switch_data(updated_switch, 1, uuid)
         changed_switch = self.switch_repository_service.get_switch("1")
 
         # Asserts
+        self.assertEqual(updated_switch_id, switch_id)
         self.assertEqual(changed_switch.status_calculation_logic, "new_status_calculation_logic")
 
     def test_update_switch_data_if_not_allowed_for_user(self):
@@ -139,6 +158,22 @@ class TestRepositoryService(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.switch_repository_service.get_switch("uuid_2")
 
+    def test_get_switch_location_id(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="status_calculation_logic")
+
+        # Actions
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        result = self.switch_repository_service.get_switch_location_id(switch_id)
+
+        # Asserts
+        self.assertEqual(result, 1)
+
+    def test_get_switch_location_id_if_not_exists(self):
+        # Asserts
+        with self.assertRaises(ValueError):
+            self.switch_repository_service.get_switch_location_id(2)
+
     def test_store_switch_operational_data(self):
         # Setup
         switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="status_calculation_logic")
@@ -155,3 +190,338 @@ class TestRepositoryService(unittest.TestCase):
         self.assertEqual(len(stored_data), 1)
         self.assertEqual(stored_data[0].value_text, expected_value_text)
 
+    def test_replace_switch_schedule(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="status_calculation_logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        slot_start = datetime.datetime(2024, 5, 1, 13)
+
+        # Actions
+        self.switch_repository_service.replace_switch_schedule(switch_id, {slot_start: 'ON'})
+        self.switch_repository_service.replace_switch_schedule(
+            switch_id, {slot_start: 'OFF', slot_start + datetime.timedelta(hours=1): 'ON'})
+
+        # Asserts
+        self.assertEqual(self.switch_repository_service.get_switch_schedule_value(switch_id, slot_start), 'OFF')
+        self.assertEqual(self.switch_repository_service.get_switch_schedule_value(
+            switch_id, slot_start + datetime.timedelta(hours=1)), 'ON')
+        self.assertIsNone(self.switch_repository_service.get_switch_schedule_value(
+            switch_id, slot_start + datetime.timedelta(hours=2)))
+
+    def test_delete_switch_schedule(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="status_calculation_logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        slot_start = datetime.datetime(2024, 5, 1, 13)
+        self.switch_repository_service.replace_switch_schedule(switch_id, {slot_start: 'ON'})
+
+        # Actions
+        self.switch_repository_service.delete_switch_schedule(switch_id)
+
+        # Asserts
+        self.assertIsNone(self.switch_repository_service.get_switch_schedule_value(switch_id, slot_start))
+
+    def test_delete_switch_deletes_schedule(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="status_calculation_logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        slot_start = datetime.datetime(2024, 5, 1, 13)
+        self.switch_repository_service.replace_switch_schedule(switch_id, {slot_start: 'ON'})
+
+        # Actions
+        self.switch_repository_service.delete_switch('uuid_1', 1)
+
+        # Asserts
+        self.assertIsNone(self.switch_repository_service.get_switch_schedule_value(switch_id, slot_start))
+
+    def test_get_switches_with_logic(self):
+        # Setup
+        self.switch_repository_service.store_switch_data(
+            SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic"))
+        self.switch_repository_service.store_switch_data(
+            SwitchModel(name="Switch 2", uuid='uuid_2', place_id='1', status_calculation_logic=None))
+
+        # Actions
+        result = self.switch_repository_service.get_switches_with_logic()
+
+        # Asserts
+        self.assertEqual([switch.uuid for switch in result], ['uuid_1'])
+
+    def test_get_switches_with_location_for_user(self):
+        # Setup
+        other_place = PlaceModel(user_id=2, name="Place 2", description="Description 2", location_id=2, id=2)
+        with self.switch_repository_service.session_maker() as session:
+            session.add(other_place)
+            session.commit()
+        for index, place_id in [(1, '1'), (2, '1'), (3, '2')]:
+            self.switch_repository_service.store_switch_data(
+                SwitchModel(name=f"Switch {index}", uuid=f'uuid_{index}', place_id=place_id,
+                            status_calculation_logic="logic"))
+
+        # Actions
+        by_uuids = self.switch_repository_service.get_switches_with_location_for_user(1, ['uuid_1', 'uuid_3'])
+        by_place = self.switch_repository_service.get_switches_with_location_for_user(1, place_id=1)
+        other_users_place = self.switch_repository_service.get_switches_with_location_for_user(1, place_id=2)
+
+        # Asserts
+        self.assertEqual([(switch.uuid, location_id) for switch, location_id in by_uuids], [('uuid_1', 1)])
+        self.assertEqual(by_uuids[0][0], SwitchRecord(1, "Switch 1", 'uuid_1', 1, "logic", None, None))
+        self.assertEqual([switch.uuid for switch, _ in by_place], ['uuid_1', 'uuid_2'])
+        self.assertEqual(other_users_place, [])
+
+    def test_get_switch_schedule_values(self):
+        # Setup
+        slot_start = datetime.datetime(2024, 5, 1, 13)
+        for index in [1, 2]:
+            switch_id = self.switch_repository_service.store_switch_data(
+                SwitchModel(name=f"Switch {index}", uuid=f'uuid_{index}', place_id='1', status_calculation_logic="logic"))
+            self.switch_repository_service.replace_switch_schedule(switch_id, {slot_start: f'value_{index}'})
+
+        # Actions
+        result = self.switch_repository_service.get_switch_schedule_values([1, 2, 3], slot_start)
+
+        # Asserts
+        self.assertEqual(result, {1: 'value_1', 2: 'value_2'})
+
+    def test_store_switch_operational_data_many(self):
+        # Setup
+        log_cre_date = datetime.datetime.now()
+        for index in [1, 2]:
+            self.switch_repository_service.store_switch_data(
+                SwitchModel(name=f"Switch {index}", uuid=f'uuid_{index}', place_id='1', status_calculation_logic="logic"))
+        switch_data = [SwitchDataModel(switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS,
+                                       log_cre_date=log_cre_date, value_text="ON") for switch_id in [1, 2]]
+
+        # Actions
+        self.switch_repository_service.store_switch_operational_data_many(switch_data)
+        with self.switch_repository_service.session_maker() as session:
+            stored_data = session.query(SwitchDataModel).order_by(SwitchDataModel.switch_id).all()
+
+        # Asserts
+        self.assertEqual([(data.switch_id, data.data_type, data.value_text) for data in stored_data],
+                         [(1, SwitchDataType.RELAY_STATUS, "ON"), (2, SwitchDataType.RELAY_STATUS, "ON")])
+
+    def test_store_switch_operational_data_many_skips_stored_data(self):
+        # Setup
+        switch_id = self.switch_repository_service.store_switch_data(
+            SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic"))
+        log_cre_date = datetime.datetime(2024, 1, 1, 12, 0)
+        switch_data = [SwitchDataModel(switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS,
+                                       log_cre_date=log_cre_date + datetime.timedelta(minutes=minutes),
+                                       value_text="ON") for minutes in range(2)]
+        self.switch_repository_service.store_switch_operational_data_many(switch_data[:1])
+
+        # Actions
+        stored_count = self.switch_repository_service.store_switch_operational_data_many(switch_data)
+
+        # Asserts
+        with self.switch_repository_service.session_maker() as session:
+            self.assertEqual(session.query(SwitchDataModel).count(), 2)
+        self.assertEqual(stored_count, 1)
+
+    def test_store_switch_status_transitions_stores_changes_only(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        start = datetime.datetime(2024, 1, 1, 12, 0)
+        statuses = ['ON', 'ON', 'OFF', 'OFF', 'ON']
+        switch_data = [SwitchDataModel(switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS,
+                                       log_cre_date=start + datetime.timedelta(minutes=index), value_text=status)
+                       for index, status in enumerate(statuses)]
+
+        # Actions
+        first_count = self.switch_repository_service.store_switch_status_transitions(switch_data[:2])
+        second_count = self.switch_repository_service.store_switch_status_transitions(switch_data[2:])
+
+        # Asserts
+        with self.switch_repository_service.session_maker() as session:
+            stored_data = session.query(SwitchDataModel).order_by(SwitchDataModel.log_cre_date).all()
+            self.assertEqual([data.value_text for data in stored_data], ['ON', 'OFF', 'ON'])
+        self.assertEqual((first_count, second_count), (1, 2))
+        self.assertEqual(tuple(self.switch_repository_service.get_switch_heartbeat(switch_id)),
+                         (start + datetime.timedelta(minutes=4), 'ON'))
+
+    def test_store_switch_status_transitions_keeps_newer_heartbeat(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        start = datetime.datetime(2024, 1, 1, 12, 0)
+        self.switch_repository_service.store_switch_status_transitions([SwitchDataModel(
+            switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS, log_cre_date=start, value_text='ON')])
+        self.switch_repository_service.store_switch_status_transitions([SwitchDataModel(
+            switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS,
+            log_cre_date=start + datetime.timedelta(minutes=10), value_text='OFF')])
+
+        # Actions
+        stored_count = self.switch_repository_service.store_switch_status_transitions([SwitchDataModel(
+            switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS, log_cre_date=start, value_text='ON')])
+
+        # Asserts
+        self.assertEqual(stored_count, 0)
+        self.assertEqual(tuple(self.switch_repository_service.get_switch_heartbeat(switch_id)),
+                         (start + datetime.timedelta(minutes=10), 'OFF'))
+
+    def test_get_switch_status_timeline(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        start = datetime.datetime(2024, 1, 1, 12, 0)
+        statuses = ['ON', 'ON', 'OFF', 'OFF']
+        self.switch_repository_service.store_switch_status_transitions([
+            SwitchDataModel(switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS,
+                            log_cre_date=start + datetime.timedelta(minutes=10 * index), value_text=status)
+            for index, status in enumerate(statuses)])
+
+        # Actions
+        timeline = self.switch_repository_service.get_switch_status_timeline(
+            switch_id, start + datetime.timedelta(minutes=5), start + datetime.timedelta(hours=1))
+
+        # Asserts
+        self.assertEqual([tuple(interval) for interval in timeline], [
+            (start + datetime.timedelta(minutes=5), start + datetime.timedelta(minutes=20), 'ON'),
+            (start + datetime.timedelta(minutes=20), start + datetime.timedelta(minutes=30), 'OFF')])
+
+    def test_get_switch_status_timeline_without_data(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+
+        # Actions
+        timeline = self.switch_repository_service.get_switch_status_timeline(
+            switch_id, datetime.datetime(2024, 1, 1), datetime.datetime(2024, 1, 2))
+
+        # Asserts
+        self.assertEqual(timeline, [])
+
+    def test_switch_data_partitions_are_not_managed_without_partitioning(self):
+        # Actions
+        created_partitions = self.switch_repository_service.create_switch_data_partitions(datetime.datetime.now(), 3)
+        dropped_partitions = self.switch_repository_service.drop_switch_data_partitions(datetime.datetime.now())
+
+        # Asserts
+        self.assertEqual(created_partitions, [])
+        self.assertEqual(dropped_partitions, [])
+
+    def test_switch_data_partitions_are_not_managed_for_unpartitioned_postgresql_table(self):
+        # Setup
+        mock_session_maker = MagicMock()
+        mock_session = mock_session_maker.return_value.__enter__.return_value
+        mock_session.execute.return_value.scalar.return_value = False
+
+        # Actions
+        with patch.object(self.switch_repository_service, 'engine') as mock_engine, \
+                patch.object(self.switch_repository_service, 'session_maker', mock_session_maker), \
+                self.assertLogs(self.switch_repository_service.logger, level='WARNING'):
+            mock_engine.dialect.name = 'postgresql'
+            created_partitions = self.switch_repository_service.create_switch_data_partitions(
+                datetime.datetime.now(), 3)
+            dropped_partitions = self.switch_repository_service.drop_switch_data_partitions(datetime.datetime.now())
+
+        # Asserts
+        self.assertEqual(created_partitions, [])
+        self.assertEqual(dropped_partitions, [])
+        self.assertEqual(mock_session.execute.call_count, 2)
+        self.assertIn('pg_partitioned_table', str(mock_session.execute.call_args.args[0]))
+
+    def test_create_switch_data_partition_moves_rows_from_default_partition(self):
+        # Setup
+        mock_session = MagicMock()
+        mock_session.execute.return_value.scalar.return_value = True
+
+        # Actions
+        self.switch_repository_service._create_switch_data_partition(mock_session, 'switch_data_y2024m05',
+                                                                     datetime.datetime(2024, 5, 1))
+
+        # Asserts
+        statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+        self.assertEqual(len(statements), 5)
+        self.assertIn('DETACH PARTITION switch_data_default', statements[1])
+        self.assertIn("FROM ('2024-05-01T00:00:00') TO ('2024-06-01T00:00:00')", statements[2])
+        self.assertIn('DELETE FROM switch_data_default', statements[3])
+        self.assertIn('INSERT INTO switch_data_y2024m05', statements[3])
+        self.assertIn('ATTACH PARTITION switch_data_default DEFAULT', statements[4])
+
+    def test_create_switch_data_partition_without_rows_in_default_partition(self):
+        # Setup
+        mock_session = MagicMock()
+        mock_session.execute.return_value.scalar.return_value = False
+
+        # Actions
+        self.switch_repository_service._create_switch_data_partition(mock_session, 'switch_data_y2024m05',
+                                                                     datetime.datetime(2024, 5, 1))
+
+        # Asserts
+        statements = [str(call.args[0]) for call in mock_session.execute.call_args_list]
+        self.assertEqual(len(statements), 2)
+        self.assertIn('CREATE TABLE switch_data_y2024m05 PARTITION OF switch_data', statements[1])
+
+    def test_get_month_start(self):
+        # Actions
+        results = [_get_month_start(datetime.datetime(2024, 11, 15, 10), months) for months in [0, 1, 2, -11]]
+
+        # Asserts
+        self.assertEqual(results, [datetime.datetime(2024, 11, 1), datetime.datetime(2024, 12, 1),
+                                   datetime.datetime(2025, 1, 1), datetime.datetime(2023, 12, 1)])
+
+    def test_store_switch_operational_data_ignoring_duplicates(self):
+        # Setup
+        switch = SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic")
+        switch_id = self.switch_repository_service.store_switch_data(switch)
+        log_cre_date = datetime.datetime(2024, 1, 1, 12, 0)
+        rows = [{'switch_id': switch_id, 'data_type': SwitchDataType.TEMPERATURE,
+                 'log_cre_date': log_cre_date + datetime.timedelta(minutes=minutes), 'value_text': None,
+                 'value_number': 20.0 + minutes} for minutes in range(5)]
+
+        # Actions
+        first_count = self.switch_repository_service.store_switch_operational_data_ignoring_duplicates(
+            rows[:3], chunk_size=2)
+        second_count = self.switch_repository_service.store_switch_operational_data_ignoring_duplicates(
+            rows, chunk_size=2)
+
+        # Asserts
+        with self.switch_repository_service.session_maker() as session:
+            self.assertEqual(session.query(SwitchDataModel).count(), 5)
+        self.assertEqual((first_count, second_count), (3, 2))
+
+    def test_get_switches_with_logic_includes_switches_with_rule(self):
+        # Setup
+        rule = {'when': {'price_among_cheapest': 4}}
+        self.switch_repository_service.store_switch_data(SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1',
+                                                                     status_calculation_rule=rule))
+        self.switch_repository_service.store_switch_data(SwitchModel(name="Switch 2", uuid='uuid_2', place_id='1'))
+
+        # Actions
+        switches = self.switch_repository_service.get_switches_with_logic()
+
+        # Asserts
+        self.assertEqual([switch.uuid for switch in switches], ['uuid_1'])
+        self.assertEqual(switches[0].status_calculation_rule, rule)
+
+    def test_mark_switch_data_rollups_dirty_keeps_earliest_date(self):
+        # Setup
+        switch_id = self.switch_repository_service.store_switch_data(
+            SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic"))
+        self.switch_repository_service.mark_switch_data_rollups_dirty(switch_id, datetime.datetime(2024, 1, 2))
+        self.switch_repository_service.mark_switch_data_rollups_dirty(switch_id, datetime.datetime(2024, 1, 1))
+
+        # Actions
+        self.switch_repository_service.mark_switch_data_rollups_dirty(switch_id, datetime.datetime(2024, 1, 3))
+        dirty_dates = self.switch_repository_service.get_switch_data_rollup_dirty_dates()
+
+        # Asserts
+        self.assertEqual(dirty_dates, {switch_id: datetime.datetime(2024, 1, 1)})
+
+    def test_clear_switch_data_rollup_dirty_dates_keeps_newer_marks(self):
+        # Setup
+        switch_id = self.switch_repository_service.store_switch_data(
+            SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic"))
+        self.switch_repository_service.mark_switch_data_rollups_dirty(switch_id, datetime.datetime(2024, 1, 2))
+        dirty_dates = self.switch_repository_service.get_switch_data_rollup_dirty_dates()
+        self.switch_repository_service.mark_switch_data_rollups_dirty(switch_id, datetime.datetime(2024, 1, 1))
+
+        # Actions
+        self.switch_repository_service.clear_switch_data_rollup_dirty_dates(dirty_dates)
+
+        # Asserts
+        self.assertEqual(self.switch_repository_service.get_switch_data_rollup_dirty_dates(),
+                         {switch_id: datetime.datetime(2024, 1, 1)})
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock
 from sqlalchemy.orm import clear_mappers
 from sqlalchemy.exc import IntegrityError
 from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.database_engine import DatabaseEngine
 from src.repository_service.user_repository_service import UserRepositoryService
 from src.user_service.models.user_model import UserModel
 
@@ -12,7 +13,8 @@ class TestUserRepositoryService(unittest.TestCase):
     def setUp(self):
         self.mock_configuration = MagicMock(spec=BaseConfiguration)
         self.mock_configuration.get.return_value = "sqlite:///:memory:"
-        self.user_repository_service = UserRepositoryService(configuration=self.mock_configuration)
+        self.user_repository_service = UserRepositoryService(configuration=self.mock_configuration,
+                                                             database_engine=DatabaseEngine(self.mock_configuration))
         self.user_repository_service.create_database()
 
     def tearDown(self):
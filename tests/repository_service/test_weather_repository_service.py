@@ -1,11 +1,12 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import clear_mappers
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 from src.configuration.base_configuration import BaseConfiguration
-from src.weather_service.models.weather_model import WeatherModel
+from src.repository_service.database_engine import DatabaseEngine
+from src.weather_service.models.weather_model import WeatherModel, WeatherRecord
 from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
 from src.repository_service.weather_repository_service import WeatherRepositoryService
 from src.repository_service.base_repository_service import BaseRepositoryService
@@ -17,7 +18,8 @@ class TestWeatherRepositoryService(unittest.TestCase):
     def setUp(self):
         self.mock_configuration = MagicMock(spec=BaseConfiguration)
         self.mock_configuration.get.return_value = "sqlite:///:memory:"
-        self.weather_repository_service = WeatherRepositoryService(self.mock_configuration)
+        self.weather_repository_service = WeatherRepositoryService(configuration=self.mock_configuration,
+                                                                   database_engine=DatabaseEngine(self.mock_configuration))
         self.weather_repository_service.create_database()
 
         self.weather_data = [
@@ -36,6 +38,20 @@ class TestWeatherRepositoryService(unittest.TestCase):
         clear_mappers()
         self.weather_repository_service.engine.dispose()
 
+    def test_create_database_adds_location_datetime_index_to_existing_table(self):
+        # Setup
+        with self.weather_repository_service.engine.begin() as connection:
+            connection.execute(text('DROP INDEX ix_weather_location_id_datetime'))
+        clear_mappers()
+
+        # Actions
+        self.weather_repository_service.create_database()
+
+        # Asserts
+        indexes = {index['name']: index['column_names']
+                   for index in inspect(self.weather_repository_service.engine).get_indexes('weather')}
+        self.assertEqual(indexes['ix_weather_location_id_datetime'], ['location_id', 'datetime'])
+
     def test_store_weather_data(self):
         # Setup
         expected_temperature = self.weather_data[0].temperature
@@ -61,6 +77,64 @@ class TestWeatherRepositoryService(unittest.TestCase):
         # Asserts
         self.assertEqual(stored_data[0].temperature, expected_temperature)
 
+    def test_store_weather_data_reports_inserted_and_updated_counts(self):
+        # Setup
+        changed_weather_data = [
+            WeatherModel(datetime=datetime(2023, 1, 1, 12, 0), cloud_cover=20.5, temperature=30.0, latitude=50.0,
+                         longitude=8.0, sunshine_duration=5.0, location_id=1),
+            WeatherModel(datetime=datetime(2023, 1, 1, 13, 0), cloud_cover=20.5, temperature=31.0, latitude=50.0,
+                         longitude=8.0, sunshine_duration=5.0, location_id=1)
+        ]
+
+        # Actions
+        first_result = self.weather_repository_service.store_weather_data(self.weather_data)
+        unchanged_result = self.weather_repository_service.store_weather_data(self.weather_data)
+        changed_result = self.weather_repository_service.store_weather_data(changed_weather_data)
+        with self.weather_repository_service.session_maker() as session:
+            stored_data = session.query(WeatherModel).order_by(WeatherModel.datetime).all()
+
+        # Asserts
+        self.assertEqual((first_result.inserted, first_result.updated), (1, 0))
+        self.assertEqual((unchanged_result.inserted, unchanged_result.updated), (0, 0))
+        self.assertEqual((changed_result.inserted, changed_result.updated), (1, 1))
+        self.assertEqual([weather.temperature for weather in stored_data], [30.0, 31.0])
+
+    def test_store_weather_data_assigns_legacy_data_without_location(self):
+        # Setup
+        with self.weather_repository_service.session_maker() as session:
+            session.add(WeatherModel(datetime=datetime(2023, 1, 1, 12, 0), cloud_cover=10.0, temperature=20.0,
+                                     latitude=50.0, longitude=8.0, sunshine_duration=1.0))
+            session.add(WeatherModel(datetime=datetime(2023, 1, 1, 11, 0), cloud_cover=10.0, temperature=19.0,
+                                     latitude=50.0, longitude=8.0, sunshine_duration=1.0))
+            session.commit()
+
+        # Actions
+        result = self.weather_repository_service.store_weather_data(self.weather_data)
+        with self.weather_repository_service.session_maker() as session:
+            stored_data = session.query(WeatherModel).order_by(WeatherModel.datetime).all()
+
+        # Asserts
+        self.assertEqual((result.inserted, result.updated), (0, 1))
+        self.assertEqual([(weather.location_id, weather.temperature) for weather in stored_data],
+                         [(None, 19.0), (1, 25.0)])
+
+    def test_store_weather_data_at_stored_coordinates_of_other_location(self):
+        # Setup
+        other_location_weather_data = [
+            WeatherModel(datetime=datetime(2023, 1, 1, 12, 0), cloud_cover=20.5, temperature=26.0, latitude=50.0,
+                         longitude=8.0, sunshine_duration=5.0, location_id=2)
+        ]
+        self.weather_repository_service.store_weather_data(self.weather_data)
+
+        # Actions
+        result = self.weather_repository_service.store_weather_data(other_location_weather_data)
+        with self.weather_repository_service.session_maker() as session:
+            stored_data = session.query(WeatherModel).all()
+
+        # Asserts
+        self.assertEqual((result.inserted, result.updated), (0, 1))
+        self.assertEqual([(weather.location_id, weather.temperature) for weather in stored_data], [(2, 26.0)])
+
     def test_get_weather_data_after_date(self):
         # Setup
         expected_date = self.weather_data[0].datetime
@@ -84,4 +158,26 @@ class TestWeatherRepositoryService(unittest.TestCase):
         result = self.weather_repository_service.get_weather_data_after_date(date_filter)
 
         # Asserts
-        self.assertEqual(len(result), 0)
\ No newline at end of file
+        self.assertEqual(len(result), 0)
+
+    def test_get_weather_data_for_location(self):
+        # Setup
+        weather_data = [
+            WeatherModel(datetime=datetime(2023, 1, 1, 13, 0), cloud_cover=20.5, temperature=26.0, latitude=50.0,
+                         longitude=8.0, sunshine_duration=5.0, location_id=1),
+            WeatherModel(datetime=datetime(2023, 1, 1, 12, 0), cloud_cover=20.5, temperature=25.0, latitude=50.0,
+                         longitude=8.0, sunshine_duration=5.0, location_id=1),
+            WeatherModel(datetime=datetime(2023, 1, 1, 12, 0), cloud_cover=20.5, temperature=15.0, latitude=56.0,
+                         longitude=24.0, sunshine_duration=5.0, location_id=2),
+            WeatherModel(datetime=datetime(2023, 1, 2, 12, 0), cloud_cover=20.5, temperature=27.0, latitude=50.0,
+                         longitude=8.0, sunshine_duration=5.0, location_id=1)
+        ]
+        self.weather_repository_service.store_weather_data(weather_data)
+
+        # Actions
+        result = self.weather_repository_service.get_weather_data_for_location(1, datetime(2023, 1, 1, 0, 0),
+                                                                               datetime(2023, 1, 1, 23, 0))
+
+        # Asserts
+        self.assertEqual([weather.temperature for weather in result], [25.0, 26.0])
+        self.assertEqual(result[0], WeatherRecord(datetime(2023, 1, 1, 12, 0), 20.5, 25.0, 50.0, 8.0, 5.0, 1))
@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock, Mock
 from flask import Flask
 from flask_jwt_extended import create_access_token, JWTManager
 from flask_smorest import Api
@@ -223,3 +224,119 @@ class TestSwitch(unittest.TestCase):
 
         # Asserts
         self.assertEqual(response.status_code, 404)
+
+
+class TestSwitchDataBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config["API_TITLE"] = "Stores REST API"
+        self.app.config["API_VERSION"] = "V1"
+        self.app.config["OPENAPI_VERSION"] = "3.0.3"
+        self.app.config["OPENAPI_URL_PREFIX"] = "/"
+        self.app.config['JWT_SECRET_KEY'] = 'super-secret'
+
+        self.jwt = JWTManager(self.app)
+        api = Api(self.app)
+        api.register_blueprint(blp)
+        self.client = self.app.test_client()
+
+        self.mock_repository_service = Mock()
+        self.mock_repository_service.get_switch_for_user.return_value = SwitchModel(
+            name='test_switch', uuid='uuid_1', place_id=1, status_calculation_logic='logic', id=3)
+        self.switch_service = SwitchService(Mock(), Mock(), Mock(), self.mock_repository_service, Mock(),
+                                            Mock(enabled=False))
+
+        def configure_injector(binder):
+            binder.bind(SwitchService, self.switch_service)
+
+        inject.configure(configure_injector)
+
+        with self.app.app_context():
+            self.access_token = create_access_token(identity='test_user')
+        self.headers = {
+            'Authorization': f'Bearer {self.access_token}',
+            'Content-Type': 'application/json'
+        }
+
+    def tearDown(self):
+        inject.clear()
+
+    def test_post_switch_data(self):
+        # Setup
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.return_value = 2
+        readings = [{"data_type": "TEMPERATURE", "log_cre_date": "2024-05-01T10:00:00", "value_number": 21.5},
+                    {"data_type": "RELAY_STATUS", "log_cre_date": "2024-05-01T09:00:00", "value_text": "ON"}]
+
+        # Actions
+        response = self.client.post("/switch/uuid_1/data", json={"readings": readings}, headers=self.headers)
+
+        # Asserts
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json, {"received": 2, "stored": 2, "duplicates": 0})
+        self.mock_repository_service.get_switch_for_user.assert_called_once_with('uuid_1', 'test_user')
+        rows = self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.call_args.args[0]
+        self.assertEqual([row['log_cre_date'] for row in rows], [datetime(2024, 5, 1, 10), datetime(2024, 5, 1, 9)])
+        self.mock_repository_service.mark_switch_data_rollups_dirty.assert_called_once_with(
+            3, datetime(2024, 5, 1, 9))
+
+    def test_post_switch_data_counts_duplicates(self):
+        # Setup
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.return_value = 1
+        readings = [{"data_type": "TEMPERATURE", "log_cre_date": f"2024-05-01T10:0{minute}:00", "value_number": 21.5}
+                    for minute in range(3)]
+
+        # Actions
+        response = self.client.post("/switch/uuid_1/data", json={"readings": readings}, headers=self.headers)
+
+        # Asserts
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json, {"received": 3, "stored": 1, "duplicates": 2})
+
+    def test_post_switch_data_converts_offset_aware_dates_to_local_time(self):
+        # Setup
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.return_value = 1
+        log_cre_date = datetime(2024, 5, 1, 10, tzinfo=timezone(timedelta(hours=3)))
+
+        # Actions
+        response = self.client.post("/switch/uuid_1/data", json={"readings": [
+            {"data_type": "RELAY_STATUS", "log_cre_date": log_cre_date.isoformat(), "value_text": "OFF"}]},
+                                    headers=self.headers)
+
+        # Asserts
+        self.assertEqual(response.status_code, 201)
+        rows = self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.call_args.args[0]
+        self.assertIsNone(rows[0]['log_cre_date'].tzinfo)
+        self.assertEqual(rows[0]['log_cre_date'], log_cre_date.astimezone().replace(tzinfo=None))
+
+    def test_post_switch_data_of_other_user_switch(self):
+        # Setup
+        self.mock_repository_service.get_switch_for_user.side_effect = ValueError("Switch not found")
+
+        # Actions
+        response = self.client.post("/switch/uuid_2/data", json={"readings": [
+            {"data_type": "RELAY_STATUS", "log_cre_date": "2024-05-01T10:00:00", "value_text": "ON"}]},
+                                    headers=self.headers)
+
+        # Asserts
+        self.assertEqual(response.status_code, 404)
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.assert_not_called()
+
+    def test_post_switch_data_limits_number_of_readings(self):
+        # Setup
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.return_value = 10000
+        start = datetime(2024, 5, 1)
+        readings = [{"data_type": "TEMPERATURE", "log_cre_date": (start + timedelta(seconds=index)).isoformat(),
+                     "value_number": 20.0} for index in range(10001)]
+
+        # Actions
+        allowed_response = self.client.post("/switch/uuid_1/data", json={"readings": readings[:10000]},
+                                            headers=self.headers)
+        rejected_response = self.client.post("/switch/uuid_1/data", json={"readings": readings},
+                                             headers=self.headers)
+
+        # Asserts
+        self.assertEqual(allowed_response.status_code, 201)
+        self.assertEqual(rejected_response.status_code, 422)
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.assert_called_once()
@@ -28,6 +28,7 @@ class TestSwitchStatus(unittest.TestCase):
         self.client = self.app.test_client()
 
         self.mock_switch_service = MagicMock()
+        self.mock_switch_service.__enter__.return_value = self.mock_switch_service
 
         def configure_injector(binder):
             binder.bind(SwitchService, self.mock_switch_service)
@@ -106,3 +107,75 @@ class TestSwitchStatus(unittest.TestCase):
         self.assertEqual(response.json, {'error_message': None,
             'switch_calculation_logic': "def get_switch_status(): return 'ON'", 'switch_status': 'ON'
         })
+
+    def _post_switch_status_batch(self, payload):
+        headers = {
+            'Authorization': f'Bearer {self.access_token}',
+            'Content-Type': 'application/json'
+        }
+        with self.app.app_context():
+            return self.client.post("/switch/status/batch", json=payload, headers=headers)
+
+    def test_get_switch_statuses_for_uuids(self):
+        # Setup
+        statuses = [{"uuid": "uuid_1", "status": "ON"},
+                    {"uuid": "uuid_2", "status": SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED},
+                    {"uuid": "uuid_3", "status": SwitchModel.SWITCH_VALUE_IF_ERROR_OCCURRED}]
+        self.mock_switch_service.get_switch_statuses.return_value = statuses
+
+        # Actions
+        response = self._post_switch_status_batch({"switch_uuids": ["uuid_1", "uuid_2", "uuid_3"]})
+
+        # Asserts
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"statuses": statuses})
+        self.mock_switch_service.get_switch_statuses.assert_called_once_with(
+            'test_user', ["uuid_1", "uuid_2", "uuid_3"], None)
+
+    def test_get_switch_statuses_reports_switch_of_other_user_as_not_found(self):
+        # Setup
+        self.mock_switch_service.get_switch_statuses.return_value = [
+            {"uuid": "other_user_uuid", "status": SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED}]
+
+        # Actions
+        response = self._post_switch_status_batch({"switch_uuids": ["other_user_uuid"]})
+
+        # Asserts
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["statuses"][0]["status"], SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED)
+        self.assertEqual(self.mock_switch_service.get_switch_statuses.call_args.args[0], 'test_user')
+
+    def test_get_switch_statuses_for_place(self):
+        # Setup
+        self.mock_switch_service.get_switch_statuses.return_value = [{"uuid": "uuid_1", "status": "OFF"}]
+
+        # Actions
+        response = self._post_switch_status_batch({"place_id": 3})
+
+        # Asserts
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"statuses": [{"uuid": "uuid_1", "status": "OFF"}]})
+        self.mock_switch_service.get_switch_statuses.assert_called_once_with('test_user', None, 3)
+
+    def test_get_switch_statuses_requires_either_uuids_or_place(self):
+        # Actions
+        both_response = self._post_switch_status_batch({"switch_uuids": ["uuid_1"], "place_id": 3})
+        none_response = self._post_switch_status_batch({})
+
+        # Asserts
+        self.assertEqual(both_response.status_code, 422)
+        self.assertEqual(none_response.status_code, 422)
+        self.mock_switch_service.get_switch_statuses.assert_not_called()
+
+    def test_get_switch_statuses_limits_number_of_uuids(self):
+        # Setup
+        self.mock_switch_service.get_switch_statuses.return_value = []
+
+        # Actions
+        allowed_response = self._post_switch_status_batch({"switch_uuids": [f"uuid_{index}" for index in range(100)]})
+        rejected_response = self._post_switch_status_batch({"switch_uuids": [f"uuid_{index}" for index in range(101)]})
+
+        # Asserts
+        self.assertEqual(allowed_response.status_code, 200)
+        self.assertEqual(rejected_response.status_code, 422)
+        self.mock_switch_service.get_switch_statuses.assert_called_once()
@@ -0,0 +1,80 @@
+import unittest
+from marshmallow import ValidationError
+from datetime import datetime
+from src.rest_api.schemas import SwitchStatusBatchRequestSchema, SwitchDataBatchSchema, SwitchSchema
+from src.switch_service.models.switch_data_model import SwitchDataType
+
+
+class TestSwitchStatusBatchRequestSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = SwitchStatusBatchRequestSchema()
+
+    def test_load_switch_uuids(self):
+        self.assertEqual(self.schema.load({'switch_uuids': ['uuid_1', 'uuid_2']}),
+                         {'switch_uuids': ['uuid_1', 'uuid_2']})
+
+    def test_load_place_id(self):
+        self.assertEqual(self.schema.load({'place_id': 1}), {'place_id': 1})
+
+    def test_load_requires_exactly_one_selection(self):
+        with self.assertRaises(ValidationError):
+            self.schema.load({})
+        with self.assertRaises(ValidationError):
+            self.schema.load({'switch_uuids': ['uuid_1'], 'place_id': 1})
+
+    def test_load_limits_number_of_switch_uuids(self):
+        with self.assertRaises(ValidationError):
+            self.schema.load({'switch_uuids': [f'uuid_{index}' for index in range(101)]})
+
+
+class TestSwitchDataBatchSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = SwitchDataBatchSchema()
+
+    def test_load_readings(self):
+        readings = self.schema.load({'readings': [
+            {'data_type': 'TEMPERATURE', 'log_cre_date': '2024-05-01T10:00:00', 'value_number': 21.5},
+            {'data_type': 'RELAY_STATUS', 'log_cre_date': '2024-05-01T10:00:00', 'value_text': 'ON'}]})['readings']
+
+        self.assertEqual(readings[0], {'data_type': SwitchDataType.TEMPERATURE,
+                                       'log_cre_date': datetime(2024, 5, 1, 10), 'value_number': 21.5})
+        self.assertEqual(readings[1]['value_text'], 'ON')
+
+    def test_load_requires_value_of_data_type(self):
+        with self.assertRaises(ValidationError):
+            self.schema.load({'readings': [{'data_type': 'TEMPERATURE', 'log_cre_date': '2024-05-01T10:00:00',
+                                            'value_text': 'warm'}]})
+        with self.assertRaises(ValidationError):
+            self.schema.load({'readings': [{'data_type': 'RELAY_STATUS', 'log_cre_date': '2024-05-01T10:00:00'}]})
+
+    def test_load_rejects_empty_batch_and_unknown_data_type(self):
+        with self.assertRaises(ValidationError):
+            self.schema.load({'readings': []})
+        with self.assertRaises(ValidationError):
+            self.schema.load({'readings': [{'data_type': 'HUMIDITY', 'log_cre_date': '2024-05-01T10:00:00',
+                                            'value_number': 1.0}]})
+
+
+class TestSwitchSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.schema = SwitchSchema()
+        self.switch_data = {'name': 'Switch 1', 'uuid': 'uuid_1', 'place_id': 1}
+
+    def test_load_status_calculation_rule(self):
+        rule = {'when': {'price_among_cheapest': 4}}
+
+        self.assertEqual(self.schema.load({**self.switch_data, 'status_calculation_rule': rule}),
+                         {**self.switch_data, 'status_calculation_rule': rule})
+
+    def test_load_requires_logic_or_rule(self):
+        with self.assertRaises(ValidationError):
+            self.schema.load(self.switch_data)
+        self.assertIn('status_calculation_logic', self.schema.load(
+            {**self.switch_data, 'status_calculation_logic': "def get_switch_status(): return 'ON'"}))
+
+    def test_load_rejects_invalid_rule(self):
+        with self.assertRaises(ValidationError):
+            self.schema.load({**self.switch_data, 'status_calculation_rule': {'when': {'unknown': 1}}})
@@ -0,0 +1,161 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
+from sqlalchemy.orm import clear_mappers
+from src.configuration.base_configuration import BaseConfiguration
+from src.place_service.models.place_model import PlaceModel
+from src.repository_service.database_engine import DatabaseEngine
+from src.repository_service.switch_repository_service import SwitchRepositoryService
+from src.switch_service.models.switch_data_model import SwitchDataModel, SwitchDataType
+from src.switch_service.models.switch_model import SwitchModel
+from src.switch_service.switch_data_rollup_service import SwitchDataRollupService
+
+
+class TestSwitchDataRollupService(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_configuration = MagicMock(spec=BaseConfiguration)
+        self.mock_configuration.get.side_effect = lambda key, default=None: \
+            "sqlite:///:memory:" if key == 'database_string' else default
+        self.repository_service = SwitchRepositoryService(configuration=self.mock_configuration,
+                                                          database_engine=DatabaseEngine(self.mock_configuration))
+        self.repository_service.create_database()
+        with self.repository_service.session_maker() as session:
+            session.add(PlaceModel(user_id=1, name="Place 1", description="Description 1", location_id=1, id=1))
+            session.commit()
+        self.switch_id = self.repository_service.store_switch_data(
+            SwitchModel(name="Switch 1", uuid='uuid_1', place_id='1', status_calculation_logic="logic"))
+        self.rollup_service = SwitchDataRollupService(self.mock_configuration, self.repository_service)
+        self.start = datetime(2024, 1, 1, 10)
+
+    def tearDown(self):
+        self.repository_service.metadata.drop_all(self.repository_service.engine)
+        clear_mappers()
+        self.repository_service.engine.dispose()
+
+    def _store(self, minutes, data_type, value_text=None, value_number=None):
+        self.repository_service.store_switch_operational_data_many([SwitchDataModel(
+            switch_id=self.switch_id, data_type=data_type, log_cre_date=self.start + timedelta(minutes=minutes),
+            value_text=value_text, value_number=value_number)])
+
+    def _regenerate(self, now):
+        with patch('src.switch_service.switch_data_rollup_service.datetime') as mock_datetime:
+            mock_datetime.now.return_value = now
+            self.rollup_service.regenerate_switch_data_rollups()
+
+    def test_regenerate_switch_data_rollups(self):
+        # Setup
+        self._store(0, SwitchDataType.RELAY_STATUS, 'ON')
+        self._store(30, SwitchDataType.RELAY_STATUS, 'OFF')
+        self._store(45, SwitchDataType.RELAY_STATUS, 'OFF')
+        self._store(90, SwitchDataType.RELAY_STATUS, 'ON')
+        self._store(10, SwitchDataType.TEMPERATURE, value_number=20.0)
+        self._store(70, SwitchDataType.TEMPERATURE, value_number=22.0)
+        self._store(80, SwitchDataType.TEMPERATURE, value_number=26.0)
+
+        # Actions
+        self._regenerate(self.start + timedelta(hours=2))
+        resolution, buckets = self.rollup_service.get_switch_data_history(
+            self.switch_id, self.start, self.start + timedelta(hours=2))
+
+        # Asserts
+        self.assertEqual(resolution, SwitchDataRollupService.HOURLY)
+        self.assertEqual([bucket.bucket_start for bucket in buckets], [self.start, self.start + timedelta(hours=1)])
+        self.assertEqual([bucket.on_time_fraction for bucket in buckets], [0.5, 0.5])
+        self.assertEqual([bucket.switch_count for bucket in buckets], [1, 1])
+        self.assertEqual((buckets[0].temperature_min, buckets[0].temperature_avg, buckets[0].temperature_max),
+                         (20.0, 20.0, 20.0))
+        self.assertEqual((buckets[1].temperature_min, buckets[1].temperature_avg, buckets[1].temperature_max),
+                         (22.0, 24.0, 26.0))
+
+    def test_regenerate_switch_data_rollups_incrementally(self):
+        # Setup
+        self._store(0, SwitchDataType.RELAY_STATUS, 'ON')
+        self._store(10, SwitchDataType.TEMPERATURE, value_number=20.0)
+        self._regenerate(self.start + timedelta(minutes=30))
+        self._store(90, SwitchDataType.RELAY_STATUS, 'OFF')
+        self._store(100, SwitchDataType.TEMPERATURE, value_number=30.0)
+
+        # Actions
+        self._regenerate(self.start + timedelta(hours=2))
+        resolution, buckets = self.rollup_service.get_switch_data_history(
+            self.switch_id, self.start, self.start + timedelta(days=30), max_buckets=100)
+
+        # Asserts
+        self.assertEqual(resolution, SwitchDataRollupService.DAILY)
+        self.assertEqual(len(buckets), 1)
+        self.assertEqual(buckets[0].bucket_start, datetime(2024, 1, 1))
+        self.assertEqual(buckets[0].on_time_fraction, 0.75)
+        self.assertEqual(buckets[0].switch_count, 1)
+        self.assertEqual((buckets[0].temperature_min, buckets[0].temperature_avg, buckets[0].temperature_max),
+                         (20.0, 25.0, 30.0))
+
+    def test_regenerate_switch_data_rollups_limits_status_without_heartbeat(self):
+        # Setup
+        self._store(0, SwitchDataType.RELAY_STATUS, 'ON')
+
+        # Actions
+        self._regenerate(self.start + timedelta(days=3))
+        resolution, buckets = self.rollup_service.get_switch_data_history(
+            self.switch_id, self.start, self.start + timedelta(days=3), max_buckets=100)
+
+        # Asserts
+        self.assertEqual(resolution, SwitchDataRollupService.HOURLY)
+        self.assertEqual([bucket.bucket_start for bucket in buckets], [self.start])
+        self.assertEqual(buckets[0].on_time_fraction, 1.0)
+
+    def test_regenerate_switch_data_rollups_holds_status_until_heartbeat(self):
+        # Setup
+        self.repository_service.store_switch_status_transitions([SwitchDataModel(
+            switch_id=self.switch_id, data_type=SwitchDataType.RELAY_STATUS, log_cre_date=self.start, value_text='ON')])
+        self.repository_service.store_switch_status_transitions([SwitchDataModel(
+            switch_id=self.switch_id, data_type=SwitchDataType.RELAY_STATUS,
+            log_cre_date=self.start + timedelta(minutes=150), value_text='ON')])
+
+        # Actions
+        self._regenerate(self.start + timedelta(days=3))
+        resolution, buckets = self.rollup_service.get_switch_data_history(
+            self.switch_id, self.start, self.start + timedelta(days=3), max_buckets=100)
+
+        # Asserts
+        self.assertEqual([bucket.bucket_start for bucket in buckets],
+                         [self.start + timedelta(hours=hour) for hour in range(3)])
+        self.assertEqual([bucket.on_time_fraction for bucket in buckets], [1.0, 1.0, 1.0])
+
+    def test_regenerate_switch_data_rollups_from_uploaded_readings(self):
+        # Setup
+        self._store(180, SwitchDataType.RELAY_STATUS, 'ON')
+        self._regenerate(self.start + timedelta(hours=4))
+        self.repository_service.store_switch_operational_data_ignoring_duplicates([
+            {'switch_id': self.switch_id, 'data_type': SwitchDataType.RELAY_STATUS, 'log_cre_date': self.start,
+             'value_text': 'ON', 'value_number': None},
+            {'switch_id': self.switch_id, 'data_type': SwitchDataType.RELAY_STATUS,
+             'log_cre_date': self.start + timedelta(minutes=30), 'value_text': 'OFF', 'value_number': None}])
+        self.repository_service.mark_switch_data_rollups_dirty(self.switch_id, self.start)
+
+        # Actions
+        self._regenerate(self.start + timedelta(hours=5))
+        resolution, buckets = self.rollup_service.get_switch_data_history(
+            self.switch_id, self.start, self.start + timedelta(hours=5))
+
+        # Asserts
+        self.assertEqual(resolution, SwitchDataRollupService.HOURLY)
+        self.assertEqual(buckets[0].bucket_start, self.start)
+        self.assertEqual(buckets[0].on_time_fraction, 0.5)
+        self.assertEqual(buckets[0].switch_count, 1)
+        self.assertEqual(buckets[-1].bucket_start, self.start + timedelta(hours=3))
+        self.assertEqual(buckets[-1].on_time_fraction, 1.0)
+        self.assertEqual(self.repository_service.get_switch_data_rollup_dirty_dates(), {})
+
+    def test_regenerate_switch_data_rollups_without_data(self):
+        # Setup
+        mock_repository_service = Mock()
+        mock_repository_service.get_last_switch_data_rollup_start.return_value = None
+        mock_repository_service.get_first_switch_data_date.return_value = None
+        rollup_service = SwitchDataRollupService(self.mock_configuration, mock_repository_service)
+
+        # Actions
+        rollup_service.regenerate_switch_data_rollups()
+
+        # Asserts
+        mock_repository_service.upsert_switch_data_rollups.assert_not_called()
@@ -0,0 +1,120 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+from src.configuration.base_configuration import BaseConfiguration
+from src.repository_service.switch_repository_service import SwitchRepositoryService
+from src.switch_service.models.switch_data_model import SwitchDataModel, SwitchDataType
+from src.switch_service.switch_data_writer import SwitchDataWriter
+
+
+class TestSwitchDataWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.configuration_values = {'switch_data_write_batch_size': '2',
+                                     'switch_data_write_flush_interval_in_seconds': '0.05',
+                                     'switch_data_write_buffer_size': '10',
+                                     'switch_data_write_enqueue_timeout_in_seconds': '0.01'}
+        self.mock_configuration = Mock(spec=BaseConfiguration)
+        self.mock_configuration.get.side_effect = lambda key, default=None: self.configuration_values.get(key, default)
+        self.mock_repository_service = Mock(spec=SwitchRepositoryService)
+        self.stored_batches = []
+        self.mock_repository_service.store_switch_operational_data_many.side_effect = \
+            lambda batch: self.stored_batches.append([data.switch_id for data in batch])
+        self.switch_data_writer = SwitchDataWriter(self.mock_configuration, self.mock_repository_service)
+
+    def tearDown(self):
+        self.switch_data_writer.close()
+
+    def _get_switch_data(self, switch_id):
+        return SwitchDataModel(switch_id=switch_id, data_type=SwitchDataType.RELAY_STATUS,
+                               log_cre_date=datetime.now(), value_text='ON')
+
+    def test_write_stores_batches_of_batch_size(self):
+        # Actions
+        accepted = self.switch_data_writer.write_many([self._get_switch_data(switch_id) for switch_id in range(5)])
+        self.switch_data_writer.close()
+
+        # Asserts
+        self.assertEqual(accepted, 5)
+        self.assertEqual([switch_id for batch in self.stored_batches for switch_id in batch], [0, 1, 2, 3, 4])
+        self.assertTrue(all(len(batch) <= 2 for batch in self.stored_batches))
+
+    def test_write_stores_partial_batch_after_flush_interval(self):
+        # Setup
+        stored = threading.Event()
+        self.mock_repository_service.store_switch_operational_data_many.side_effect = lambda batch: stored.set()
+
+        # Actions
+        self.switch_data_writer.write(self._get_switch_data(1))
+
+        # Asserts
+        self.assertTrue(stored.wait(timeout=2))
+
+    def test_write_drops_records_when_buffer_is_full(self):
+        # Setup
+        self.configuration_values['switch_data_write_buffer_size'] = '1'
+        release = threading.Event()
+        self.mock_repository_service.store_switch_operational_data_many.side_effect = lambda batch: release.wait(2)
+        switch_data_writer = SwitchDataWriter(self.mock_configuration, self.mock_repository_service)
+
+        # Actions
+        results = [switch_data_writer.write(self._get_switch_data(switch_id)) for switch_id in range(5)]
+        release.set()
+        switch_data_writer.close()
+
+        # Asserts
+        self.assertIn(False, results)
+        self.assertEqual(switch_data_writer.dropped_count, results.count(False))
+
+    def test_write_many_waits_for_full_buffer_once(self):
+        # Setup
+        self.configuration_values['switch_data_write_buffer_size'] = '1'
+        self.configuration_values['switch_data_write_enqueue_timeout_in_seconds'] = '0.2'
+        release = threading.Event()
+        self.mock_repository_service.store_switch_operational_data_many.side_effect = lambda batch: release.wait(5)
+        switch_data_writer = SwitchDataWriter(self.mock_configuration, self.mock_repository_service)
+
+        # Actions
+        start = time.monotonic()
+        accepted = switch_data_writer.write_many([self._get_switch_data(switch_id) for switch_id in range(50)])
+        elapsed = time.monotonic() - start
+        release.set()
+        switch_data_writer.close()
+
+        # Asserts
+        self.assertLess(elapsed, 1.0)
+        self.assertLess(accepted, 50)
+        self.assertEqual(switch_data_writer.dropped_count, 50 - accepted)
+
+    def test_failed_store_is_counted(self):
+        # Setup
+        self.mock_repository_service.store_switch_operational_data_many.side_effect = Exception('Boom!')
+
+        # Actions
+        self.switch_data_writer.write(self._get_switch_data(1))
+        self.switch_data_writer.close()
+
+        # Asserts
+        self.assertEqual(self.switch_data_writer.failed_count, 1)
+
+    def test_close_without_writes(self):
+        # Actions
+        self.switch_data_writer.close()
+
+        # Asserts
+        self.mock_repository_service.store_switch_operational_data_many.assert_not_called()
+
+    def test_write_stores_status_transitions_if_enabled(self):
+        # Setup
+        self.configuration_values['switch_data_transition_only'] = 'true'
+        switch_data_writer = SwitchDataWriter(self.mock_configuration, self.mock_repository_service)
+
+        # Actions
+        switch_data_writer.write(self._get_switch_data(1))
+        switch_data_writer.close()
+
+        # Asserts
+        self.mock_repository_service.store_switch_status_transitions.assert_called_once()
+        self.mock_repository_service.store_switch_operational_data_many.assert_not_called()
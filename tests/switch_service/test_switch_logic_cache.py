@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+from src.switch_service.switch_logic_cache import SwitchLogicCache
+
+
+class TestSwitchLogicCache(unittest.TestCase):
+
+    def setUp(self):
+        self.switch_logic_cache = SwitchLogicCache(max_size=2)
+        self.logic = "def get_switch_status(): return 'ON'"
+
+    def test_get_compiled_logic(self):
+        # Actions
+        compiled_logic = self.switch_logic_cache.get_compiled_logic(1, self.logic)
+        scope = {}
+        exec(compiled_logic, scope)
+
+        # Asserts
+        self.assertEqual(scope['get_switch_status'](), 'ON')
+
+    @patch('src.switch_service.switch_logic_cache.compile', create=True, side_effect=compile)
+    def test_get_compiled_logic_compiles_once(self, mock_compile):
+        # Actions
+        first = self.switch_logic_cache.get_compiled_logic(1, self.logic)
+        second = self.switch_logic_cache.get_compiled_logic(1, self.logic)
+
+        # Asserts
+        self.assertIs(first, second)
+        mock_compile.assert_called_once()
+
+    def test_get_compiled_logic_recompiles_changed_logic(self):
+        # Setup
+        changed_logic = "def get_switch_status(): return 'OFF'"
+
+        # Actions
+        first = self.switch_logic_cache.get_compiled_logic(1, self.logic)
+        second = self.switch_logic_cache.get_compiled_logic(1, changed_logic)
+
+        # Asserts
+        self.assertIsNot(first, second)
+        self.assertEqual(len(self.switch_logic_cache), 1)
+
+    def test_get_compiled_logic_evicts_least_recently_used(self):
+        # Actions
+        first = self.switch_logic_cache.get_compiled_logic(1, self.logic)
+        self.switch_logic_cache.get_compiled_logic(2, self.logic)
+        self.switch_logic_cache.get_compiled_logic(1, self.logic)
+        self.switch_logic_cache.get_compiled_logic(3, self.logic)
+
+        # Asserts
+        self.assertEqual(len(self.switch_logic_cache), 2)
+        self.assertIs(self.switch_logic_cache.get_compiled_logic(1, self.logic), first)
+        self.assertNotIn(2, self.switch_logic_cache._entries)
+
+    def test_get_compiled_logic_syntax_error(self):
+        # Asserts
+        with self.assertRaises(SyntaxError):
+            self.switch_logic_cache.get_compiled_logic(1, "def get_switch_status(: return")
+        self.assertEqual(len(self.switch_logic_cache), 0)
+
+    def test_invalidate(self):
+        # Setup
+        self.switch_logic_cache.get_compiled_logic(1, self.logic)
+
+        # Actions
+        self.switch_logic_cache.invalidate(1)
+        self.switch_logic_cache.invalidate(2)
+
+        # Asserts
+        self.assertEqual(len(self.switch_logic_cache), 0)
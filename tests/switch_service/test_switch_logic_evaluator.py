@@ -0,0 +1,169 @@
+import multiprocessing
+import signal
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+from src.configuration.base_configuration import BaseConfiguration
+from src.electricity_price_service.models.electricity_price_model import ElectricityPriceRecord
+from src.switch_service.switch_logic_evaluator import SwitchLogicEvaluator, SwitchLogicTimeoutError, \
+    SwitchLogicEvaluationError, get_allowed_builtins, _run_worker
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class TestSwitchLogicEvaluator(unittest.TestCase):
+
+    def setUp(self):
+        self.configuration_values = {'switch_logic_evaluator_enabled': 'true',
+                                     'switch_logic_evaluator_pool_size': '1',
+                                     'switch_logic_evaluation_timeout_in_seconds': '5'}
+        self.mock_configuration = Mock(spec=BaseConfiguration)
+        self.mock_configuration.get.side_effect = lambda key, default=None: self.configuration_values.get(key, default)
+        self.switch_logic_evaluator = SwitchLogicEvaluator(self.mock_configuration)
+
+    def tearDown(self):
+        self.switch_logic_evaluator.close()
+
+    def test_evaluate_returns_status(self):
+        # Setup
+        logic = "def get_switch_status():\n    return 'ON' if datetime.now().hour == 13 else 'OFF'"
+
+        # Actions
+        status = self.switch_logic_evaluator.evaluate(logic, {}, datetime(2024, 5, 1, 13))
+
+        # Asserts
+        self.assertTrue(self.switch_logic_evaluator.enabled)
+        self.assertEqual(status, 'ON')
+
+    def test_evaluate_calls_data_functions_in_calling_process(self):
+        # Setup
+        get_prices = Mock(return_value=[1.0, 3.0])
+        logic = "def get_switch_status():\n    return 'ON' if get_prices(1, day=2)[1] > 2 else 'OFF'"
+
+        # Actions
+        status = self.switch_logic_evaluator.evaluate(logic, {'get_prices': get_prices})
+
+        # Asserts
+        self.assertEqual(status, 'ON')
+        get_prices.assert_called_once_with(1, day=2)
+
+    def test_evaluate_passes_records_to_logic(self):
+        # Setup
+        get_prices = Mock(return_value=[ElectricityPriceRecord(datetime(2024, 5, 1, 13), 3.0)])
+        logic = "def get_switch_status():\n    return 'ON' if get_prices()[0].price > 2 else 'OFF'"
+
+        # Actions
+        status = self.switch_logic_evaluator.evaluate(logic, {'get_prices': get_prices})
+
+        # Asserts
+        self.assertEqual(status, 'ON')
+
+    def test_evaluate_raises_exception_of_logic(self):
+        # Setup
+        logic = "def get_switch_status():\n    return undefined_status"
+
+        # Actions & Asserts
+        with self.assertRaisesRegex(SwitchLogicEvaluationError, 'undefined_status'):
+            self.switch_logic_evaluator.evaluate(logic, {})
+
+    def test_evaluate_stops_endless_logic_and_replaces_worker(self):
+        # Setup
+        self.configuration_values['switch_logic_evaluation_timeout_in_seconds'] = '1'
+        switch_logic_evaluator = SwitchLogicEvaluator(self.mock_configuration)
+        logic = "def get_switch_status():\n    while True:\n        pass"
+
+        # Actions & Asserts
+        try:
+            with self.assertRaises(SwitchLogicTimeoutError):
+                switch_logic_evaluator.evaluate(logic, {})
+            self.assertEqual(switch_logic_evaluator.evaluate("def get_switch_status():\n    return 'OFF'", {}),
+                             'OFF')
+        finally:
+            switch_logic_evaluator.close()
+
+    def test_evaluate_recycles_worker_after_max_evaluations(self):
+        # Setup
+        self.configuration_values['switch_logic_evaluator_max_evaluations_per_worker'] = '1'
+        switch_logic_evaluator = SwitchLogicEvaluator(self.mock_configuration)
+        logic = "def get_switch_status():\n    return 'ON'"
+
+        # Actions
+        try:
+            switch_logic_evaluator.evaluate(logic, {})
+            first_worker = switch_logic_evaluator._idle_workers.get(timeout=10)
+            switch_logic_evaluator._idle_workers.put(first_worker)
+            switch_logic_evaluator.evaluate(logic, {})
+            second_worker = switch_logic_evaluator._idle_workers.get(timeout=10)
+            switch_logic_evaluator._idle_workers.put(second_worker)
+        finally:
+            switch_logic_evaluator.close()
+
+        # Asserts
+        self.assertIsNot(first_worker, second_worker)
+        self.assertNotEqual(first_worker.process.pid, second_worker.process.pid)
+
+    def test_evaluate_returns_before_timed_out_worker_is_replaced(self):
+        # Setup
+        self.configuration_values['switch_logic_evaluation_timeout_in_seconds'] = '1'
+        switch_logic_evaluator = SwitchLogicEvaluator(self.mock_configuration)
+        switch_logic_evaluator.evaluate("def get_switch_status():\n    return 'OFF'", {})
+        started = threading.Event()
+        start_worker = switch_logic_evaluator._start_worker
+
+        def start_worker_slowly():
+            started.wait(10)
+            return start_worker()
+
+        switch_logic_evaluator._start_worker = start_worker_slowly
+        logic = "def get_switch_status():\n    while True:\n        pass"
+
+        # Actions
+        try:
+            begin = time.monotonic()
+            with self.assertRaises(SwitchLogicTimeoutError):
+                switch_logic_evaluator.evaluate(logic, {})
+            duration = time.monotonic() - begin
+            started.set()
+            status = switch_logic_evaluator.evaluate("def get_switch_status():\n    return 'ON'", {})
+        finally:
+            started.set()
+            switch_logic_evaluator.close()
+
+        # Asserts
+        self.assertLess(duration, 5)
+        self.assertEqual(status, 'ON')
+
+    @unittest.skipIf(resource is None, 'resource limits are not supported on this platform')
+    def test_evaluator_worker_is_killed_after_cpu_limit(self):
+        # Setup
+        parent_connection, child_connection = multiprocessing.get_context('spawn').Pipe()
+        process = multiprocessing.get_context('spawn').Process(target=_run_worker, args=(child_connection, 0, 1),
+                                                               daemon=True)
+        process.start()
+        child_connection.close()
+
+        # Actions
+        try:
+            parent_connection.send(("def get_switch_status():\n    while True:\n        pass", None, []))
+            process.join(30)
+        finally:
+            if process.is_alive():
+                process.kill()
+                process.join()
+            parent_connection.close()
+
+        # Asserts
+        self.assertEqual(process.exitcode, -signal.SIGXCPU)
+
+    def test_get_allowed_builtins_with_fixed_time(self):
+        # Actions
+        builtins = get_allowed_builtins(datetime(2024, 5, 1, 13))
+
+        # Asserts
+        self.assertEqual(builtins['datetime'].now(), datetime(2024, 5, 1, 13))
+        self.assertEqual(sorted(builtins), ['datetime', 'print', 'sorted', 'timedelta'])
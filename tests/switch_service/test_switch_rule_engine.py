@@ -0,0 +1,84 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from src.electricity_price_service.models.electricity_price_model import ElectricityPriceModel
+from src.electricity_price_service.price_series import PriceSeries
+from src.switch_service.switch_rule_engine import SwitchRuleEngine, SwitchRuleError
+from src.weather_service.weather_series import WeatherSeries
+
+
+class TestSwitchRuleEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.switch_rule_engine = SwitchRuleEngine()
+        self.day_start = datetime(2024, 5, 1)
+        prices = [5.0, 3.0, 1.0, 2.0, 8.0, 4.0]
+        self.price_loader = Mock(return_value=PriceSeries.from_records(
+            [ElectricityPriceModel(self.day_start + timedelta(hours=hour), price) for hour, price in enumerate(prices)]))
+        self.weather_loader = Mock(return_value=WeatherSeries([self.day_start + timedelta(hours=2)], [15.0], [0], [0]))
+
+    def _evaluate(self, rule, hour):
+        return self.switch_rule_engine.evaluate(rule, self.day_start + timedelta(hours=hour, minutes=30),
+                                                self.price_loader, self.weather_loader)
+
+    def test_evaluate_price_among_cheapest(self):
+        # Setup
+        rule = {'when': {'price_among_cheapest': 2}}
+
+        # Actions
+        statuses = [self._evaluate(rule, hour) for hour in range(6)]
+
+        # Asserts
+        self.assertEqual(statuses, ['OFF', 'OFF', 'ON', 'ON', 'OFF', 'OFF'])
+
+    def test_evaluate_price_among_most_expensive_and_thresholds(self):
+        # Actions & Asserts
+        self.assertEqual(self._evaluate({'when': {'price_among_most_expensive': 1}}, 4), 'ON')
+        self.assertEqual(self._evaluate({'when': {'price_below': 3.5}}, 1), 'ON')
+        self.assertEqual(self._evaluate({'when': {'price_above': 3.5}}, 1), 'OFF')
+
+    def test_evaluate_combined_conditions_with_custom_statuses(self):
+        # Setup
+        rule = {'when': {'all': [{'temperature_below': 20}, {'any': [{'price_below': 2}, {'hour_between': [22, 4]}]},
+                                 {'not': {'price_above': 4}}]},
+                'then': 'HEAT', 'else': 'IDLE'}
+
+        # Actions
+        statuses = [self._evaluate(rule, hour) for hour in range(6)]
+
+        # Asserts
+        self.assertEqual(statuses, ['IDLE', 'HEAT', 'HEAT', 'HEAT', 'IDLE', 'IDLE'])
+
+    def test_evaluate_loads_only_used_data(self):
+        # Actions
+        self._evaluate({'when': {'hour_between': [0, 12]}}, 1)
+
+        # Asserts
+        self.price_loader.assert_not_called()
+        self.weather_loader.assert_not_called()
+
+    def test_evaluate_without_current_price(self):
+        # Setup
+        self.price_loader.return_value = PriceSeries((), ())
+
+        # Actions & Asserts
+        with self.assertRaises(SwitchRuleError):
+            self._evaluate({'when': {'price_below': 1}}, 1)
+
+    def test_evaluate_after_last_price(self):
+        # Actions & Asserts
+        with self.assertRaisesRegex(SwitchRuleError, 'No electricity price is available'):
+            self._evaluate({'when': {'price_below': 1}}, 6)
+
+    def test_validate_rule_rejects_invalid_rules(self):
+        # Setup
+        invalid_rules = [{}, {'when': {'unknown': 1}}, {'when': {'price_below': 'cheap'}},
+                         {'when': {'price_among_cheapest': 0}}, {'when': {'all': []}},
+                         {'when': {'hour_between': [1, 25]}}, {'when': {'price_below': 1, 'price_above': 0}},
+                         {'when': {'price_below': 1}, 'then': ''}, {'when': {'price_below': 1}, 'unknown': 1}]
+
+        # Actions & Asserts
+        for rule in invalid_rules:
+            with self.assertRaises(SwitchRuleError, msg=rule):
+                SwitchRuleEngine.validate_rule(rule)
+        self.assertTrue(SwitchRuleEngine.validate_rule({'when': {'price_below': 1}}))
@@ -1,11 +1,14 @@
 import inject
 import unittest
 from unittest.mock import Mock, patch, mock_open
+from src.electricity_price_service.price_series import PriceSeries
 from src.switch_service.switch_service import SwitchService
+from src.switch_service.switch_logic_evaluator import get_allowed_builtins
 from src.configuration.base_configuration import BaseConfiguration
 from src.switch_service.models.switch_model import SwitchModel
 from src.switch_service.models.switch_data_model import SwitchDataModel
 from src.switch_service.models.switch_data_model import SwitchDataType
+from datetime import datetime, timedelta
 
 
 class TestSwitchService(unittest.TestCase):
@@ -15,10 +18,13 @@ class TestSwitchService(unittest.TestCase):
         self.mock_weather_service = Mock()
         self.mock_repository_service = Mock()
         self.mock_electricity_price_service = Mock()
+        self.mock_switch_data_writer = Mock()
+        self.mock_switch_logic_evaluator = Mock(enabled=False)
         self.mock_logger = Mock()
         with patch('src.switch_service.switch_service.logging.getLogger', return_value=self.mock_logger):
             self.switch_service = SwitchService(self.mock_config, self.mock_weather_service,
-                                                self.mock_electricity_price_service, self.mock_repository_service)
+                                                self.mock_electricity_price_service, self.mock_repository_service,
+                                                self.mock_switch_data_writer, self.mock_switch_logic_evaluator)
 
     def tearDown(self):
         inject.clear()
@@ -28,7 +34,57 @@ class TestSwitchService(unittest.TestCase):
         self.assertIn('datetime', scope['__builtins__'])
         self.assertIn('print', scope['__builtins__'])
         self.assertIn('get_weather_data_after_date', scope)
+        self.assertIn('get_weather_data_for_switch_location', scope)
         self.assertIn('get_electricity_price_data_after_date', scope)
+        self.assertIn('get_electricity_price_series', scope)
+        self.assertIn('get_weather_series_for_switch_location', scope)
+
+    def test_get_weather_data_for_switch_location(self):
+        # Setup
+        mock_switch = Mock()
+        mock_switch.id = 1
+        start_date = datetime(2024, 5, 1)
+        self.mock_repository_service.get_switch_location_id.return_value = 7
+        self.mock_weather_service.get_weather_data_for_location.return_value = 'some data'
+        scope = self.switch_service._get_allowed_scope(mock_switch)
+
+        # Actions
+        first_result = scope['get_weather_data_for_switch_location'](start_date)
+        scope['get_weather_data_for_switch_location'](start_date, start_date + timedelta(hours=12))
+
+        # Asserts
+        self.assertEqual(first_result, 'some data')
+        self.mock_repository_service.get_switch_location_id.assert_called_once_with(1)
+        self.mock_weather_service.get_weather_data_for_location.assert_any_call(7, start_date, None)
+        self.mock_weather_service.get_weather_data_for_location.assert_any_call(
+            7, start_date, start_date + timedelta(hours=12))
+
+    def test_get_weather_series_for_switch_location_shares_location_lookup(self):
+        # Setup
+        mock_switch = Mock()
+        mock_switch.id = 1
+        start_date = datetime(2024, 5, 1)
+        self.mock_repository_service.get_switch_location_id.return_value = 7
+        self.mock_weather_service.get_weather_series_for_location.return_value = 'some series'
+        scope = self.switch_service._get_allowed_scope(mock_switch)
+
+        # Actions
+        scope['get_weather_data_for_switch_location'](start_date)
+        result = scope['get_weather_series_for_switch_location'](start_date)
+
+        # Asserts
+        self.assertEqual(result, 'some series')
+        self.mock_repository_service.get_switch_location_id.assert_called_once_with(1)
+        self.mock_weather_service.get_weather_series_for_location.assert_called_once_with(7, start_date, None)
+
+    def test_get_weather_data_for_switch_location_without_switch(self):
+        # Setup
+        scope = self.switch_service._get_allowed_scope()
+
+        # Asserts
+        with self.assertRaises(ValueError):
+            scope['get_weather_data_for_switch_location'](datetime(2024, 5, 1))
+        self.mock_weather_service.get_weather_data_for_location.assert_not_called()
 
     def test_fetch_switch_data_when_switch_exists(self):
         # Setup
@@ -65,7 +121,7 @@ class TestSwitchService(unittest.TestCase):
 
         # Asserts
         self.assertEqual(status, 'ON')
-        self.mock_repository_service.store_switch_operational_data.assert_called_once()
+        self.mock_switch_data_writer.write.assert_called_once()
 
     @patch.object(SwitchService, '_fetch_switch')
     def test_get_switch_status_error(self, mock_fetch_switch):
@@ -80,7 +136,24 @@ class TestSwitchService(unittest.TestCase):
         # Asserts
         self.assertEqual(status, SwitchModel.SWITCH_VALUE_IF_ERROR_OCCURRED)
         self.mock_logger.error.assert_called()
-        self.mock_repository_service.store_switch_operational_data.assert_called_once()
+        self.mock_switch_data_writer.write.assert_called_once()
+
+    @patch.object(SwitchService, '_fetch_switch')
+    def test_get_switch_status_reuses_compiled_logic(self, mock_fetch_switch):
+        # Setup
+        mock_switch = Mock()
+        mock_switch.id = 1
+        mock_switch.status_calculation_logic = "def get_switch_status(): return 'ON'"
+        mock_fetch_switch.return_value = mock_switch
+
+        # Actions
+        first_status = self.switch_service.get_switch_status('test_switch', 1)
+        second_status = self.switch_service.get_switch_status('test_switch', 1)
+
+        # Asserts
+        self.assertEqual(first_status, 'ON')
+        self.assertEqual(second_status, 'ON')
+        self.assertEqual(len(self.switch_service.switch_logic_cache), 1)
 
     def test_test_switch_status_calculation_logic(self):
         # Setup
@@ -110,7 +183,7 @@ class TestSwitchService(unittest.TestCase):
         status = self.switch_service.get_switch_status('non_existent_switch', 1)
         self.assertEqual(status, SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED)
         self.mock_logger.error.assert_called()
-        self.mock_repository_service.store_switch_operational_data.assert_not_called()
+        self.mock_switch_data_writer.write.assert_not_called()
 
     def test_store_switch_data(self):
         # Setup
@@ -134,6 +207,32 @@ class TestSwitchService(unittest.TestCase):
         # Asserts
         self.mock_repository_service.update_switch_data.assert_called_once_with(switch_data, 1, "uuid_1")
 
+    def test_update_switch_data_invalidates_compiled_logic(self):
+        # Setup
+        switch_data = SwitchModel(name='test_switch', uuid="uuid_1", place_id='1',
+                                  status_calculation_logic='mock_logic')
+        self.mock_repository_service.update_switch_data.return_value = 1
+        self.switch_service.switch_logic_cache.get_compiled_logic(1, "def get_switch_status(): return 'ON'")
+
+        # Actions
+        self.switch_service.update_switch_data(switch_data, 1, "uuid_1")
+
+        # Asserts
+        self.assertEqual(len(self.switch_service.switch_logic_cache), 0)
+        self.mock_repository_service.delete_switch_schedule.assert_called_once_with(1)
+
+    def test_delete_switch_invalidates_compiled_logic(self):
+        # Setup
+        self.mock_repository_service.delete_switch.return_value = 1
+        self.switch_service.switch_logic_cache.get_compiled_logic(1, "def get_switch_status(): return 'ON'")
+
+        # Actions
+        self.switch_service.delete_switch("uuid_1", 1)
+
+        # Asserts
+        self.mock_repository_service.delete_switch.assert_called_once_with("uuid_1", 1)
+        self.assertEqual(len(self.switch_service.switch_logic_cache), 0)
+
     def test_store_switch_operational_data(self):
         # Setup
         switch_data = SwitchDataModel(switch_id=1, data_type=SwitchDataType.RELAY_STATUS, value_text='ON')
@@ -143,3 +242,278 @@ class TestSwitchService(unittest.TestCase):
 
         # Asserts
         self.mock_repository_service.store_switch_operational_data.assert_called_once_with(switch_data)
+
+    def _enable_decision_table(self, horizon_in_hours='3'):
+        configuration_values = {'switch_decision_table_enabled': 'true',
+                                'switch_decision_table_horizon_in_hours': horizon_in_hours}
+        self.mock_config.get.side_effect = lambda key, default=None: configuration_values.get(key, default)
+        self.mock_switch_logic_evaluator.enabled = True
+        self.mock_switch_logic_evaluator.evaluate.side_effect = self._evaluate_in_process
+
+    @staticmethod
+    def _evaluate_in_process(status_calculation_logic, data_functions, now):
+        global_scope = {'__builtins__': get_allowed_builtins(now), **data_functions}
+        exec(status_calculation_logic, global_scope)
+        return global_scope['get_switch_status']()
+
+    def test_get_allowed_scope_with_fixed_time(self):
+        # Setup
+        moment = datetime(2024, 5, 1, 13)
+
+        # Actions
+        scope = self.switch_service._get_allowed_scope(now=moment)
+
+        # Asserts
+        self.assertEqual(scope['__builtins__']['datetime'].now(), moment)
+        self.assertEqual(scope['__builtins__']['datetime'](2024, 5, 2), datetime(2024, 5, 2))
+
+    def test_regenerate_switch_decision_tables(self):
+        # Setup
+        self._enable_decision_table()
+        switch = SwitchModel(name='test_switch', uuid='uuid_1', place_id=1, id=1,
+                             status_calculation_logic="def get_switch_status():\n"
+                                                      "    if datetime.now().hour == 14:\n"
+                                                      "        raise Exception('error')\n"
+                                                      "    return 'ON' if datetime.now().hour == 13 else 'OFF'")
+        self.mock_repository_service.get_switches_with_logic.return_value = [switch]
+        current_slot_start = datetime(2024, 5, 1, 13)
+
+        # Actions
+        with patch.object(SwitchService, '_get_current_slot_start', return_value=current_slot_start):
+            self.switch_service.regenerate_switch_decision_tables()
+
+        # Asserts
+        self.mock_repository_service.replace_switch_schedule.assert_called_once_with(
+            1, {datetime(2024, 5, 1, 13): 'ON', datetime(2024, 5, 1, 15): 'OFF'})
+
+    def test_regenerate_switch_decision_tables_logs_one_error_per_switch(self):
+        # Setup
+        self._enable_decision_table(horizon_in_hours='48')
+        switch = SwitchModel(name='test_switch', uuid='uuid_1', place_id=1, id=1,
+                             status_calculation_logic="def get_switch_status(): raise Exception('error')")
+        self.mock_repository_service.get_switches_with_logic.return_value = [switch]
+
+        # Actions
+        self.switch_service.regenerate_switch_decision_tables()
+
+        # Asserts
+        self.mock_logger.error.assert_called_once()
+        self.assertIn('48 of 48 slots', self.mock_logger.error.call_args.args[0])
+        self.mock_repository_service.replace_switch_schedule.assert_called_once_with(1, {})
+
+    def test_regenerate_switch_decision_tables_when_disabled(self):
+        # Actions
+        self.switch_service.regenerate_switch_decision_tables()
+
+        # Asserts
+        self.mock_repository_service.get_switches_with_logic.assert_not_called()
+
+    def test_decision_table_requires_switch_logic_evaluator(self):
+        # Setup
+        self._enable_decision_table()
+        self.mock_switch_logic_evaluator.enabled = False
+
+        # Actions
+        enabled = self.switch_service.is_decision_table_enabled()
+        self.switch_service.regenerate_switch_decision_tables()
+
+        # Asserts
+        self.assertFalse(enabled)
+        self.mock_repository_service.get_switches_with_logic.assert_not_called()
+        self.mock_logger.warning.assert_called_once()
+
+    def test_maintain_switch_data_partitions(self):
+        # Setup
+        self.mock_config.get.side_effect = lambda key, default=None: {
+            'switch_data_partition_months_ahead': '2', 'switch_data_retention_in_months': '14'}.get(key, default)
+        now = datetime.now()
+        month_index = now.year * 12 + now.month - 1 - 14
+        expected_retention_start = datetime(month_index // 12, month_index % 12 + 1, 1)
+
+        # Actions
+        self.switch_service.maintain_switch_data_partitions()
+
+        # Asserts
+        self.assertEqual(self.mock_repository_service.create_switch_data_partitions.call_args.args[1], 3)
+        self.mock_repository_service.drop_switch_data_partitions.assert_called_once_with(expected_retention_start)
+
+    def test_maintain_switch_data_partitions_keeps_data_without_retention(self):
+        # Setup
+        self.mock_config.get.side_effect = lambda key, default=None: default
+
+        # Actions
+        self.switch_service.maintain_switch_data_partitions()
+
+        # Asserts
+        self.mock_repository_service.create_switch_data_partitions.assert_called_once()
+        self.mock_repository_service.drop_switch_data_partitions.assert_not_called()
+
+    def test_store_switch_readings(self):
+        # Setup
+        self.mock_repository_service.get_switch_for_user.return_value = SwitchModel(
+            name='test_switch', uuid='uuid_1', place_id=1, status_calculation_logic='logic', id=3)
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.return_value = 1
+        readings = [{'data_type': SwitchDataType.TEMPERATURE, 'log_cre_date': datetime(2024, 5, 1, 10),
+                     'value_number': 21.5},
+                    {'data_type': SwitchDataType.RELAY_STATUS, 'log_cre_date': datetime(2024, 5, 1, 10),
+                     'value_text': 'ON'}]
+
+        # Actions
+        result = self.switch_service.store_switch_readings('uuid_1', 1, readings)
+
+        # Asserts
+        self.assertEqual(result, {'received': 2, 'stored': 1, 'duplicates': 1})
+        rows = self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.call_args.args[0]
+        self.assertEqual(rows[0], {'switch_id': 3, 'data_type': SwitchDataType.TEMPERATURE,
+                                   'log_cre_date': datetime(2024, 5, 1, 10), 'value_text': None,
+                                   'value_number': 21.5})
+        self.mock_repository_service.mark_switch_data_rollups_dirty.assert_called_once_with(
+            3, datetime(2024, 5, 1, 10))
+
+    def test_store_switch_readings_for_unknown_switch(self):
+        # Setup
+        self.mock_repository_service.get_switch_for_user.side_effect = ValueError('not found')
+
+        # Actions & Asserts
+        with self.assertRaises(ValueError):
+            self.switch_service.store_switch_readings('uuid_1', 1, [])
+        self.mock_repository_service.store_switch_operational_data_ignoring_duplicates.assert_not_called()
+
+    def test_evaluate_switch_logic_in_evaluator_when_enabled(self):
+        # Setup
+        self.mock_switch_logic_evaluator.enabled = True
+        self.mock_switch_logic_evaluator.evaluate.return_value = 'ON'
+        switch = SwitchModel(name='test_switch', uuid='uuid_1', place_id=1, id=1,
+                             status_calculation_logic="def get_switch_status(): return 'OFF'")
+
+        # Actions
+        status = self.switch_service._evaluate_switch_logic(switch, datetime(2024, 5, 1, 13))
+
+        # Asserts
+        self.assertEqual(status, 'ON')
+        logic, data_functions, now = self.mock_switch_logic_evaluator.evaluate.call_args.args
+        self.assertEqual(logic, switch.status_calculation_logic)
+        self.assertIn('get_electricity_price_data_after_date', data_functions)
+        self.assertEqual(now, datetime(2024, 5, 1, 13))
+
+    def test_evaluate_switch_rule(self):
+        # Setup
+        self.mock_switch_logic_evaluator.enabled = True
+        switch = SwitchModel(name='test_switch', uuid='uuid_1', place_id=1, id=1,
+                             status_calculation_rule={'when': {'price_among_cheapest': 1}})
+        now = datetime(2024, 5, 1, 1, 30)
+        self.mock_electricity_price_service.get_electricity_price_series.return_value = PriceSeries(
+            [datetime(2024, 5, 1, hour) for hour in range(3)], [3.0, 1.0, 2.0])
+
+        # Actions
+        status = self.switch_service._evaluate_switch_logic(switch, now)
+
+        # Asserts
+        self.assertEqual(status, 'ON')
+        self.mock_switch_logic_evaluator.evaluate.assert_not_called()
+        self.mock_electricity_price_service.get_electricity_price_series.assert_called_once_with(
+            datetime(2024, 5, 1), datetime(2024, 5, 2))
+
+    @patch.object(SwitchService, '_fetch_switch')
+    def test_get_switch_status_from_decision_table(self, mock_fetch_switch):
+        # Setup
+        self._enable_decision_table()
+        mock_switch = Mock()
+        mock_switch.id = 1
+        mock_switch.status_calculation_logic = "def get_switch_status(): raise Exception('error')"
+        mock_fetch_switch.return_value = mock_switch
+        self.mock_repository_service.get_switch_schedule_value.return_value = 'ON'
+
+        # Actions
+        status = self.switch_service.get_switch_status('test_switch', 1)
+
+        # Asserts
+        self.assertEqual(status, 'ON')
+        self.assertEqual(self.mock_repository_service.get_switch_schedule_value.call_args.args[0], 1)
+        self.mock_switch_data_writer.write.assert_called_once()
+
+    @patch.object(SwitchService, '_fetch_switch')
+    def test_get_switch_status_without_decision_table_slot(self, mock_fetch_switch):
+        # Setup
+        self._enable_decision_table()
+        mock_switch = Mock()
+        mock_switch.id = 1
+        mock_switch.status_calculation_logic = "def get_switch_status(): return 'OFF'"
+        mock_fetch_switch.return_value = mock_switch
+        self.mock_repository_service.get_switch_schedule_value.return_value = None
+
+        # Actions
+        status = self.switch_service.get_switch_status('test_switch', 1)
+
+        # Asserts
+        self.assertEqual(status, 'OFF')
+
+    def test_get_switch_statuses(self):
+        # Setup
+        logic = ("def get_switch_status():\n"
+                 "    prices = get_electricity_price_data_after_date(datetime(2024, 5, 1))\n"
+                 "    weather = get_weather_data_for_switch_location(datetime(2024, 5, 1))\n"
+                 "    return 'ON' if prices == ['price_1', 'price_2'] and weather == ['weather_1'] else 'OFF'")
+        switches = [(SwitchModel(name='switch_1', uuid='uuid_1', place_id=1, id=1, status_calculation_logic=logic), 7),
+                    (SwitchModel(name='switch_2', uuid='uuid_2', place_id=1, id=2, status_calculation_logic=logic), 7),
+                    (SwitchModel(name='switch_3', uuid='uuid_3', place_id=1, id=3, status_calculation_logic=None), 7)]
+        self.mock_repository_service.get_switches_with_location_for_user.return_value = switches
+        self.mock_electricity_price_service.get_electricity_price_data_after_date.return_value = ['price_1', 'price_2']
+        self.mock_weather_service.get_weather_data_for_location.return_value = ['weather_1']
+
+        # Actions
+        statuses = self.switch_service.get_switch_statuses(1, ['uuid_1', 'uuid_2', 'uuid_3', 'uuid_4'])
+
+        # Asserts
+        self.assertEqual(statuses, [{'uuid': 'uuid_1', 'status': 'ON'},
+                                    {'uuid': 'uuid_2', 'status': 'ON'},
+                                    {'uuid': 'uuid_3', 'status': SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED},
+                                    {'uuid': 'uuid_4', 'status': SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED}])
+        self.mock_repository_service.get_switches_with_location_for_user.assert_called_once_with(
+            1, ['uuid_1', 'uuid_2', 'uuid_3', 'uuid_4'], None)
+        self.mock_electricity_price_service.get_electricity_price_data_after_date.assert_called_once()
+        self.mock_weather_service.get_weather_data_for_location.assert_called_once_with(7, datetime(2024, 5, 1), None)
+        self.mock_repository_service.get_switch_location_id.assert_not_called()
+        stored_switch_data = self.mock_switch_data_writer.write_many.call_args.args[0]
+        self.assertEqual([data.switch_id for data in stored_switch_data], [1, 2, 3])
+        self.assertEqual([data.value_text for data in stored_switch_data],
+                         ['ON', 'ON', SwitchModel.SWITCH_VALUE_IF_SWITCH_NOT_IMPLEMENTED])
+
+    def test_get_switch_statuses_with_price_series(self):
+        # Setup
+        logic = ("def get_switch_status():\n"
+                 "    day_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)\n"
+                 "    prices = get_electricity_price_series(day_start, day_start + timedelta(days=1))\n"
+                 "    return 'ON' if prices.is_among_cheapest(datetime.now(), 2) else 'OFF'")
+        day_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        switches = [(SwitchModel(name='switch_1', uuid='uuid_1', place_id=1, id=1, status_calculation_logic=logic), 7),
+                    (SwitchModel(name='switch_2', uuid='uuid_2', place_id=1, id=2, status_calculation_logic=logic), 7)]
+        self.mock_repository_service.get_switches_with_location_for_user.return_value = switches
+        self.mock_electricity_price_service.get_electricity_price_series.return_value = PriceSeries(
+            [day_start + timedelta(hours=hour) for hour in range(24)], [0.0] * 24)
+
+        # Actions
+        statuses = self.switch_service.get_switch_statuses(1, ['uuid_1', 'uuid_2'])
+
+        # Asserts
+        self.assertEqual(statuses, [{'uuid': 'uuid_1', 'status': 'ON'}, {'uuid': 'uuid_2', 'status': 'ON'}])
+        self.mock_electricity_price_service.get_electricity_price_series.assert_called_once_with(
+            day_start, day_start + timedelta(days=1))
+
+    def test_get_switch_statuses_for_place(self):
+        # Setup
+        self._enable_decision_table()
+        switches = [(SwitchModel(name='switch_1', uuid='uuid_1', place_id=2, id=1,
+                                 status_calculation_logic="def get_switch_status(): raise Exception('error')"), 7),
+                    (SwitchModel(name='switch_2', uuid='uuid_2', place_id=2, id=2,
+                                 status_calculation_logic="def get_switch_status(): raise Exception('error')"), 7)]
+        self.mock_repository_service.get_switches_with_location_for_user.return_value = switches
+        self.mock_repository_service.get_switch_schedule_values.return_value = {1: 'ON'}
+
+        # Actions
+        statuses = self.switch_service.get_switch_statuses(1, place_id=2)
+
+        # Asserts
+        self.assertEqual(statuses, [{'uuid': 'uuid_1', 'status': 'ON'},
+                                    {'uuid': 'uuid_2', 'status': SwitchModel.SWITCH_VALUE_IF_ERROR_OCCURRED}])
+        self.assertEqual(self.mock_repository_service.get_switch_schedule_values.call_args.args[0], [1, 2])
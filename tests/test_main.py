@@ -9,7 +9,9 @@ class TestMain(unittest.TestCase):
         self.mock_job_service = Mock()
         self.mock_rest_api = Mock()
         self.mock_repository_service = Mock()
-        self.mock_main = Main(self.mock_job_service, self.mock_rest_api, self.mock_repository_service)
+        self.mock_data_change_notifier = Mock()
+        self.mock_main = Main(self.mock_job_service, self.mock_rest_api, self.mock_repository_service,
+                              self.mock_data_change_notifier)
 
     def test_init(self):
         # Asserts
@@ -23,6 +25,7 @@ class TestMain(unittest.TestCase):
 
         # Asserts
         self.mock_repository_service.create_database.assert_called_once()
+        self.mock_data_change_notifier.start.assert_called_once()
         self.assertEqual(mock_return_value, self.mock_rest_api.app)
 
     def test_run_jobs(self):
@@ -32,3 +35,4 @@ class TestMain(unittest.TestCase):
         # Asserts
         self.mock_repository_service.create_database.assert_called_once()
         self.mock_job_service.plan_jobs.assert_called_once()
+        self.mock_data_change_notifier.start.assert_not_called()
@@ -1,41 +1,42 @@
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from src.weather_service.api.open_meteo_weather_api import OpenMeteoWeatherAPI
+from src.location_service.models.location_model import LocationModel
 
 class TestOpenMeteoWeatherAPI(unittest.TestCase):
 
-    @patch('src.weather_service.api.open_meteo_weather_api.requests')
-    def test_get_weather_data(self, mock_requests):
+    def test_get_weather_data(self):
 
         # Setup
         expected_url = 'https://api.openmeteo.com?latitude=52.555&longitude=24.5555&weather_data_types=cloud_cover,temperature,sunshine_duration&forecast_days=3&timezone=EET'
         data = {"my": "json", "file": "here"}
         response = Mock()
         response.json.return_value = data
-        mock_requests.get.return_value = response
+        mock_http_client = Mock()
+        mock_http_client.get.return_value = response
         mock_configuration = Mock()
         mock_configuration.get.side_effect = lambda key: {
             'open_meteo_url': 'https://api.openmeteo.com?latitude={latitude}&longitude={longitude}&weather_data_types={weather_data_types}&forecast_days={forecast_days}&timezone={timezone}'}[
             key]
-        api_service = OpenMeteoWeatherAPI(mock_configuration)
+        api_service = OpenMeteoWeatherAPI(mock_configuration, mock_http_client)
 
         # Action
         result = api_service.get_weather_data(52.555, 24.5555)
 
         # Assertion
-        mock_requests.get.assert_called_once_with(expected_url)
+        mock_http_client.get.assert_called_once_with(expected_url)
         response.json.assert_called_once()
         self.assertEqual(result, data)
 
-    @patch('src.weather_service.api.open_meteo_weather_api.requests')
-    def test_get_weather_data_request_exception(self, mock_requests):
+    def test_get_weather_data_request_exception(self):
         # Setup
-        mock_requests.get.side_effect = Exception('Boom!')
+        mock_http_client = Mock()
+        mock_http_client.get.side_effect = Exception('Boom!')
         mock_configuration = Mock()
         mock_configuration.get.side_effect = lambda key: {
             'open_meteo_url': 'https://api.openmeteo.com?latitude={latitude}&longitude={longitude}&weather_data_types={weather_data_types}&forecast_days={forecast_days}&timezone={timezone}'}[
             key]
-        api_service = OpenMeteoWeatherAPI(mock_configuration)
+        api_service = OpenMeteoWeatherAPI(mock_configuration, mock_http_client)
 
         # Action
         result = api_service.get_weather_data(52.555, 24.5555)
@@ -43,3 +44,43 @@ class TestOpenMeteoWeatherAPI(unittest.TestCase):
         # Assertion
         self.assertIsNone(result)
 
+    def test_get_weather_data_many(self):
+
+        # Setup
+        expected_url = 'https://api.openmeteo.com?latitude=52.555,56.95&longitude=24.5555,24.1&weather_data_types=cloud_cover,temperature,sunshine_duration&forecast_days=3&timezone=EET'
+        data = [{"latitude": 52.555}, {"latitude": 56.95}]
+        response = Mock()
+        response.json.return_value = data
+        mock_http_client = Mock()
+        mock_http_client.get.return_value = response
+        mock_configuration = Mock()
+        mock_configuration.get.side_effect = lambda key: {
+            'open_meteo_url': 'https://api.openmeteo.com?latitude={latitude}&longitude={longitude}&weather_data_types={weather_data_types}&forecast_days={forecast_days}&timezone={timezone}'}[
+            key]
+        api_service = OpenMeteoWeatherAPI(mock_configuration, mock_http_client)
+        locations = [LocationModel(latitude=52.555, longitude=24.5555, id=1),
+                     LocationModel(latitude=56.95, longitude=24.1, id=2)]
+
+        # Action
+        result = api_service.get_weather_data_many(locations)
+
+        # Assertion
+        mock_http_client.get.assert_called_once_with(expected_url)
+        self.assertEqual(result, data)
+
+    def test_get_payload_fingerprint_ignores_generation_time(self):
+
+        # Setup
+        api_service = OpenMeteoWeatherAPI(Mock(), Mock())
+        first_response = [{'latitude': 52.555, 'generationtime_ms': 0.12, 'hourly': {'temperature_2m': [1.5]}}]
+        second_response = [{'latitude': 52.555, 'generationtime_ms': 0.47, 'hourly': {'temperature_2m': [1.5]}}]
+        changed_response = [{'latitude': 52.555, 'generationtime_ms': 0.12, 'hourly': {'temperature_2m': [2.5]}}]
+
+        # Action
+        fingerprint = api_service.get_payload_fingerprint(first_response)
+
+        # Assertion
+        self.assertEqual(fingerprint, api_service.get_payload_fingerprint(second_response))
+        self.assertEqual(api_service.get_payload_fingerprint(first_response[0]),
+                         api_service.get_payload_fingerprint(second_response[0]))
+        self.assertNotEqual(fingerprint, api_service.get_payload_fingerprint(changed_response))
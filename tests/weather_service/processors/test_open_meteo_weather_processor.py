@@ -45,4 +45,44 @@ class TestOpenMeteoWeatherProcessor(unittest.TestCase):
         processed_data = self.processor.process_raw_data(self.data, self.location_id)
 
         # Asserts
-        self.assertIsNone(processed_data)
\ No newline at end of file
+        self.assertIsNone(processed_data)
+
+    def test_process_raw_data_many(self):
+        # Setup
+        first_location_data = self._get_data('open_meteo_sample_response.json')
+        second_location_data = self._get_data('open_meteo_sample_response.json')
+        second_location_data['latitude'] = 56.95
+        self.processor = OpenMeteoWeatherProcessor()
+
+        # Actions
+        processed_data = self.processor.process_raw_data_many([first_location_data, second_location_data], [1, 2])
+
+        # Asserts
+        self.assertEqual(len(processed_data), 2)
+        self.assertEqual(len(processed_data[0]), 24)
+        self.assertEqual(processed_data[0][0].location_id, 1)
+        self.assertEqual(processed_data[1][0].location_id, 2)
+        self.assertEqual(processed_data[1][0].latitude, 56.95)
+
+    def test_process_raw_data_many_single_location_response(self):
+        # Setup
+        self.data = self._get_data('open_meteo_sample_response.json')
+        self.processor = OpenMeteoWeatherProcessor()
+
+        # Actions
+        processed_data = self.processor.process_raw_data_many(self.data, [1])
+
+        # Asserts
+        self.assertEqual(len(processed_data), 1)
+        self.assertEqual(len(processed_data[0]), 24)
+
+    def test_process_raw_data_many_location_count_mismatch(self):
+        # Setup
+        self.data = self._get_data('open_meteo_sample_response.json')
+        self.processor = OpenMeteoWeatherProcessor()
+
+        # Actions
+        processed_data = self.processor.process_raw_data_many([self.data], [1, 2])
+
+        # Asserts
+        self.assertIsNone(processed_data)
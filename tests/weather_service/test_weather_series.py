@@ -0,0 +1,62 @@
+import pickle
+import unittest
+from datetime import datetime, timedelta
+from src.weather_service.models.weather_model import WeatherModel
+from src.weather_service.weather_series import WeatherSeries
+
+
+class TestWeatherSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.start = datetime(2024, 5, 1)
+        self.series = WeatherSeries.from_records(
+            [WeatherModel(self._hour(hour), hour * 10, temperature, 1, 2, hour / 10, 1)
+             for hour, temperature in reversed(list(enumerate([4.0, None, 8.0, 6.0])))])
+
+    def _hour(self, hour):
+        return self.start + timedelta(hours=hour)
+
+    def test_from_records_orders_by_datetime(self):
+        # Asserts
+        self.assertEqual(self.series.datetimes, tuple(self._hour(hour) for hour in range(4)))
+        self.assertEqual(self.series.temperatures, (4.0, None, 8.0, 6.0))
+        self.assertEqual(self.series.cloud_covers, (0, 10, 20, 30))
+        self.assertEqual(self.series.sunshine_durations, (0.0, 0.1, 0.2, 0.3))
+        self.assertEqual(len(self.series), 4)
+
+    def test_get_window(self):
+        # Actions
+        window = self.series.get_window(self._hour(1), self._hour(3))
+
+        # Asserts
+        self.assertEqual(window.datetimes, (self._hour(1), self._hour(2)))
+        self.assertEqual(window.temperatures, (None, 8.0))
+        self.assertEqual(window.cloud_covers, (10, 20))
+
+    def test_get_values_at(self):
+        # Setup
+        moment = self._hour(2) + timedelta(minutes=30)
+
+        # Asserts
+        self.assertEqual(self.series.get_temperature_at(moment), 8.0)
+        self.assertEqual(self.series.get_cloud_cover_at(moment), 20)
+        self.assertEqual(self.series.get_sunshine_duration_at(moment), 0.2)
+        self.assertIsNone(self.series.get_temperature_at(self._hour(-1)))
+
+    def test_get_temperature_range(self):
+        # Asserts
+        self.assertEqual(self.series.get_temperature_range(), (4.0, 6.0, 8.0))
+        self.assertEqual(self.series.get_window(self._hour(1), self._hour(2)).get_temperature_range(),
+                         (None, None, None))
+
+    def test_pickle(self):
+        # Actions
+        result = pickle.loads(pickle.dumps(self.series))
+
+        # Asserts
+        self.assertEqual(result.temperatures, self.series.temperatures)
+        self.assertEqual(result.datetimes, self.series.datetimes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,35 @@
 import unittest
 from unittest.mock import Mock, call
+from datetime import datetime, timedelta
 from src.weather_service.api.base_weather_api import BaseWeatherAPI
 from src.weather_service.processors.base_weather_processor import BaseWeatherProcessor
+from src.repository_service.base_repository_service import UpsertResult
 from src.repository_service.weather_repository_service import WeatherRepositoryService
 from src.location_service.location_service import LocationService
 from src.location_service.models.location_model import LocationModel
+from src.weather_service.models.weather_model import WeatherModel
 from src.weather_service.weather_service import WeatherService
+from src.configuration.base_configuration import BaseConfiguration
+from src.cache_service.data_change_notifier import DataChangeNotifier
 
 
 class TestWeatherService(unittest.TestCase):
 
     def setUp(self):
         self.mock_weather_api = Mock(spec=BaseWeatherAPI)
+        self.mock_weather_api.MAX_LOCATIONS_PER_REQUEST = 1
         self.mock_weather_processor = Mock(spec=BaseWeatherProcessor)
         self.mock_repository_service = Mock(spec=WeatherRepositoryService)
         self.mock_location_service = Mock(spec=LocationService)
+        self.mock_configuration = Mock(spec=BaseConfiguration)
+        self.configuration_values = {'weather_data_regeneration_concurrency': '1',
+                                     'weather_api_rate_limit_per_second': '0',
+                                     'weather_data_cache_ttl_in_seconds': '0'}
+        self.mock_configuration.get.side_effect = lambda key, default=None: self.configuration_values.get(key, default)
+        self.mock_data_change_notifier = Mock(spec=DataChangeNotifier)
         self.weather_service = WeatherService(self.mock_weather_api, self.mock_weather_processor,
-                                              self.mock_repository_service, self.mock_location_service)
+                                              self.mock_repository_service, self.mock_location_service,
+                                              self.mock_configuration, self.mock_data_change_notifier)
 
     def test_regenerate_weather_data(self):
 
@@ -38,6 +51,112 @@ class TestWeatherService(unittest.TestCase):
         self.mock_repository_service.store_weather_data.assert_any_call({'processed_temp': 18})
         self.mock_repository_service.store_weather_data.assert_any_call({'processed_temp': 23})
 
+    def test_regenerate_weather_data_concurrently(self):
+        # Setup
+        self.configuration_values['weather_data_regeneration_concurrency'] = '4'
+        locations = [LocationModel(latitude=index, longitude=index + 1, id=index) for index in range(10)]
+        self.mock_location_service.get_all_locations.return_value = locations
+        self.mock_weather_api.get_weather_data.side_effect = lambda latitude, longitude: {'temp': latitude}
+        self.mock_weather_processor.process_raw_data.side_effect = lambda data, location_id: [data['temp'], location_id]
+
+        # Action
+        self.weather_service.regenerate_weather_data()
+
+        # Asserts
+        self.assertEqual(self.mock_weather_api.get_weather_data.call_count, len(locations))
+        for location in locations:
+            self.mock_repository_service.store_weather_data.assert_any_call([location.latitude, location.id])
+
+    def test_regenerate_weather_data_continues_after_failed_location(self):
+        # Setup
+        self.mock_location_service.get_all_locations.return_value = [LocationModel(latitude=1, longitude=2, id=1),
+                                                                     LocationModel(latitude=3, longitude=4, id=2)]
+        self.mock_weather_api.get_weather_data.side_effect = [Exception('Boom!'), {'temp': 25}]
+        self.mock_weather_processor.process_raw_data.return_value = {'processed_temp': 23}
+
+        # Action
+        self.weather_service.regenerate_weather_data()
+
+        # Asserts
+        self.mock_repository_service.store_weather_data.assert_called_once_with({'processed_temp': 23})
+
+    def test_regenerate_weather_data_in_batches(self):
+        # Setup
+        self.mock_weather_api.MAX_LOCATIONS_PER_REQUEST = 2
+        locations = [LocationModel(latitude=1, longitude=2, id=1),
+                     LocationModel(latitude=3, longitude=4, id=2),
+                     LocationModel(latitude=5, longitude=6, id=3)]
+        self.mock_location_service.get_all_locations.return_value = locations
+        self.mock_weather_api.get_weather_data_many.return_value = [{'temp': 20}, {'temp': 25}]
+        self.mock_weather_api.get_weather_data.return_value = {'temp': 30}
+        self.mock_weather_processor.process_raw_data_many.return_value = [['weather_1'], None]
+        self.mock_weather_processor.process_raw_data.return_value = ['weather_3']
+
+        # Action
+        self.weather_service.regenerate_weather_data()
+
+        # Asserts
+        self.mock_weather_api.get_weather_data_many.assert_called_once_with(locations[:2])
+        self.mock_weather_api.get_weather_data.assert_called_once_with(5, 6)
+        self.mock_weather_processor.process_raw_data_many.assert_called_once_with([{'temp': 20}, {'temp': 25}], [1, 2])
+        self.mock_repository_service.store_weather_data.assert_any_call(['weather_1'])
+        self.mock_repository_service.store_weather_data.assert_any_call(['weather_3'])
+
+    def test_regenerate_weather_data_skips_unchanged_data(self):
+        # Setup
+        self.mock_location_service.get_all_locations.return_value = [LocationModel(latitude=1, longitude=2, id=1)]
+        self.mock_weather_api.get_weather_data.return_value = {'temp': 20}
+        self.mock_weather_api.get_payload_fingerprint.side_effect = ['fingerprint', 'fingerprint', 'changed']
+        self.mock_weather_processor.process_raw_data.return_value = ['weather_1']
+
+        # Action
+        for _ in range(3):
+            self.weather_service.regenerate_weather_data()
+
+        # Asserts
+        self.assertEqual(self.mock_weather_processor.process_raw_data.call_count, 2)
+        self.assertEqual(self.mock_repository_service.store_weather_data.call_count, 2)
+
+    def test_regenerate_weather_data_retries_after_failed_store(self):
+        # Setup
+        self.mock_location_service.get_all_locations.return_value = [LocationModel(latitude=1, longitude=2, id=1)]
+        self.mock_weather_api.get_payload_fingerprint.return_value = 'fingerprint'
+        self.mock_weather_processor.process_raw_data.return_value = ['weather_1']
+        self.mock_repository_service.store_weather_data.side_effect = [Exception('Boom!'), Mock()]
+
+        # Action
+        self.weather_service.regenerate_weather_data()
+        self.weather_service.regenerate_weather_data()
+
+        # Asserts
+        self.assertEqual(self.mock_repository_service.store_weather_data.call_count, 2)
+        self.assertEqual(self.weather_service.payload_fingerprints, {(1,): 'fingerprint'})
+
+    def test_regenerate_weather_data_publishes_changes_once(self):
+        # Setup
+        self.mock_location_service.get_all_locations.return_value = [LocationModel(latitude=1, longitude=2, id=1),
+                                                                     LocationModel(latitude=3, longitude=4, id=2)]
+        self.mock_repository_service.store_weather_data.side_effect = [UpsertResult(24, 0), UpsertResult(0, 0)]
+
+        # Action
+        self.weather_service.regenerate_weather_data()
+
+        # Asserts
+        self.mock_data_change_notifier.subscribe.assert_called_once_with('weather',
+                                                                         self.weather_service.weather_cache.invalidate)
+        self.mock_data_change_notifier.publish.assert_called_once_with('weather')
+
+    def test_regenerate_weather_data_does_not_publish_unchanged_data(self):
+        # Setup
+        self.mock_location_service.get_all_locations.return_value = [LocationModel(latitude=1, longitude=2, id=1)]
+        self.mock_repository_service.store_weather_data.return_value = UpsertResult(0, 0)
+
+        # Action
+        self.weather_service.regenerate_weather_data()
+
+        # Asserts
+        self.mock_data_change_notifier.publish.assert_not_called()
+
     def test_get_weather_data_after_date(self):
         # Setup
         mock_date = '2024.05.02'
@@ -50,4 +169,94 @@ class TestWeatherService(unittest.TestCase):
         self.mock_repository_service.get_weather_data_after_date.assert_called_once_with(mock_date)
         self.assertEqual(mock_result, 'some data')
 
+    def test_get_weather_data_for_location(self):
+        # Setup
+        start_date = datetime(2024, 5, 2)
+        end_date = datetime(2024, 5, 3)
+        self.mock_repository_service.get_weather_data_for_location.return_value = 'some data'
+
+        # Actions
+        mock_result = self.weather_service.get_weather_data_for_location(1, start_date, end_date)
+
+        # Asserts
+        self.mock_repository_service.get_weather_data_for_location.assert_called_once_with(1, start_date, end_date)
+        self.assertEqual(mock_result, 'some data')
+
+    def test_get_weather_data_for_location_limits_window(self):
+        # Setup
+        start_date = datetime(2024, 5, 2)
+        expected_end_date = start_date + WeatherService.MAX_WEATHER_DATA_WINDOW
+
+        # Actions
+        self.weather_service.get_weather_data_for_location(1, start_date)
+        self.weather_service.get_weather_data_for_location(1, start_date, datetime(2025, 1, 1))
+
+        # Asserts
+        self.mock_repository_service.get_weather_data_for_location.assert_has_calls(
+            [call(1, start_date, expected_end_date), call(1, start_date, expected_end_date)])
+
+    def _create_cached_service(self):
+        self.configuration_values['weather_data_cache_ttl_in_seconds'] = '300'
+        return WeatherService(self.mock_weather_api, self.mock_weather_processor, self.mock_repository_service,
+                              self.mock_location_service, self.mock_configuration, self.mock_data_change_notifier)
+
+    def test_get_weather_data_for_location_from_cache(self):
+        # Setup
+        weather_service = self._create_cached_service()
+        now = datetime.now()
+        weather_data = [WeatherModel(now + timedelta(hours=hour), 0, hour, 1, 2, 0, 1) for hour in range(10)]
+        self.mock_repository_service.get_weather_data_for_location.return_value = weather_data
 
+        # Action
+        first_result = weather_service.get_weather_data_for_location(1, now, now + timedelta(hours=3))
+        second_result = weather_service.get_weather_data_for_location(1, now + timedelta(hours=5))
+
+        # Asserts
+        self.mock_repository_service.get_weather_data_for_location.assert_called_once()
+        self.assertEqual([weather.temperature for weather in first_result], [1, 2, 3])
+        self.assertEqual([weather.temperature for weather in second_result], [6, 7, 8, 9])
+
+    def test_get_weather_series_for_location(self):
+        # Setup
+        start_date = datetime(2024, 5, 2)
+        self.mock_repository_service.get_weather_data_for_location.return_value = [
+            WeatherModel(start_date + timedelta(hours=hour), 0, hour, 1, 2, 0, 1) for hour in [2, 0, 1]]
+
+        # Action
+        result = self.weather_service.get_weather_series_for_location(1, start_date, start_date + timedelta(hours=2))
+
+        # Asserts
+        self.mock_repository_service.get_weather_data_for_location.assert_called_once_with(
+            1, start_date - timedelta(microseconds=1), start_date + timedelta(hours=2))
+        self.assertEqual(result.temperatures, (0, 1))
+
+    def test_get_weather_series_for_location_from_cache(self):
+        # Setup
+        weather_service = self._create_cached_service()
+        now = datetime.now()
+        weather_data = [WeatherModel(now + timedelta(hours=hour), 0, hour, 1, 2, 0, 1) for hour in range(10)]
+        self.mock_repository_service.get_weather_data_for_location.return_value = weather_data
+
+        # Action
+        first_result = weather_service.get_weather_series_for_location(1, now, now + timedelta(hours=3))
+        second_result = weather_service.get_weather_series_for_location(1, now + timedelta(hours=5))
+
+        # Asserts
+        self.mock_repository_service.get_weather_data_for_location.assert_called_once()
+        self.assertEqual(first_result.temperatures, (0, 1, 2))
+        self.assertEqual(second_result.temperatures, (5, 6, 7, 8, 9))
+
+    def test_regenerate_weather_data_invalidates_cache(self):
+        # Setup
+        weather_service = self._create_cached_service()
+        self.mock_location_service.get_all_locations.return_value = [LocationModel(latitude=1, longitude=2, id=1)]
+        self.mock_repository_service.get_weather_data_after_date.return_value = []
+        weather_service.get_weather_data_after_date(datetime.now())
+        weather_service.get_weather_data_after_date(datetime.now())
+
+        # Action
+        weather_service.regenerate_weather_data()
+        weather_service.get_weather_data_after_date(datetime.now())
+
+        # Asserts
+        self.assertEqual(self.mock_repository_service.get_weather_data_after_date.call_count, 2)